@@ -2,6 +2,7 @@ from . import utils
 from . import prepare
 from .base_dataset import BaseDataset, Split
 from .sequence_mixin import SequenceMixin
+from .samplers import AspectRatioBucketSampler, SequenceWindowSampler, WeightedMergeSampler
 from .split_mixin import SplitMixin
 from .waymo_dataset import WaymoDataset
 from .coco_base_dataset import CocoBaseDataset
@@ -12,6 +13,7 @@ from .flyingthings3D_subset_dataset import FlyingThings3DSubsetDataset
 from .mot17 import Mot17
 from .flying_chairs2_dataset import FlyingChairs2Dataset
 from .merge_dataset import MergeDataset
+from .shard_dataset import ShardDataset, write_shards
 from .crowd_human_dataset import CrowdHumanDataset
 from .sintel_flow_dataset import SintelFlowDataset
 from .sintel_disparity_dataset import SintelDisparityDataset
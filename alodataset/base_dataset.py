@@ -1,4 +1,9 @@
 import os
+import collections
+import concurrent.futures
+import functools
+import itertools
+import hashlib
 import pickle
 import requests
 import shutil
@@ -9,6 +14,9 @@ from typing import List, Callable, Dict
 from enum import Enum
 
 from aloscene.io.utils.errors import InvalidSampleError
+from aloscene.utils.payload import to_payload, from_payload
+from aloscene.utils.pipeline_profiler import profile_stage
+from alodataset.utils.sample_cache import SampleCache
 from aloscene import Frame
 import aloscene
 
@@ -34,7 +42,88 @@ class Split(Enum):
     Type: List[str] = ["train", "val", "test"]
 
 
-def stream_loader(dataset, num_workers=2):
+def _payload_collate_fn(collate_fn, batch_data):
+    """Collate the data in the worker then convert it to a payload (see :mod:`aloscene.utils.payload`)"""
+    return to_payload(collate_fn(batch_data))
+
+
+class PayloadDataLoader(torch.utils.data.DataLoader):
+    """DataLoader used with `detached_payload=True`. The workers send the data to the main process as a
+    compact payload (raw tensors in shared memory + small schema) instead of pickling the whole augmented
+    tensors. The augmented tensors are then rebuilt on the main process, without any copy.
+    """
+
+    def __init__(self, *args, collate_fn, **kwargs):
+        # The loader can be re-instantiated with its own collate_fn (by pytorch lightning for instance)
+        if not (isinstance(collate_fn, functools.partial) and collate_fn.func is _payload_collate_fn):
+            collate_fn = functools.partial(_payload_collate_fn, collate_fn)
+        super().__init__(*args, collate_fn=collate_fn, **kwargs)
+
+    def __iter__(self):
+        for payload in super().__iter__():
+            yield from_payload(payload)
+
+
+class ThreadedStreamLoader(object):
+    """Stream loader reading the items of a dataset with a pool of threads, in the main process.
+
+    Up to `prefetch` items are read ahead by `num_threads` threads and yielded in order. Without worker
+    processes, there is no process startup and no inter-process communication: the first item is available
+    as soon as it is loaded and the frames are yielded as built by the dataset (and its `transform_fn`).
+    It fits the I/O bound streaming (evaluation, inference), where the threads mostly wait for the disk or
+    decode images with `torchvision.io`, which releases the GIL. The pure python loading and transformations
+    are serialized by the GIL: use process workers for them.
+
+    Parameters
+    ----------
+    dataset : torch.utils.data.Dataset
+        Dataset to read. It must support concurrent reads (the datasets of alodataset do).
+    num_threads : int
+        Number of threads, by default 4
+    prefetch : int
+        Maximum number of items read ahead, by default 2 * num_threads
+    indices : list
+        Indices of the items to read, by default all the items in order
+    """
+
+    def __init__(self, dataset, num_threads: int = 4, prefetch: int = None, indices: list = None):
+        assert num_threads > 0, "num_threads must be positive"
+        self.dataset = dataset
+        self.num_threads = num_threads
+        self.prefetch = 2 * num_threads if prefetch is None else max(prefetch, 1)
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.dataset) if self.indices is None else len(self.indices)
+
+    def _load(self, idx):
+        return self.dataset._collate_fn(self.dataset[idx])
+
+    def __iter__(self):
+        indices = iter(range(len(self.dataset)) if self.indices is None else self.indices)
+        pending = collections.deque()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.num_threads)
+        try:
+            for idx in itertools.islice(indices, self.prefetch):
+                pending.append(executor.submit(self._load, idx))
+            while pending:
+                data = pending.popleft().result()
+                for idx in itertools.islice(indices, 1):
+                    pending.append(executor.submit(self._load, idx))
+                yield data
+        finally:
+            # Stopped before the end (or error): the items not started yet are not read
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+def _get_loader_class(num_workers, detached_payload):
+    # Without workers, there is no inter-process communication to save.
+    return PayloadDataLoader if detached_payload and num_workers > 0 else torch.utils.data.DataLoader
+
+
+def stream_loader(dataset, num_workers=2, detached_payload=False, num_threads=0):
     """Get a stream loader from the dataset. Compared to the :func:`train_loader`
     the :func:`stream_loader` do not have batch dimension and do not shuffle the dataset.
 
@@ -44,19 +133,35 @@ def stream_loader(dataset, num_workers=2):
         Dataset to make dataloader
     num_workers : int
         Number of workers, by default 2
+    detached_payload : bool
+        If True (and num_workers > 0), the workers send the frames as a compact payload that is rebuilt
+        on the main process. See :class:`PayloadDataLoader`. By default False.
+    num_threads : int
+        If > 0, the items are read by `num_threads` threads of the main process instead of worker processes
+        (`num_workers` is ignored). See :class:`ThreadedStreamLoader`. By default 0.
 
     Returns
     -------
     torch.utils.data.DataLoader
         A generator
     """
-    data_loader = torch.utils.data.DataLoader(
+    if num_threads > 0:
+        return ThreadedStreamLoader(dataset, num_threads=num_threads)
+    loader_class = _get_loader_class(num_workers, detached_payload)
+    data_loader = loader_class(
         dataset, batch_size=None, collate_fn=lambda d: dataset._collate_fn(d), num_workers=num_workers
     )
     return data_loader
 
 
-def train_loader(dataset, batch_size=1, num_workers=2, sampler=torch.utils.data.RandomSampler, sampler_kwargs={}):
+def train_loader(
+    dataset,
+    batch_size=1,
+    num_workers=2,
+    sampler=torch.utils.data.RandomSampler,
+    sampler_kwargs={},
+    detached_payload=False,
+):
     """Get training loader from the dataset
 
     Parameters
@@ -70,6 +175,9 @@ def train_loader(dataset, batch_size=1, num_workers=2, sampler=torch.utils.data.
     sampler : torch.utils.data, optional
         Callback to sampler the dataset, by default torch.utils.data.RandomSampler
         Or instance of any class inheriting from torch.utils.data.Sampler
+    detached_payload : bool, optional
+        If True (and num_workers > 0), the workers send the frames as a compact payload that is rebuilt
+        on the main process. See :class:`PayloadDataLoader`. By default False.
 
     Returns
     -------
@@ -78,7 +186,8 @@ def train_loader(dataset, batch_size=1, num_workers=2, sampler=torch.utils.data.
     """
     if sampler is not None and not(isinstance(sampler, torch.utils.data.Sampler)):
         sampler = sampler(dataset, **sampler_kwargs)
-    data_loader = torch.utils.data.DataLoader(
+    loader_class = _get_loader_class(num_workers, detached_payload)
+    data_loader = loader_class(
         dataset,
         # batch_sampler=batch_sampler,
         sampler=sampler,
@@ -105,6 +214,43 @@ def rename_data_to_none(data):
     return data
 
 
+def load_lazy_children(data):
+    """Load the lazy children of the frames (see :class:`~aloscene.tensors.lazy_child.LazyChild`) left by the
+    transformations, so that they are loaded by the DataLoader workers and not sent unloaded to the main process"""
+    if isinstance(data, dict):
+        for key in data:
+            if isinstance(data[key], aloscene.tensors.AugmentedTensor):
+                data[key].load_lazy_children()
+    else:
+        data.load_lazy_children()
+    return data
+
+
+def _is_config_value(value):
+    """Only the simple attributes of a dataset are used to identify its configuration"""
+    if value is None or isinstance(value, (str, int, float, bool, Enum)):
+        return True
+    elif isinstance(value, (list, tuple)):
+        return all(_is_config_value(v) for v in value)
+    elif isinstance(value, dict):
+        return all(_is_config_value(k) and _is_config_value(v) for k, v in value.items())
+    return False
+
+
+class _CacheWarmer(torch.utils.data.Dataset):
+    """Load (and so cache) the samples of a dataset, without returning them"""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, idx):
+        self.dataset._load_item(idx)
+        return idx
+
+
 def _user_prompt(message):
     res = input(message + "\033[93m")
     print("\033[0m", end="")  # Color reset
@@ -121,6 +267,9 @@ class BaseDataset(torch.utils.data.Dataset):
         max_retry_on_error=3,
         retry_offset=20,
         sample: bool = False,
+        cache_dir: str = None,
+        cache_max_size: float = 20.0,
+        decode_size: tuple = None,
         **kwargs,
     ):
         """ Streaming dataset
@@ -150,6 +299,18 @@ class BaseDataset(torch.utils.data.Dataset):
         sample : bool
             Download (or not) a dataset sample from internet and replace the default dataset_dir,
             by default False.
+        cache_dir : str
+            If not None, the decoded samples (before `transform_fn`) are cached into this directory,
+            so that only the first epoch pays for the decoding. The samples are identified by the dataset name,
+            the configuration of the dataset (see :func:`cache_config`) and the index. See
+            :class:`~alodataset.utils.sample_cache.SampleCache`. By default None (no cache).
+        cache_max_size : float
+            Size budget of the cache directory in GB, the least recently used samples being evicted first.
+            By default 20.
+        decode_size : tuple
+            Planned output size (H, W) of the transformations (see :func:`set_decode_size`). The datasets
+            supporting it decode their JPEG images at a reduced scale still larger than this size, their labels
+            being rescaled accordingly. By default None (full resolution).
         """
 
         super(BaseDataset, self).__init__(**kwargs)
@@ -165,10 +326,39 @@ class BaseDataset(torch.utils.data.Dataset):
         self.print_errors = print_errors
         self.retry_offset = retry_offset
         self.max_retry_on_error = max_retry_on_error
+        self.cache_dir = cache_dir
+        self.cache_max_size = cache_max_size
+        self._cache = None
+        self.decode_size = decode_size
 
     def getitem(self):
         raise Exception("Not implemented Error")
 
+    def get_item_sizes(self):
+        """Size (H, W) of the frame of each item before the transformations, without decoding the samples.
+        Used to group the items of similar aspect ratios in the batches
+        (see :class:`~alodataset.samplers.AspectRatioBucketSampler`).
+
+        Returns
+        -------
+        sizes: np.ndarray
+            Array of shape (len(self), 2)
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not know the size of its items without loading them.")
+
+    def set_decode_size(self, size: tuple):
+        """Set the planned output size (H, W) of the transformations. The images are then decoded directly
+        at a reduced scale (see :func:`aloscene.io.image.load_image_reduced`) if the transformations shrink
+        them anyway. With an aspect ratio preserving resize to a shortest side `s`, use `(s, s)`.
+
+        Parameters
+        ----------
+        size : tuple | None
+            Minimum size (H, W) of the decoded images. None to decode the images at full resolution.
+        """
+        self.decode_size = tuple(size) if size is not None else None
+        self._cache = None
+
     def __repr__(self) -> str:
         """Print class format inspired by VisionDataset"""
         head = "Dataset " + self.__class__.__name__
@@ -201,17 +391,81 @@ class BaseDataset(torch.utils.data.Dataset):
         max_try = self.max_retry_on_error
         raise InvalidSampleError(f"Reached the limit of {max_try} consecutive corrupted samples.")
 
-    def __getitem__(self, idx):
-        if self.sample:
-            data = self.items[idx]
-        else:
+    def cache_config(self) -> dict:
+        """Configuration of the dataset used to identify its cached samples. By default, all the simple
+        attributes (str, numbers, lists...) of the dataset are used. Child classes can override this method
+        if some other attributes change the content of the samples.
+        """
+        ignore = ["items", "transform_fn", "ignore_errors", "print_errors", "retry_offset", "max_retry_on_error"]
+        ignore += ["cache_dir", "cache_max_size", "_cache", "frame_cache"]
+        config = {key: value for key, value in vars(self).items() if key not in ignore and _is_config_value(value)}
+        config.update({"class": type(self).__name__, "len": len(self)})
+        return config
+
+    @property
+    def cache(self) -> SampleCache:
+        """Cache of the decoded samples, or None if `cache_dir` is not set"""
+        if self.cache_dir is None or self.sample:
+            return None
+        if self._cache is None:
+            config = self.cache_config()
+            config_hash = hashlib.md5(repr(sorted(config.items())).encode()).hexdigest()[:16]
+            self._cache = SampleCache(
+                self.cache_dir, os.path.join(self.name, config_hash), max_size=self.cache_max_size
+            )
+        return self._cache
+
+    def _load_item(self, idx):
+        """Get the sample `idx` (before transformation) from the cache if any, or decode it"""
+        cache = self.cache
+        data = cache.get(idx) if cache is not None else None
+        if data is None:
             data = self.getitem_ignore_errors(idx) if self.ignore_errors else self.getitem(idx)
-        if self.transform_fn is not None:
-            data = self.transform_fn(data)
+            if cache is not None:
+                cache.put(idx, data)
+        return data
 
-        # Rename datas to None before to return the result
-        # (Name support not yet supported in the datapipeline)
-        data = rename_data_to_none(data)
+    def warm_cache(self, num_workers: int = 8):
+        """Decode and cache all the samples of the dataset, in parallel.
+
+        Parameters
+        ----------
+        num_workers : int
+            Number of workers, by default 8
+        """
+        if self.cache is None:
+            raise Exception("`cache_dir` must be set to warm the cache of the dataset")
+        loader = torch.utils.data.DataLoader(
+            _CacheWarmer(self), batch_size=None, num_workers=num_workers, collate_fn=lambda idx: idx
+        )
+        for _ in tqdm(loader, desc=f"Caching {self.name}"):
+            pass
+
+    def __getitem__(self, idx):
+        # Each stage is timed if a PipelineProfiler is started (see aloscene.utils.pipeline_profiler)
+        with profile_stage("dataset/item") as item_stage:
+            with profile_stage("dataset/getitem") as stage:
+                if self.sample:
+                    data = self.items[idx]
+                else:
+                    data = self._load_item(idx)
+                if stage is not None:
+                    stage.add_bytes(data)
+            if self.transform_fn is not None:
+                with profile_stage("dataset/transform_fn") as stage:
+                    data = self.transform_fn(data)
+                    if stage is not None:
+                        stage.add_bytes(data)
+
+            with profile_stage("dataset/load_lazy_children"):
+                data = load_lazy_children(data)
+
+            # Rename datas to None before to return the result
+            # (Name support not yet supported in the datapipeline)
+            with profile_stage("dataset/rename_data_to_none"):
+                data = rename_data_to_none(data)
+            if item_stage is not None:
+                item_stage.add_bytes(data)
         return data
 
     def get(self, idx: int) -> Dict[str, aloscene.Frame]:
@@ -315,7 +569,7 @@ class BaseDataset(torch.utils.data.Dataset):
         """Streamer collat fn"""
         return batch_data
 
-    def stream_loader(self, num_workers=2):
+    def stream_loader(self, num_workers=2, detached_payload=False, num_threads=0):
         """Get a stream loader from the dataset. Compared to the :func:`train_loader`
         the :func:`stream_loader` do not have batch dimension and do not shuffle the dataset.
 
@@ -325,15 +579,30 @@ class BaseDataset(torch.utils.data.Dataset):
             Dataset to make dataloader
         num_workers : int
             Number of workers, by default 2
+        detached_payload : bool
+            Send the frames from the workers as a compact payload, by default False.
+            See :class:`PayloadDataLoader`
+        num_threads : int
+            If > 0, read the items with threads instead of worker processes, by default 0.
+            See :class:`ThreadedStreamLoader`
 
         Returns
         -------
         torch.utils.data.DataLoader
             A generator
         """
-        return stream_loader(self, num_workers=num_workers)
+        return stream_loader(
+            self, num_workers=num_workers, detached_payload=detached_payload, num_threads=num_threads
+        )
 
-    def train_loader(self, batch_size=1, num_workers=2, sampler=torch.utils.data.RandomSampler, sampler_kwargs={}):
+    def train_loader(
+        self,
+        batch_size=1,
+        num_workers=2,
+        sampler=torch.utils.data.RandomSampler,
+        sampler_kwargs={},
+        detached_payload=False,
+    ):
         """Get training loader from the dataset
 
         Parameters
@@ -346,13 +615,23 @@ class BaseDataset(torch.utils.data.Dataset):
             Number of workers, by default 2
         sampler : torch.utils.data, optional
             Callback to sampler the dataset, by default torch.utils.data.RandomSampler
+        detached_payload : bool, optional
+            Send the frames from the workers as a compact payload, by default False.
+            See :class:`PayloadDataLoader`
 
         Returns
         -------
         torch.utils.data.DataLoader
             A generator
         """
-        return train_loader(self, batch_size=batch_size, num_workers=num_workers, sampler=sampler, sampler_kwargs=sampler_kwargs    )
+        return train_loader(
+            self,
+            batch_size=batch_size,
+            num_workers=num_workers,
+            sampler=sampler,
+            sampler_kwargs=sampler_kwargs,
+            detached_payload=detached_payload,
+        )
 
     def prepare(self):
         """Prepare the dataset. Not all child class need to implement this method.
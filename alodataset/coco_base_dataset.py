@@ -8,6 +8,7 @@ import numpy as np
 import torch
 
 from alodataset import BaseDataset
+from alodataset.utils.coco_index import CocoIndex
 from aloscene import BoundingBoxes2D, Frame, Labels, Mask
 from collections import defaultdict
 from pathlib import Path
@@ -43,6 +44,10 @@ class CocoBaseDataset(BaseDataset):
         by default None
     return_multiple_labels : bool, optional
         Return Labels as a dictionary, with all posible categories found in annotations file, by default False
+    mmap_index : bool, optional
+        Read the annotations through a memory-mapped :class:`~alodataset.utils.coco_index.CocoIndex` (compiled
+        once next to the annotation file) instead of loading the json file with `pycocotools`, by default False.
+        The startup is much faster and the annotations memory is shared by the workers.
     **kwargs : dict
         :mod:`BaseDataset <base_dataset>` optional parameters
 
@@ -73,6 +78,7 @@ class CocoBaseDataset(BaseDataset):
         classes: list = None,
         fix_classes_len: int = None,
         return_multiple_labels: list = None,
+        mmap_index: bool = False,
         **kwargs,
     ):
         super(CocoBaseDataset, self).__init__(name=name, **kwargs)
@@ -91,8 +97,11 @@ class CocoBaseDataset(BaseDataset):
             self.items = [int(Path(os.path.join(self.img_folder, f)).stem) for f in os.listdir(self.img_folder) if os.path.isfile(os.path.join(self.img_folder, f))]
             return
 
-        self.coco = COCO(os.path.join(self.dataset_dir, ann_file))
-        self.items = list(sorted(self.coco.imgs.keys()))
+        if mmap_index:
+            self.coco = CocoIndex.load(os.path.join(self.dataset_dir, ann_file))
+        else:
+            self.coco = COCO(os.path.join(self.dataset_dir, ann_file))
+        self.items = list(sorted(self.coco.getImgIds()))
 
         # Setup the class names
         cats = self.coco.loadCats(self.coco.getCatIds())
@@ -114,13 +123,7 @@ class CocoBaseDataset(BaseDataset):
             self._ids_renamed = [-1 if label not in classes else classes.index(label) for label in label_names]
             self._ids_renamed = np.array(self._ids_renamed)
 
-            # Check each annotation and keep only that have at least 1 box in classes list
-            ids = []
-            for i in self.items:
-                target = self.coco.loadAnns(self.coco.getAnnIds(i))
-                if any([self._ids_renamed[bbox["category_id"]] >= 0 for bbox in target]):
-                    ids.append(i)
-            self.items = ids  # Remove images without bboxes with classes in classes list
+            self.items = self._filter_items()  # Remove images without bboxes with classes in classes list
 
         # Fix lenght of label_names to a desired `fix_classes_len`
         if fix_classes_len is not None:
@@ -136,6 +139,20 @@ class CocoBaseDataset(BaseDataset):
             }
             self.label_types, self.label_types_names = self._get_label_types(dict_cats)
 
+    def _filter_items(self):
+        """Keep only the items that have at least 1 box in classes list"""
+        valid_categories = self._ids_renamed >= 0
+        if isinstance(self.coco, CocoIndex):
+            ids = np.asarray(self.items, dtype=np.int64)
+            return ids[np.isin(ids, self.coco.images_with_categories(valid_categories))].tolist()
+
+        ids = []
+        for i in self.items:
+            target = self.coco.loadAnns(self.coco.getAnnIds(i))
+            if any([valid_categories[bbox["category_id"]] for bbox in target]):
+                ids.append(i)
+        return ids
+
     def _get_label_types(self, dict_cats: Dict[dict, list]):
         label_types, label_types_names = defaultdict(list), defaultdict(list)
 
@@ -223,6 +240,19 @@ class CocoBaseDataset(BaseDataset):
 
         return boxes, segmentation
 
+    def get_item_sizes(self):
+        """Size (H, W) of the image of each item, read from the annotation file
+
+        Returns
+        -------
+        sizes: np.ndarray
+            Array of shape (len(self), 2)
+        """
+        if self.sample:
+            return BaseDataset.get_item_sizes(self)
+        images = self.coco.loadImgs(self.items)
+        return np.array([[image["height"], image["width"]] for image in images], dtype=np.int64).reshape(-1, 2)
+
     def getitem(self, idx):
         """Get the :mod:`Frame <aloscene.frame>` corresponds to *idx* index
 
@@ -244,11 +274,17 @@ class CocoBaseDataset(BaseDataset):
             #get the filename from image_id without relying on annotation file
             return Frame(os.path.join(self.img_folder, f"{str(image_id).zfill(12)}.jpg"))
 
-        frame = Frame(os.path.join(self.img_folder, self.coco.loadImgs(image_id)[0]["file_name"]))
+        image_info = self.coco.loadImgs(image_id)[0]
+        frame = Frame(os.path.join(self.img_folder, image_info["file_name"]), decode_size=self.decode_size)
 
         target = self.coco.loadAnns(self.coco.getAnnIds(image_id))
         target = {"image_id": image_id, "annotations": target}
-        _, target = self.prepare(frame, target)
+        if self.decode_size is not None and frame.HW != (image_info["height"], image_info["width"]):
+            # Image decoded at a reduced scale: annotations are given at full resolution
+            _, target = self.prepare(frame, target, size=(image_info["height"], image_info["width"]))
+            target = self.prepare.rescale(target, frame.HW)
+        else:
+            _, target = self.prepare(frame, target)
 
         # Append target into frame
         boxes, segmentation = self._target2aloscene(target, frame)
@@ -292,9 +328,50 @@ class ConvertCocoPolysToMask(object):
             masks = torch.zeros((0, height, width), dtype=torch.uint8)
         return masks
 
-    def __call__(self, image, target):
+    def rescale(self, target, size):
+        """Rescale a target to a new image size
 
-        w, h = image.shape[-1], image.shape[-2]
+        Parameters
+        ----------
+        target : dict
+            Target returned by :func:`__call__`
+        size : tuple
+            New image size (H, W)
+
+        Returns
+        -------
+        dict
+            Rescaled target
+        """
+        h, w = target["size"].tolist()
+        target["boxes"] = target["boxes"] * torch.tensor([size[1] / w, size[0] / h] * 2)
+        if "keypoints" in target:
+            keypoints = target["keypoints"].clone()
+            keypoints[..., 0] *= size[1] / w
+            keypoints[..., 1] *= size[0] / h
+            target["keypoints"] = keypoints
+        if self.return_masks and len(target["masks"]) == 0:
+            target["masks"] = target["masks"].new_zeros((0, *size))
+        elif self.return_masks:
+            masks = target["masks"]
+            masks = torch.nn.functional.interpolate(masks[None].float(), size=tuple(size), mode="nearest")[0]
+            target["masks"] = masks.to(target["masks"].dtype)
+        target["size"] = torch.as_tensor([int(size[0]), int(size[1])])
+        return target
+
+    def __call__(self, image, target, size=None):
+        """Convert the COCO annotations of an image into a target dict
+
+        Parameters
+        ----------
+        image : torch.Tensor
+            Image of the annotations
+        target : dict
+            Image id and COCO annotations of the image
+        size : tuple, optional
+            Size (H, W) of the annotations, by default the size of `image`
+        """
+        w, h = (image.shape[-1], image.shape[-2]) if size is None else (size[1], size[0])
 
         image_id = target["image_id"]
         image_id = torch.tensor([image_id])
@@ -130,16 +130,8 @@ class CocoDetectionDataset(CocoBaseDataset, SplitMixin):
                 self._ids_renamed = np.array(self._ids_renamed)
                 self.label_names = classes
 
-                # Check each annotation and keep only that have at least 1 box in classes list
-                ids = []
-                for i in self.items:
-                    # Only take into account images with things annotations
-                    target = self.coco.loadAnns(
-                        self.coco.getAnnIds(i)
-                    )  # + self.coco_stuff.loadAnns(self.coco_stuff.getAnnIds(i))
-                    if any([self._ids_renamed[bbox["category_id"]] >= 0 for bbox in target]):
-                        ids.append(i)
-                self.items = ids  # Remove images without bboxes with classes in classes list
+                # Only take into account images with things annotations
+                self.items = self._filter_items()  # Remove images without bboxes with classes in classes list
 
                 if fix_classes_len is not None:
                     self._fix_classes(fix_classes_len)
@@ -15,7 +15,7 @@ from alodataset.utils.panoptic_utils import rgb2id
 from alodataset.utils.panoptic_utils import masks_to_boxes
 
 from alodataset import BaseDataset, SplitMixin, Split
-from aloscene import Frame, BoundingBoxes2D, Mask, Labels
+from aloscene import Frame, BoundingBoxes2D, Mask, RLEMask, Labels
 
 
 class CocoPanopticDataset(BaseDataset, SplitMixin):
@@ -43,6 +43,10 @@ class CocoPanopticDataset(BaseDataset, SplitMixin):
         Define image folder and annotation file/folder to use, by default Split.TRAIN
     return_masks : bool, optional
         Include masks labels in the output, by default True
+    rle_masks : bool, optional
+        Return the masks as a run-length encoded :mod:`RLEMask <aloscene.rle_mask>` instead of a dense
+        :mod:`Mask <aloscene.mask>`, encoded from the panoptic annotation without building the dense masks. Much
+        smaller for frames with many instances, by default False
     classes : list, optional
         List of classes to be filtered in the annotation reading process, by default None
     ignore_classes: list, optional
@@ -72,6 +76,7 @@ class CocoPanopticDataset(BaseDataset, SplitMixin):
         name: str = "coco",
         split=Split.TRAIN,
         return_masks: bool = True,
+        rle_masks: bool = False,
         classes: list = None,
         ignore_classes: list=None,
         fix_classes_len: int = None,  # Match with pre-trained weights
@@ -86,6 +91,7 @@ class CocoPanopticDataset(BaseDataset, SplitMixin):
         self.ann_folder = os.path.join(self.dataset_dir, self.get_split_ann_folder())
         self.ann_file = os.path.join(self.dataset_dir, self.get_split_ann_file())
         self.return_masks = return_masks
+        self.rle_masks = rle_masks
         self.label_names, self.label_types, self.label_types_names = None, None, None
         self.items = self._get_sequences()
 
@@ -217,7 +223,7 @@ class CocoPanopticDataset(BaseDataset, SplitMixin):
         assert self.split in self.SPLIT_ANN_FILES
         return self.SPLIT_ANN_FILES[self.split]
 
-    def _append_type_labels(self, element: Union[BoundingBoxes2D, Mask], labels):
+    def _append_type_labels(self, element: Union[BoundingBoxes2D, Mask, RLEMask], labels):
         if self.label_types is not None:
             for ktype in self.label_types:
                 label_types = torch.as_tensor(self.label_types[ktype])[labels]
@@ -229,6 +235,23 @@ class CocoPanopticDataset(BaseDataset, SplitMixin):
                 )
                 element.append_labels(label_types, name=ktype)
 
+    def get_item_sizes(self):
+        """Size (H, W) of the image of each item, read from the image headers
+
+        Returns
+        -------
+        sizes: np.ndarray
+            Array of shape (len(self), 2)
+        """
+        if self.sample:
+            return BaseDataset.get_item_sizes(self)
+        sizes = np.zeros((len(self.items), 2), dtype=np.int64)
+        for idx, (img_path, _, _) in enumerate(self.items):
+            # Only the header of the image is read
+            with Image.open(img_path) as image:
+                sizes[idx] = image.height, image.width
+        return sizes
+
     def getitem(self, idx):
         """Get the :mod:`Frame <aloscene.frame>` corresponds to *idx* index
 
@@ -253,9 +276,6 @@ class CocoPanopticDataset(BaseDataset, SplitMixin):
         masks = rgb2id(masks)  # Convert RGB to classesID
 
         ids = np.array([ann["id"] for ann in ann_info["segments_info"]])
-        masks = masks == ids[:, None, None]
-        masks = torch.as_tensor(masks, dtype=torch.uint8)
-
         labels = torch.as_tensor([ann["category_id"] for ann in ann_info["segments_info"]], dtype=torch.int64)
 
         # Clean index by unique classes filtered
@@ -264,14 +284,21 @@ class CocoPanopticDataset(BaseDataset, SplitMixin):
 
             # Keep only valid masks
             idxs = torch.where(new_labels >= 0)[0]
-            masks = masks[idxs]
+            ids = ids[idxs.numpy()]
             labels = new_labels[idxs]
 
+        if self.rle_masks:
+            masks = RLEMask.from_id_map(masks, ids)
+            boxes = masks.to_boxes2d().as_tensor()
+        else:
+            masks = torch.as_tensor(masks == ids[:, None, None], dtype=torch.uint8)
+            boxes = masks_to_boxes(masks)
+
         # Make aloscene.frame
         frame = Frame(img_path)
         labels_2d = Labels(labels.to(torch.float32), labels_names=self.label_names, names=("N"), encoding="id")
         boxes_2d = BoundingBoxes2D(
-            masks_to_boxes(masks),
+            boxes,
             boxes_format="xyxy",
             absolute=True,
             frame_size=frame.HW,
@@ -282,7 +309,7 @@ class CocoPanopticDataset(BaseDataset, SplitMixin):
         frame.boxes2d = boxes_2d
 
         if self.return_masks:
-            masks_2d = Mask(masks, names=("N", "H", "W"))
+            masks_2d = masks if self.rle_masks else Mask(masks, names=("N", "H", "W"))
             masks_2d.append_labels(labels_2d, name="category")
             self._append_type_labels(masks_2d, labels)
             frame.segmentation = masks_2d
@@ -8,6 +8,7 @@ import os
 import json
 
 from typing import Union
+from PIL import Image
 
 from alodataset import BaseDataset
 from alodataset.io import fs
@@ -127,6 +128,24 @@ class CrowdHumanDataset(BaseDataset):
 
         return bboxes, classes
 
+    def get_item_sizes(self):
+        """Size (H, W) of the image of each item, read from the image headers
+
+        Returns
+        -------
+        sizes: np.ndarray
+            Array of shape (len(self), 2)
+        """
+        if self.sample:
+            return BaseDataset.get_item_sizes(self)
+        sizes = np.zeros((len(self.items), 2), dtype=np.int64)
+        for idx, record in enumerate(self.items):
+            img_folder = self.img_folder if "test" in self.img_folder else self.img_folder[record["ann_id"]]
+            # Only the header of the image is read
+            with Image.open(os.path.join(img_folder, record["ID"] + ".jpg")) as image:
+                sizes[idx] = image.height, image.width
+        return sizes
+
     def getitem(self, idx):
         if self.sample:
             return BaseDataset.__getitem__(self, idx)
@@ -7,7 +7,7 @@ from alodataset import BaseDataset, SequenceMixin, Split, SplitMixin
 
 # from aloscene.io.disparity import load_disp
 
-from aloscene import Frame, Flow, Mask, Disparity
+from aloscene import Flow, Mask, Disparity, LazyChild
 
 
 class FlyingThings3DSubsetDataset(BaseDataset, SequenceMixin, SplitMixin):
@@ -294,21 +294,26 @@ class FlyingThings3DSubsetDataset(BaseDataset, SequenceMixin, SplitMixin):
         return forward_features, forward_labels
 
     @staticmethod
-    def _load_flow(flow_label, occ_label, data, t):
+    def _load_flow(flow_path, occ_path=None):
         """
-        Load a Flow object and append occlusion if it is found
+        Load a Flow object and append occlusion if its path is given
         """
-        if len(data[flow_label]) <= t:
-            return None
-
-        flow = Flow(data[flow_label][t])
+        flow = Flow(flow_path)
 
-        if occ_label in data:
-            occ = Mask(data[occ_label][t])
+        if occ_path is not None:
+            occ = Mask(occ_path)
             flow.append_occlusion(occ)
 
         return flow
 
+    @staticmethod
+    def _lazy_flow(flow_label, occ_label, data, t):
+        """
+        Flow loaded on first access, from the paths of the flow and occlusion only
+        """
+        occ_path = data[occ_label][t] if occ_label in data else None
+        return LazyChild(FlyingThings3DSubsetDataset._load_flow, data[flow_label][t], occ_path)
+
     @staticmethod
     def _load_disparity(disp_label, occ_label, data, t, camera):
         """
@@ -332,16 +337,15 @@ class FlyingThings3DSubsetDataset(BaseDataset, SequenceMixin, SplitMixin):
         data = sequence_data[camera]
         frames = []
         for t in range(self.sequence_size):
-            frame = Frame(data["image"][t]).temporal()
-            if "flow" in data:
-                flow = FlyingThings3DSubsetDataset._load_flow("flow", "flow_occ", data, t)
-                if flow is not None:
-                    frame.append_flow(flow, "flow_forward")
-
-            if "flow_backward" in data:
-                flow_backward = FlyingThings3DSubsetDataset._load_flow("flow_backward", "flow_occ_backward", data, t)
-                if flow_backward is not None:
-                    frame.append_flow(flow_backward, "flow_backward")
+            frame = self.load_sequence_frame(data["image"][t]).temporal()
+            # The flows are loaded on first access (not loaded if dropped by the transformations)
+            if "flow" in data and len(data["flow"]) > t:
+                flow = FlyingThings3DSubsetDataset._lazy_flow("flow", "flow_occ", data, t)
+                frame.append_flow(flow, "flow_forward")
+
+            if "flow_backward" in data and len(data["flow_backward"]) > t:
+                flow_backward = FlyingThings3DSubsetDataset._lazy_flow("flow_backward", "flow_occ_backward", data, t)
+                frame.append_flow(flow_backward, "flow_backward")
 
             if "disp" in data:
                 disp = FlyingThings3DSubsetDataset._load_disparity("disp", "disp_occ", data, t, camera)
@@ -4,7 +4,7 @@ import warnings
 import numpy as np
 from PIL import Image
 from typing import List, Dict, Union
-from aloscene import Frame, Depth
+from aloscene import Frame, Depth, LazyChild
 from alodataset import BaseDataset
 
 
@@ -205,8 +205,7 @@ class KittiDepth(BaseDataset):
 
         if self.return_depth:
             depth_path = self.get_corresponding_depth(image_path)
-            depth = self.depth_from_path(depth_path)
-            frame.append_depth(depth)
+            frame.append_depth(LazyChild(KittiDepth.depth_from_path, depth_path))
 
         return frame
 
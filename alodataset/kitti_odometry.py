@@ -7,6 +7,7 @@ from alodataset import BaseDataset, SplitMixin, Split
 from aloscene import Frame, Pose, CameraIntrinsic, CameraExtrinsic
 
 from alodataset.utils.kitti import load_calib_cam_to_cam, sequence_indices
+from alodataset.utils.label_table import load_label_table
 
 
 class KittiOdometryDataset(BaseDataset, SplitMixin):
@@ -68,6 +69,8 @@ class KittiOdometryDataset(BaseDataset, SplitMixin):
         self.items: Dict[Any, Any] = {}
 
         self.seq_params = {}
+        self.times = {}
+        self.poses = {}
 
         for seq in self.sequences:
 
@@ -88,16 +91,13 @@ class KittiOdometryDataset(BaseDataset, SplitMixin):
                 )
                 self.seq_params[seq]["right_extrinsic"] = CameraExtrinsic(calib[f"T_cam{1 if grayscale else 3}_rect"])
 
-            with open(os.path.join(self.dataset_dir, "sequences", seq, "times.txt"), "r") as f:
-                times = [float(x) for x in f.readlines()]
-
-            poses = None
+            # Timestamp of each frame, and 3x4 pose matrix (flattened) of each frame
+            self.times[seq] = load_label_table(os.path.join(self.dataset_dir, "sequences", seq, "times.txt"))[:, 0]
             if int(seq) < 11:
-                with open(os.path.join(self.dataset_dir, "poses", f"{seq}.txt"), "r") as f:
-                    poses = f.readlines()
+                self.poses[seq] = load_label_table(os.path.join(self.dataset_dir, "poses", f"{seq}.txt"))
 
             # Compute all the items.
-            sequence_size = len(times)
+            sequence_size = len(self.times[seq])
 
             # Compute sequence indices
             temporal_sequences = sequence_indices(sequence_size, self.sequence_size, self.skip, self.sequence_skip)
@@ -107,8 +107,6 @@ class KittiOdometryDataset(BaseDataset, SplitMixin):
                     + idx: {
                         "sequence": seq,
                         "temporal_sequence": temporal_seq,
-                        "times": [times[x] for x in temporal_seq],
-                        "poses": [poses[x] for x in temporal_seq] if poses else None,
                     }
                     for idx, temporal_seq in enumerate(temporal_sequences)
                 }
@@ -184,9 +182,7 @@ class KittiOdometryDataset(BaseDataset, SplitMixin):
             left_frame.append_cam_extrinsic(self.seq_params[sequence]["left_extrinsic"])
 
             if self.split == Split.TRAIN:
-                pose = Pose(
-                    torch.Tensor([float(x) for x in item["poses"][id].split(" ")] + [0, 0, 0, 1]).reshape(4, 4)
-                )
+                pose = Pose(torch.Tensor(np.r_[self.poses[sequence][seq], [0, 0, 0, 1]]).reshape(4, 4))
                 left_frame.append_pose(pose)
 
             left.append(left_frame.temporal())
@@ -211,11 +207,12 @@ class KittiOdometryDataset(BaseDataset, SplitMixin):
         frames["left"] = torch.cat(left, dim=0)
 
         # Timestamps need to be added at the end because torch.cat can't merge them.
-        frames["left"].timestamp = item["times"]
+        times = self.times[sequence][item["temporal_sequence"]].tolist()
+        frames["left"].timestamp = times
 
         if self.right_frame:
             frames["right"] = torch.cat(right, dim=0)
-            frames["right"].timestamp = item["times"]
+            frames["right"].timestamp = times
 
         return frames
 
@@ -2,12 +2,12 @@ import os
 import torch
 import numpy as np
 from typing import List, Dict, Any, Union
-from collections import defaultdict
 
 from alodataset import BaseDataset, SplitMixin, Split
 from aloscene import Frame, CameraIntrinsic, CameraExtrinsic, BoundingBoxes2D, Labels, BoundingBoxes3D
 
 from alodataset.utils.kitti import load_calib_cam_to_cam, sequence_indices
+from alodataset.utils.label_table import load_frame_labels
 
 
 class KittiTrackingDataset(BaseDataset, SplitMixin):
@@ -67,6 +67,7 @@ class KittiTrackingDataset(BaseDataset, SplitMixin):
         self.items: Dict[Any, Any] = {}
 
         self.seq_params = {}
+        self.labels = {}
 
         for seq in self.sequences:
 
@@ -84,11 +85,11 @@ class KittiTrackingDataset(BaseDataset, SplitMixin):
                 self.seq_params[seq]["right_intrinsic"] = calib["right_intrinsic"]
                 self.seq_params[seq]["right_extrinsic"] = calib["right_extrinsic"]
 
-            with open(os.path.join(self.dataset_dir, "label_02", f"{seq}.txt"), "r") as f:
-                labels: defaultdict[int, List[List[str]]] = defaultdict(list)
-                for line in f:
-                    line = line.split()
-                    labels[int(line[0])].append(line[1:])
+            # Rows: frame, track_id, type, truncated, occluded, alpha, bbox (4), dimensions (3), location (3),
+            # rotation_y. The type is encoded as its index in LABELS.
+            self.labels[seq] = load_frame_labels(
+                os.path.join(self.dataset_dir, "label_02", f"{seq}.txt"), n_columns=17, categories={2: self.LABELS}
+            )
 
             # Compute all the items.
             sequence_size = len(os.listdir(os.path.join(self.dataset_dir, "image_02", seq)))
@@ -101,7 +102,6 @@ class KittiTrackingDataset(BaseDataset, SplitMixin):
                     + idx: {
                         "sequence": seq,
                         "temporal_sequence": temporal_seq,
-                        "labels": [labels[x] for x in temporal_seq] if labels else None,
                     }
                     for idx, temporal_seq in enumerate(temporal_sequences)
                 }
@@ -157,40 +157,34 @@ class KittiTrackingDataset(BaseDataset, SplitMixin):
 
         for id, seq in enumerate(item["temporal_sequence"]):
 
-            labels = []
-            categories = []
-            labels_3d = []
-            categories_3d = []
-            boxes2d = []
-            boxes3d = []
-
-            for box in item["labels"][id]:
-                x, y, w, h = float(box[5]), float(box[6]), float(box[7]), float(box[8])
-                boxes2d.append([x, y, w, h])
-                labels.append(int(box[0]))  # track_id
-                categories.append(self.LABELS.index(box[1]))  # type
-
-                # If the object caterory is "Don't care", there is no 3D box.
-                if box[1] != "DontCare":
-                    boxes3d.append(
-                        [
-                            float(box[12]),
-                            # The center of the 3d box on Kitty is the center of the bottom face. We need to
-                            # move it up by half the height of the box to correspond to the center of the box.
-                            # Check kitti_tracking devkit for more info.
-                            float(box[13]) - float(box[9]) / 2,
-                            float(box[14]),
-                            float(box[10]),
-                            float(box[9]),
-                            float(box[11]),
-                            # The rotation of the 3d box on Kitty is based on the X axis. We need to rotate it
-                            # to have same the rotation wanted by BoundingBoxes3D.
-                            # Check kitti_object devkit for more info.
-                            float(box[15]) + np.pi / 2,
-                        ]
-                    )
-                    labels_3d.append(int(box[0]))  # track_id
-                    categories_3d.append(self.LABELS.index(box[1]))  # type
+            # Labels of the frame: a slice of the label table of the sequence
+            rows = self.labels[sequence][seq]
+            boxes2d = rows[:, 6:10]
+            labels = rows[:, 1].astype(np.int64)  # track_id
+            categories = rows[:, 2].astype(np.int64)  # type
+
+            # If the object caterory is "Don't care", there is no 3D box.
+            rows_3d = rows[categories != self.LABELS.index("DontCare")]
+            boxes3d = np.stack(
+                [
+                    rows_3d[:, 13],
+                    # The center of the 3d box on Kitty is the center of the bottom face. We need to
+                    # move it up by half the height of the box to correspond to the center of the box.
+                    # Check kitti_tracking devkit for more info.
+                    rows_3d[:, 14] - rows_3d[:, 10] / 2,
+                    rows_3d[:, 15],
+                    rows_3d[:, 11],
+                    rows_3d[:, 10],
+                    rows_3d[:, 12],
+                    # The rotation of the 3d box on Kitty is based on the X axis. We need to rotate it
+                    # to have same the rotation wanted by BoundingBoxes3D.
+                    # Check kitti_object devkit for more info.
+                    rows_3d[:, 16] + np.pi / 2,
+                ],
+                axis=1,
+            )
+            labels_3d = rows_3d[:, 1].astype(np.int64)  # track_id
+            categories_3d = rows_3d[:, 2].astype(np.int64)  # type
 
             left_frame = Frame(
                 os.path.join(
@@ -201,13 +195,13 @@ class KittiTrackingDataset(BaseDataset, SplitMixin):
                 )
             )
 
-            if boxes2d:
+            if len(boxes2d) > 0:
                 labels = Labels(labels, labels_names=["boxes"])
                 bounding_box = BoundingBoxes2D(boxes2d, boxes_format="xyxy", absolute=True, frame_size=left_frame.HW)
                 bounding_box.append_labels(labels, "track_id")
                 bounding_box.append_labels(Labels(categories, labels_names=self.LABELS), "categories")
                 left_frame.append_boxes2d(bounding_box)
-            if boxes3d:
+            if len(boxes3d) > 0:
                 labels_3d = Labels(labels_3d, labels_names=["boxes"])
                 boxe3d = BoundingBoxes3D(
                     boxes3d,
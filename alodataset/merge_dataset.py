@@ -1,3 +1,6 @@
+from bisect import bisect_right
+
+import numpy as np
 import torch
 
 from alodataset.base_dataset import rename_data_to_none
@@ -14,6 +17,10 @@ class MergeDataset(torch.utils.data.Dataset):
 
     Shuffling the dataset will shuffle the samples of all datasets together
 
+    The index is virtual: the cumulative number of samples of the datasets (`offsets`), searched by
+    bisection. For fractional weights or a fixed composition of the batches (ex: 70% / 30%), use the
+    :class:`~alodataset.samplers.WeightedMergeSampler`.
+
     Parameters
     ----------
     datasets : List[alodataset.BaseDataset]
@@ -28,7 +35,7 @@ class MergeDataset(torch.utils.data.Dataset):
     def __init__(self, datasets, transform_fn=None, weights=None):
         self.datasets = datasets
         self.weights = self._init_weights(weights)
-        self.indices = self._init_indices()
+        self.offsets = self._init_offsets()
         self.transform_fn = transform_fn
 
     def _init_weights(self, weights):
@@ -40,22 +47,38 @@ class MergeDataset(torch.utils.data.Dataset):
             raise RuntimeError("The number of weights should be equal to the number of datasets.")
 
         if any(type(w) != int for w in weights):
-            raise RuntimeError("weights should be a list of int.")
+            raise RuntimeError(
+                "weights should be a list of int. For fractional weights, use alodataset.WeightedMergeSampler."
+            )
         return weights
 
-    def _init_indices(self):
-        indices = []
-        for dset_idx, dset in enumerate(self.datasets):
-            for _ in range(self.weights[dset_idx]):
-                for idx in range(len(dset)):
-                    indices.append((dset_idx, idx))
-        return indices
+    def _init_offsets(self):
+        """Index of the first sample of each dataset in the MergeDataset, and the total number of samples"""
+        offsets = [0]
+        for dset, weight in zip(self.datasets, self.weights):
+            offsets.append(offsets[-1] + weight * len(dset))
+        return offsets
+
+    def get_index(self, idx):
+        """Dataset index and sample index (in this dataset) of the item `idx` of the MergeDataset"""
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"Index {idx} out of range for a MergeDataset of length {len(self)}")
+        dset_idx = bisect_right(self.offsets, idx) - 1
+        return dset_idx, (idx - self.offsets[dset_idx]) % len(self.datasets[dset_idx])
 
     def __len__(self):
-        return len(self.indices)
+        return self.offsets[-1]
+
+    def get_item_sizes(self):
+        """Size (H, W) of the frame of each item before the transformations (see
+        :func:`alodataset.BaseDataset.get_item_sizes`)"""
+        sizes = [np.tile(dset.get_item_sizes(), (weight, 1)) for dset, weight in zip(self.datasets, self.weights)]
+        return np.concatenate(sizes, axis=0).reshape(-1, 2)
 
     def __getitem__(self, idx):
-        dset_idx, sample_idx = self.indices[idx]
+        dset_idx, sample_idx = self.get_index(idx)
         data = self.datasets[dset_idx][sample_idx]
         if self.transform_fn is not None:
             data = self.transform_fn(data)
@@ -66,7 +89,7 @@ class MergeDataset(torch.utils.data.Dataset):
         """data loader collate_fn"""
         return batch_data
 
-    def stream_loader(self, num_workers=2):
+    def stream_loader(self, num_workers=2, detached_payload=False, num_threads=0):
         """Get a stream loader from the dataset. Compared to the :func:`train_loader`
         the :func:`stream_loader` do not have batch dimension and do not shuffle the dataset.
 
@@ -76,17 +99,39 @@ class MergeDataset(torch.utils.data.Dataset):
             Dataset to make dataloader
         num_workers : int
             Number of workers, by default 2
+        detached_payload : bool
+            Send the frames from the workers as a compact payload, by default False.
+            See :class:`alodataset.base_dataset.PayloadDataLoader`
+        num_threads : int
+            If > 0, read the items with threads instead of worker processes, by default 0.
+            See :class:`alodataset.base_dataset.ThreadedStreamLoader`
 
         Returns
         -------
         torch.utils.data.DataLoader
             A generator
         """
-        return stream_loader(self, num_workers=num_workers)
-
-    def train_loader(self, batch_size=1, num_workers=2, sampler=torch.utils.data.RandomSampler):
+        return stream_loader(
+            self, num_workers=num_workers, detached_payload=detached_payload, num_threads=num_threads
+        )
+
+    def train_loader(
+        self,
+        batch_size=1,
+        num_workers=2,
+        sampler=torch.utils.data.RandomSampler,
+        sampler_kwargs={},
+        detached_payload=False,
+    ):
         """Get training loader from the dataset"""
-        return train_loader(self, batch_size=batch_size, num_workers=num_workers, sampler=sampler)
+        return train_loader(
+            self,
+            batch_size=batch_size,
+            num_workers=num_workers,
+            sampler=sampler,
+            sampler_kwargs=sampler_kwargs,
+            detached_payload=detached_payload,
+        )
 
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ import os
 # Init parser
 import configparser
 from alodataset import BaseDataset, Split, SequenceMixin, SplitMixin
+from alodataset.utils.label_table import load_frame_labels
 
 import aloscene
 
@@ -91,6 +92,7 @@ class Mot17(BaseDataset, SequenceMixin, SplitMixin):
         self.visibility_threshold = visibility_threshold
 
         self.mot_sequences = {}
+        self.sequence_sizes = {}
         self.items = {}
         listdir = os.listdir(self.mot_folder)
 
@@ -114,11 +116,14 @@ class Mot17(BaseDataset, SequenceMixin, SplitMixin):
 
             config = configparser.ConfigParser()
             config.read(os.path.join(self.mot_folder, sequence, "seqinfo.ini"))
+            self.sequence_sizes[sequence] = (int(config["Sequence"]["imHeight"]), int(config["Sequence"]["imWidth"]))
 
-            with open(os.path.join(self.mot_folder, sequence, "gt/gt.txt")) as gt:
-                for line in gt.read().split("\n"):
-                    if len(line) > 0:
-                        self._add_line(sequence, line, config)
+            # Rows of gt.txt: frame_id, object_id, box_left, box_top, box_width, box_height, conf, class, visible
+            labels = load_frame_labels(os.path.join(self.mot_folder, sequence, "gt/gt.txt"), delimiter=",")
+            # All the frames of gt.txt are kept, only the visible boxes with a confidence of 1 are kept
+            self.mot_sequences[sequence] = labels.select(
+                (labels.table[:, 8] > self.visibility_threshold) & (labels.table[:, 6] == 1)
+            )
 
             seqs = more_itertools.windowed(
                 range(len(self.mot_sequences[sequence])), self.sequence_size, step=1 + self.sequence_skip
@@ -129,49 +134,6 @@ class Mot17(BaseDataset, SequenceMixin, SplitMixin):
                 {len(self.items) + idx: {"seq": seq, "mot_sequence": sequence} for idx, seq in enumerate(seqs)}
             )
 
-    def _add_line(self, sequence: str, line: str, config: configparser.ConfigParser):
-        """Given a sequence name and the GF `line`
-        this method aggrege the sequence data
-        """
-        if sequence not in self.mot_sequences:
-            self.mot_sequences[sequence] = {}
-
-        # print(line)
-
-        frame_id, object_id, box_left, box_top, box_width, box_height, conf, aa, visible = line.split(",")
-
-        frame_id = int(frame_id)
-        object_id = int(object_id)
-
-        try:
-            self.mot_sequences[sequence][frame_id]
-        except:
-            self.mot_sequences[sequence][frame_id] = []
-
-        if float(visible) <= self.visibility_threshold:
-            return
-
-        conf = float(conf)
-        if conf != 1:
-            return
-
-        # Boxes coordinates
-        box_left = float(box_left)
-        box_top = float(box_top)
-        box_height = float(box_height)
-        box_width = float(box_width)
-
-        self.mot_sequences[sequence][frame_id].append(
-            {
-                "xc": (box_left + (box_width / 2)) / float(config["Sequence"]["imWidth"]),
-                "yc": (box_top + (box_height / 2)) / float(config["Sequence"]["imHeight"]),
-                "width": box_width / float(config["Sequence"]["imWidth"]),
-                "height": box_height / float(config["Sequence"]["imHeight"]),
-                # "frame_size": (int(), int(config["Sequence"]["imWidth"])),
-                "object_id": object_id,
-            }
-        )
-
     def getitem(self, idx):
         if self.sample:
             return BaseDataset.__getitem__(self, idx)
@@ -198,21 +160,16 @@ class Mot17(BaseDataset, SequenceMixin, SplitMixin):
             image_path = os.path.join(
                 self.dataset_dir, self.get_split_folder(), sequence_name, "img1", str(s).zfill(6) + ".jpg"
             )
-            n_frame = aloscene.Frame(image_path)
-
-            # Append boxes
-            boxes = []
-            objects_id = []  # Object Id
-            objects_class = []  # Always 1 (Human)
+            n_frame = self.load_sequence_frame(image_path)
 
-            for data in self.mot_sequences[sequence_name][s]:
-                boxes.append([data["xc"], data["yc"], data["width"], data["height"]])
-                objects_id.append(data["object_id"])
-                objects_class.append(0)  # Human label (Only one label in this dataset)
+            # Boxes of the frame, relative (xc, yc, width, height)
+            rows = self.mot_sequences[sequence_name][s]
+            height, width = self.sequence_sizes[sequence_name]
+            boxes = rows[:, 2:6] / np.array([width, height, width, height])
+            boxes[:, :2] += boxes[:, 2:] / 2
+            objects_id = rows[:, 1].astype(np.int64)  # Object Id
+            objects_class = np.zeros(len(rows), dtype=np.int64)  # Always 0 (Human label, only one label)
 
-            # Setup boxes
-            if len(boxes) == 0:
-                boxes = np.zeros((0, 4))
             boxes = aloscene.BoundingBoxes2D(boxes, boxes_format="xcyc", absolute=False)
             # Setup boxes labels
             objects_class = aloscene.Labels(objects_class, labels_names=["person"], encoding="id", names=("N"))
@@ -0,0 +1,47 @@
+"""Pack the dense ground truth (`.flo` flows, `.pfm` disparities, `.npy` depths) of a dataset into one
+memory-mapped `gt.alopack` per directory (see :mod:`aloscene.io.gt_pack`). The readers of `aloscene.io`
+then read the packed arrays without parsing the files. The original files are kept: the datasets still
+list them to build their items.
+
+Usage:
+    python -m alodataset.prepare.pack_ground_truth /data/FlyingThings3D_subset --num_workers 8
+    python -m alodataset.prepare.pack_ground_truth /data/MPI-Sintel --float16
+"""
+import argparse
+from functools import partial
+from multiprocessing import Pool
+import os
+
+from tqdm import tqdm
+
+from aloscene.io.gt_pack import PACK_EXTENSIONS, pack_directory
+
+
+def ground_truth_directories(root: str, extensions: tuple = PACK_EXTENSIONS):
+    """Directories (recursively) under `root` containing ground truth files"""
+    directories = []
+    for directory, _, files in os.walk(root):
+        if any(name.endswith(tuple(extensions)) for name in files):
+            directories.append(directory)
+    return sorted(directories)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the dense ground truth of a dataset")
+    parser.add_argument("root", help="Root directory of the dataset")
+    parser.add_argument("--float16", action="store_true", help="Store the float arrays in float16 (lossy)")
+    parser.add_argument(
+        "--extensions", nargs="+", default=list(PACK_EXTENSIONS), help="Files to pack (default: %(default)s)"
+    )
+    parser.add_argument("--num_workers", type=int, default=1, help="Number of processes (default: %(default)s)")
+    args = parser.parse_args()
+
+    directories = ground_truth_directories(args.root, tuple(args.extensions))
+    pack = partial(pack_directory, float16=args.float16, extensions=tuple(args.extensions))
+    with Pool(args.num_workers) as pool:
+        n_files = sum(tqdm(pool.imap_unordered(pack, directories), total=len(directories), desc="Packing"))
+    print(f"{n_files} files packed in {len(directories)} directories")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Pre-warm the sample cache of a dataset (see `cache_dir` in :class:`alodataset.BaseDataset`): decode all
+the samples of the dataset in parallel and save them into the cache directory, so that even the first
+training epoch only pays for the augmentations.
+
+Usage:
+    python -m alodataset.prepare.warm_cache CocoDetectionDataset \
+        --kwargs '{"img_folder": "train2017", "ann_file": "annotations/instances_train2017.json"}' \
+        --cache_dir ~/.aloception/cache --num_workers 16
+"""
+import argparse
+import json
+
+import alodataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm the sample cache of a dataset")
+    parser.add_argument("dataset", help="Name of the dataset class in alodataset (ex: CocoDetectionDataset)")
+    parser.add_argument("--kwargs", type=json.loads, default={}, help="Dataset parameters, as a json dict")
+    parser.add_argument(
+        "--cache_dir", default="~/.aloception/cache", help="Cache directory (default: %(default)s)"
+    )
+    parser.add_argument("--cache_max_size", type=float, default=20.0, help="Cache budget in GB (default: %(default)s)")
+    parser.add_argument("--num_workers", type=int, default=8, help="Number of processes (default: %(default)s)")
+    args = parser.parse_args()
+
+    if not hasattr(alodataset, args.dataset):
+        raise Exception(f"Unknown dataset: {args.dataset}")
+    dataset = getattr(alodataset, args.dataset)(
+        cache_dir=args.cache_dir, cache_max_size=args.cache_max_size, **args.kwargs
+    )
+    dataset.warm_cache(num_workers=args.num_workers)
+
+
+if __name__ == "__main__":
+    main()
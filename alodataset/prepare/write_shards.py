@@ -0,0 +1,41 @@
+"""Pack the samples of a dataset into tar shards, to be streamed with :class:`alodataset.ShardDataset`.
+
+Usage:
+    python -m alodataset.prepare.write_shards CocoDetectionDataset /data/shards/coco_train \
+        --kwargs '{"img_folder": "train2017", "ann_file": "annotations/instances_train2017.json"}' \
+        --image_format jpg
+"""
+import argparse
+import json
+
+import alodataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the samples of a dataset into tar shards")
+    parser.add_argument("dataset", help="Name of the dataset class in alodataset (ex: CocoDetectionDataset)")
+    parser.add_argument("output_dir", help="Directory of the shards")
+    parser.add_argument("--kwargs", type=json.loads, default={}, help="Dataset parameters, as a json dict")
+    parser.add_argument(
+        "--max_samples_per_shard", type=int, default=1000, help="Samples per shard (default: %(default)s)"
+    )
+    parser.add_argument("--max_shard_size", type=float, default=1.0, help="Shard size in GB (default: %(default)s)")
+    parser.add_argument(
+        "--image_format", choices=["jpg", "png"], default=None, help="Encode the frames (default: raw tensors)"
+    )
+    args = parser.parse_args()
+
+    if not hasattr(alodataset, args.dataset):
+        raise Exception(f"Unknown dataset: {args.dataset}")
+    dataset = getattr(alodataset, args.dataset)(**args.kwargs)
+    alodataset.write_shards(
+        dataset,
+        args.output_dir,
+        max_samples_per_shard=args.max_samples_per_shard,
+        max_shard_size=args.max_shard_size,
+        image_format=args.image_format,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+from typing import Optional
+
+import numpy as np
+import torch
+import torch.distributed
+
+
+class SequenceWindowSampler(torch.utils.data.Sampler):
+    """Sampler reading the neighbouring items of a sequence dataset in order, on the same DataLoader worker.
+
+    The neighbouring items of the sequence datasets (consecutive indices) are overlapping windows of the same
+    sequence. The indices are split into chunks of `chunk_size` consecutive items, visited in a random order if
+    `shuffle`. Each worker reads its chunks in order: with the frame cache of the dataset (`frame_cache` of
+    :class:`~alodataset.SequenceMixin`), the frames shared by the consecutive windows are decoded once per
+    worker instead of `sequence_size` times.
+
+    The DataLoader sends the batches to its workers in turn: the batches are interleaved accordingly, the
+    `batch_size` and `num_workers` of the sampler must be the ones of the DataLoader. (The last batches of an
+    epoch can be sent to other workers if the workers do not get the same number of chunks.)
+
+    Parameters
+    ----------
+    data_source : torch.utils.data.Dataset
+        Dataset to sample
+    batch_size : int
+        Batch size of the DataLoader, by default 1
+    num_workers : int
+        Number of workers of the DataLoader, by default 0
+    chunk_size : int
+        Number of consecutive items read in order, rounded up to a multiple of `batch_size`. By default, 16 batches.
+    shuffle : bool
+        Visit the chunks in a random order, by default True
+    generator : torch.Generator
+        Generator used to shuffle the chunks, by default None
+
+    Examples
+    --------
+    >>> dataset = alodataset.WaymoDataset(sequence_size=4, frame_cache=32, ...)
+    >>> sampler_kwargs = {"batch_size": 8, "num_workers": 4}
+    >>> loader = dataset.train_loader(
+    ...     batch_size=8, num_workers=4, sampler=alodataset.SequenceWindowSampler, sampler_kwargs=sampler_kwargs
+    ... )
+    """
+
+    def __init__(
+        self,
+        data_source,
+        batch_size: int = 1,
+        num_workers: int = 0,
+        chunk_size: int = None,
+        shuffle: bool = True,
+        generator: Optional[torch.Generator] = None,
+    ):
+        self.data_source = data_source
+        self.batch_size = batch_size
+        self.n_streams = max(num_workers, 1)
+        chunk_size = 16 * batch_size if chunk_size is None else chunk_size
+        self.chunk_size = -(-chunk_size // batch_size) * batch_size
+        self.shuffle = shuffle
+        self.generator = generator
+
+    def __len__(self):
+        return len(self.data_source)
+
+    def __iter__(self):
+        n_items = len(self.data_source)
+        chunks = [range(start, min(start + self.chunk_size, n_items)) for start in range(0, n_items, self.chunk_size)]
+        if self.shuffle and len(chunks) > 1:
+            # The last chunk (possibly incomplete) stays at the end, to keep the batches of the workers aligned
+            order = torch.randperm(len(chunks) - 1, generator=self.generator).tolist() + [len(chunks) - 1]
+            chunks = [chunks[c] for c in order]
+
+        # One stream of items per worker. The batch `b` of the DataLoader goes to the worker `b % num_workers`
+        streams = [[] for _ in range(self.n_streams)]
+        for c, chunk in enumerate(chunks):
+            streams[c % self.n_streams].extend(chunk)
+        for start in range(0, max(len(stream) for stream in streams), self.batch_size):
+            for stream in streams:
+                yield from stream[start : start + self.batch_size]
+
+
+class WeightedMergeSampler(torch.utils.data.Sampler):
+    """Streaming sampler of a :class:`~alodataset.MergeDataset` with fractional weights.
+
+    Each sample comes from the dataset `i` with the probability `weights[i]` (normalized). The samples of a
+    dataset are drawn without replacement: a new random order of the dataset is drawn once all its samples have
+    been sampled. Only one permutation per dataset is kept, whatever the weights.
+
+    If `batch_size` is set, each batch of the DataLoader has a fixed composition: `floor(weights[i] * batch_size)`
+    samples of the dataset `i` (ex: 7 and 3 for weights (0.7, 0.3) and batches of 10), the remaining samples of
+    the batch being drawn with the probabilities of the fractional parts.
+
+    Parameters
+    ----------
+    data_source : alodataset.MergeDataset
+        Dataset to sample
+    weights : List[float]
+        Sampling weight of each dataset. By default, proportional to the number of samples of each dataset in
+        the MergeDataset.
+    num_samples : int
+        Number of samples per epoch, by default the length of the MergeDataset
+    batch_size : int
+        Batch size of the DataLoader, to draw batches of fixed composition. By default None (independent samples).
+    generator : torch.Generator
+        Random generator, by default None
+
+    Examples
+    --------
+    >>> dataset = alodataset.MergeDataset([coco, crowd_human])
+    >>> sampler_kwargs = {"weights": [0.7, 0.3], "batch_size": 10}
+    >>> loader = dataset.train_loader(
+    ...     batch_size=10, sampler=alodataset.WeightedMergeSampler, sampler_kwargs=sampler_kwargs
+    ... )
+    """
+
+    def __init__(
+        self,
+        data_source,
+        weights: list = None,
+        num_samples: int = None,
+        batch_size: int = None,
+        generator: Optional[torch.Generator] = None,
+    ):
+        self.data_source = data_source
+        offsets = data_source.offsets
+        if weights is None:
+            weights = [offsets[d + 1] - offsets[d] for d in range(len(data_source.datasets))]
+        if len(weights) != len(data_source.datasets):
+            raise RuntimeError("The number of weights should be equal to the number of datasets.")
+        if any(w < 0 for w in weights) or sum(weights) <= 0:
+            raise RuntimeError("weights should be positive.")
+        if any(w > 0 and len(dset) == 0 for w, dset in zip(weights, data_source.datasets)):
+            raise RuntimeError("Empty datasets can not have a positive weight.")
+        self.weights = torch.tensor(weights, dtype=torch.float64) / sum(weights)
+        self.num_samples = len(data_source) if num_samples is None else num_samples
+        self.batch_size = batch_size
+        self.generator = generator
+
+    def __len__(self):
+        return self.num_samples
+
+    def _datasets_stream(self):
+        """Dataset index of each sample"""
+        n_samples = 0
+        while n_samples < self.num_samples:
+            if self.batch_size is None:
+                block = min(1024, self.num_samples - n_samples)
+                yield from torch.multinomial(self.weights, block, replacement=True, generator=self.generator).tolist()
+            else:
+                block = min(self.batch_size, self.num_samples - n_samples)
+                # (The small epsilon avoids floor(6.9999...) = 6 for a 70% weight on batches of 10)
+                counts = torch.floor(self.weights * block + 1e-9).long()
+                n_extra = block - int(counts.sum())
+                if n_extra > 0:
+                    fractions = (self.weights * block - counts).clamp(min=0)
+                    extra = torch.multinomial(fractions, n_extra, replacement=False, generator=self.generator)
+                    counts[extra] += 1
+                yield from torch.repeat_interleave(torch.arange(len(counts)), counts).tolist()
+            n_samples += block
+
+    def __iter__(self):
+        offsets = self.data_source.offsets
+        datasets = self.data_source.datasets
+        orders = [[] for _ in datasets]
+        positions = [0] * len(datasets)
+        for d in self._datasets_stream():
+            if positions[d] == len(orders[d]):
+                orders[d] = torch.randperm(len(datasets[d]), generator=self.generator).tolist()
+                positions[d] = 0
+            yield offsets[d] + orders[d][positions[d]]
+            positions[d] += 1
+
+
+class AspectRatioBucketSampler(torch.utils.data.distributed.DistributedSampler):
+    """Sampler grouping the items of similar aspect ratios in the same batches, to minimize the padding of
+    :func:`~aloscene.tensors.SpatialAugmentedTensor.batch_list`.
+
+    The items are visited in a random order and dispatched into aspect ratio buckets (W / H, before the
+    transformations, see :func:`alodataset.BaseDataset.get_item_sizes`). A batch is emitted each time a bucket
+    is full. At the end of the epoch, the remaining items are sorted by aspect ratio and grouped in batches, the
+    last incomplete batch being dropped.
+
+    The sampler is distributed-aware: in distributed training, all the replicas build the same batches (same
+    seed) and each replica reads one batch out of `num_replicas`. As a `DistributedSampler`, it is kept as is by
+    pytorch lightning. Call :func:`set_epoch` at each epoch to change the order (done by pytorch lightning).
+
+    Parameters
+    ----------
+    data_source : torch.utils.data.Dataset
+        Dataset to sample, implementing `get_item_sizes()` if `sizes` is not given.
+    batch_size : int
+        Batch size of the DataLoader (per replica)
+    bucket_bounds : list of float
+        Aspect ratio (W / H) bounds of the buckets. By default 2 ** [-1, -2/3, -1/3, 0, 1/3, 2/3, 1] (8 buckets).
+    sizes : np.ndarray
+        Size (H, W) of each item. By default, `data_source.get_item_sizes()`.
+    shuffle : bool
+        Visit the items in a random order, by default True. Otherwise, the items are visited in order.
+    num_replicas : int
+        Number of replicas. By default, the world size if the distributed training is initialized, else 1.
+    rank : int
+        Rank of this replica. By default, the rank of the process if the distributed training is initialized,
+        else 0.
+    seed : int
+        Random seed shared by the replicas, by default 0
+
+    Examples
+    --------
+    >>> loader = dataset.train_loader(
+    ...     batch_size=8, sampler=alodataset.AspectRatioBucketSampler, sampler_kwargs={"batch_size": 8}
+    ... )
+    """
+
+    DEFAULT_BUCKET_BOUNDS = [2 ** (k / 3) for k in range(-3, 4)]
+
+    def __init__(
+        self,
+        data_source,
+        batch_size: int = 1,
+        bucket_bounds: list = None,
+        sizes=None,
+        shuffle: bool = True,
+        num_replicas: int = None,
+        rank: int = None,
+        seed: int = 0,
+    ):
+        # The DistributedSampler constructor is not called: it requires an initialized process group
+        distributed = torch.distributed.is_available() and torch.distributed.is_initialized()
+        if num_replicas is None:
+            num_replicas = torch.distributed.get_world_size() if distributed else 1
+        if rank is None:
+            rank = torch.distributed.get_rank() if distributed else 0
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.dataset = data_source
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+
+        sizes = np.asarray(data_source.get_item_sizes() if sizes is None else sizes, dtype=np.float64)
+        self.sizes = sizes.reshape(-1, 2)
+        self.aspect_ratios = self.sizes[:, 1] / self.sizes[:, 0]
+        bounds = self.DEFAULT_BUCKET_BOUNDS if bucket_bounds is None else sorted(bucket_bounds)
+        self.buckets = np.searchsorted(bounds, self.aspect_ratios)
+        self.n_buckets = len(bounds) + 1
+        # Number of batches per replica
+        self.n_batches = len(self.sizes) // batch_size // self.num_replicas
+
+    def __len__(self):
+        return self.n_batches * self.batch_size
+
+    def set_epoch(self, epoch: int):
+        """Set the epoch, used to seed the order of the items"""
+        self.epoch = epoch
+
+    def get_batches(self):
+        """Batches of the epoch, for all the replicas"""
+        if self.shuffle:
+            generator = torch.Generator().manual_seed(self.seed + self.epoch)
+            order = torch.randperm(len(self.sizes), generator=generator).tolist()
+        else:
+            order = range(len(self.sizes))
+
+        batches = []
+        buckets = [[] for _ in range(self.n_buckets)]
+        for idx in order:
+            bucket = buckets[self.buckets[idx]]
+            bucket.append(idx)
+            if len(bucket) == self.batch_size:
+                batches.append(bucket[:])
+                bucket.clear()
+        remaining = sorted(sum(buckets, []), key=lambda idx: self.aspect_ratios[idx])
+        for start in range(0, len(remaining) - self.batch_size + 1, self.batch_size):
+            batches.append(remaining[start : start + self.batch_size])
+        return batches
+
+    def __iter__(self):
+        batches = self.get_batches()
+        for batch in batches[self.rank :: self.num_replicas][: self.n_batches]:
+            yield from batch
+
+    def padding_ratio(self, sizes=None):
+        """Share of the padded pixels in the batches of the epoch (all replicas), estimated on the sizes of the
+        items before the transformations.
+
+        Parameters
+        ----------
+        sizes : np.ndarray
+            Size (H, W) of each item, by default the sizes of the sampler. Use the sizes after the transformations
+            to estimate the padding of the training batches.
+        """
+        sizes = self.sizes if sizes is None else np.asarray(sizes, dtype=np.float64).reshape(-1, 2)
+        pixels, padded = 0.0, 0.0
+        for batch in self.get_batches():
+            batch_sizes = sizes[batch]
+            pixels += batch_sizes.prod(axis=1).sum()
+            padded += len(batch) * batch_sizes.max(axis=0).prod()
+        return 1 - pixels / padded if padded > 0 else 0.0
@@ -1,5 +1,14 @@
+from typing import Callable, Hashable
+
+import torch
+
+from aloscene import Frame
+from aloscene.io.image import load_image
+from alodataset.utils.frame_cache import FrameCache
+
+
 class SequenceMixin(object):
-    def __init__(self, sequence_size: int = 1, sequence_skip: int = 0, **kwargs):
+    def __init__(self, sequence_size: int = 1, sequence_skip: int = 0, frame_cache: int = 0, **kwargs):
         """Sequence Mixin
         Parameters
         ----------
@@ -7,9 +16,43 @@ class SequenceMixin(object):
             Size of sequence to load
         sequence_skip: int
             Number of frame to skip between each element of the sequence
+        frame_cache: int
+            Number of decoded images kept in memory by each process reading the dataset, so that the frames
+            shared by the neighbouring sequences are decoded once (see
+            :class:`~alodataset.utils.frame_cache.FrameCache`). Use it with a sampler reading the neighbouring
+            sequences in order (:class:`~alodataset.samplers.SequenceWindowSampler`). By default 0 (no cache).
         """
 
         super(SequenceMixin, self).__init__(**kwargs)
 
         self.sequence_size = sequence_size
         self.sequence_skip = sequence_skip
+        self.frame_cache = FrameCache(frame_cache) if frame_cache > 0 else None
+
+    def load_sequence_image(self, key: Hashable, loader: Callable, *args, **kwargs) -> torch.Tensor:
+        """Decoded image `loader(*args, **kwargs)` of a sequence element, read from the frame cache if enabled.
+        The returned tensor can be shared with the cache: it must not be modified in place.
+
+        Parameters
+        ----------
+        key: Hashable
+            Identifier of the image in the dataset (ex: its path, or its (segment, camera, frame id))
+        loader: Callable
+            Function decoding the image
+        """
+        if self.frame_cache is None:
+            return loader(*args, **kwargs)
+        return self.frame_cache.get(key, loader, *args, **kwargs)
+
+    def load_sequence_frame(self, path: str) -> Frame:
+        """Same as `Frame(path)`, with the decoded image read from the frame cache if enabled"""
+        if self.frame_cache is None:
+            return Frame(path)
+        # Cached in uint8 (4 times smaller). The conversion gives a new tensor: no need to copy it.
+        image = self.frame_cache.get(path, load_image, path, dtype=torch.uint8)
+        return Frame(image.to(torch.float32), normalization="255", names=("C", "H", "W"), zero_copy=True)
+
+    def frame_cache_stats(self) -> dict:
+        """Statistics of the frame cache of the current process (see :meth:`FrameCache.stats`), None if the
+        cache is disabled"""
+        return None if self.frame_cache is None else self.frame_cache.stats()
@@ -0,0 +1,221 @@
+"""Packed shard format: the samples of any :class:`~alodataset.BaseDataset` are written once into a few
+large tar shards, then streamed sequentially by :class:`ShardDataset`. Reading a dataset becomes a few large
+sequential reads instead of thousands of small files to open.
+
+Each member of a shard is one sample serialized with :func:`~alodataset.utils.sample_cache.sample_to_bytes`:
+the payload schema of the sample (classes, properties, labels structure) followed by the raw bytes of its
+tensors, the RGB frames being optionally encoded in jpg or png. An index file (`shards.json`) lists the
+shards and their number of samples.
+"""
+import io
+import json
+import os
+import random
+import tarfile
+from typing import Callable
+
+import torch
+from tqdm import tqdm
+
+from alodataset.base_dataset import rename_data_to_none, stream_loader, train_loader
+from alodataset.utils.sample_cache import sample_to_bytes, sample_from_bytes
+
+SHARDS_INDEX = "shards.json"
+
+
+def write_shards(
+    dataset,
+    output_dir: str,
+    max_samples_per_shard: int = 1000,
+    max_shard_size: float = 1.0,
+    image_format: str = None,
+):
+    """Pack the samples (before `transform_fn`) of a dataset into tar shards.
+
+    Parameters
+    ----------
+    dataset : alodataset.BaseDataset
+        Dataset to pack
+    output_dir : str
+        Directory of the shards
+    max_samples_per_shard : int
+        Maximum number of samples in a shard, by default 1000
+    max_shard_size : float
+        Maximum size of a shard in GB (a new shard is started once this size is reached), by default 1.
+    image_format : str | None
+        If "jpg" or "png", the RGB frames are encoded in this format. By default None (raw tensors).
+
+    Returns
+    -------
+    index: dict
+        Content of the shards index
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    shards = []
+    tar, shard_size = None, 0
+    for idx in tqdm(range(len(dataset)), desc=f"Packing {dataset.name}"):
+        if tar is None:
+            shards.append({"path": f"shard-{len(shards):06d}.tar", "n_samples": 0})
+            tar = tarfile.open(os.path.join(output_dir, shards[-1]["path"]), "w")
+            shard_size = 0
+
+        buffer = sample_to_bytes(dataset._load_item(idx), image_format=image_format)
+        info = tarfile.TarInfo(name=f"{idx:09d}.alosample")
+        info.size = len(buffer)
+        tar.addfile(info, io.BytesIO(buffer))
+        shards[-1]["n_samples"] += 1
+        shard_size += len(buffer)
+
+        if shards[-1]["n_samples"] >= max_samples_per_shard or shard_size >= max_shard_size * 1e9:
+            tar.close()
+            tar = None
+    if tar is not None:
+        tar.close()
+
+    index = {"name": dataset.name, "n_samples": sum(s["n_samples"] for s in shards), "shards": shards}
+    with open(os.path.join(output_dir, SHARDS_INDEX), "w") as f:
+        json.dump(index, f, indent=4)
+    return index
+
+
+class ShardDataset(torch.utils.data.IterableDataset):
+    """Stream the samples packed with :func:`write_shards`.
+
+    The shards are read sequentially. With multiple DataLoader workers, each worker reads its own subset
+    of the shards. Shuffling is approximated by shuffling the order of the shards and by sampling from a
+    buffer of decoded samples. The shards are shuffled with a seed shared by all the workers before being
+    split between them, so that each shard is read by exactly one worker. Call :func:`set_epoch` at each
+    epoch to change the order when `seed` is given.
+
+    Parameters
+    ----------
+    shard_dir : str
+        Directory of the shards (containing the `shards.json` index)
+    transform_fn : function
+        transformation applied to each sample
+    shuffle : bool
+        Shuffle the order of the shards and the samples through a shuffle buffer, by default False
+    shuffle_buffer : int
+        Number of samples in the shuffle buffer (if `shuffle`), by default 1000
+    seed : int
+        Seed of the order of the shards (if `shuffle`), offset by the epoch. By default None: the base seed of
+        the DataLoader workers, drawn at each epoch.
+    """
+
+    def __init__(
+        self,
+        shard_dir: str,
+        transform_fn: Callable = None,
+        shuffle: bool = False,
+        shuffle_buffer: int = 1000,
+        seed: int = None,
+    ):
+        super().__init__()
+        self.shard_dir = shard_dir
+        with open(os.path.join(shard_dir, SHARDS_INDEX)) as f:
+            self.index = json.load(f)
+        self.name = self.index["name"]
+        self.transform_fn = transform_fn
+        self.shuffle = shuffle
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.epoch = 0
+
+    def __len__(self):
+        return self.index["n_samples"]
+
+    def set_epoch(self, epoch: int):
+        """Set the epoch, used to seed the order of the shards"""
+        self.epoch = epoch
+
+    def _shards_seed(self, worker_info):
+        """Seed of the order of the shards, the same for all the workers"""
+        if self.seed is not None:
+            return self.seed + self.epoch
+        if worker_info is not None:
+            # Each worker is seeded with the base seed of the DataLoader + its id
+            return worker_info.seed - worker_info.id + self.epoch
+        return random.randrange(2**32)
+
+    def _worker_shards(self):
+        """Shards read by the current worker"""
+        shards = [os.path.join(self.shard_dir, shard["path"]) for shard in self.index["shards"]]
+        worker_info = torch.utils.data.get_worker_info()
+        if self.shuffle:
+            generator = torch.Generator().manual_seed(self._shards_seed(worker_info) % 2**63)
+            shards = [shards[i] for i in torch.randperm(len(shards), generator=generator).tolist()]
+        if worker_info is not None:
+            shards = shards[worker_info.id :: worker_info.num_workers]
+        return shards
+
+    def _iter_samples(self):
+        """Read the samples of the worker shards, sequentially"""
+        for path in self._worker_shards():
+            with tarfile.open(path, "r|") as tar:
+                for member in tar:
+                    if member.isfile():
+                        yield sample_from_bytes(bytearray(tar.extractfile(member).read()))
+
+    def _iter_shuffled(self):
+        buffer = []
+        for data in self._iter_samples():
+            if len(buffer) < self.shuffle_buffer:
+                buffer.append(data)
+                continue
+            idx = random.randrange(len(buffer))
+            buffer[idx], data = data, buffer[idx]
+            yield data
+        random.shuffle(buffer)
+        yield from buffer
+
+    def __iter__(self):
+        samples = self._iter_shuffled() if self.shuffle else self._iter_samples()
+        for data in samples:
+            if self.transform_fn is not None:
+                data = self.transform_fn(data)
+            yield rename_data_to_none(data)
+
+    def _collate_fn(self, batch_data):
+        """Streamer collat fn"""
+        return batch_data
+
+    def stream_loader(self, num_workers=2, detached_payload=False):
+        """Get a stream loader from the dataset (see :func:`alodataset.base_dataset.stream_loader`)
+
+        Parameters
+        ----------
+        num_workers : int
+            Number of workers, by default 2
+        detached_payload : bool
+            Send the frames from the workers as a compact payload, by default False.
+            See :class:`~alodataset.base_dataset.PayloadDataLoader`
+
+        Returns
+        -------
+        torch.utils.data.DataLoader
+            A generator
+        """
+        return stream_loader(self, num_workers=num_workers, detached_payload=detached_payload)
+
+    def train_loader(self, batch_size=1, num_workers=2, detached_payload=False):
+        """Get training loader from the dataset (see :func:`alodataset.base_dataset.train_loader`). The samples
+        are shuffled by the dataset itself if `shuffle` is True.
+
+        Parameters
+        ----------
+        batch_size : int, optional
+            Batch size, by default 1
+        num_workers : int, optional
+            Number of workers, by default 2
+        detached_payload : bool, optional
+            Send the frames from the workers as a compact payload, by default False.
+            See :class:`~alodataset.base_dataset.PayloadDataLoader`
+
+        Returns
+        -------
+        torch.utils.data.DataLoader
+            A generator
+        """
+        return train_loader(
+            self, batch_size=batch_size, num_workers=num_workers, sampler=None, detached_payload=detached_payload
+        )
@@ -86,7 +86,7 @@ class SintelDisparityDataset(SintelBaseDataset):
         data = sequence_data[camera]
         frames = []
         for t in range(self.sequence_size):
-            frame = Frame(data["image"][t]).temporal()
+            frame = self.load_sequence_frame(data["image"][t]).temporal()
 
             if "flow" in data:
                 flow = SintelDisparityDataset._load_flow("flow", "flow_occ", data, t)
@@ -1,7 +1,7 @@
 import os
 import torch
 
-from aloscene import Flow, Frame, Mask
+from aloscene import Flow, Frame, LazyChild, Mask
 
 from alodataset.sintel_base_dataset import SintelBaseDataset
 
@@ -59,21 +59,26 @@ class SintelFlowDataset(SintelBaseDataset):
                 labels["left_flow_occ"][-1].append(left_flow_occ)
 
     @staticmethod
-    def _load_flow(flow_label, occ_label, data, t):
+    def _load_flow(flow_path, occ_path=None):
         """
-        Load a Flow object and append occlusion if it is found
+        Load a Flow object and append occlusion if its path is given
         """
-        if len(data[flow_label]) <= t:
-            return None
+        flow = Flow(flow_path)
 
-        flow = Flow(data[flow_label][t])
-
-        if occ_label in data:
-            occ = Mask(data[occ_label][t])
+        if occ_path is not None:
+            occ = Mask(occ_path)
             flow.append_occlusion(occ)
 
         return flow
 
+    @staticmethod
+    def _lazy_flow(flow_label, occ_label, data, t):
+        """
+        Flow loaded on first access, from the paths of the flow and occlusion only
+        """
+        occ_path = data[occ_label][t] if occ_label in data else None
+        return LazyChild(SintelFlowDataset._load_flow, data[flow_label][t], occ_path)
+
     def _get_camera_frames(self, sequence_data, camera):
         """
         Load sequences frames for a specific camera
@@ -81,12 +86,12 @@ class SintelFlowDataset(SintelBaseDataset):
         data = sequence_data[camera]
         frames = []
         for t in range(self.sequence_size):
-            frame = Frame(data["image"][t]).temporal()
+            frame = self.load_sequence_frame(data["image"][t]).temporal()
 
-            if "flow" in data:
-                flow = SintelFlowDataset._load_flow("flow", "flow_occ", data, t)
-                if flow is not None:
-                    frame.append_flow(flow, "flow_forward")
+            # The flow is loaded on first access (not loaded if dropped by the transformations)
+            if "flow" in data and len(data["flow"]) > t:
+                flow = SintelFlowDataset._lazy_flow("flow", "flow_occ", data, t)
+                frame.append_flow(flow, "flow_forward")
 
             frames.append(frame)
 
@@ -10,7 +10,114 @@ import torchvision.transforms.functional as F
 from torch.distributions.uniform import Uniform
 import torchvision
 
-from aloscene import Frame, Flow, Mask
+from aloscene import Frame, Flow, Mask, AugmentedTensor
+from aloscene.utils.pipeline_profiler import profile_stage
+
+
+def _batch_shape(frame: Frame, same_on_sequence: bool = False):
+    """Shape of the leading batch dims (`B` and/or `T`) of the frame. If `same_on_sequence`,
+    the size of the `T` dim is set to 1 (the params are shared along the sequence).
+    """
+    shape = []
+    for name, size in zip(frame.names, frame.shape):
+        if name == "B":
+            shape.append(size)
+        elif name == "T":
+            shape.append(1 if same_on_sequence else size)
+        else:
+            break
+    return tuple(shape)
+
+
+def _batch_view(param: torch.Tensor, tensor: torch.Tensor):
+    """View of the per-element `param` that broadcasts on `tensor`"""
+    return param.reshape(param.shape + (1,) * (tensor.dim() - param.dim()))
+
+
+def _crop_window(window: tuple, size: tuple, top: int, left: int, h: int, w: int):
+    """Compose a crop of (`top`, `left`, `h`, `w`) pixels on a frame of size `size` with the current
+    `window`: the (top, left, height, width) region of the original frame, in original pixels, that
+    is resized to `size`.
+
+    Returns
+    -------
+    window: tuple
+        New region of the original frame
+    size: tuple
+        New frame size
+    """
+    scale_y = window[2] / size[0]
+    scale_x = window[3] / size[1]
+    return (window[0] + top * scale_y, window[1] + left * scale_x, h * scale_y, w * scale_x), (h, w)
+
+
+def _random_region(H: int, W: int, h: int, w: int):
+    """Sample a (top, left, h, w) region of size (`h`, `w`) in a frame of size (`H`, `W`), the same way
+    than `torchvision.transforms.RandomCrop.get_params`.
+    """
+    if H == h and W == w:
+        return 0, 0, h, w
+    top = torch.randint(0, H - h + 1, size=(1,)).item()
+    left = torch.randint(0, W - w + 1, size=(1,)).item()
+    return top, left, h, w
+
+
+def _rgb_to_hsv(img: torch.Tensor):
+    """Convert a (..., 3, H, W) RGB tensor with values between 0 and 1 to the (h, s, v) channels,
+    following torchvision conventions.
+    """
+    r, g, b = img.unbind(dim=-3)
+    maxc = torch.max(img, dim=-3).values
+    minc = torch.min(img, dim=-3).values
+    eqc = maxc == minc
+    cr = maxc - minc
+    ones = torch.ones_like(maxc)
+    s = cr / torch.where(eqc, ones, maxc)
+    cr_divisor = torch.where(eqc, ones, cr)
+    rc = (maxc - r) / cr_divisor
+    gc = (maxc - g) / cr_divisor
+    bc = (maxc - b) / cr_divisor
+    hr = (maxc == r) * (bc - gc)
+    hg = ((maxc == g) & (maxc != r)) * (2.0 + rc - bc)
+    hb = ((maxc != g) & (maxc != r)) * (4.0 + gc - rc)
+    h = torch.fmod((hr + hg + hb) / 6.0 + 1.0, 1.0)
+    return h, s, maxc
+
+
+def _hsv_to_rgb(h: torch.Tensor, s: torch.Tensor, v: torch.Tensor):
+    """Convert the (..., H, W) h, s, v channels to a (..., 3, H, W) RGB tensor.
+    Elementwise formulation, much faster than the torchvision one on batched tensors.
+    """
+    n = torch.tensor([5.0, 3.0, 1.0], device=h.device).view(3, 1, 1)
+    k = (n + h.unsqueeze(-3) * 6) % 6
+    return v.unsqueeze(-3) * (1 - s.unsqueeze(-3) * torch.clamp(torch.minimum(k, 4 - k), 0, 1))
+
+
+def _batch_select(mask: torch.Tensor, on_true, on_false):
+    """Select, for each element of the batch, `on_true` where `mask` is True and `on_false` elsewhere.
+    The children of the augmented tensors are selected recursively.
+
+    Parameters
+    ----------
+    mask: torch.Tensor
+        Boolean tensor with the shape of the leading batch dims
+    on_true, on_false: AugmentedTensor | dict | list | None
+        Two versions of the same data
+    """
+    if on_true is None or on_false is None:
+        return on_true
+    elif mask.dim() == 0:
+        return on_true if mask else on_false
+    elif isinstance(on_true, dict):
+        return {key: _batch_select(mask, on_true[key], on_false[key]) for key in on_true}
+    elif isinstance(on_true, list):
+        return [_batch_select(mask[i], t, f) for i, (t, f) in enumerate(zip(on_true, on_false))]
+
+    data = torch.where(_batch_view(mask, on_true), on_true._as_raw_tensor(), on_false._as_raw_tensor())
+    selected = on_true._shallow_copy(data)
+    for name in on_true._children_list:
+        setattr(selected, name, _batch_select(mask, getattr(on_true, name), getattr(on_false, name)))
+    return selected
 
 
 class AloTransform(object):
@@ -55,7 +162,82 @@ class AloTransform(object):
     def set_params(self):
         raise Exception("Must be implement by a child class")
 
-    def __call__(self, frames: Union[Mapping[str, Frame], List[Frame], Frame], **kwargs):
+    def sample_batch_params(self, batch_shape: tuple, device: torch.device):
+        """Sample the params of each element of a batch, as tensors of shape `batch_shape`.
+        Transformations without batched implementation return None: in batched mode, they are
+        applied on each element of the batch, one after the other.
+
+        Parameters
+        ----------
+        batch_shape: tuple
+            Shape of the leading batch dims (`B` and/or `T`)
+        device: torch.device
+            Device of the frames
+
+        Returns
+        -------
+        params: tuple | None
+            Params to give to `set_params` before calling `apply_batch`
+        """
+        return None
+
+    def apply_batch(self, frame: Frame, **kwargs):
+        """Apply the transformation at once on all the elements of a batched frame, using the params
+        sampled by `sample_batch_params`. By default, the regular `apply` method is used, which is
+        enough for the transformations without random params.
+
+        Parameters
+        ----------
+        frame: Frame
+            Frame with `B` and/or `T` leading dims
+        """
+        return self.apply(frame, **kwargs)
+
+    def _call_per_element(self, frames: Union[Mapping[str, Frame], Frame], **kwargs):
+        """Batched mode of the transformations without batched implementation: the transformation
+        is called on each element of the `B` dim.
+        """
+        first = frames[next(iter(frames))] if isinstance(frames, dict) else frames
+        if first.names[0] != "B":
+            return self._call(frames, **kwargs)
+        results = []
+        for b in range(first.shape[0]):
+            element = {key: frames[key][b] for key in frames} if isinstance(frames, dict) else frames[b]
+            results.append(self._call(element, **kwargs))
+        if isinstance(frames, dict):
+            return {key: torch.cat([r[key].batch() for r in results], dim=0) for key in frames}
+        return torch.cat([r.batch() for r in results], dim=0)
+
+    def _call_batched(self, frames: Union[Mapping[str, Frame], Frame], **kwargs):
+        """Apply the transformation once on batched frame(s), with one set of params per element
+        of the `B` dim (and per element of the `T` dim if not `same_on_sequence`).
+        """
+        same_on_sequence, same_on_frames = self._init_same_on()
+        frame_set = frames if isinstance(frames, dict) else {None: frames}
+
+        n_set = {}
+        params = None
+        for key, frame in frame_set.items():
+            if params is None or not same_on_frames:
+                shape = _batch_shape(frame, same_on_sequence)
+                params = self.sample_batch_params(shape, frame.device)
+                if params is None:
+                    return self._call_per_element(frames, **kwargs)
+                apply_mask = torch.rand(shape, device=frame.device) < self.p if self.p < 1 else None
+
+            self.set_params(*params)
+            n_frame = self.apply_batch(frame, **kwargs)
+            if apply_mask is not None:
+                if n_frame.shape != frame.shape:
+                    raise Exception(
+                        "Impossible to apply the transformation on a part of the batch if it changes the frame size"
+                    )
+                n_frame = _batch_select(apply_mask.expand(_batch_shape(frame)), n_frame, frame)
+            n_set[key] = n_frame
+
+        return n_set if isinstance(frames, dict) else n_set[None]
+
+    def __call__(self, frames: Union[Mapping[str, Frame], List[Frame], Frame], batched: bool = False, **kwargs):
         """Iter on the given frame(s) or return the frame.
         Based on `same_on_sequence` and  `same_on_frames` parameters
         the method will return and call the `sample_params` method at different time.
@@ -64,7 +246,24 @@ class AloTransform(object):
         ----------
         frames (dict|list|Frame)
             Could be a dict mapping frame's name to `Frame`, or a list of `Frame`, or a `Frame`.
+        batched: bool
+            If True, `frames` (Frame or dict of Frame) have `B` and/or `T` leading dims and the transformation
+            is applied at once on all the elements, with per-element params (see `sample_batch_params`).
+            This way, the augmentations can run after the collate, on the accelerator. The frames of a
+            dict must share the same leading dims. By default False.
         """
+        # Timed per transformation class if a PipelineProfiler is started (see aloscene.utils.pipeline_profiler)
+        with profile_stage("transform/" + type(self).__name__) as stage:
+            frames = self._call(frames, batched=batched, **kwargs)
+            if stage is not None:
+                stage.add_bytes(frames)
+        return frames
+
+    def _call(self, frames: Union[Mapping[str, Frame], List[Frame], Frame], batched: bool = False, **kwargs):
+        """See :func:`__call__`"""
+        if batched:
+            return self._call_batched(frames, **kwargs)
+
         unif = random.random()
         if not unif < self.p:
             return frames
@@ -153,17 +352,49 @@ class AloTransform(object):
 
 
 class Compose(AloTransform):
-    def __init__(self, transforms: AloTransform, *args, **kwargs):
+    def __init__(self, transforms: AloTransform, *args, fuse_geometry: bool = True, **kwargs):
         """Compose a set of transformation
 
         Parameters
         ----------
         transforms: (list of AloTransform)
             List of transformation to apply sequentially
+        fuse_geometry: bool
+            Fold the consecutive crop & resize transformations (`RandomSizeCrop`, `RandomCrop`, `Resize`,
+            `RandomResizeWithAspectRatio`) into a single crop followed by a single resize. The frame and
+            its labels are then resampled only once. The crop region is rounded to the pixels of the
+            original frame. By default True.
         """
         self.transforms = transforms
+        self.fuse_geometry = fuse_geometry
         super().__init__(*args, **kwargs)
 
+    @staticmethod
+    def _is_fusable(transform: AloTransform, frame: Frame):
+        """The transformation can be fused if it implements `fold_geometry` and samples the same params
+        for all the elements of the frame.
+        """
+        return hasattr(transform, "fold_geometry") and ("T" not in frame.names or transform.same_on_sequence is True)
+
+    def _apply_fused(self, transforms: list, frame: Frame):
+        """Apply a chain of crop & resize transformations with a single crop and a single resize"""
+        window = (0.0, 0.0, float(frame.H), float(frame.W))
+        size = frame.HW
+        for t in transforms:
+            if not random.random() < t.p:
+                continue
+            t.set_params(*t.sample_params())
+            window, size = t.fold_geometry(window, size)
+
+        top, left = int(round(window[0])), int(round(window[1]))
+        h = min(int(round(window[2])), frame.H - top)
+        w = min(int(round(window[3])), frame.W - left)
+        if (top, left, h, w) != (0, 0, frame.H, frame.W):
+            frame = F.crop(frame, top, left, h, w)
+        if tuple(size) != (h, w):
+            frame = frame.resize(tuple(size))
+        return frame
+
     def sample_params(self):
         """Sample and set params of all the child transformations
         into the `self.transforms` list.
@@ -181,6 +412,14 @@ class Compose(AloTransform):
             t.set_params(*params[p])
         return params
 
+    def _call_batched(self, frames: Union[Mapping[str, Frame], Frame], **kwargs):
+        """Apply each child transformation in batched mode"""
+        if not random.random() < self.p:
+            return frames
+        for t in self.transforms:
+            frames = t(frames, batched=True, **kwargs)
+        return frames
+
     def apply(self, frame: Frame):
         """Apply the transformation
 
@@ -189,8 +428,24 @@ class Compose(AloTransform):
         frame: Frame
             Frame to apply the transformation on
         """
-        for t in self.transforms:
-            frame = t(frame)
+        if not self.fuse_geometry:
+            for t in self.transforms:
+                frame = t(frame)
+            return frame
+
+        chain = []
+        for t in list(self.transforms) + [None]:
+            if t is not None and self._is_fusable(t, frame):
+                chain.append(t)
+                continue
+            # End of a chain of crop & resize transformations
+            if len(chain) == 1:
+                frame = chain[0](frame)
+            elif len(chain) > 1:
+                frame = self._apply_fused(chain, frame)
+            chain = []
+            if t is not None:
+                frame = t(frame)
         return frame
 
     def __repr__(self):
@@ -270,6 +525,10 @@ class RandomHorizontalFlip(AloTransform):
         """Given predefined params, set the params on the class"""
         self._r = _r
 
+    def sample_batch_params(self, batch_shape: tuple, device: torch.device):
+        """Sample one `number` per element of the batch"""
+        return (torch.rand(batch_shape, device=device),)
+
     def apply(self, frame: Frame):
         """Apply the transformation
 
@@ -282,6 +541,21 @@ class RandomHorizontalFlip(AloTransform):
             return frame.hflip()
         return frame
 
+    def apply_batch(self, frame: Frame):
+        """Flip the elements of the batch for which the sampled `number` is < `self.p`
+
+        Parameters
+        ----------
+        frame: Frame
+            Frame with `B` and/or `T` leading dims
+        """
+        flip = (self._r < self.p).expand(_batch_shape(frame))
+        if not flip.any():
+            return frame
+        elif flip.all():
+            return frame.hflip()
+        return _batch_select(flip, frame.hflip(), frame)
+
 
 class RandomSizeCrop(AloTransform):
     def __init__(self, min_size: Union[int, float], max_size: Union[int, float], *args, **kwargs):
@@ -319,6 +593,20 @@ class RandomSizeCrop(AloTransform):
         self._w = _w
         self._h = _h
 
+    def _crop_size(self, H: int, W: int):
+        """Size of the crop for a frame of size (`H`, `W`)"""
+        if isinstance(self._w, float):
+            sample_w = int(round(self._w * W))
+            sample_h = int(round(self._h * H))
+        else:
+            sample_w = self._w
+            sample_h = self._h
+        return min(H, sample_h), min(W, sample_w)
+
+    def fold_geometry(self, window: tuple, size: tuple):
+        """Compose the crop with the current `window` (see :class:`Compose`)"""
+        return _crop_window(window, size, *_random_region(*size, *self._crop_size(*size)))
+
     def apply(self, frame: Frame):
         """Apply the transformation
 
@@ -327,17 +615,8 @@ class RandomSizeCrop(AloTransform):
         frame: Frame
             Frame to apply the transformation on
         """
-        if isinstance(self._w, float):
-            sample_w = int(round(self._w * frame.W))
-            sample_h = int(round(self._h * frame.H))
-        else:
-            sample_w = self._w
-            sample_h = self._h
-
-        w = min(frame.W, sample_w)
-        h = min(frame.H, sample_h)
-
-        region = T.RandomCrop.get_params(frame, [h, w])
+        h, w = self._crop_size(frame.H, frame.W)
+        region = _random_region(frame.H, frame.W, h, w)
         frame = F.crop(frame, *region)
         return frame
 
@@ -443,12 +722,18 @@ class RandomCrop(AloTransform):
         self.top = top
         self.left = left
 
-    def apply(self, frame: Frame):
-        H, W = frame.HW
+    def _region(self, H: int, W: int):
         h, w = self.size
         top = int(self.top * (H - h + 1))  # 0 <= top <= H-h
         left = int(self.left * (W - w + 1))  # 0 <= left <= W - w
-        frame = F.crop(frame, top, left, h, w)
+        return top, left, h, w
+
+    def fold_geometry(self, window: tuple, size: tuple):
+        """Compose the crop with the current `window` (see :class:`Compose`)"""
+        return _crop_window(window, size, *self._region(*size))
+
+    def apply(self, frame: Frame):
+        frame = F.crop(frame, *self._region(*frame.HW))
         return frame
 
 
@@ -482,8 +767,11 @@ class RandomResizeWithAspectRatio(AloTransform):
         max_size: int
             Maximum size of the largest side.
         """
-        h, w = frame.H, frame.W
+        return RandomResizeWithAspectRatio._size_with_aspect_ratio(frame.H, frame.W, size, max_size)
 
+    @staticmethod
+    def _size_with_aspect_ratio(h: int, w: int, size: int, max_size: int = None):
+        """Same as :meth:`get_size_with_aspect_ratio`, given the frame height `h` and width `w`"""
         if max_size is not None:
             min_original_size = float(min((w, h)))
             max_original_size = float(max((w, h)))
@@ -512,6 +800,10 @@ class RandomResizeWithAspectRatio(AloTransform):
         """Given predefined params, set the params on the class"""
         self._size = _size
 
+    def fold_geometry(self, window: tuple, size: tuple):
+        """Compose the resize with the current `window` (see :class:`Compose`)"""
+        return window, self._size_with_aspect_ratio(*size, self._size, self.max_size)
+
     def apply(self, frame: Frame):
         """Apply the transformation
 
@@ -548,6 +840,14 @@ class Resize(AloTransform):
         """Given predefined params, set the params on the class"""
         self.size = size
 
+    def sample_batch_params(self, batch_shape: tuple, device: torch.device):
+        """Same `size` for all the elements of the batch"""
+        return (self.size,)
+
+    def fold_geometry(self, window: tuple, size: tuple):
+        """Compose the resize with the current `window` (see :class:`Compose`)"""
+        return window, self.size
+
     def apply(self, frame: Frame):
         """Apply the transformation
 
@@ -626,6 +926,10 @@ class RealisticNoise(AloTransform):
         """No parameters to set"""
         pass
 
+    def sample_batch_params(self, batch_shape: tuple, device: torch.device):
+        """No parameters to sample, the noise is already sampled for each pixel"""
+        return tuple()
+
     def apply(self, frame: Frame):
         n_frame = frame.norm01()
 
@@ -667,6 +971,42 @@ class CustomRandomColoring(AloTransform):
         self.gamma = Uniform(gamma_min, gamma_max).sample()
         self.brightness = Uniform(brightness_min, brightness_max).sample()
         self.colors = Uniform(colors_min, colors_max).sample(sample_shape=(3,))
+        return (self.gamma, self.brightness, self.colors)
+
+    def set_params(self, gamma, brightness, colors):
+        """Given predefined params, set the params on the class"""
+        self.gamma = gamma
+        self.brightness = brightness
+        self.colors = colors
+
+    def sample_batch_params(self, batch_shape: tuple, device: torch.device):
+        """Sample `gamma`, `brightness` and `colors` for each element of the batch"""
+        gamma_min, gamma_max = self.gamma_r
+        brightness_min, brightness_max = self.brightness_r
+        colors_min, colors_max = self.colors_r
+
+        gamma = torch.empty(batch_shape, device=device).uniform_(gamma_min, gamma_max)
+        brightness = torch.empty(batch_shape, device=device).uniform_(brightness_min, brightness_max)
+        colors = torch.empty(batch_shape + (3,), device=device).uniform_(colors_min, colors_max)
+        return (gamma, brightness, colors)
+
+    def apply_batch(self, frame: Frame):
+        """Apply the transformation on all the elements of the batch, each with its own params
+
+        Parameters
+        ----------
+        frame: Frame
+            Frame with `B` and/or `T` leading dims
+        """
+        assert frame.normalization == "01", "frame should be normalized between 0 and 1 before color modification"
+        C = frame.shape[frame.names.index("C")]
+        # change color by applying different coefficients to R, G, and B channels
+        colors = self.colors[..., torch.arange(C, device=self.colors.device) % 3]
+        colors = colors.reshape(colors.shape + (1,) * (frame.dim() - colors.dim()))
+
+        data = frame.as_tensor() ** _batch_view(self.gamma, frame) * _batch_view(self.brightness, frame)
+        data = torch.clip(data * colors, 0, 1)
+        return frame._shallow_copy(data)
 
     def apply(self, frame: Frame):
         assert frame.normalization == "01", "frame should be normalized between 0 and 1 before color modification"
@@ -675,10 +1015,10 @@ class CustomRandomColoring(AloTransform):
         frame = frame * self.brightness
         # change color by applying different coefficients to R, G, and B channels
         C = frame.shape[frame.names.index("C")]
-        labels = frame.drop_labels()
+        labels = frame.drop_children()
         for c in range(C):
             frame[frame.get_slices({"C": c})] *= self.colors[c % 3]
-        frame.set_labels(labels)
+        frame.set_children(labels)
         frame = torch.clip(frame, 0, 1)
 
         return frame
@@ -761,6 +1101,60 @@ class ColorJitter(AloTransform, torchvision.transforms.ColorJitter):
         """Given predefined params, set the params on the class"""
         self.params = params
 
+    def sample_batch_params(self, batch_shape: tuple, device: torch.device):
+        """Sample the brightness, contrast, saturation and hue factors of each element of the batch.
+        The order of the adjustments is shared by all the elements.
+        """
+
+        def _uniform(bounds):
+            if bounds is None:
+                return None
+            return torch.empty(batch_shape, device=device).uniform_(bounds[0], bounds[1])
+
+        return (torch.randperm(4),) + tuple(
+            _uniform(bounds) for bounds in [self.brightness, self.contrast, self.saturation, self.hue]
+        )
+
+    def apply_batch(self, frame: Frame):
+        """Apply the transformation on all the elements of the batch, each with its own factors
+
+        Parameters
+        ----------
+        frame: aloscene.Frame
+            Frame with `B` and/or `T` leading dims
+
+        Returns
+        -------
+        n_frame: aloscene.Frame
+        """
+        n_frame = frame.norm01()
+
+        frame_data = n_frame.as_tensor()
+
+        def _blend(img, other, factor):
+            factor = _batch_view(factor, img)
+            return (factor * img + (1 - factor) * other).clamp(0, 1)
+
+        for fn_id in self.params[0]:
+            if fn_id == 0 and self.params[1] is not None:
+                frame_data = _blend(frame_data, torch.zeros_like(frame_data), self.params[1])
+            elif fn_id == 1 and self.params[2] is not None:
+                mean = F.rgb_to_grayscale(frame_data).mean(dim=(-3, -2, -1), keepdim=True)
+                frame_data = _blend(frame_data, mean, self.params[2])
+            elif fn_id == 2 and self.params[3] is not None:
+                frame_data = _blend(frame_data, F.rgb_to_grayscale(frame_data), self.params[3])
+            elif fn_id == 3 and self.params[4] is not None:
+                h, s, v = _rgb_to_hsv(frame_data)
+                h = (h + _batch_view(self.params[4], h)) % 1.0
+                frame_data = _hsv_to_rgb(h, s, v)
+
+        n_frame = n_frame._shallow_copy(frame_data)
+
+        if n_frame.normalization != frame.normalization:
+            n_frame = n_frame.norm_as(frame)
+
+        return n_frame
+
     def apply(self, frame: Frame):
         """Apply the transformation on the frame
 
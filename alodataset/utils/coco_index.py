@@ -0,0 +1,256 @@
+"""Columnar, memory-mapped index of a COCO annotation file.
+
+Loading a COCO (or LVIS) json file with `pycocotools` takes tens of seconds and hundreds of MB in each
+process. The :class:`CocoIndex` is compiled once from the json file and saved next to it as numpy arrays:
+image ids, annotation offsets per image, boxes, category ids, areas, crowd flags, and the remaining
+fields of the images and annotations (segmentations, file names...) as json blobs with their offsets.
+The arrays are then loaded with `mmap_mode="r"`: the startup is near-instant and the memory is shared by
+all the processes reading the same index.
+
+The index implements the subset of the `pycocotools.coco.COCO` API used by the datasets
+(`getImgIds`, `loadImgs`, `getAnnIds`, `loadAnns`, `getCatIds`, `loadCats`).
+"""
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+_VERSION = 2
+_META_FILE = "meta.json"
+# Annotation fields stored as numpy columns. The other fields go to the json blob of the annotation.
+_ANN_COLUMNS = ["id", "image_id", "category_id", "bbox", "area", "iscrowd"]
+
+
+def _to_blob(objects: list):
+    """Encode a list of json objects into one uint8 blob and the (n + 1) offsets of the objects"""
+    encoded = [json.dumps(obj, separators=(",", ":")).encode() for obj in objects]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _as_list(ids):
+    return list(ids) if isinstance(ids, (list, tuple, np.ndarray)) else [ids]
+
+
+def _positions(sorted_ids: np.ndarray, ids, skip_unknown: bool = False) -> np.ndarray:
+    """Positions of `ids` in `sorted_ids`. Raise a KeyError for an unknown id (as `pycocotools`), or skip it if
+    `skip_unknown`"""
+    ids = np.asarray(_as_list(ids), dtype=np.int64)
+    positions = np.searchsorted(sorted_ids, ids)
+    found = positions < len(sorted_ids)
+    found[found] = sorted_ids[positions[found]] == ids[found]
+    if skip_unknown:
+        return positions[found]
+    if not found.all():
+        raise KeyError(int(ids[~found][0]))
+    return positions
+
+
+class CocoIndex(object):
+    """Memory-mapped index of a COCO annotation file. Use :meth:`load` to build (once) and load the index.
+
+    Parameters
+    ----------
+    index_dir : str
+        Directory of the compiled index
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, _META_FILE)) as f:
+            meta = json.load(f)
+        self.cats = {cat["id"]: cat for cat in meta["categories"]}
+        for name in meta["arrays"]:
+            setattr(self, name, np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r"))
+
+    def __getstate__(self):
+        # Pickle only the location of the index: the arrays are mapped again by the other process
+        return {"index_dir": self.index_dir}
+
+    def __setstate__(self, state):
+        self.__init__(state["index_dir"])
+
+    @staticmethod
+    def default_index_dir(ann_file: str) -> str:
+        return f"{ann_file}.aloindex"
+
+    @staticmethod
+    def _fallback_index_dir(ann_file: str) -> str:
+        """Index directory used if the directory of the annotation file is not writable"""
+        path_hash = hashlib.md5(os.path.abspath(ann_file).encode()).hexdigest()[:16]
+        return os.path.join(os.path.expanduser("~"), ".aloception", "coco_index", path_hash)
+
+    @staticmethod
+    def _is_valid(index_dir: str, ann_file: str) -> bool:
+        """The index exists and has been compiled from the current version of the annotation file"""
+        meta_path = os.path.join(index_dir, _META_FILE)
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stat = os.stat(ann_file)
+        return meta["version"] == _VERSION and meta["source"] == [stat.st_size, stat.st_mtime]
+
+    @classmethod
+    def load(cls, ann_file: str, index_dir: str = None):
+        """Load the index of `ann_file`, compiling it first if needed.
+
+        Parameters
+        ----------
+        ann_file : str
+            Path of the COCO json annotation file
+        index_dir : str, optional
+            Directory of the index. By default, `<ann_file>.aloindex` or, if not writable, a directory in
+            `~/.aloception/coco_index`.
+
+        Returns
+        -------
+        CocoIndex
+        """
+        candidates = [index_dir] if index_dir is not None else [cls.default_index_dir(ann_file)]
+        if index_dir is None:
+            candidates.append(cls._fallback_index_dir(ann_file))
+        for candidate in candidates:
+            if cls._is_valid(candidate, ann_file):
+                return cls(candidate)
+        for candidate in candidates:
+            try:
+                cls.build(ann_file, candidate)
+            except OSError:
+                continue
+            return cls(candidate)
+        raise Exception(f"Impossible to write the annotation index of {ann_file} into {candidates}")
+
+    @staticmethod
+    def build(ann_file: str, index_dir: str):
+        """Compile the index of `ann_file` into `index_dir`
+
+        Parameters
+        ----------
+        ann_file : str
+            Path of the COCO json annotation file
+        index_dir : str
+            Directory of the index
+        """
+        stat = os.stat(ann_file)
+        with open(ann_file) as f:
+            dataset = json.load(f)
+
+        images = sorted(dataset.get("images", []), key=lambda img: img["id"])
+        image_ids = np.array([img["id"] for img in images], dtype=np.int64)
+        # Annotations grouped by image (the images being sorted by id)
+        anns = dataset.get("annotations", [])
+        ann_image_pos = np.searchsorted(image_ids, np.array([a["image_id"] for a in anns], dtype=np.int64))
+        order = np.argsort(ann_image_pos, kind="stable")
+        anns = [anns[i] for i in order]
+
+        arrays = {
+            "image_ids": image_ids,
+            "image_ann_offsets": np.searchsorted(ann_image_pos[order], np.arange(len(images) + 1)).astype(np.int64),
+            "ann_ids": np.array([a["id"] for a in anns], dtype=np.int64),
+            "ann_image_ids": np.array([a["image_id"] for a in anns], dtype=np.int64),
+            "ann_category_ids": np.array([a.get("category_id", -1) for a in anns], dtype=np.int64),
+            "ann_bboxes": np.array([a.get("bbox", [0, 0, 0, 0]) for a in anns], dtype=np.float64).reshape(-1, 4),
+            "ann_areas": np.array([a.get("area", 0) for a in anns], dtype=np.float64),
+            "ann_iscrowd": np.array([a.get("iscrowd", 0) for a in anns], dtype=np.int64),
+        }
+        arrays["ann_ids_order"] = np.argsort(arrays["ann_ids"], kind="stable")
+        arrays["ann_ids_sorted"] = arrays["ann_ids"][arrays["ann_ids_order"]]
+        arrays["image_blob"], arrays["image_blob_offsets"] = _to_blob(images)
+        arrays["ann_blob"], arrays["ann_blob_offsets"] = _to_blob(
+            [{k: v for k, v in a.items() if k not in _ANN_COLUMNS} for a in anns]
+        )
+        meta = {
+            "version": _VERSION,
+            "source": [stat.st_size, stat.st_mtime],
+            "categories": dataset.get("categories", []),
+            "arrays": list(arrays.keys()),
+        }
+
+        # Write into a temporary directory, then move it (other processes may build the same index)
+        tmp_dir = f"{index_dir}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(tmp_dir)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+            with open(os.path.join(tmp_dir, _META_FILE), "w") as f:
+                json.dump(meta, f)
+            if os.path.exists(index_dir):
+                shutil.rmtree(index_dir, ignore_errors=True)
+            os.replace(tmp_dir, index_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.exists(os.path.join(index_dir, _META_FILE)):
+                raise
+
+    def _blob(self, blob: np.ndarray, offsets: np.ndarray, pos: int) -> dict:
+        return json.loads(blob[offsets[pos] : offsets[pos + 1]].tobytes())
+
+    def images_with_categories(self, valid_categories: np.ndarray) -> list:
+        """Ids of the images with at least one annotation whose category is valid
+
+        Parameters
+        ----------
+        valid_categories : np.ndarray
+            Boolean array, indexed by category id
+
+        Returns
+        -------
+        list
+            Sorted image ids
+        """
+        valid = np.zeros(len(self.ann_ids), dtype=bool)
+        known = (self.ann_category_ids >= 0) & (self.ann_category_ids < len(valid_categories))
+        valid[known] = valid_categories[self.ann_category_ids[known]]
+        n_valid = np.add.reduceat(np.append(valid, False).astype(np.int64), self.image_ann_offsets[:-1])
+        # reduceat returns the element at the offset for the images without annotations
+        n_valid[self.image_ann_offsets[:-1] == self.image_ann_offsets[1:]] = 0
+        return self.image_ids[n_valid > 0].tolist()
+
+    # pycocotools.coco.COCO API
+
+    def getImgIds(self) -> list:
+        return self.image_ids.tolist()
+
+    def loadImgs(self, ids) -> list:
+        positions = _positions(self.image_ids, ids)
+        return [self._blob(self.image_blob, self.image_blob_offsets, pos) for pos in positions]
+
+    def getAnnIds(self, imgIds) -> list:
+        ann_ids = []
+        # As pycocotools, the unknown image ids are skipped
+        for pos in _positions(self.image_ids, imgIds, skip_unknown=True):
+            ann_ids += self.ann_ids[self.image_ann_offsets[pos] : self.image_ann_offsets[pos + 1]].tolist()
+        return ann_ids
+
+    def loadAnns(self, ids) -> list:
+        anns = []
+        for pos in self.ann_ids_order[_positions(self.ann_ids_sorted, ids)]:
+            ann = self._blob(self.ann_blob, self.ann_blob_offsets, pos)
+            ann.update(
+                {
+                    "id": int(self.ann_ids[pos]),
+                    "image_id": int(self.ann_image_ids[pos]),
+                    "category_id": int(self.ann_category_ids[pos]),
+                    "bbox": self.ann_bboxes[pos].tolist(),
+                    "area": float(self.ann_areas[pos]),
+                    "iscrowd": int(self.ann_iscrowd[pos]),
+                }
+            )
+            anns.append(ann)
+        return anns
+
+    def getCatIds(self, catNms=[], supNms=[], catIds=[]) -> list:
+        catNms, supNms, catIds = _as_list(catNms), _as_list(supNms), _as_list(catIds)
+        cats = list(self.cats.values())
+        cats = [cat for cat in cats if len(catNms) == 0 or cat["name"] in catNms]
+        cats = [cat for cat in cats if len(supNms) == 0 or cat.get("supercategory") in supNms]
+        cats = [cat for cat in cats if len(catIds) == 0 or cat["id"] in catIds]
+        return [cat["id"] for cat in cats]
+
+    def loadCats(self, ids) -> list:
+        return [self.cats[i] for i in _as_list(ids)]
@@ -0,0 +1,89 @@
+"""In-memory cache of the decoded images of the sequence datasets.
+
+With `sequence_size=T` and `sequence_skip=0`, two neighbouring items of a sequence dataset share T-1 frames:
+without cache, each image is decoded T times per epoch. The :class:`FrameCache` keeps the last decoded images
+(least recently used eviction), so that the windows read in order (see
+:class:`~alodataset.samplers.SequenceWindowSampler`) decode each image about once.
+
+The cache lives in the process reading the dataset: each DataLoader worker has its own cache, which is never
+sent between processes.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import torch
+
+
+class FrameCache(object):
+    """Least recently used cache of decoded images.
+
+    Parameters
+    ----------
+    max_frames : int
+        Maximum number of cached images
+    """
+
+    def __init__(self, max_frames: int):
+        assert max_frames > 0, "max_frames must be positive"
+        self.max_frames = max_frames
+        self._frames = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # The cached images stay in their process
+        state = self.__dict__.copy()
+        state.update(_frames=OrderedDict(), hits=0, misses=0, nbytes=0)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, key: Hashable, loader: Callable, *args, **kwargs) -> torch.Tensor:
+        """Cached image of `key`, or image returned by `loader(*args, **kwargs)` (then cached). The returned
+        tensor is shared with the cache: it must not be modified in place.
+        """
+        with self._lock:
+            image = self._frames.get(key)
+            if image is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        # Decoded without the lock: the threads of a ThreadedStreamLoader decode in parallel
+        image = loader(*args, **kwargs)
+        with self._lock:
+            if key in self._frames:
+                return self._frames[key]
+            self._frames[key] = image
+            self.nbytes += image.numel() * image.element_size()
+            while len(self._frames) > self.max_frames:
+                _, evicted = self._frames.popitem(last=False)
+                self.nbytes -= evicted.numel() * evicted.element_size()
+        return image
+
+    def clear(self):
+        """Remove all the cached images and reset the statistics"""
+        with self._lock:
+            self.__dict__.update(self.__getstate__())
+
+    def stats(self) -> dict:
+        """Statistics of the cache (in the current process): number of hits and misses, hit rate, number of
+        cached images and their size in bytes"""
+        n_gets = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / n_gets if n_gets > 0 else 0.0,
+            "n_frames": len(self._frames),
+            "nbytes": self.nbytes,
+        }
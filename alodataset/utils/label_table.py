@@ -0,0 +1,188 @@
+"""Bulk parsing of the text label files of the tracking / odometry datasets (MOT17 `gt.txt`, KITTI tracking
+`label_02`, KITTI odometry `poses` and `times.txt`).
+
+Each file is parsed at once by numpy into a float table (one row per line), the string columns being encoded
+as category indices. For the per-frame labels, the rows are sorted by frame and indexed by a per-frame offset
+array (:class:`FrameLabels`): the labels of a frame are a slice of the table.
+
+The parsed tables are cached on disk (by default in `~/.aloception/label_cache`), identified by the path, the
+size and the modification time of the label file and by the parsing options. The next runs load the binary
+table instead of parsing the text file.
+"""
+import hashlib
+import os
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".aloception", "label_cache")
+
+
+def _cache_path(cache_dir: str, path: str, *options) -> str:
+    stat = os.stat(path)
+    key = repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns) + options)
+    return os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npz")
+
+
+def _save_cache(cache_file: str, **arrays):
+    """Save the arrays in the cache. The cache is optional: the errors (ex: read-only home) are ignored."""
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+
+def _load_cache(cache_file: str) -> Optional[dict]:
+    try:
+        with np.load(cache_file) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_label_table(
+    path: str,
+    delimiter: str = None,
+    n_columns: int = None,
+    categories: Dict[int, List[str]] = None,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+) -> np.ndarray:
+    """Parse a text file of numbers (one row per line) into a float64 array of shape (n_lines, n_columns).
+
+    Parameters
+    ----------
+    path : str
+        Path of the text file
+    delimiter : str
+        Delimiter of the columns, by default any whitespace
+    n_columns : int
+        Number of columns to read (the next ones are ignored), by default all the columns
+    categories : dict
+        String columns: column -> list of the category names. The column is encoded with the index of the
+        category in the list. A value not in the list raises a ValueError.
+    cache_dir : str
+        Directory of the parsed tables cache, None to disable the cache. By default `~/.aloception/label_cache`.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_lines, n_columns)
+    """
+    categories = {} if categories is None else categories
+    cache_file = None
+    if cache_dir is not None:
+        options = ("table", delimiter, n_columns, sorted((c, tuple(n)) for c, n in categories.items()))
+        cache_file = _cache_path(cache_dir, path, *options)
+        cached = _load_cache(cache_file)
+        if cached is not None:
+            return cached["table"]
+
+    converters = {column: names.index for column, names in categories.items()}
+    usecols = None if n_columns is None else range(n_columns)
+    table = np.loadtxt(
+        path, delimiter=delimiter, usecols=usecols, converters=converters, ndmin=2, dtype=np.float64, encoding="utf-8"
+    )
+
+    if cache_file is not None:
+        _save_cache(cache_file, table=table)
+    return table
+
+
+class FrameLabels(object):
+    """Rows of a label table grouped by frame id. The rows of the frame `f` are
+    `table[offsets[f]:offsets[f + 1]]`, in the order of the label file.
+
+    Parameters
+    ----------
+    table : np.ndarray
+        Label table, sorted by frame id
+    frame_ids : np.ndarray
+        Sorted frame ids that appear in the label file
+    offsets : np.ndarray
+        Offsets of the rows of each frame id, of size max(frame_ids) + 2
+    """
+
+    def __init__(self, table: np.ndarray, frame_ids: np.ndarray, offsets: np.ndarray):
+        self.table = table
+        self.frame_ids = frame_ids
+        self.offsets = offsets
+
+    @classmethod
+    def from_table(cls, table: np.ndarray, frame_column: int = 0):
+        """Group the rows of a label table by the (integer) frame id of the column `frame_column`"""
+        frames = table[:, frame_column].astype(np.int64)
+        if len(frames) > 0 and frames.min() < 0:
+            raise ValueError("The frame ids must be positive.")
+        order = np.argsort(frames, kind="stable")
+        frames = frames[order]
+        n_frames = int(frames[-1]) + 1 if len(frames) > 0 else 0
+        offsets = np.searchsorted(frames, np.arange(n_frames + 1), side="left")
+        return cls(table[order], np.unique(frames), offsets)
+
+    def __len__(self):
+        """Number of frame ids that appear in the label file"""
+        return len(self.frame_ids)
+
+    def __contains__(self, frame_id: int):
+        start, end = self._bounds(frame_id)
+        return start < end
+
+    def _bounds(self, frame_id: int):
+        if frame_id < 0 or frame_id + 1 >= len(self.offsets):
+            return 0, 0
+        return self.offsets[frame_id], self.offsets[frame_id + 1]
+
+    def __getitem__(self, frame_id: int) -> np.ndarray:
+        """Rows of the frame `frame_id` (a view on the table), empty if the frame has no label"""
+        start, end = self._bounds(frame_id)
+        return self.table[start:end]
+
+    def select(self, mask: np.ndarray):
+        """Keep the rows where `mask` is True. The frame ids are kept, even without remaining rows."""
+        counts = np.diff(self.offsets)
+        frame_of_row = np.repeat(np.arange(len(counts)), counts)
+        kept_counts = np.bincount(frame_of_row[mask], minlength=len(counts))
+        offsets = np.concatenate([[0], np.cumsum(kept_counts)])
+        return FrameLabels(self.table[mask], self.frame_ids, offsets)
+
+
+def load_frame_labels(
+    path: str,
+    frame_column: int = 0,
+    delimiter: str = None,
+    n_columns: int = None,
+    categories: Dict[int, List[str]] = None,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+) -> FrameLabels:
+    """Parse a text label file with one row per object and per frame (see :func:`load_label_table`) and index
+    the rows by frame id. The index is cached with the table.
+
+    Parameters
+    ----------
+    path : str
+        Path of the text file
+    frame_column : int
+        Column of the frame ids, by default 0
+    delimiter, n_columns, categories, cache_dir :
+        See :func:`load_label_table`
+    """
+    categories = {} if categories is None else categories
+    cache_file = None
+    if cache_dir is not None:
+        options = ("frames", frame_column, delimiter, n_columns, sorted((c, tuple(n)) for c, n in categories.items()))
+        cache_file = _cache_path(cache_dir, path, *options)
+        cached = _load_cache(cache_file)
+        if cached is not None:
+            return FrameLabels(cached["table"], cached["frame_ids"], cached["offsets"])
+
+    table = load_label_table(path, delimiter=delimiter, n_columns=n_columns, categories=categories, cache_dir=None)
+    labels = FrameLabels.from_table(table, frame_column)
+
+    if cache_file is not None:
+        _save_cache(cache_file, table=labels.table, frame_ids=labels.frame_ids, offsets=labels.offsets)
+    return labels
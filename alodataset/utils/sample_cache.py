@@ -0,0 +1,272 @@
+"""Serialization of dataset samples and persistent on-disk cache of decoded samples.
+
+A serialized sample is made of a small pickled header (the payload schema of the sample, see
+:mod:`aloscene.utils.payload`, and the layout of its tensors) followed by the raw bytes of the tensors.
+In the cache, each sample is saved in its own file and loaded back through a memory map: the tensors are
+views on the mapped file, the pages being read from the disk (or the page cache) only when accessed.
+
+The cache has a size budget shared by all the datasets cached in the same directory. When the budget is
+exceeded, the least recently used samples are removed.
+"""
+import os
+import pickle
+import struct
+import uuid
+
+import numpy as np
+import torch
+import torchvision
+
+from aloscene import Frame
+from aloscene.utils.payload import to_payload, from_payload
+from aloscene.utils.payload import _AUGMENTED_TENSOR, _DICT, _LIST, _TUPLE
+
+# Alignment (in bytes) of each tensor in the sample file
+_ALIGNMENT = 64
+_HEADER_SIZE = struct.Struct("<Q")
+
+
+def _align(offset: int):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _encodable_frames(schema, frames: set):
+    """Find the tensor index of the RGB frames (with values between 0 and 255) of the payload schema"""
+    tag, node = schema
+    if tag == _AUGMENTED_TENSOR:
+        names = tuple(node["names"])
+        if issubclass(node["cls"], Frame) and node["properties"].get("normalization") == "255":
+            if names == ("C", "H", "W") or names == (None, None, None):
+                frames.add(node["tensor"])
+        for child in node["children"].values():
+            _encodable_frames(child, frames)
+    elif tag == _DICT:
+        for value in node.values():
+            _encodable_frames(value, frames)
+    elif tag in [_LIST, _TUPLE]:
+        for value in node:
+            _encodable_frames(value, frames)
+    return frames
+
+
+def _encode_image(tensor: torch.Tensor, image_format: str):
+    """Encode a (3, H, W) tensor with values between 0 and 255, or return None if it can not be encoded
+    without loss of precision (other than the jpeg compression).
+    """
+    if tensor.shape[0] != 3 or tensor.numel() == 0:
+        return None
+    image = tensor.round().clamp(0, 255).to(torch.uint8)
+    if image_format == "png" and not torch.equal(image.to(tensor.dtype), tensor):
+        return None
+    if image_format == "jpg":
+        return torchvision.io.encode_jpeg(image, quality=95)
+    elif image_format == "png":
+        return torchvision.io.encode_png(image)
+    raise Exception(f"Unknown image format: {image_format}. Should be one of (jpg, png)")
+
+
+def sample_to_bytes(data, image_format: str = None) -> bytes:
+    """Serialize a sample (any structure of augmented tensors): a pickled header (payload schema and tensors
+    layout) followed by the raw bytes of the tensors, each aligned on 64 bytes.
+
+    Parameters
+    ----------
+    data: AugmentedTensor | dict | list | tuple
+        Sample to serialize
+    image_format: str | None
+        If "jpg" or "png", the RGB frames (with the "255" normalization) are saved encoded in this format
+        instead of raw tensors. By default None.
+
+    Returns
+    -------
+    bytes
+    """
+    payload = to_payload(data)
+    tensors, encoded = [], {}
+    frames = _encodable_frames(payload["schema"], set()) if image_format is not None else set()
+    for idx, tensor in enumerate(payload["tensors"]):
+        tensor = tensor.detach().cpu()
+        if idx in frames:
+            encoded_image = _encode_image(tensor, image_format)
+            if encoded_image is not None:
+                encoded[idx] = str(tensor.dtype).replace("torch.", "")
+                tensor = encoded_image
+        tensors.append(tensor.reshape(-1).contiguous())
+
+    layout, offset = [], 0
+    for tensor, raw in zip(tensors, payload["tensors"]):
+        nbytes = tensor.numel() * tensor.element_size()
+        layout.append((str(tensor.dtype).replace("torch.", ""), tuple(raw.shape), offset, nbytes))
+        offset = _align(offset + nbytes)
+
+    header = pickle.dumps({"schema": payload["schema"], "layout": layout, "encoded": encoded})
+    data_offset = _align(_HEADER_SIZE.size + len(header))
+
+    buffer = bytearray(data_offset + offset)
+    buffer[: _HEADER_SIZE.size] = _HEADER_SIZE.pack(len(header))
+    buffer[_HEADER_SIZE.size : _HEADER_SIZE.size + len(header)] = header
+    for tensor, (_, _, tensor_offset, nbytes) in zip(tensors, layout):
+        if nbytes > 0:
+            start = data_offset + tensor_offset
+            buffer[start : start + nbytes] = tensor.view(torch.uint8).numpy().tobytes()
+    return bytes(buffer)
+
+
+def _read_header(prefix: bytes):
+    """Read the header of a serialized sample from its first bytes. Return the size of the header, the
+    header and the offset of the tensors data (None if the prefix is too small to contain the whole header).
+    """
+    (header_size,) = _HEADER_SIZE.unpack(prefix[: _HEADER_SIZE.size])
+    if len(prefix) < _HEADER_SIZE.size + header_size:
+        return header_size, None, None
+    header = pickle.loads(prefix[_HEADER_SIZE.size : _HEADER_SIZE.size + header_size])
+    return header_size, header, _align(_HEADER_SIZE.size + header_size)
+
+
+def _from_buffer(header: dict, buffer: torch.Tensor):
+    """Rebuild the sample from its header and the uint8 buffer of its tensors data"""
+    tensors = []
+    for idx, (dtype, shape, offset, nbytes) in enumerate(header["layout"]):
+        raw = buffer[offset : offset + nbytes] if nbytes > 0 else torch.empty(0, dtype=torch.uint8)
+        if idx in header.get("encoded", {}):
+            image = torchvision.io.decode_image(raw, torchvision.io.ImageReadMode.RGB)
+            tensors.append(image.to(getattr(torch, header["encoded"][idx])).view(shape))
+        else:
+            tensors.append(raw.view(getattr(torch, dtype)).view(shape))
+    return from_payload({"schema": header["schema"], "tensors": tensors})
+
+
+def sample_from_bytes(buffer: bytes):
+    """Rebuild a sample serialized with :func:`sample_to_bytes`. The tensors share the memory of `buffer`
+    (copied first if `buffer` is not writable).
+    """
+    _, header, data_offset = _read_header(buffer)
+    if not isinstance(buffer, bytearray):
+        buffer = bytearray(buffer)
+    data = buffer[data_offset:] if len(buffer) > data_offset else bytearray(1)
+    return _from_buffer(header, torch.frombuffer(data, dtype=torch.uint8))
+
+
+def save_sample(path: str, data, image_format: str = None):
+    """Save a sample (any structure of augmented tensors) into a memory mappable file. The file is
+    written atomically.
+
+    Parameters
+    ----------
+    path: str
+        Path of the sample file
+    data: AugmentedTensor | dict | list | tuple
+        Sample to save
+    image_format: str | None
+        Encode the RGB frames in this format, see :func:`sample_to_bytes`. By default None.
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(sample_to_bytes(data, image_format=image_format))
+    os.replace(tmp_path, path)
+
+
+def load_sample(path: str):
+    """Load a sample saved with :func:`save_sample`. The tensors are memory mapped (copy on write).
+
+    Parameters
+    ----------
+    path: str
+        Path of the sample file
+
+    Returns
+    -------
+    data: AugmentedTensor | dict | list | tuple
+    """
+    with open(path, "rb") as f:
+        header_size, _, _ = _read_header(f.read(_HEADER_SIZE.size))
+        f.seek(0)
+        _, header, data_offset = _read_header(f.read(_HEADER_SIZE.size + header_size))
+
+    if os.path.getsize(path) > data_offset:
+        buffer = torch.from_numpy(np.memmap(path, dtype=np.uint8, mode="c", offset=data_offset))
+    else:
+        buffer = torch.empty(0, dtype=torch.uint8)
+    return _from_buffer(header, buffer)
+
+
+class SampleCache(object):
+    """Cache of the samples of one dataset (for one configuration of the dataset) with a LRU eviction.
+
+    Parameters
+    ----------
+    cache_dir: str
+        Root directory of the cache. The size budget is shared by all the namespaces of this directory.
+    namespace: str
+        Sub directory of the cache where the samples of the dataset are saved (ex: dataset name and
+        configuration hash)
+    max_size: float
+        Size budget of the cache directory, in GB. By default 20.
+    """
+
+    EXTENSION = ".alosample"
+
+    def __init__(self, cache_dir: str, namespace: str, max_size: float = 20.0):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.directory = os.path.join(self.cache_dir, namespace)
+        self.max_size = int(max_size * 1e9)
+        # Estimation of the size of the cache directory, updated on each write and rescanned when
+        # the budget seems to be exceeded (other processes can write in the cache as well)
+        self._size = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, idx: int) -> str:
+        return os.path.join(self.directory, f"{idx}{self.EXTENSION}")
+
+    def get(self, idx: int):
+        """Load the sample `idx` from the cache, or return None if the sample is not cached"""
+        path = self.path(idx)
+        try:
+            data = load_sample(path)
+            os.utime(path)  # Mark as recently used
+        except (FileNotFoundError, EOFError):
+            # Not cached, or evicted by another process while loading
+            return None
+        return data
+
+    def put(self, idx: int, data):
+        """Save the sample `idx` into the cache, then evict the least recently used samples
+        if the size budget is exceeded.
+        """
+        path = self.path(idx)
+        save_sample(path, data)
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._files())
+        else:
+            self._size += os.path.getsize(path)
+        if self._size > self.max_size:
+            self._evict()
+
+    def _files(self):
+        """(mtime, path, size) of all the samples of the cache directory"""
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(self.EXTENSION):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        return files
+
+    def _evict(self):
+        """Remove the least recently used samples until the cache fits into the size budget"""
+        files = sorted(self._files())
+        size = sum(f[2] for f in files)
+        for _, path, file_size in files:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= file_size
+        self._size = size
@@ -371,7 +371,7 @@ class WaymoDataset(BaseDataset, SequenceMixin, SplitMixin):
             image_path = os.path.join(
                 self.dataset_dir, self.get_split_folder(), segment, "image" + camera_id, str(el).zfill(3) + ".jpg"
             )
-            image = torchvision.io.read_image(image_path)
+            image = self.load_sequence_image((segment, camera_id, el), torchvision.io.read_image, image_path)
             # Add the sequence dimension
             image = torch.unsqueeze(image, dim=0)
 
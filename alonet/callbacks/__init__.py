@@ -3,3 +3,4 @@ from .metrics_callback import MetricsCallback
 from .base_metrics_callback import InstancesBaseMetricsCallback
 from .map_metrics_callback import ApMetricsCallback
 from .pq_metrics_callback import PQMetricsCallback
+from .pipeline_profiler_callback import PipelineProfilerCallback
@@ -0,0 +1,46 @@
+import pytorch_lightning as pl
+
+from aloscene.utils.pipeline_profiler import PipelineProfiler
+
+
+class PipelineProfilerCallback(pl.Callback):
+    """Callback timing the stages of the data pipeline during the fit (loading of the samples, each
+    transformation, `batch_list`...), see :mod:`aloscene.utils.pipeline_profiler`.
+
+    At the end of each training epoch, the statistics of the epoch are appended to `epoch_stats` and the mean
+    time, the 90th percentile and the throughput of each stage are logged (`pipeline/<stage>/mean_ms`,
+    `pipeline/<stage>/p90_ms`, `pipeline/<stage>/mb_per_s`).
+
+    Parameters
+    ----------
+    log : bool
+        Log the statistics with the logger of the trainer, by default True
+    """
+
+    def __init__(self, log: bool = True):
+        self.profiler = PipelineProfiler()
+        self.log = log
+        self.epoch_stats = []
+        super().__init__()
+
+    def on_fit_start(self, trainer, pl_module):
+        # Started before the DataLoader workers are forked
+        self.profiler.start()
+
+    def on_fit_end(self, trainer, pl_module):
+        self.profiler.stop()
+
+    def on_exception(self, trainer, pl_module, exception):
+        self.profiler.stop()
+
+    def on_train_epoch_end(self, trainer, pl_module):
+        stats = self.profiler.stats()
+        self.profiler.reset()
+        self.epoch_stats.append(stats)
+        if not self.log or trainer.logger is None or not stats:
+            return
+        metrics = {}
+        for name, stage in stats.items():
+            for key in ["mean_ms", "p90_ms", "mb_per_s"]:
+                metrics[f"pipeline/{name}/{key}"] = stage[key]
+        trainer.logger.log_metrics(metrics, step=trainer.global_step)
@@ -4,6 +4,7 @@ import torch
 import alonet
 from typing import Union
 import aloscene
+from aloscene.utils.payload import to_device
 
 
 class BaseLightningModule(pl.LightningModule):
@@ -96,6 +97,24 @@ class BaseLightningModule(pl.LightningModule):
 
         return m_outputs
 
+    def transfer_batch_to_device(self, batch, device: torch.device, dataloader_idx: int):
+        """Move the batch to the device with one non-blocking copy per dtype, the host tensors of the whole frame
+        tree (boxes, labels, masks, flow, ...) being gathered into pinned buffers first.
+        Parameters
+        ----------
+        batch : Union[list, :mod:`Frames <aloscene.frame>`]
+            Batch given by the dataloader
+        device : torch.device
+            Target device
+        dataloader_idx : int
+            Index of the dataloader the batch comes from
+        Returns
+        -------
+        Union[list, :mod:`Frames <aloscene.frame>`]
+            Batch on the device
+        """
+        return to_device(batch, device)
+
     def inference(self, m_outputs: dict, frames: aloscene.Frame, **kwargs):
         """Given the model forward outputs, run inference.
         Parameters
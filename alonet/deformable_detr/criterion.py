@@ -121,10 +121,7 @@ class DeformableCriterion(DetrCriterion):
         pred_logits = outputs["pred_logits"]  # (b, nb_slots, nb_classes)
         idx = self._get_src_permutation_idx(indices)
         # Select the target labels in each batch and concat everything
-        target_classes_pos = torch.cat(
-            [boxes2d.labels.as_tensor()[indices[b][1]] for b, boxes2d in enumerate(frames.boxes2d)]
-        )
-        target_classes_pos = target_classes_pos.type(torch.long)
+        target_classes_pos = self._get_target_classes_pos(frames, indices, **kwargs)
         # target_classes (b, nb_slots)
         # positive slot is assigned with class id
         # negative slot is assigned with a virtual background class whose id is equal num_classes
@@ -154,7 +151,9 @@ class DeformableCriterion(DetrCriterion):
         return losses
 
     @torch.no_grad()
-    def get_metrics(self, outputs: dict, frames: aloscene.Frame, indices: list, num_boxes: torch.Tensor) -> dict:
+    def get_metrics(
+        self, outputs: dict, frames: aloscene.Frame, indices: list, num_boxes: torch.Tensor, **kwargs
+    ) -> dict:
         """Compute some usefull metrics related to the model performance
 
         Parameters
@@ -184,7 +183,7 @@ class DeformableCriterion(DetrCriterion):
         if "activation_fn" not in outputs:
             raise Exception("'activation_fn' must be declared in forward output.")
         if outputs["activation_fn"] == "softmax":
-            return super().get_metrics(outputs, frames, indices, num_boxes)
+            return super().get_metrics(outputs, frames, indices, num_boxes, **kwargs)
 
         threshold = 0.3
         metrics = {}
@@ -195,10 +194,7 @@ class DeformableCriterion(DetrCriterion):
         background_class = len(frames.boxes2d[0].labels.labels_names)
 
         # Select the target labels in each batch and concat everything
-        target_classes_pos = torch.cat(
-            [boxes2d.labels.as_tensor()[indices[b][1]] for b, boxes2d in enumerate(frames.boxes2d)]
-        )
-        target_classes_pos = target_classes_pos.type(torch.long)
+        target_classes_pos = self._get_target_classes_pos(frames, indices, **kwargs)
 
         # pred_classes (b, nb_slots)
         outs_probs = outputs["pred_logits"].sigmoid()
@@ -9,6 +9,7 @@ from torch import nn
 from alonet.multi_gpu import get_world_size, is_dist_avail_and_initialized
 import torch.nn.functional as F
 import aloscene
+from aloscene.utils import box_ops
 
 
 class DetrCriterion(nn.Module):
@@ -79,10 +80,7 @@ class DetrCriterion(nn.Module):
         num_classes = len(frames.boxes2d[0].labels.labels_names) + 1
 
         # Select the target labels in each batch and concat everything
-        target_classes_pos = torch.cat(
-            [boxes2d.labels.as_tensor()[indices[b][1]] for b, boxes2d in enumerate(frames.boxes2d)]
-        )
-        target_classes_pos = target_classes_pos.type(torch.long)
+        target_classes_pos = self._get_target_classes_pos(frames, indices, **kwargs)
 
         pred_logits = outputs["pred_logits"]
         idx = self._get_src_permutation_idx(indices)
@@ -126,28 +124,49 @@ class DetrCriterion(nn.Module):
             pred_boxes, boxes_format="xcyc", absolute=False, device=pred_boxes.device
         )
 
-        target_boxes = torch.cat(
-            [
-                # Convert to xcyc and relative pos (based on the imge size) ans select
-                # into the boxes per batch following the `target_indices` from the Hungarian matching
-                boxes2d.xcyc().rel_pos().as_tensor()[indices[b][1]]
-                for b, boxes2d in enumerate(frames.boxes2d)
-            ],
-            dim=0,
-        )
+        # Select the packed (xcyc, relative) boxes following the `target_indices` from the Hungarian matching
+        tgt_boxes = self._packed_targets(frames, **kwargs)
+        target_boxes = tgt_boxes.data.as_tensor()[tgt_boxes.flat_index([t_idx for _, t_idx in indices])]
         target_boxes = aloscene.BoundingBoxes2D(target_boxes, boxes_format="xcyc", absolute=False)
 
         # L1 loss
         loss_bbox = F.l1_loss(pred_boxes.as_tensor(), target_boxes.as_tensor(), reduction="none")
         losses["loss_bbox"] = loss_bbox.sum() / num_boxes
 
-        # Giou loss
-        giou = pred_boxes.giou_with(target_boxes)
-        loss_giou = 1 - torch.diag(giou)
+        # Giou loss, between each prediction and its matched target only
+        giou = box_ops.paired_box_giou(
+            box_ops.box_xyxy(pred_boxes.as_tensor(), "xcyc"), box_ops.box_xyxy(target_boxes.as_tensor(), "xcyc")
+        )
+        loss_giou = 1 - giou
         losses["loss_giou"] = loss_giou.sum() / num_boxes
 
         return losses
 
+    def pack_targets(self, frames: aloscene.Frame) -> aloscene.Ragged:
+        """Pack the target boxes2d of all the frames, in relative `xcyc` format and with their labels. The packed
+        boxes are computed once by :func:`forward` and shared by all the losses and metrics.
+
+        Parameters
+        ----------
+        frames : :mod:`Frames <aloscene.frame>`
+            Target frame with boxes2d and labels
+
+        Returns
+        -------
+        :mod:`Ragged <aloscene.tensors.ragged>`
+            Packed boxes of the batch
+        """
+        return aloscene.Ragged.from_list([boxes2d.xcyc().rel_pos() for boxes2d in frames.boxes2d])
+
+    def _packed_targets(self, frames: aloscene.Frame, tgt_boxes: aloscene.Ragged = None, **kwargs):
+        return self.pack_targets(frames) if tgt_boxes is None else tgt_boxes
+
+    def _get_target_classes_pos(self, frames: aloscene.Frame, indices: list, **kwargs):
+        """Select the target labels in each batch following the `target_indices` of the matching"""
+        tgt_boxes = self._packed_targets(frames, **kwargs)
+        target_classes_pos = tgt_boxes.data.labels.as_tensor()[tgt_boxes.flat_index([t_idx for _, t_idx in indices])]
+        return target_classes_pos.type(torch.long)
+
     def _get_src_permutation_idx(self, indices, **kwargs):
         # permute predictions following indices
         batch_idx = torch.cat([torch.full_like(src, i) for i, (src, _) in enumerate(indices)])
@@ -236,10 +255,7 @@ class DetrCriterion(nn.Module):
         background_class = len(frames.boxes2d[0].labels.labels_names)
 
         # Select the target labels in each batch and concat everything
-        target_classes_pos = torch.cat(
-            [boxes2d.labels.as_tensor()[indices[b][1]] for b, boxes2d in enumerate(frames.boxes2d)]
-        )
-        target_classes_pos = target_classes_pos.type(torch.long)
+        target_classes_pos = self._get_target_classes_pos(frames, indices, **kwargs)
 
         pred_classes = outputs["pred_logits"].argmax(-1)
         idx = self._get_src_permutation_idx(indices)
@@ -332,10 +348,7 @@ class DetrCriterion(nn.Module):
         background_class = len(frames.boxes2d[0].labels.labels_names)
 
         # Select the target labels in each batch and concat everything
-        target_classes_pos = torch.cat(
-            [boxes2d.labels.as_tensor()[indices[b][1]] for b, boxes2d in enumerate(frames.boxes2d)]
-        )
-        target_classes_pos = target_classes_pos.type(torch.long)
+        target_classes_pos = self._get_target_classes_pos(frames, indices, **kwargs)
         pred_classes = outputs["pred_logits"].argmax(-1)
         idx = self._get_src_permutation_idx(indices)
         target_classes = torch.full(
@@ -349,9 +362,7 @@ class DetrCriterion(nn.Module):
 
         # Scatter predicted objects size & Objects position
         pred_boxes = outputs["pred_boxes"]
-        target_boxes = torch.cat(
-            [boxes2d.xcyc().rel_pos().as_tensor() for b, boxes2d in enumerate(frames.boxes2d)], dim=0
-        )
+        target_boxes = self._packed_targets(frames, **kwargs).data.as_tensor()
 
         pred_boxes = pred_boxes[pred_classes != background_class]
         scatter_p_boxes_size = pred_boxes[:, 2:]
@@ -401,11 +412,15 @@ class DetrCriterion(nn.Module):
 
         outputs_without_aux = {k: v for k, v in m_outputs.items() if k != "aux_outputs"}
 
+        # Pack the targets once for the matcher, the losses and the metrics of all the stages
+        tgt_boxes = self.pack_targets(frames)
+        matcher_boxes = self.matcher.pack_targets(matcher_frames)
+
         # Retrieve the matching between the outputs of the last layer and the targets
-        indices = self.matcher(outputs_without_aux, matcher_frames, **kwargs)
+        indices = self.matcher(outputs_without_aux, matcher_frames, tgt_boxes=matcher_boxes, **kwargs)
 
         # Compute the average number of target boxes accross all nodes, for normalization purposes
-        num_boxes = sum(boxes2d.labels.shape[0] for boxes2d in frames.boxes2d)
+        num_boxes = len(tgt_boxes.data)
         num_boxes = torch.as_tensor([num_boxes], dtype=torch.float, device=next(iter(m_outputs.values())).device)
 
         if is_dist_avail_and_initialized():
@@ -415,17 +430,17 @@ class DetrCriterion(nn.Module):
         # Compute all the requested losses
         losses = {}
         for loss in self.losses:
-            losses.update(self.get_loss(loss, m_outputs, frames, indices, num_boxes))
+            losses.update(self.get_loss(loss, m_outputs, frames, indices, num_boxes, tgt_boxes=tgt_boxes))
 
-        metrics = self.get_metrics(m_outputs, frames, indices, num_boxes)
+        metrics = self.get_metrics(m_outputs, frames, indices, num_boxes, tgt_boxes=tgt_boxes)
         if compute_statistical_metrics:
-            metrics.update(self.get_statistical_metrics(m_outputs, frames, indices, num_boxes))
+            metrics.update(self.get_statistical_metrics(m_outputs, frames, indices, num_boxes, tgt_boxes=tgt_boxes))
 
         # In case of auxiliary losses, we repeat this process with the output of each intermediate layer.
         if "aux_outputs" in m_outputs:
             for i, aux_outputs in enumerate(m_outputs["aux_outputs"]):
 
-                indices = self.matcher(aux_outputs, matcher_frames, **kwargs)
+                indices = self.matcher(aux_outputs, matcher_frames, tgt_boxes=matcher_boxes, **kwargs)
 
                 for loss in self.losses:
                     if loss == "masks":
@@ -434,7 +449,9 @@ class DetrCriterion(nn.Module):
                     if loss == "labels":
                         # Logging is enabled only for the last layer
                         kwargs.update({"log": False})
-                    l_dict = self.get_loss(loss, aux_outputs, frames, indices, num_boxes, **kwargs)
+                    l_dict = self.get_loss(
+                        loss, aux_outputs, frames, indices, num_boxes, tgt_boxes=tgt_boxes, **kwargs
+                    )
                     l_dict = {k + f"_{i}": v for k, v in l_dict.items()}
 
                     losses.update(l_dict)
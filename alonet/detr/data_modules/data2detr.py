@@ -11,11 +11,13 @@ import torch
 from argparse import Namespace, ArgumentParser, _ArgumentGroup
 from typing import Optional
 
+import alodataset
 from alodataset import transforms as T  # , Split
 import pytorch_lightning as pl
 
 import alonet
 import aloscene
+from aloscene.utils.payload import to_device
 from torch.utils.data.sampler import RandomSampler, SequentialSampler
 
 
@@ -35,6 +37,9 @@ class Data2Detr(pl.LightningDataModule):
         If no augmentation (--no_augmentation) is used, --size can be used to resize all the frame.
     sample : bool, optional
         Use Sample instead of all dataset, by default False
+    aspect_ratio_sampler : bool, optional
+        Group the train frames of similar aspect ratios in the same batches
+        (see :class:`~alodataset.samplers.AspectRatioBucketSampler`), by default False
     args : Namespace, optional
         Attributes stored in specific Namespace, by default None
 
@@ -126,6 +131,12 @@ class Data2Detr(pl.LightningDataModule):
         parser.add_argument(
             "--sequential", action="store_true", help="Use sequential loading for train (Default: %(default)s)"
         )
+        parser.add_argument(
+            "--aspect_ratio_sampler",
+            action="store_true",
+            help="Group the train frames of similar aspect ratios in the same batches, to reduce the padding "
+            + "(Default: %(default)s)",
+        )
         return parent_parser
 
     def train_transform(self, frame: aloscene.Frame, same_on_sequence: bool = True, same_on_frames: bool = False):
@@ -213,6 +224,26 @@ class Data2Detr(pl.LightningDataModule):
         """
         raise Exception("This class must be inhert and set ``train_dataset`` and ``val_dataset`` class attributes")
 
+    def transfer_batch_to_device(self, batch, device: torch.device, dataloader_idx: int):
+        """Move the batch to the device with one non-blocking copy per dtype (see
+        :func:`aloscene.utils.payload.to_device`)
+
+        Parameters
+        ----------
+        batch : list
+            List of :mod:`~aloscene.frame` given by the dataloader
+        device : torch.device
+            Target device
+        dataloader_idx : int
+            Index of the dataloader the batch comes from
+
+        Returns
+        -------
+        list
+            List of :mod:`~aloscene.frame` on the device
+        """
+        return to_device(batch, device)
+
     def train_dataloader(self):
         """Get train dataloader
 
@@ -221,6 +252,13 @@ class Data2Detr(pl.LightningDataModule):
         torch.utils.data.DataLoader
             Dataloader for training process
         """
+        if self.aspect_ratio_sampler:
+            return self.train_dataset.train_loader(
+                batch_size=self.batch_size,
+                num_workers=self.num_workers,
+                sampler=alodataset.AspectRatioBucketSampler,
+                sampler_kwargs={"batch_size": self.batch_size, "shuffle": not self.sequential},
+            )
         return self.train_dataset.train_loader(
             batch_size=self.batch_size,
             num_workers=self.num_workers,
@@ -10,6 +10,7 @@ from torch import nn
 # from util.box_ops import box_cxcywh_to_xyxy, generalized_box_iou
 
 import aloscene
+from aloscene.utils import box_ops
 
 
 class DetrHungarianMatcher(nn.Module):
@@ -108,10 +109,10 @@ class DetrHungarianMatcher(nn.Module):
             Target boxes2d across the batch
         """
         out_bbox = m_outputs["pred_boxes"].flatten(0, 1)  # [batch_size * num_queries, 4]
-        out_bbox = aloscene.BoundingBoxes2D(out_bbox, absolute=False, boxes_format="xcyc", names=("N", None))
         assert tgt_boxes.boxes_format == "xcyc" and not tgt_boxes.absolute
         try:
-            cost_giou = -out_bbox.giou_with(tgt_boxes)
+            # Raw xyxy tensors, without intermediate BoundingBoxes2D
+            cost_giou = -box_ops.batched_box_giou(box_ops.box_xyxy(out_bbox, "xcyc"), tgt_boxes._xyxy_tensor())
         except Exception as e:
             print('m_outputs["pred_boxes"]', m_outputs["pred_boxes"])
             raise e
@@ -127,8 +128,24 @@ class DetrHungarianMatcher(nn.Module):
         ]
         return final_indices
 
+    def pack_targets(self, frames: aloscene.Frame) -> aloscene.Ragged:
+        """Pack the target boxes2d of all the frames in relative `xcyc` format, with their labels. The packed boxes
+        can be given to several matchings of the same targets (ex: auxiliary outputs).
+
+        Parameters
+        ----------
+        frames: aloscene.Frame
+            Target frame with a set of boxes2d with labels.
+
+        Returns
+        -------
+        :mod:`Ragged <aloscene.tensors.ragged>`
+            Packed boxes of the batch
+        """
+        return aloscene.Ragged.from_list([boxes.rel_pos().xcyc().remove_padding() for boxes in frames.boxes2d])
+
     @torch.no_grad()
-    def forward(self, m_outputs: dict, frames: aloscene.Frame, **kwargs):
+    def forward(self, m_outputs: dict, frames: aloscene.Frame, tgt_boxes: aloscene.Ragged = None, **kwargs):
         """Performs the matching
 
         Parameters
@@ -139,6 +156,8 @@ class DetrHungarianMatcher(nn.Module):
             "pred_boxes": Tensor of dim [batch_size, num_queries, 4] with the predicted box coordinates
         frames: aloscene.Frame
             Target frame with a set of boxes2d named : "gt_boxes_2d" with labels.
+        tgt_boxes: aloscene.Ragged, optional
+            Target boxes packed by :func:`pack_targets`. If None, the boxes of `frames` are packed.
 
         Returns
         -------
@@ -155,7 +174,11 @@ class DetrHungarianMatcher(nn.Module):
 
         bs, num_queries = m_outputs["pred_logits"].shape[:2]
 
-        tgt_boxes = torch.cat([boxes.rel_pos().xcyc().remove_padding() for boxes in frames.boxes2d], dim=0)
+        if tgt_boxes is None:
+            tgt_boxes = self.pack_targets(frames)
+        # Retrieve the number of target per batch
+        sizes = tgt_boxes.lengths.tolist()
+        tgt_boxes = tgt_boxes.data
 
         # No GT boxes
         if tgt_boxes.shape[0] == 0:
@@ -176,9 +199,6 @@ class DetrHungarianMatcher(nn.Module):
         # (batch, num_queries, total_targets)
         C = C.view(bs, num_queries, -1).cpu()
 
-        # Retrieve the number of target per batch
-        sizes = [boxes.labels.shape[0] for boxes in frames.boxes2d]
-
         # Retrieve the p_indices & t_indices for each batch
         batch_cost_matrix = [c[i] for i, c in enumerate(C.split(sizes, -1))]
 
@@ -124,6 +124,7 @@ class PanopticCriterion(nn.Module):
         """
         assert frames.names[0] == "B"
         assert frames.segmentation[0].labels is not None and frames.segmentation[0].labels.encoding == "id"
+        kwargs.pop("tgt_boxes", None)  # Packed target boxes (see DetrCriterion.forward), not used by the masks losses
 
         losses = {}
         if num_boxes == 0 or outputs["pred_masks"].numel() == 0:
@@ -146,8 +147,13 @@ class PanopticCriterion(nn.Module):
         for gt_masks, p_masks, m_filters, b_index in zip(
             frames.segmentation, outputs_masks, outputs["pred_masks_info"]["filters"], indices
         ):
+            t_index = b_index[1]
+            if isinstance(gt_masks, aloscene.RLEMask):
+                # Only the matched target masks are densified
+                gt_masks, t_index = gt_masks[t_index].to_mask(), torch.arange(len(t_index))
+            gt_masks = gt_masks.as_tensor()
             if not self.upscale_interpolate:
-                gt_masks = F.interpolate(torch.unsqueeze(gt_masks.as_tensor(), dim=0), size=o_shape, mode="bilinear", align_corners=False)[0]
+                gt_masks = F.interpolate(torch.unsqueeze(gt_masks, dim=0), size=o_shape, mode="bilinear", align_corners=False)[0]
 
             # Get pred_masks by indices matcher and append zero mask if it is necessary
             m_index = torch.where(m_filters)[0]
@@ -160,7 +166,7 @@ class PanopticCriterion(nn.Module):
                     pred_masks.append(zero_masks)
 
 
-            target_masks.append(gt_masks[b_index[1]])
+            target_masks.append(gt_masks[t_index])
 
         # Reshape for loss process
         pred_masks = torch.cat(pred_masks, dim=0).flatten(1)
@@ -186,9 +186,9 @@ class ApMetrics(object):
             predicted boxes
         t_bbox : :mod:`BoundingBoxes2D <aloscene.bounding_boxes_2d>`
             Target boxes with :mod:`~aloscene.labels` with the :attr:`labels_names` property set.
-        p_mask : :mod:`Mask <aloscene.mask>`
+        p_mask : :mod:`Mask <aloscene.mask>` | :mod:`RLEMask <aloscene.rle_mask>`
             Apply APmask metric
-        t_mask : :mod:`Mask <aloscene.mask>`
+        t_mask : :mod:`Mask <aloscene.mask>` | :mod:`RLEMask <aloscene.rle_mask>`
             Apply APmask metric
         """
         assert isinstance(p_bbox, aloscene.BoundingBoxes2D)
@@ -196,8 +196,8 @@ class ApMetrics(object):
         assert isinstance(p_bbox.labels, aloscene.Labels)
         assert isinstance(t_bbox.labels, aloscene.Labels)
         assert isinstance(p_bbox.labels.scores, torch.Tensor)
-        assert isinstance(p_mask, (type(None), aloscene.Mask))
-        assert isinstance(t_mask, (type(None), aloscene.Mask))
+        assert isinstance(p_mask, (type(None), aloscene.Mask, aloscene.RLEMask))
+        assert isinstance(t_mask, (type(None), aloscene.Mask, aloscene.RLEMask))
 
         p_bbox = p_bbox.to(torch.device("cpu"))
         p_labels = p_bbox.labels
@@ -148,9 +148,9 @@ class PQMetrics(object):
 
         Parameters
         ----------
-        p_mask : :mod:`Mask <aloscene.mask>`
+        p_mask : :mod:`Mask <aloscene.mask>` | :mod:`RLEMask <aloscene.rle_mask>`
             Predicted masks by network inference
-        t_mask : :mod:`Mask <aloscene.mask>`
+        t_mask : :mod:`Mask <aloscene.mask>` | :mod:`RLEMask <aloscene.rle_mask>`
             Target masks with labels and labels_names properties
 
         Raises
@@ -160,7 +160,8 @@ class PQMetrics(object):
             as well as must have labels attribute. Finally, :attr:`t_mask` must have two minimal labels:
             :attr:`category` and :attr:`isthing`
         """
-        assert isinstance(p_mask, aloscene.Mask) and isinstance(t_mask, aloscene.Mask)
+        assert isinstance(p_mask, (aloscene.Mask, aloscene.RLEMask))
+        assert isinstance(t_mask, (aloscene.Mask, aloscene.RLEMask))
         assert isinstance(p_mask.labels, aloscene.Labels) and isinstance(t_mask.labels, (dict, aloscene.Labels))
 
         p_mask = p_mask.to(torch.device("cpu"))
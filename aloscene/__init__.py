@@ -1,8 +1,9 @@
 ALOSCENE_ROOT = "/".join(__file__.split("/")[:-1])
-from . tensors import AugmentedTensor, SpatialAugmentedTensor
+from . tensors import AugmentedTensor, SpatialAugmentedTensor, LazyChild, Ragged
 from . labels import Labels
 from . camera_calib import CameraExtrinsic, CameraIntrinsic
 from . mask import Mask
+from . rle_mask import RLEMask
 from . flow import Flow
 from . depth import Depth
 from . points_2d import Points2D
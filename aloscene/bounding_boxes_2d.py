@@ -9,7 +9,9 @@ import cv2
 import aloscene
 from aloscene.renderer import View
 from aloscene.labels import Labels
-from torchvision.ops.boxes import nms
+from aloscene.utils import box_ops
+from aloscene.tensors.view_cache import cached_view
+from torchvision.ops.boxes import nms, batched_nms as class_aware_nms
 
 from aloscene.renderer import View, put_adapative_cv2_text
 
@@ -130,6 +132,7 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
         """
         self._append_child("labels", labels, name)
 
+    @cached_view
     def xcyc(self):
         """Get a new BoundingBoxes2D Tensor with boxes following this format:
         [x_center, y_center, width, height]. Could be relative value (betwen 0 and 1)
@@ -172,6 +175,7 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
         else:
             raise Exception(f"BoundingBoxes2D:Do not know mapping from {tensor.boxes_format} to xcyc")
 
+    @cached_view
     def xyxy(self):
         """Get a new BoundingBoxes2D Tensor with boxes following this format:
         [x1, y1, x2, y2]. Could be relative value (betwen 0 and 1)
@@ -211,6 +215,7 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
         else:
             raise Exception(f"BoundingBoxes2D:Do not know mapping from {tensor.boxes_format} to xyxy")
 
+    @cached_view
     def yxyx(self):
         """Get a new BoundingBoxes2D Tensor with boxes following this format:
         [y1, x1, y1, x1]. Could be relative value (betwen 0 and 1)
@@ -257,6 +262,7 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
         else:
             raise Exception(f"BoundingBoxes2D:Do not know mapping from {tensor.boxes_format} to yxyx")
 
+    @cached_view
     def abs_pos(self, frame_size):
         """Get a new BoundingBoxes2D Tensor with absolute position
         relative to the given `frame_size`.
@@ -311,6 +317,7 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
 
         return tensor
 
+    @cached_view
     def rel_pos(self):
         """Get a new BoundingBoxes2D Tensor with absolute position
         relative to the given `frame_size`.
@@ -520,6 +527,70 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
         # Return the view to display
         return View(frame, **kwargs)
 
+    def _xyxy_tensor(self, absolute: Union[bool, None] = None, frame_size: Union[tuple, None] = None) -> Tensor:
+        """Get the boxes as a raw `xyxy` tensor, without intermediate BoundingBoxes2D. The tensor shares the
+        memory of the boxes if they are already `xyxy` and in the desired position.
+        Parameters
+        ----------
+        absolute: bool | None
+            Convert the boxes to absolute (True) or relative (False) position. None to keep the current position.
+        frame_size: tuple | None
+            Frame size of the absolute position. By default, the current `frame_size`.
+        """
+        boxes = box_ops.box_xyxy(self._as_raw_tensor(), self.boxes_format)
+        absolute = self.absolute if absolute is None else absolute
+        frame_size = self.frame_size if frame_size is None else frame_size
+
+        if self.absolute and (not absolute or frame_size != self.frame_size):
+            H, W = self.frame_size
+            boxes = boxes / torch.tensor([W, H, W, H], dtype=boxes.dtype, device=boxes.device)
+        if absolute and (not self.absolute or frame_size != self.frame_size):
+            if frame_size is None:
+                raise Exception("Boxes are encoded as relative, the frame size must be given to get absolute boxes.")
+            H, W = frame_size
+            boxes = boxes * torch.tensor([W, H, W, H], dtype=boxes.dtype, device=boxes.device)
+        return boxes
+
+    @staticmethod
+    def pad_list(boxes_list: list, absolute: bool = False, frame_size: Union[tuple, None] = None):
+        """Pad a list of BoundingBoxes2D (one per frame) to a raw `xyxy` tensor of shape (B, N, 4), with N the
+        largest number of boxes, and a boolean validity mask of shape (B, N). The padded tensors are the inputs of
+        the batched kernels :meth:`batched_iou`, :meth:`batched_giou` and :meth:`batched_nms`.
+        Parameters
+        ----------
+        boxes_list: list of aloscene.BoundingBoxes2D
+            Boxes of each frame
+        absolute: bool
+            Pad the boxes in absolute (True) or relative (False) position
+        frame_size: tuple | None
+            Frame size of the absolute position. By default, the `frame_size` of each set of boxes.
+        Examples
+        --------
+        >>> boxes, mask = BoundingBoxes2D.pad_list(frames.boxes2d)
+        >>> iou = BoundingBoxes2D.batched_iou(boxes, boxes, mask, mask)
+        Returns
+        -------
+        boxes: torch.Tensor
+            `xyxy` boxes of shape (B, N, 4), the padded boxes being zeros
+        mask: torch.Tensor
+            Boolean mask of shape (B, N), True for the valid boxes
+        """
+        tensors = [boxes._xyxy_tensor(absolute, frame_size) for boxes in boxes_list]
+        n_boxes = max([len(tensor) for tensor in tensors], default=0)
+        device = tensors[0].device if len(tensors) > 0 else None
+        dtype = tensors[0].dtype if len(tensors) > 0 else None
+        padded = torch.zeros((len(tensors), n_boxes, 4), dtype=dtype, device=device)
+        mask = torch.zeros((len(tensors), n_boxes), dtype=torch.bool, device=device)
+        for b, tensor in enumerate(tensors):
+            padded[b, : len(tensor)] = tensor
+            mask[b, : len(tensor)] = True
+        return padded, mask
+
+    # Batched kernels on raw padded `xyxy` tensors, see :mod:`aloscene.utils.box_ops`
+    batched_iou = staticmethod(box_ops.batched_box_iou)
+    batched_giou = staticmethod(box_ops.batched_box_giou)
+    batched_nms = staticmethod(box_ops.batched_nms)
+
     def iou_with(self, boxes2, ret_union=False) -> torch.Tensor:
         """Compute the IOU between the two set of boxes
         Parameters
@@ -533,42 +604,9 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
         >>> # Compute the IOU between each pair of boxes of the current set
         >>> iou = boxes.iou_with(boxes)
         """
-        boxes1 = self
-
-        if boxes1.boxes_format != "xyxy":
-            boxes1 = boxes1.xyxy()
-        if boxes2.boxes_format != "xyxy":
-            boxes2 = boxes2.xyxy()
-        # TODO, should do a method that ensure two boxes are in the same format
-        # and convert the boxes automaticly
-        if boxes2.absolute != boxes1.absolute and boxes1.absolute:
-            boxes2 = boxes2.abs_pos(boxes1.frame_size)
-        elif boxes2.absolute != boxes1.absolute and not boxes1.absolute:
-            boxes2 = boxes2.rel_pos()
-
-        assert boxes1.boxes_format == boxes2.boxes_format
-        assert boxes1.absolute == boxes2.absolute
-
-        area1 = boxes1.area()
-        area2 = boxes2.area()
-
-        boxes1 = boxes1.as_tensor()
-        boxes2 = boxes2.as_tensor()
-
-        lt = torch.max(boxes1[:, None, :2], boxes2[:, :2])  # [N,M,2]
-        rb = torch.min(boxes1[:, None, 2:], boxes2[:, 2:])  # [N,M,2]
-
-        wh = (rb - lt).clamp(min=0)  # [N,M,2]
-        inter = wh[:, :, 0] * wh[:, :, 1]  # [N,M]
-
-        union = area1[:, None] + area2 - inter
-
-        iou = inter / union
-
-        if ret_union:
-            return iou, union
-        else:
-            return iou
+        boxes1 = self._xyxy_tensor()
+        boxes2 = boxes2._xyxy_tensor(self.absolute, self.frame_size)
+        return box_ops.batched_box_iou(boxes1, boxes2, ret_union=ret_union)
 
     def giou_with(self, boxes2) -> torch.Tensor:
         """
@@ -587,45 +625,17 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
         >>> # Compute the GIOU between each pair of boxes of the current set
         >>> giou = boxes.giou_with(boxes)
         """
-        boxes1 = self
-        if boxes1.boxes_format != "xyxy":
-            boxes1 = boxes1.xyxy()
-        if boxes2.boxes_format != "xyxy":
-            boxes2 = boxes2.xyxy()
-
-        if boxes2.absolute != boxes1.absolute and boxes1.absolute:
-            boxes2 = boxes2.abs_pos()
-        elif boxes2.absolute != boxes1.absolute and not boxes1.absolute:
-            boxes2 = boxes2.rel_pos()
-
-        assert boxes1.boxes_format == boxes2.boxes_format
-        assert boxes1.absolute == boxes2.absolute
+        boxes1 = self._xyxy_tensor()
+        boxes2 = boxes2._xyxy_tensor(self.absolute, self.frame_size)
 
         # degenerate boxes gives inf / nan results
         # so do an early check
-        try:
-            assert (boxes1.as_tensor()[:, 2:] >= boxes1.as_tensor()[:, :2]).all(), f"{boxes1.as_tensor()}"
-            assert (boxes2.as_tensor()[:, 2:] >= boxes2.as_tensor()[:, :2]).all(), f"{boxes2.as_tensor()}"
-        except:
-            print("boxes1", boxes1)
-            print("boxes2", boxes2)
-            assert (boxes1.as_tensor()[:, 2:] >= boxes1.as_tensor()[:, :2]).all(), f"{boxes1.as_tensor()}"
-            assert (boxes2.as_tensor()[:, 2:] >= boxes2.as_tensor()[:, :2]).all(), f"{boxes2.as_tensor()}"
-
-        iou, union = boxes1.iou_with(boxes2, ret_union=True)
-
-        boxes1 = boxes1.as_tensor()
-        boxes2 = boxes2.as_tensor()
-
-        lt = torch.min(boxes1[:, None, :2], boxes2[:, :2])  # left top corner
-        rb = torch.max(boxes1[:, None, 2:], boxes2[:, 2:])  # right bottom corner
-
-        wh = (rb - lt).clamp(min=0)  # [N,M,2]
-        area = wh[:, :, 0] * wh[:, :, 1]
+        assert (boxes1[:, 2:] >= boxes1[:, :2]).all(), f"{boxes1}"
+        assert (boxes2[:, 2:] >= boxes2[:, :2]).all(), f"{boxes2}"
 
-        return iou - (area - union) / area
+        return box_ops.batched_box_giou(boxes1, boxes2)
 
-    def nms(self, scores: torch.Tensor, iou_threshold: float = 0.5) -> torch.Tensor:
+    def nms(self, scores: torch.Tensor, iou_threshold: float = 0.5, labels: torch.Tensor = None) -> torch.Tensor:
         """Perform NMS on the set of boxes. To be performed, the boxes one must passed
         a `scores` tensor.
         Parameters
@@ -634,6 +644,8 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
             Scores of each boxes to perform the NMS computation.
         iou_threshold: float
             NMS iou threshold
+        labels: torch.Tensor | None
+            Integer label of each box. If given, the boxes only suppress the boxes of the same label.
         Examples
         --------
         >>> # indices kept by the NMS
@@ -643,8 +655,10 @@ class BoundingBoxes2D(aloscene.tensors.AugmentedTensor):
             int64 tensor
             The indices of the elements that have been kept by NMS, sorted in decreasing order of scores
         """
-        nms_boxes = self.xyxy()
-        return nms(nms_boxes.as_tensor(), scores, iou_threshold)
+        nms_boxes = self._xyxy_tensor()
+        if labels is not None:
+            return class_aware_nms(nms_boxes, scores, labels, iou_threshold)
+        return nms(nms_boxes, scores, iou_threshold)
 
     def _hflip(self, **kwargs):
         """Flip boxes horizontally"""
@@ -49,6 +49,9 @@ class Depth(aloscene.tensors.SpatialAugmentedTensor):
         if isinstance(x, str):
             x = load_depth(x)
             names = ("C", "H", "W")
+            # The loaded depth is not shared (or is a copy-on-write view of a ground truth pack). The other dtypes
+            # are converted to float32 by the copy.
+            kwargs["zero_copy"] = x.dtype == np.float32
         tensor = super().__new__(cls, x, *args, names=names, **kwargs)
         tensor.add_child("occlusion", occlusion, align_dim=["B", "T"], mergeable=True)
         tensor.add_property("scale", scale)
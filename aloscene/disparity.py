@@ -42,12 +42,14 @@ class Disparity(aloscene.tensors.SpatialAugmentedTensor):
         if isinstance(x, str):
             x = load_disp(x, png_negate)
             names = ("C", "H", "W")
+            # The loaded disparity is not shared (or is a copy-on-write view of a ground truth pack)
+            kwargs["zero_copy"] = True
 
         tensor = super().__new__(cls, x, *args, names=names, **kwargs)
         tensor.add_child("occlusion", occlusion, align_dim=["B", "T"], mergeable=True)
         tensor.add_property("disp_format", disp_format)
 
-        if tensor.disp_format == "unsigned" and (tensor.as_tensor() < 0).any():
+        if tensor.disp_format == "unsigned" and (tensor.rename(None) < 0).any():
             raise ValueError("All disparity values should be positive for disp_format='unsigned'")
         if tensor.disp_format == "signed" and tensor.camera_side is None:
             raise ValueError("camera_side is needed for signed disparity")
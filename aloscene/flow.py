@@ -23,6 +23,8 @@ class Flow(aloscene.tensors.SpatialAugmentedTensor):
             # load flow from path
             x = load_flow(x)
             names = ("C", "H", "W")
+            # The loaded flow is not shared (or is a copy-on-write view of a ground truth pack): no need to copy it
+            kwargs["zero_copy"] = True
         tensor = super().__new__(cls, x, *args, names=names, **kwargs)
         tensor.add_child("occlusion", occlusion, align_dim=["B", "T"], mergeable=True)
         return tensor
@@ -60,6 +60,17 @@ class Frame(aloscene.tensors.SpatialAugmentedTensor):
     mean_std: tuple
         Tuple with the mean and std of the tensor. (mean, std).
         Example: ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225)))
+    zero_copy: bool
+        If True, the frame is built on top of the given tensor or numpy array without any copy. The frame then
+        shares the memory (and the dtype) of `x`. False by default.
+    dtype: torch.dtype
+        dtype of the frame loaded from an image path, float32 by default. With `torch.uint8`, the frame keeps
+        the decoded pixels (4 times smaller) with the "255" normalization: flip, crop, pad, resize and batching
+        keep the uint8 storage, the conversion to float being fused with the normalization
+        (`norm01`, `norm_resnet`, `mean_std_norm`...).
+    decode_size: tuple
+        Minimum size (H, W) of the frame loaded from an image path. If set, JPEG images are decoded at a reduced
+        scale (1/2, 1/4 or 1/8) when the result is still larger than this size. None by default (full resolution).
 
 
     Notes
@@ -86,6 +97,10 @@ class Frame(aloscene.tensors.SpatialAugmentedTensor):
     >>> # Creating a frame from a numpy array or tensor
     >>> data = np.zeros((1, 3, 256, 512))
     >>> frame = aloscene.Frame(data, normalization="01", names=("B", "C", "H", "W"))
+    >>>
+    >>> # Keeping the uint8 pixels until the normalization (on the target device)
+    >>> frame = aloscene.Frame("path/to/frame.jpg", dtype=torch.uint8)
+    >>> frame = frame.to("cuda").norm_resnet()
     """
 
     @staticmethod
@@ -104,14 +119,18 @@ class Frame(aloscene.tensors.SpatialAugmentedTensor):
         normalization="255",
         mean_std=None,
         names=("C", "H", "W"),
+        dtype=torch.float32,
+        decode_size=None,
         *args,
         **kwargs,
     ):
         if isinstance(x, str):
             # Load frame from path
-            x = load_image(x)
+            x = load_image(x, dtype=dtype, decode_size=decode_size)
             normalization = "255"
             names = ("C", "H", "W")
+            # The loaded image is not shared: no need to copy it
+            kwargs["zero_copy"] = True
 
         tensor = super().__new__(cls, x, *args, names=names, **kwargs)
 
@@ -444,6 +463,7 @@ class Frame(aloscene.tensors.SpatialAugmentedTensor):
     def norm255(self) -> Frame:
         """Normnalize the tensor from the current tensor
         normalization to values between 0 and 255
+        (a uint8 frame is kept in uint8)
 
         Examples
         --------
@@ -516,9 +536,13 @@ class Frame(aloscene.tensors.SpatialAugmentedTensor):
             tensor = tensor - mean_tensor
             tensor = tensor / std_tensor
         elif tensor.normalization == "255":
-            tensor = tensor.div(255)
-            tensor = tensor - mean_tensor
-            tensor = tensor / std_tensor
+            # (x / 255 - mean) / std with a single allocation (uint8 frames are converted on the fly)
+            scale, shift = 1.0 / (255.0 * std_tensor), -mean_tensor / std_tensor
+            if tensor.is_floating_point():
+                tensor = tensor.mul(scale)
+            else:
+                tensor = tensor.to(torch.float32).mul_(scale)
+            tensor = tensor.add_(shift)
         elif tensor.normalization == "minmax_sym":
             tensor = (tensor + 1.0) / 2.0
             tensor = tensor - mean_tensor
@@ -554,6 +578,19 @@ class Frame(aloscene.tensors.SpatialAugmentedTensor):
         view = View(frame, title=title)
         return view
 
+    def _pad_fill_value(self):
+        """Value of the padded area based on the frame normalization (see `batch_list`)"""
+        pad_values = {"01": 0, "255": 0, "minmax_sym": -1}
+        if self.normalization in pad_values:
+            return pad_values[self.normalization]
+        elif self.mean_std is not None:
+            mean_tensor, std_tensor = self._get_mean_std_tensor(
+                self.shape, self.names, self.mean_std, device=self.device
+            )
+            return -mean_tensor / std_tensor
+        else:
+            raise Exception("This normalziation {} is not handle by the frame _pad method".format(self.normalization))
+
     def _pad(self, offset_y: tuple, offset_x: tuple, **kwargs):
         """Pad the based on the given offset
 
@@ -1,7 +1,9 @@
 import numpy as np
 
+from aloscene.io.gt_pack import read_packed
 
-def load_depth(path):
+
+def load_depth(path, packed=True):
     """
     Load Depth data
 
@@ -11,9 +13,13 @@ def load_depth(path):
         path to the disparity file. Supported format: {".npy"}. If your file is stored differently, as an
         alternative, you can open the file yourself and then create the Depth augmented Tensor from the depth
         data.
+    packed: bool
+        read the depth from the ground truth pack of the directory if it contains the file
+        (see :mod:`aloscene.io.gt_pack`). Default is True
     """
     if path.endswith(".npy"):
-        return np.load(path)
+        depth = read_packed(path) if packed else None
+        return np.load(path) if depth is None else depth
     else:
         raise ValueError(
             f"Unknown extension for depth file: {path}. As an alternative you can load the file manually\
@@ -3,6 +3,8 @@ import numpy as np
 import torch
 import re
 
+from aloscene.io.gt_pack import read_packed
+
 
 def load_pfm_np(path, flip=True, clean=False):
     with open(path, "rb") as file:
@@ -47,7 +49,7 @@ def load_pfm_np(path, flip=True, clean=False):
     return np.squeeze(data, axis=-1) if color and data.shape[-1] == 1 else data
 
 
-def load_disp_pfm(path, flip=True, clean=False):
+def load_disp_pfm(path, flip=True, clean=False, packed=True):
     """
     Loads disparity as a torch.Tensor
 
@@ -57,16 +59,24 @@ def load_disp_pfm(path, flip=True, clean=False):
         flip the vertical axis. Default is True
     clean : bool
         changes nan and extreme values to zero. Default is False
-    add_temporal :
-        adds a temporal dimension as first channel.
+    packed : bool
+        read the disparity from the ground truth pack of the directory if it contains the file
+        (see :mod:`aloscene.io.gt_pack`). Default is True
 
     Returns
     -------
     disp : torch.Tensor
         disparity map
     """
+    # The packs store the flipped disparity
+    disp_np = read_packed(path) if packed and flip else None
+    if disp_np is not None:
+        if clean:
+            disp_np[(disp_np < -1e30) | (disp_np > 1e30)] = 0.0
+        return torch.from_numpy(disp_np)
+
     disp_np = load_pfm_np(path, flip, clean)
-    disp_np = disp_np.transpose([2, 0, 1]).astype(np.float32)  # pytorch convention : C, H, W
+    disp_np = np.ascontiguousarray(disp_np.transpose([2, 0, 1]), dtype=np.float32)  # pytorch convention : C, H, W
     disp = torch.from_numpy(disp_np)
     return disp
 
@@ -85,7 +95,7 @@ def load_disp_png(path, decoding="rgb", scale=256.0, negate=False):
     if negate:
         disp = -1 * disp
     # from numpy to pytorch
-    disp = disp.transpose([2, 0, 1]).astype(np.float32)
+    disp = np.ascontiguousarray(disp.transpose([2, 0, 1]), dtype=np.float32)
     disp = torch.from_numpy(disp)
     return disp
 
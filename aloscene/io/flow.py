@@ -1,8 +1,10 @@
 import numpy as np
 import torch
 
+from aloscene.io.gt_pack import read_packed
 
-def load_flow_flo(flo_path):
+
+def load_flow_flo(flo_path, packed=True):
     """
     Load a 2D flow map with pytorch in float32 format
 
@@ -10,14 +12,19 @@ def load_flow_flo(flo_path):
     ----------
     flo_path : str
         path of the ".flo" file
-    add_temporal : bool, default=True
-        add a first dimension for time
+    packed : bool, default=True
+        read the flow from the ground truth pack of the directory if it contains the file
+        (see :mod:`aloscene.io.gt_pack`)
 
     Returns
     -------
     flow : torch.Tensor
         tensor containing the flow map
     """
+    if packed:
+        flow = read_packed(flo_path)
+        if flow is not None:
+            return torch.from_numpy(flow)
     with open(flo_path, "rb") as f:
         header = f.read(4)
         if header.decode("utf-8") != "PIEH":
@@ -25,7 +32,7 @@ def load_flow_flo(flo_path):
         width = np.fromfile(f, np.int32, 1).squeeze()
         height = np.fromfile(f, np.int32, 1).squeeze()
         flow = np.fromfile(f, np.float32, width * height * 2).reshape((height, width, 2))
-    flow = flow.transpose([2, 0, 1])  # pytorch convention : C, H, W
+    flow = np.ascontiguousarray(flow.transpose([2, 0, 1]))  # pytorch convention : C, H, W
     flow = torch.from_numpy(flow)
     return flow
 
@@ -44,5 +51,8 @@ def load_scene_flow(path: str) -> np.ndarray:
         raise ValueError(
             f"Scene flow file should be of type .npy, but {path} has the extension .{path.split('.')[-1]}"
         )
+    packed = read_packed(path)
+    if packed is not None:
+        return packed
     with open(path, "rb") as file:
         return np.load(file)
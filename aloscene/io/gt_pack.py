@@ -0,0 +1,148 @@
+"""Memory-mapped container of the dense ground truth (flow, disparity, depth) of a directory.
+
+The ground truth files of a directory (`.flo`, `.pfm`, `.npy`) are decoded once and written into a single
+`gt.alopack` file in the same directory: the arrays are stored contiguous, in the layout returned by the
+readers of :mod:`aloscene.io` (C, H, W for the flows and disparities), and aligned on 64 bytes. The readers
+(:func:`~aloscene.io.flow.load_flow_flo`, :func:`~aloscene.io.disparity.load_disp_pfm`,
+:func:`~aloscene.io.depth.load_depth`) look for the pack of the directory and, if it contains the file,
+return a zero-copy view on the memory-mapped pack instead of parsing the file.
+
+The float arrays can optionally be stored in float16: half the size on disk and in the page cache, but lossy
+(~3 significant digits) and converted back to their original dtype when read (one copy). Use it when the reads
+are IO bound (network storage, dataset larger than the RAM).
+
+File layout: magic, arrays (64 bytes aligned), json header (name, offset, shape, dtype of each array),
+header size (uint64) and magic.
+"""
+import json
+import os
+
+import numpy as np
+import torch
+
+PACK_FILE = "gt.alopack"
+PACK_EXTENSIONS = (".flo", ".pfm", ".npy")
+_MAGIC = b"ALOPACK1"
+_ALIGN = 64
+_TORCH_DTYPES = {np.dtype(np.float32).str: torch.float32, np.dtype(np.float64).str: torch.float64}
+
+# Opened packs, by directory (None if the directory has no pack)
+_PACKS = {}
+
+
+class GtPack(object):
+    """Read-only, memory-mapped ground truth pack
+
+    Parameters
+    ----------
+    path : str
+        Path of the pack file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Copy-on-write mapping: the returned arrays are writable (and can be shared with torch without copy)
+        # but the modifications are never written back to the file
+        self._data = np.memmap(path, dtype=np.uint8, mode="c")
+        footer = self._data[-16:].tobytes()
+        if footer[8:] != _MAGIC or self._data[: len(_MAGIC)].tobytes() != _MAGIC:
+            raise Exception(f"{path} is not a ground truth pack")
+        header_size = int(np.frombuffer(footer[:8], dtype=np.uint64)[0])
+        self.entries = json.loads(self._data[-16 - header_size : -16].tobytes())
+
+    def __contains__(self, name: str):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, name: str) -> np.ndarray:
+        """Array of the file `name`, as returned by the reader of its format. The arrays stored in float16
+        are converted back to their original dtype, the other arrays are views on the pack."""
+        entry = self.entries[name]
+        dtype = np.dtype(entry["dtype"])
+        array = np.ndarray(entry["shape"], dtype=dtype, buffer=self._data, offset=entry["offset"])
+        if "source_dtype" in entry:
+            # Faster than numpy to convert from float16
+            array = torch.from_numpy(array).to(_TORCH_DTYPES[entry["source_dtype"]]).numpy()
+        return array
+
+
+def open_pack(directory: str):
+    """Pack of a directory (opened once per process), or None if the directory has no pack"""
+    if directory not in _PACKS:
+        path = os.path.join(directory, PACK_FILE)
+        _PACKS[directory] = GtPack(path) if os.path.exists(path) else None
+    return _PACKS[directory]
+
+
+def read_packed(path: str):
+    """Array of the ground truth file `path` read from the pack of its directory, or None if the file
+    is not packed"""
+    directory, name = os.path.split(os.path.abspath(path))
+    pack = open_pack(directory)
+    if pack is None or name not in pack:
+        return None
+    return pack.get(name)
+
+
+def _read_unpacked(path: str) -> np.ndarray:
+    """Decode a ground truth file with the reader of its format"""
+    # Imported here: the readers import this module
+    from aloscene.io.depth import load_depth
+    from aloscene.io.disparity import load_disp_pfm
+    from aloscene.io.flow import load_flow_flo
+
+    if path.endswith(".flo"):
+        return load_flow_flo(path, packed=False).numpy()
+    elif path.endswith(".pfm"):
+        return load_disp_pfm(path, packed=False).numpy()
+    elif path.endswith(".npy"):
+        return load_depth(path, packed=False)
+    raise ValueError(f"Unknown extension for ground truth file: {path}")
+
+
+def pack_directory(directory: str, float16: bool = False, extensions: tuple = PACK_EXTENSIONS):
+    """Pack the ground truth files of a directory into `<directory>/gt.alopack`. The original files are kept.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the ground truth files (not recursive)
+    float16 : bool
+        Store the float arrays in float16, by default False. Lossy.
+    extensions : tuple
+        Extensions of the files to pack, by default (".flo", ".pfm", ".npy")
+
+    Returns
+    -------
+    n_files: int
+        Number of packed files
+    """
+    directory = os.path.abspath(directory)
+    names = sorted(name for name in os.listdir(directory) if name.endswith(tuple(extensions)))
+    if len(names) == 0:
+        return 0
+
+    path = os.path.join(directory, PACK_FILE)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    entries = {}
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC)
+        for name in names:
+            array = np.ascontiguousarray(_read_unpacked(os.path.join(directory, name)))
+            entry = {}
+            if float16 and array.dtype in (np.float32, np.float64):
+                entry["source_dtype"] = array.dtype.str
+                array = array.astype(np.float16)
+            offset = -(-f.tell() // _ALIGN) * _ALIGN
+            f.write(b"\0" * (offset - f.tell()))
+            array.tofile(f)
+            entries[name] = dict(entry, offset=offset, shape=list(array.shape), dtype=array.dtype.str)
+        header = json.dumps(entries, separators=(",", ":")).encode()
+        f.write(header)
+        f.write(np.array([len(header)], dtype=np.uint64).tobytes())
+        f.write(_MAGIC)
+    os.replace(tmp_path, path)
+    _PACKS.pop(directory, None)
+    return len(names)
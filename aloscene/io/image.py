@@ -4,10 +4,41 @@ import cv2
 import torch
 import torchvision
 import numpy as np
+from PIL import Image
 from torchvision.io.image import ImageReadMode
 
 
-def load_image(image_path):
+def load_image_reduced(image_path, decode_size):
+    """
+    Decode a JPEG image at the smallest scale (1, 1/2, 1/4 or 1/8, in the DCT domain) whose size is still
+    larger than or equal to `decode_size`. The reduced decoding skips most of the decoding work.
+
+    Parameters
+    ----------
+    image_path : str
+        path of the image
+    decode_size : tuple
+        minimum size (H, W) of the decoded image
+
+    Returns
+    -------
+    image : torch.Tensor | None
+        uint8 tensor (3, H, W) containing the image, or None if the image is not a JPEG image or is too small
+        to be decoded at a reduced scale
+    """
+    with Image.open(image_path) as image:
+        if image.format != "JPEG":
+            return None
+        full_size = image.size
+        # draft keeps a size larger than or equal to the requested (W, H) size
+        image.draft("RGB", (decode_size[1], decode_size[0]))
+        if image.size == full_size:
+            return None
+        image = np.asarray(image if image.mode == "RGB" else image.convert("RGB"))
+    return torch.from_numpy(np.ascontiguousarray(image.transpose(2, 0, 1)))
+
+
+def load_image(image_path, dtype=torch.float32, decode_size=None):
     """
     Load an image with pytorch in float32 format
 
@@ -15,20 +46,33 @@ def load_image(image_path):
     ----------
     image_path : str
         path of the image
+    dtype : torch.dtype
+        dtype of the returned tensor, float32 by default. With uint8, the decoded pixels are returned without
+        any conversion (4 times smaller).
+    decode_size : tuple, optional
+        If set, minimum size (H, W) of the returned image: JPEG images are decoded at a reduced scale if they
+        are at least twice as large (see :func:`load_image_reduced`). None by default (full resolution).
 
     Returns
     -------
     image : torch.Tensor
         tensor containing the image
     """
+    if decode_size is not None:
+        try:
+            image = load_image_reduced(image_path, decode_size)
+        except OSError as e:
+            raise InvalidSampleError(f"[Alodataset Warning] Invalid image: {image_path} error={e}")
+        if image is not None:
+            return image.type(dtype)
     try:
-        image = torchvision.io.read_image(image_path, ImageReadMode.RGB).type(torch.float32)
+        image = torchvision.io.read_image(image_path, ImageReadMode.RGB).type(dtype)
     except RuntimeError as e:
         try:
             image = cv2.imread(image_path)
             image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             image = np.moveaxis(image, 2, 0)
-            image = torch.Tensor(image).type(torch.float32)
+            image = torch.from_numpy(image).type(dtype).contiguous()
         except RuntimeError as e:
             raise InvalidSampleError(f"[Alodataset Warning] Invalid image: {image_path} error={e}")
     return image
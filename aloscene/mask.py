@@ -10,6 +10,7 @@ import aloscene
 from aloscene.renderer import View
 from aloscene.io.mask import load_mask
 from aloscene.labels import Labels
+from aloscene.utils.mask_ops import masks_centroids, masks_to_id_map
 
 
 class Mask(aloscene.tensors.SpatialAugmentedTensor):
@@ -53,7 +54,7 @@ class Mask(aloscene.tensors.SpatialAugmentedTensor):
 
         Parameters
         ----------
-        mask2 : :mod:`Mask <aloscene.mask>`
+        mask2 : :mod:`Mask <aloscene.mask>` | :mod:`RLEMask <aloscene.rle_mask>`
             Masks with size (M,H,W)
 
         Returns
@@ -66,6 +67,8 @@ class Mask(aloscene.tensors.SpatialAugmentedTensor):
         Exception
             Features size (H,W) between masks have to be the same
         """
+        if isinstance(mask2, aloscene.RLEMask):
+            return aloscene.RLEMask.from_mask(self).iou_with(mask2)
         if len(self) == 0 and len(mask2) == 0:
             return torch.rand(0, 0)
         elif len(self) == 0:
@@ -180,34 +183,27 @@ class Mask(aloscene.tensors.SpatialAugmentedTensor):
         from alodataset.utils.panoptic_utils import VOID_CLASS_ID
 
         assert self.names[0] != "T" and self.names[1] != "B"
-        frame = self.cpu().rename(None).permute([1, 2, 0]).detach().contiguous().numpy()
 
         # Try to retrieve the associated label ID (if any)
         labels = self._get_set_children(labels_set=labels_set)
+        if not (hasattr(self, "labels") and self.labels is not None and len(labels) > 0):
+            frame = self.cpu().rename(None).permute([1, 2, 0]).detach().contiguous().numpy()
+            return (frame, []) if return_ann else frame
+        assert len(labels) == len(self)  # Required to make panoptic view
+
+        # One mask by ID, with the BG class ID=VOID. Categories ID are remapped with a lookup table
+        masks = self._as_raw_tensor().detach()
+        masks = masks.to(torch.uint8) if masks.dtype == torch.bool else masks
+        has_ids = isinstance(labels, aloscene.Labels)
+        categories = labels.as_tensor().to(masks.device) if return_cats and has_ids else None
+        frame = masks_to_id_map(masks, categories=categories, void_id=VOID_CLASS_ID).cpu().numpy()
+
         annotations = []
-        if hasattr(self, "labels") and self.labels is not None and len(labels) > 0:
-            assert len(labels) == len(self)  # Required to make panoptic view
-
-            frame = np.concatenate([np.zeros_like(frame[..., [0]]), frame], axis=-1)  # Add BG class with ID=VOID
-            frame = np.argmax(frame, axis=-1).astype("int") + VOID_CLASS_ID  # Get one mask by ID
-            copy_frame = frame.copy()
-
-            for i, label in enumerate(labels):  # Add ID in text and use same color by object ID
-                # Change ID if labels are defined
-                if label is not None:
-                    label = int(label)
-
-                    if return_cats:
-                        frame[copy_frame == (i + VOID_CLASS_ID + 1)] = label
-
-                    if return_ann:
-                        feat = self[i].cpu().detach().contiguous().numpy()  # Get i_mask
-                        mass_y, mass_x = np.where(feat > 0.5)
-                        x, y = np.average(mass_x), np.average(mass_y)
-                        x = 0 if np.isnan(x) else x
-                        y = 0 if np.isnan(y) else y
-                        text = str(label) if labels.labels_names is None else labels.labels_names[label]
-                        annotations.append({"color": (0, 0, 0), "x": int(x), "y": int(y), "text": text})
+        if return_ann and has_ids:  # Add ID in text at the center of mass of each object
+            _, centroids = masks_centroids(masks)
+            for label, (x, y) in zip(labels.as_tensor().long().tolist(), centroids.tolist()):
+                text = str(label) if labels.labels_names is None else labels.labels_names[label]
+                annotations.append({"color": (0, 0, 0), "x": int(x), "y": int(y), "text": text})
         if return_ann:
             return frame, annotations
         return frame
@@ -13,6 +13,7 @@ import cv2
 import aloscene
 from aloscene.renderer import View
 from aloscene.labels import Labels
+from aloscene.tensors.view_cache import cached_view
 import torchvision
 from torchvision.ops.boxes import nms
 from aloscene.renderer import View, put_adapative_cv2_text, adapt_text_size_to_frame
@@ -148,6 +149,7 @@ class Points2D(aloscene.tensors.AugmentedTensor):
         """
         self._append_child("labels", labels, name)
 
+    @cached_view
     def xy(self):
         """Get a new Point2d Tensor with points following this format:
         [x, y]. Could be relative value (betwen 0 and 1)
@@ -165,6 +167,7 @@ class Points2D(aloscene.tensors.AugmentedTensor):
             tensor.points_format = "xy"
             return tensor
 
+    @cached_view
     def yx(self):
         """Get a new Point2d Tensor with points following this format:
         [y, x]. Could be relative value (betwen 0 and 1)
@@ -182,6 +185,7 @@ class Points2D(aloscene.tensors.AugmentedTensor):
             tensor.points_format = "yx"
             return tensor
 
+    @cached_view
     def abs_pos(self, frame_size: tuple):
         """Get a new Point2d Tensor with absolute position
         relative to the given `frame_size`.
@@ -256,6 +260,7 @@ class Points2D(aloscene.tensors.AugmentedTensor):
 
             return tensor
 
+    @cached_view
     def rel_pos(self):
         """Get a new Point2d Tensor with relative position (between 0 and 1)
         based on the current frame_size.
@@ -0,0 +1,235 @@
+"""Binary instance masks stored as run-length encoding"""
+import numpy as np
+import torch
+
+from typing import Union
+
+import aloscene
+from aloscene.labels import Labels
+from aloscene.utils import rle
+
+
+class RLEMask(aloscene.tensors.AugmentedTensor):
+    """Set of N binary masks of size `frame_size` (H, W), stored as run-length encoding: an int32 tensor of shape
+    (N, K) of the lengths of the alternate background / foreground runs of each mask, flattened in row-major order
+    (see :mod:`aloscene.utils.rle`).
+
+    An RLEMask is an alternative to a :mod:`Mask <aloscene.mask>` of shape (N, H, W) for sparse instance masks
+    (ex: panoptic or instance segmentation with many objects): it is orders of magnitude smaller in memory and
+    to send between the dataloader workers. Area, IoU, flips, crop, pad and resize are computed on the runs. The
+    masks are only densified on demand with :meth:`to_mask` (ex: for the loss computation).
+
+    Parameters
+    ----------
+    x : torch.Tensor | np.ndarray
+        Runs of shape (N, K)
+    frame_size : tuple
+        Size (H, W) of the masks
+    labels : Union[dict, :mod:`Labels <aloscene.labels>`], optional
+        Labels for each mask
+
+    Examples
+    --------
+    >>> rle_masks = aloscene.RLEMask.from_mask(masks)
+    >>> rle_masks = rle_masks.hflip().resize((320, 480))
+    >>> masks = rle_masks.to_mask()
+    """
+
+    @staticmethod
+    def __new__(
+        cls, x, frame_size: tuple, labels: Union[dict, Labels, None] = None, names=("N", None), *args, **kwargs
+    ):
+        x = torch.as_tensor(np.asarray(x) if not isinstance(x, torch.Tensor) else x).to(torch.int32)
+        if x.dim() != 2:
+            raise Exception(f"RLEMask: the runs must be of shape (N, K), got {tuple(x.shape)}")
+        tensor = super().__new__(cls, x, *args, names=names, zero_copy=True, **kwargs)
+        tensor.add_child("labels", labels, align_dim=["N"], mergeable=True)
+        tensor.add_property("frame_size", tuple(int(s) for s in frame_size))
+        return tensor
+
+    def __init__(self, x, *args, **kwargs):
+        super().__init__(x)
+
+    @classmethod
+    def from_mask(cls, mask: torch.Tensor, threshold: float = 0.5):
+        """Encode a (N, H, W) :mod:`Mask <aloscene.mask>` (or tensor). The labels of the mask are kept.
+
+        Parameters
+        ----------
+        mask : :mod:`Mask <aloscene.mask>` | torch.Tensor
+            Masks of shape (N, H, W)
+        threshold : float
+            Pixels above this value are foreground, by default 0.5
+        """
+        data = mask.as_tensor() if isinstance(mask, aloscene.tensors.AugmentedTensor) else mask
+        data = data.detach().cpu().numpy()
+        runs = rle.encode(data > threshold)
+        rle_mask = cls(torch.from_numpy(runs), frame_size=data.shape[-2:], device=mask.device)
+        if isinstance(mask, aloscene.Mask):
+            rle_mask.set_children(mask.get_children())
+        return rle_mask
+
+    @classmethod
+    def from_id_map(cls, id_map: np.ndarray, ids, labels: Union[dict, Labels, None] = None):
+        """Encode the masks `id_map == ids[i]` of an id map (ex: COCO panoptic annotation), without building the
+        dense (N, H, W) masks.
+
+        Parameters
+        ----------
+        id_map : np.ndarray
+            Map of shape (H, W) of the segment id of each pixel
+        ids : np.ndarray
+            Segment id of each mask
+        labels : Union[dict, :mod:`Labels <aloscene.labels>`], optional
+            Labels for each mask
+        """
+        runs = rle.encode_id_map(np.asarray(id_map), np.asarray(ids))
+        return cls(torch.from_numpy(runs), frame_size=id_map.shape[-2:], labels=labels)
+
+    @property
+    def H(self):
+        return self.frame_size[0]
+
+    @property
+    def W(self):
+        return self.frame_size[1]
+
+    @property
+    def HW(self):
+        return self.frame_size
+
+    def append_labels(self, labels: Labels, name: Union[str, None] = None):
+        """Attach a set of labels to the masks.
+
+        Parameters
+        ----------
+        labels : :mod:`Labels <aloscene.labels>`
+            Set of labels to attached to the masks
+        name : str
+            If none, the label will be attached without name (if possible). Otherwise if no other unnamed
+            labels are attached to the frame, the labels will be added to the set of labels.
+        """
+        self._append_child("labels", labels, name)
+
+    def _runs(self) -> np.ndarray:
+        return self._as_raw_tensor().cpu().numpy()
+
+    def _with_runs(self, runs: np.ndarray, frame_size: tuple = None):
+        """New RLEMask with the same children and properties, with the given runs"""
+        n_rle_mask = self._shallow_copy(torch.from_numpy(runs).to(self.device))
+        n_rle_mask.frame_size = tuple(int(s) for s in (self.frame_size if frame_size is None else frame_size))
+        return n_rle_mask
+
+    def to_mask(self) -> "aloscene.Mask":
+        """Decode the masks to a dense (N, H, W) :mod:`Mask <aloscene.mask>`, with the same labels"""
+        masks = torch.from_numpy(rle.decode(self._runs(), self.frame_size)).to(torch.float32)
+        mask = aloscene.Mask(masks, names=("N", "H", "W"), device=self.device)
+        mask.set_children(self.get_children())
+        return mask
+
+    def area(self) -> torch.Tensor:
+        """Number of pixels of each mask, tensor of size (N,)"""
+        return torch.from_numpy(rle.area(self._runs()))
+
+    def iou_with(self, mask2) -> torch.Tensor:
+        """IoU between each mask and each mask of `mask2`, computed on the runs
+
+        Parameters
+        ----------
+        mask2 : :mod:`RLEMask <aloscene.rle_mask>` | :mod:`Mask <aloscene.mask>`
+            Masks with size (M,H,W)
+
+        Returns
+        -------
+        torch.Tensor
+            IoU matrix of size (N,M)
+        """
+        if not isinstance(mask2, RLEMask):
+            mask2 = RLEMask.from_mask(mask2)
+        assert self.frame_size == mask2.frame_size
+        return torch.from_numpy(rle.iou(self._runs(), mask2._runs()).astype(np.float32))
+
+    def to_boxes2d(self) -> "aloscene.BoundingBoxes2D":
+        """Absolute `xyxy` boxes around the masks, with the labels of the masks"""
+        boxes = torch.from_numpy(rle.bounding_boxes(self._runs(), self.frame_size))
+        boxes = aloscene.BoundingBoxes2D(boxes, boxes_format="xyxy", absolute=True, frame_size=self.frame_size)
+        boxes.set_children(self.get_children())
+        return boxes
+
+    def mask2id(self, labels_set: Union[str, None] = None, return_ann: bool = False, return_cats: bool = False):
+        """Create a panoptic view of the masks, where each pixel represent one class. See
+        :meth:`Mask.mask2id <aloscene.mask.Mask.mask2id>`, computed without densifying the masks.
+        """
+        from alodataset.utils.panoptic_utils import VOID_CLASS_ID
+
+        if return_ann or not (hasattr(self, "labels") and self.labels is not None):
+            # Annotations or masks without labels: same output as the dense masks
+            return self.to_mask().mask2id(labels_set=labels_set, return_ann=return_ann, return_cats=return_cats)
+
+        labels = aloscene.Mask._get_set_children(self, labels_set=labels_set)
+        assert len(labels) == len(self)  # Required to make panoptic view
+        frame = rle.id_map(self._runs(), self.frame_size)
+        if return_cats and isinstance(labels, aloscene.Labels) and len(labels) > 0:
+            categories = np.concatenate([[VOID_CLASS_ID], labels.cpu().numpy().astype("int")])
+            return categories[frame]
+        return frame + VOID_CLASS_ID
+
+    def _hflip(self, **kwargs):
+        return self._with_runs(rle.hflip(self._runs(), self.frame_size))
+
+    def _vflip(self, **kwargs):
+        return self._with_runs(rle.vflip(self._runs(), self.frame_size))
+
+    def _resize(self, size, **kwargs):
+        """Nearest neighbor resize of the masks
+
+        Parameters
+        ----------
+        size : tuple of float
+            target size (H, W) in relative coordinates between 0 and 1
+        """
+        n_size = (round(size[0] * self.H), round(size[1] * self.W))
+        return self._with_runs(rle.resize(self._runs(), self.frame_size, n_size), n_size)
+
+    def _crop(self, H_crop: tuple, W_crop: tuple, **kwargs):
+        """Crop the masks
+
+        Parameters
+        ----------
+        H_crop: tuple
+            (start, end) between 0 and 1
+        W_crop: tuple
+            (start, end) between 0 and 1
+        """
+        H_crop = (round(H_crop[0] * self.H), round(H_crop[1] * self.H))
+        W_crop = (round(W_crop[0] * self.W), round(W_crop[1] * self.W))
+        n_size = (H_crop[1] - H_crop[0], W_crop[1] - W_crop[0])
+        return self._with_runs(rle.crop(self._runs(), self.frame_size, H_crop, W_crop), n_size)
+
+    def _pad(self, offset_y: tuple, offset_x: tuple, **kwargs):
+        """Pad the masks with background
+
+        Parameters
+        ----------
+        offset_y: tuple
+            (percentage top_offset, percentage bottom_offset) Percentage based on the previous size
+        offset_x: tuple
+            (percentage left_offset, percentage right_offset) Percentage based on the previous size
+        """
+        pad_y = (int(round(offset_y[0] * self.H)), int(round(offset_y[1] * self.H)))
+        pad_x = (int(round(offset_x[0] * self.W)), int(round(offset_x[1] * self.W)))
+        n_size = (self.H + sum(pad_y), self.W + sum(pad_x))
+        return self._with_runs(rle.pad(self._runs(), self.frame_size, pad_y, pad_x), n_size)
+
+    def _rotate(self, angle, center=None, **kwargs):
+        """Rotation can not be computed on the runs: the masks are densified, rotated and encoded back"""
+        masks = self.to_mask()._rotate(angle, center=center, **kwargs)
+        return self._with_runs(rle.encode(masks.as_tensor().cpu().numpy() > 0.5))
+
+    def _spatial_shift(self, shift_y: float, shift_x: float, **kwargs):
+        """Spatial shift is not applied on the masks, as for :mod:`Mask <aloscene.mask>`"""
+        return self
+
+    def get_view(self, *args, **kwargs):
+        """Get a view of the masks, see :meth:`Mask.get_view <aloscene.mask.Mask.get_view>`"""
+        return self.to_mask().get_view(*args, **kwargs)
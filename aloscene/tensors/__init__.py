@@ -1,2 +1,5 @@
 from .augmented_tensor import AugmentedTensor
 from .spatial_augmented_tensor import SpatialAugmentedTensor
+from .lazy_child import LazyChild
+from .ragged import Ragged
+from .view_cache import ViewCache, cached_view, view_cache_stats, reset_view_cache_stats
@@ -5,6 +5,8 @@ import numpy as np
 from typing import *
 import copy
 
+from aloscene.tensors.lazy_child import LazyChild, has_lazy, load_lazy
+
 
 def _torch_function_get_self(cls, func, types, args, kwargs):
     """Based on this dicussion https://github.com/pytorch/pytorch/issues/63767
@@ -26,8 +28,38 @@ def _torch_function_get_self(cls, func, types, args, kwargs):
     return None
 
 
+# Torch functions computed element by element: the output has the same dimensions than the input and
+# the labels & properties of the input can be attached as it is on the output.
+_ELEMENTWISE_FUNCTIONS = {
+    "__add__", "__radd__", "__iadd__", "__sub__", "__rsub__", "__isub__", "__mul__", "__rmul__", "__imul__",
+    "__truediv__", "__rtruediv__", "__itruediv__", "__div__", "__rdiv__", "__idiv__", "__floordiv__",
+    "__rfloordiv__", "__mod__", "__pow__", "__rpow__", "__ipow__", "__neg__", "__abs__", "__invert__",
+    "__lt__", "__le__", "__gt__", "__ge__", "__eq__", "__ne__", "__and__", "__or__", "__xor__",
+    "add", "add_", "sub", "sub_", "mul", "mul_", "div", "div_", "true_divide", "neg", "neg_", "abs", "abs_",
+    "pow", "pow_", "exp", "exp_", "log", "log_", "sqrt", "sqrt_", "clamp", "clamp_", "clip", "clip_",
+    "floor", "floor_", "ceil", "ceil_", "round", "round_", "sigmoid", "sigmoid_", "tanh", "tanh_",
+    "relu", "relu_", "lt", "le", "gt", "ge", "eq", "ne", "logical_not", "logical_and", "logical_or",
+}
+
+# Kind of torch function, see `AugmentedTensor._torch_function_kind`
+_ELEMENTWISE = "elementwise"
+_GENERIC = "generic"
+
+
 class AugmentedTensor(torch.Tensor):
-    """Tensor with attached labels"""
+    """Tensor with attached labels
+
+    Parameters
+    ----------
+    names: tuple
+        Name of each dimension of the tensor.
+    device: torch.device | None
+        Device on which to create the tensor.
+    zero_copy: bool
+        False by default. If True, `x` (torch.Tensor or numpy array) is wrapped in place without any copy:
+        the augmented tensor shares the same memory as `x` and keeps its dtype. The data is only copied
+        if `x` is not already on the target `device`.
+    """
 
     BATCH_LIST_INTERSECT = False
 
@@ -39,7 +71,11 @@ class AugmentedTensor(torch.Tensor):
     warnings.filterwarnings(action="ignore", message=ERROR_MSG)
 
     @staticmethod
-    def __new__(cls, x, names=None, device=None, *args, **kwargs):
+    def __new__(cls, x, names=None, device=None, *args, zero_copy=False, **kwargs):
+        if zero_copy:
+            tensor = cls._wrap_zero_copy(x, device=device)
+            return cls._init_augmented_tensor(tensor, names)
+
         # TODO The following is not optigal yet
         # I do it to be able to create directly an Aumented Tensor to the GPU
         # But the following Workaround first create the tensor on the CPU, then
@@ -52,6 +88,35 @@ class AugmentedTensor(torch.Tensor):
         else:
             tensor = super().__new__(cls, x, *args, **kwargs)
 
+        tensor = cls._init_augmented_tensor(tensor, names)
+
+        if device is not None:
+            tensor = tensor.to(device)
+
+        if isinstance(x, torch.Tensor):
+            tensor = tensor * x
+
+        return tensor
+
+    @classmethod
+    def _wrap_zero_copy(cls, x, device=None):
+        """Return a `cls` instance sharing the memory of `x` (torch.Tensor or numpy array).
+        The data is only moved if `x` is not already on `device`.
+        """
+        if not isinstance(x, torch.Tensor):
+            x = torch.as_tensor(x, device=device)
+        elif device is not None:
+            x = x.to(device)
+        # Disable the __torch_function__ of `x` in case `x` is already an AugmentedTensor
+        with torch._C.DisableTorchFunction():
+            if x.has_names():
+                x = torch.Tensor.rename(x, None)
+            tensor = x.as_subclass(cls)
+        return tensor
+
+    @staticmethod
+    def _init_augmented_tensor(tensor, names):
+        """Set up the children & properties structure on a newly created augmented tensor"""
         tensor._children_list = []
         tensor._child_property = {}
         tensor._property_list = []
@@ -64,12 +129,6 @@ class AugmentedTensor(torch.Tensor):
             t = type(tensor)
             raise Exception(f"AugmentedTensor ({t}) method must be create with `names` dim.")
 
-        if device is not None:
-            tensor = tensor.to(device)
-
-        if isinstance(x, torch.Tensor):
-            tensor = tensor * x
-
         return tensor
 
     def __init__(self, x, **kwargs):
@@ -81,7 +140,7 @@ class AugmentedTensor(torch.Tensor):
         """
         labels = {}
         for name in self._children_list:
-            labels[name] = {"value": getattr(self, name), "property": self._child_property[name]}
+            labels[name] = {"value": self._get_child(name, load=False), "property": self._child_property[name]}
             setattr(self, name, None)
         return labels
 
@@ -92,7 +151,7 @@ class AugmentedTensor(torch.Tensor):
             # Use apply to return the same label but with a new structure
             # so that if the returned structure is changed, this will not impact the current one
             labels[name] = {
-                "value": self.apply_on_child(getattr(self, name), lambda l: l),
+                "value": self.apply_on_child(self._get_child(name, load=False), lambda l: l),
                 "property": self._child_property[name],
             }
         return labels
@@ -171,6 +230,8 @@ class AugmentedTensor(torch.Tensor):
         """Check label name _check_child_name_alignment"""
 
         def __check_child_name_alignment(var):
+            if isinstance(var, LazyChild):
+                return True  # Checked once loaded
             if not any(v != None for v in self.names):
                 return True
             elif not any(v in self.COMMON_DIM_NAMES for v in var.names):
@@ -237,7 +298,7 @@ class AugmentedTensor(torch.Tensor):
         """
         assert isinstance(child_name, str)
         assert isinstance(set_name, str) or set_name == None
-        label = getattr(self, child_name)
+        label = self._get_child(child_name, load=False)
         class_name = type(self).__name__
         if label is not None and not isinstance(label, dict):
             raise Exception(
@@ -258,6 +319,46 @@ class AugmentedTensor(torch.Tensor):
             setattr(self, child_name, child)
         else:
             label[set_name] = child
+            if type(child) is LazyChild:
+                self.__dict__["_lazy_children"] = True
+
+    def _get_child(self, name, load=None):
+        """Value of the child `name`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the child
+        load : bool | None
+            Load the lazy values of the child (see :class:`~aloscene.tensors.lazy_child.LazyChild`). By default
+            (None), only the mergeable children are loaded: the non mergeable children can be merged, sliced or
+            expanded on the aligned dimensions without being loaded.
+        """
+        if load is None:
+            load = self._child_property[name]["mergeable"]
+        if load:
+            return getattr(self, name)
+        # Skip __getattribute__, which loads the lazy children
+        return super().__getattribute__(name)
+
+    def load_lazy_children(self):
+        """Load the lazy children not loaded yet (see :class:`~aloscene.tensors.lazy_child.LazyChild`), and the
+        lazy children of the children. Done by the DataLoader workers, so that the children are not loaded
+        serially by the main process."""
+        for name in self._children_list:
+            value = super().__getattribute__(name)
+            if has_lazy(value):
+                value = self._load_lazy_child(name, value)
+            self.apply_on_child(value, lambda child: child.load_lazy_children())
+        self.__dict__["_lazy_children"] = False
+        return self
+
+    def _load_lazy_child(self, name, value):
+        """Replace the lazy values of a child by the loaded values"""
+        value = load_lazy(value)
+        self._check_child_name_alignment(value)
+        setattr(self, name, value)
+        return value
 
     def _getitem_child(self, label, label_name, idx):
         """
@@ -275,6 +376,10 @@ class AugmentedTensor(torch.Tensor):
                 return label_list[slicer]
             return n_label_list
 
+        if isinstance(label, LazyChild):
+            # Slicing a non aligned dimension
+            label = label.load()
+
         if isinstance(idx, tuple) or isinstance(idx, list):
             label_dim_idx = 0
             for slicer_idx, slicer in enumerate(idx):
@@ -319,7 +424,7 @@ class AugmentedTensor(torch.Tensor):
 
         name_to_n_label = {}
         for name in self._children_list:
-            label = getattr(self, name)
+            label = self._get_child(name)
             if label is not None:
                 name_to_n_label[name] = self.apply_on_child(
                     label, lambda l: self._getitem_child(l, name, idx), on_list=False
@@ -351,7 +456,9 @@ class AugmentedTensor(torch.Tensor):
         # if hasattr(self, "_children_list") and  key in self._children_list and check:
         #    self._check_child_name_alignment(value)
         super().__setattr__(key, value)
-        pass
+        # Flag checked by __getattribute__ before looking for the lazy children to load
+        if type(value) in (LazyChild, dict, list) and key[0] != "_" and has_lazy(value):
+            self.__dict__["_lazy_children"] = True
 
     def clone(self, *args, **kwargs):
         n_frame = super().clone(*args, **kwargs)
@@ -506,7 +613,7 @@ class AugmentedTensor(torch.Tensor):
                     prop_name_to_value[prop] = getattr(tensor, prop)
 
             for label_name in tensor._children_list:
-                label_value = getattr(tensor, label_name)
+                label_value = tensor._get_child(label_name)
                 if label_value is not None and isinstance(label_value, dict):
                     labels_dict2list[label_name] = {}
                 elif label_value is not None:
@@ -515,7 +622,7 @@ class AugmentedTensor(torch.Tensor):
         for tensor in tensor_list:
             if isinstance(tensor, type(self)):
                 for label_name in tensor._children_list:
-                    label_value = getattr(tensor, label_name)
+                    label_value = tensor._get_child(label_name)
                     if label_name not in labels_dict2list:
                         continue
                     if isinstance(label_value, dict):
@@ -583,6 +690,8 @@ class AugmentedTensor(torch.Tensor):
         #    raise Exception("Impossible to expand the labeled tensor beyond the batch dimension fow now. Export your labeled tensor into tensor before to do it.")
 
         def _handle_expand_on_label(label, name):
+            if isinstance(label, LazyChild) and squeeze:
+                label = label.load()
             if not squeeze:
                 if self._child_property[name]["mergeable"]:
                     return label[None]
@@ -592,7 +701,7 @@ class AugmentedTensor(torch.Tensor):
                 return label[0]
 
         for name in self._children_list:
-            label = getattr(tensor, name)
+            label = tensor._get_child(name)
             if label is not None:
                 results = self.apply_on_child(label, lambda l: _handle_expand_on_label(l, name), on_list=False)
                 setattr(tensor, name, results)
@@ -601,17 +710,53 @@ class AugmentedTensor(torch.Tensor):
         for t in range(len(self)):
             yield self[t]
 
+    # Kind of each torch function already called on an augmented tensor
+    _torch_function_kinds = {}
+
+    @staticmethod
+    def _torch_function_kind(func):
+        """Classify (once) the given torch function as `_ELEMENTWISE` or `_GENERIC`. Merge
+        (cat, stack...) and shape-changing functions (squeeze, unsqueeze...) are `_GENERIC`."""
+        kind = AugmentedTensor._torch_function_kinds.get(func)
+        if kind is None:
+            kind = _ELEMENTWISE if getattr(func, "__name__", None) in _ELEMENTWISE_FUNCTIONS else _GENERIC
+            AugmentedTensor._torch_function_kinds[func] = kind
+        return kind
+
+    def _elementwise_result(self, tensor):
+        """Attach the labels & properties of this augmented tensor on the result of an
+        elementwise torch function. Return False if the `tensor` must go through the generic path.
+        """
+        if tensor is self:
+            return True
+        # The output could have more dimensions than `self` because of broadcasting.
+        with torch._C.DisableTorchFunction():
+            same_dim = self.dim() == tensor.dim()
+        dst = tensor.__dict__
+        if not same_dim or len(dst) > 0:
+            return False
+        # Bypass __getattribute__/__setattr__: same result than the generic path, for a fraction of the cost
+        src = self.__dict__
+        dst["_property_list"] = src["_property_list"]
+        dst["_children_list"] = src["_children_list"]
+        dst["_child_property"] = src["_child_property"]
+        for name in src["_property_list"]:
+            dst[name] = src[name]
+        for name in src["_children_list"]:
+            dst[name] = src[name]
+        if "_lazy_children" in src:
+            dst["_lazy_children"] = src["_lazy_children"]
+        return True
+
     @classmethod
     def __torch_function__(cls, func, types, args=(), kwargs=None):
         self = _torch_function_get_self(cls, func, types, args, kwargs)
 
-        def _merging_frame(args):
-            if len(args) >= 1 and isinstance(args[0], (list, tuple)):
-                for el in args[0]:
-                    if isinstance(el, cls):
-                        return True
-                return False
-            return False
+        if AugmentedTensor._torch_function_kind(func) is _ELEMENTWISE:
+            tensor = super().__torch_function__(func, types, args, {} if kwargs is None else kwargs)
+            if not isinstance(tensor, type(self)) or self._elementwise_result(tensor):
+                return tensor
+            return self._generic_torch_function_result(cls, tensor, func, types, args, kwargs)
 
         if kwargs is None:
             kwargs = {}
@@ -624,6 +769,23 @@ class AugmentedTensor(torch.Tensor):
             tensor = super().__torch_function__(func, types, args, kwargs)
             # tensor = super().torch_func_method(func, types, args, kwargs)
 
+        return self._generic_torch_function_result(cls, tensor, func, types, args, kwargs)
+
+    def _generic_torch_function_result(self, cls, tensor, func, types, args=(), kwargs=None):
+        """Attach the labels & properties of this augmented tensor on the result of any torch function,
+        merging (cat, stack...) and expanding/squeezing the labels if needed.
+        """
+        if kwargs is None:
+            kwargs = {}
+
+        def _merging_frame(args):
+            if len(args) >= 1 and isinstance(args[0], (list, tuple)):
+                for el in args[0]:
+                    if isinstance(el, cls):
+                        return True
+                return False
+            return False
+
         if isinstance(tensor, type(self)):
             tensor._property_list = self._property_list
             tensor._children_list = self._children_list
@@ -638,10 +800,10 @@ class AugmentedTensor(torch.Tensor):
                 self._merge_tensor(tensor, args[0], func, types, args=args, kwargs=kwargs)
 
             for name in self._children_list:
-                if not hasattr(
-                    tensor, name
+                if (
+                    name not in tensor.__dict__
                 ):  # Set what is not already set (some could have been set by the merge function above)
-                    setattr(tensor, name, getattr(self, name))
+                    setattr(tensor, name, self._get_child(name))
 
             # The torch method called expand the shape of the tensor.
             # Check how to extand the label based on this operation (if possible)
@@ -664,7 +826,7 @@ class AugmentedTensor(torch.Tensor):
                 return l.reset_names()
 
         for name in self._children_list:
-            label = getattr(self, name)
+            label = self._get_child(name, load=False)
             if label is not None:
                 self.apply_on_child(label, _reset_names)
 
@@ -694,7 +856,7 @@ class AugmentedTensor(torch.Tensor):
         """
 
         def _rename(v):
-            if v is None:
+            if v is None or isinstance(v, LazyChild):
                 return v
             if "auto_restore_names" in inspect.getfullargspec(v.rename_).kwonlyargs:
                 return v.rename_(None, auto_restore_names=auto_restore_names)
@@ -703,7 +865,7 @@ class AugmentedTensor(torch.Tensor):
 
         if args[0] is None:
             for name in self._children_list:
-                label = getattr(self, name)
+                label = self._get_child(name, load=False)
                 if label is not None:
                     self.apply_on_child(label, _rename)
         self._saved_names = self.names
@@ -727,7 +889,7 @@ class AugmentedTensor(torch.Tensor):
         """
 
         def _rename(v):
-            if v is None:
+            if v is None or isinstance(v, LazyChild):
                 return v
             if "auto_restore_names" in inspect.getfullargspec(v.rename).kwonlyargs:
                 return v.rename(None, auto_restore_names=auto_restore_names)
@@ -739,7 +901,7 @@ class AugmentedTensor(torch.Tensor):
 
         if args[0] is None:
             for name in self._children_list:
-                label = getattr(self, name)
+                label = self._get_child(name, load=False)
                 if label is not None:
                     setattr(tensor, name, self.apply_on_child(label, _rename))
 
@@ -761,6 +923,32 @@ class AugmentedTensor(torch.Tensor):
         n_tensor.rename_(None)
         return n_tensor
 
+    def _as_raw_tensor(self):
+        """Returns an unnamed `torch.Tensor` sharing the memory of this augmented tensor (no copy, no labels)"""
+        with torch._C.DisableTorchFunction():
+            tensor = self.as_subclass(torch.Tensor)
+            if tensor.has_names():
+                tensor = torch.Tensor.rename(tensor, None)
+        return tensor
+
+    def _shallow_copy(self, data=None):
+        """Returns a new augmented tensor with the same properties and children (not copied) than this
+        augmented tensor.
+
+        Parameters
+        ----------
+        data: torch.Tensor | None
+            Unnamed data of the new augmented tensor. If None, the new tensor shares the memory of this one.
+        """
+        tensor = type(self)._wrap_zero_copy(self._as_raw_tensor() if data is None else data)
+        tensor.__dict__.update(self.__dict__)
+        if data is not None:
+            # The cached views (see `ViewCache`) are only valid for the same data
+            tensor.__dict__.pop("_view_cache", None)
+        with torch._C.DisableTorchFunction():
+            torch.Tensor.rename_(tensor, *self.names)
+        return tensor
+
     def as_numpy(self, dtype=np.float16):
         """Returns numpy array on the cpu
 
@@ -1104,7 +1292,16 @@ class AugmentedTensor(torch.Tensor):
         ):
             self._auto_restore_names = False
             self.reset_names()
-        return super().__getattribute__(name)
+        value = super().__getattribute__(name)
+        if (
+            type(value) in (LazyChild, dict, list)
+            and name[0] != "_"
+            and self.__dict__.get("_lazy_children", False)
+            and name in self._children_list
+            and has_lazy(value)
+        ):
+            value = self._load_lazy_child(name, value)
+        return value
 
     def _hflip(self, *args, **kwargs):
         # Must be implement by child class to handle hflip
@@ -0,0 +1,63 @@
+class LazyChild(object):
+    """Child of an augmented tensor loaded on first access.
+
+    A `LazyChild` can be attached to an augmented tensor instead of the child itself (ex:
+    `frame.append_flow(LazyChild(Flow, flow_path), "flow_forward")`). The loader is called the first time the
+    child is accessed (`frame.flow`), including by a transformation (hflip, crop...) or a device transfer. A
+    child dropped before being accessed (`frame.flow = None`, `frame.drop_children()`) is never loaded. A lazy
+    child must be attached through the `append_*` methods, `add_child` or a child attribute assignment (not
+    written in place in the dict of a child), which flag the augmented tensor as having lazy children.
+
+    The non mergeable children (flow, boxes...) stay lazy when the augmented tensors are merged
+    (`torch.cat`, `batch_list`...), sliced or expanded on the "B" and "T" dimensions. The mergeable children
+    (depth, disparity...) are loaded to be merged.
+
+    Parameters
+    ----------
+    loader : callable
+        Function returning the child. Use a module level function (or class) with picklable arguments so that
+        the lazy child can be sent to the DataLoader workers.
+    *args, **kwargs
+        Arguments of the loader
+    """
+
+    def __init__(self, loader, *args, **kwargs):
+        self.loader = loader
+        self.args = args
+        self.kwargs = kwargs
+        self._loaded = False
+        self._value = None
+
+    def load(self):
+        """Load (once) and return the child"""
+        if not self._loaded:
+            self._value = self.loader(*self.args, **self.kwargs)
+            self._loaded = True
+            self.args, self.kwargs = (), {}
+        return self._value
+
+    def __repr__(self):
+        loader = getattr(self.loader, "__qualname__", repr(self.loader))
+        return f"LazyChild({loader}, loaded={self._loaded})"
+
+
+def has_lazy(value) -> bool:
+    """True if the child structure (dict, list or child) contains a lazy child not loaded yet"""
+    if type(value) is LazyChild:
+        return True
+    elif type(value) is dict:
+        return any(has_lazy(v) for v in value.values())
+    elif type(value) is list:
+        return any(has_lazy(v) for v in value)
+    return False
+
+
+def load_lazy(value):
+    """Load the lazy children of a child structure (dict, list or child)"""
+    if type(value) is LazyChild:
+        return value.load()
+    elif type(value) is dict:
+        return {key: load_lazy(v) for key, v in value.items()}
+    elif type(value) is list:
+        return [load_lazy(v) for v in value]
+    return value
@@ -0,0 +1,142 @@
+from typing import Callable, List, Tuple, Union
+
+import torch
+
+
+class Ragged(object):
+    """Packed list of tensors of variable length on their first dimension (ex: the boxes2d of each frame of a
+    batch): the tensors are concatenated in one contiguous tensor `data`, the rows of the frame `i` being
+    `data[offsets[i] : offsets[i + 1]]`.
+
+    Any tensor (`torch.Tensor` or augmented tensor: :mod:`BoundingBoxes2D <aloscene.bounding_boxes_2d>`,
+    :mod:`BoundingBoxes3D <aloscene.bounding_boxes_3d>`, :mod:`Points2D <aloscene.points_2d>`,
+    :mod:`Labels <aloscene.labels>`...) can be packed. The mergeable children (ex: the labels of the boxes) are
+    packed with it. A row wise operation (format conversion, flip...) is applied once on all the frames with
+    :meth:`apply`, and a frame is a view of the packed tensor (no copy).
+
+    Parameters
+    ----------
+    data : torch.Tensor
+        Packed tensor of shape (N, ...), N being the total number of rows
+    offsets : torch.Tensor
+        Long tensor of shape (B + 1,), with `offsets[0] == 0` and `offsets[-1] == N`
+
+    Examples
+    --------
+    >>> boxes = Ragged.from_list(frames.boxes2d)
+    >>> boxes = boxes.apply(lambda b: b.rel_pos().xcyc())
+    >>> padded, mask = boxes.to_padded()
+    >>> boxes[1]  # boxes2d of the second frame
+    """
+
+    def __init__(self, data: torch.Tensor, offsets: torch.Tensor):
+        self.data = data
+        self.offsets = torch.as_tensor(offsets, dtype=torch.int64).cpu()
+        assert self.offsets.dim() == 1 and len(self.offsets) > 0 and int(self.offsets[-1]) == len(data)
+        self._bounds = self.offsets.tolist()
+
+    @classmethod
+    def from_list(cls, tensors: List[torch.Tensor]):
+        """Pack a list of tensors (or augmented tensors) with the same trailing dimensions"""
+        assert len(tensors) > 0, "Can not pack an empty list"
+        lengths = torch.as_tensor([len(tensor) for tensor in tensors], dtype=torch.int64)
+        offsets = torch.cat([torch.zeros((1,), dtype=torch.int64), lengths.cumsum(0)])
+        return cls(torch.cat(list(tensors), dim=0), offsets)
+
+    @property
+    def lengths(self) -> torch.Tensor:
+        """Number of rows of each frame, long tensor of shape (B,)"""
+        return self.offsets[1:] - self.offsets[:-1]
+
+    def __len__(self):
+        return len(self._bounds) - 1
+
+    def __getitem__(self, idx: Union[int, slice]):
+        """Rows of the frame `idx` (view of the packed tensor), or Ragged of a contiguous range of frames"""
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            assert step == 1, "Only contiguous frames can be sliced"
+            stop = max(start, stop)
+            offsets = self.offsets[start : stop + 1] - self.offsets[start]
+            return Ragged(self.data[self._bounds[start] : self._bounds[stop]], offsets)
+        idx = idx + len(self) if idx < 0 else idx
+        if not 0 <= idx < len(self):
+            raise IndexError(f"Frame index {idx} out of range for {len(self)} frames")
+        return self.data[self._bounds[idx] : self._bounds[idx + 1]]
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __repr__(self):
+        return f"Ragged(lengths={self.lengths.tolist()}, data={repr(self.data)})"
+
+    def tolist(self) -> list:
+        """List of the tensors of each frame (views of the packed tensor)"""
+        return list(self)
+
+    def batch_index(self) -> torch.Tensor:
+        """Frame index of each row, long tensor of shape (N,) on the device of the data"""
+        frames = torch.arange(len(self), device=self.data.device)
+        return torch.repeat_interleave(frames, self.lengths.to(self.data.device))
+
+    def flat_index(self, indices: List[torch.Tensor]) -> torch.Tensor:
+        """Indices in the packed tensor of a list of row indices per frame
+
+        Parameters
+        ----------
+        indices : list of torch.Tensor
+            For each frame, the indices of the selected rows of the frame
+
+        Returns
+        -------
+        torch.Tensor
+            Long tensor of the indices of the selected rows in :attr:`data`
+        """
+        assert len(indices) == len(self)
+        if len(indices) == 0:
+            return torch.zeros((0,), dtype=torch.int64, device=self.data.device)
+        flat = [torch.as_tensor(index, dtype=torch.int64) + self._bounds[b] for b, index in enumerate(indices)]
+        return torch.cat(flat).to(self.data.device)
+
+    def apply(self, func: Callable, *args, **kwargs):
+        """Apply a row wise operation on all the frames at once: `func(data, *args, **kwargs)` must return a tensor
+        with the same number of rows (ex: `lambda boxes: boxes.xcyc()`, `lambda boxes: boxes.hflip()`)"""
+        data = func(self.data, *args, **kwargs)
+        assert len(data) == len(self.data), "Ragged.apply: the operation must keep the number of rows"
+        return Ragged(data, self.offsets)
+
+    def to(self, *args, **kwargs):
+        return Ragged(self.data.to(*args, **kwargs), self.offsets)
+
+    def to_padded(
+        self, fill_value: float = 0.0, max_length: Union[int, None] = None
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Padded form of the packed rows
+
+        Parameters
+        ----------
+        fill_value : float
+            Value of the padded rows
+        max_length : int | None
+            Number of rows of the padded tensor, by default the length of the longest frame
+
+        Returns
+        -------
+        padded : torch.Tensor
+            Raw tensor (without children) of shape (B, max_length, ...)
+        mask : torch.Tensor
+            Boolean validity mask of shape (B, max_length)
+        """
+        data = self.data._as_raw_tensor() if hasattr(self.data, "_as_raw_tensor") else self.data
+        longest = max(self._bounds[b + 1] - self._bounds[b] for b in range(len(self))) if len(self) > 0 else 0
+        max_length = longest if max_length is None else max_length
+        assert longest <= max_length, f"Ragged.to_padded: a frame has {longest} rows, more than {max_length}"
+
+        batch_index = self.batch_index()
+        rows = torch.arange(len(data), device=data.device) - self.offsets.to(data.device)[batch_index]
+        padded = data.new_full((len(self), max_length) + tuple(data.shape[1:]), fill_value)
+        padded[batch_index, rows] = data
+        mask = torch.zeros((len(self), max_length), dtype=torch.bool, device=data.device)
+        mask[batch_index, rows] = True
+        return padded, mask
@@ -7,10 +7,12 @@ from typing import Union
 
 from aloscene.renderer import View, Renderer
 from .augmented_tensor import AugmentedTensor
+from .lazy_child import LazyChild
 import inspect
 import aloscene
 from aloscene.camera_calib import CameraExtrinsic, CameraIntrinsic
 from aloscene.utils.data_utils import LDtoDL
+from aloscene.utils.pipeline_profiler import profile_stage
 
 import warnings
 
@@ -261,11 +263,11 @@ class SpatialAugmentedTensor(AugmentedTensor):
                     if sub_label is not None:
                         self.apply_on_child(sub_label, lambda l: batch_label(label, l, sub_name), on_list=False)
             else:
-                self.apply_on_child(label, lambda l: l.reset_names(), on_list=True)
+                self.apply_on_child(label, lambda l: l if isinstance(l, LazyChild) else l.reset_names(), on_list=True)
 
         # Add a batch dimension on the
         for name in tensor._children_list:
-            label = getattr(tensor, name)
+            label = tensor._get_child(name)
             if label is not None:
                 self.apply_on_child(label, lambda l: batch_label(tensor, l, name), on_list=False)
 
@@ -309,11 +311,11 @@ class SpatialAugmentedTensor(AugmentedTensor):
                     if sub_label is not None:
                         self.apply_on_child(sub_label, lambda l: batch_label(label, l, sub_name), on_list=False)
             else:
-                self.apply_on_child(label, lambda l: l.reset_names(), on_list=True)
+                self.apply_on_child(label, lambda l: l if isinstance(l, LazyChild) else l.reset_names(), on_list=True)
 
         # Add a batch dimension on the label
         for name in tensor._children_list:
-            label = getattr(tensor, name)
+            label = tensor._get_child(name)
             if label is not None:
                 self.apply_on_child(label, lambda l: batch_label(tensor, l, name), on_list=False)
 
@@ -349,75 +351,109 @@ class SpatialAugmentedTensor(AugmentedTensor):
             A child of aloscene.tensors.SpatialAugmentedTensor (or dict of SpatialAugmentedTensor)
             with `mask` label to keep track of the padded areas.
         """
+        # Timed if a PipelineProfiler is started (see aloscene.utils.pipeline_profiler)
+        with profile_stage("batch_list") as stage:
+            batch = SpatialAugmentedTensor._batch_list(
+                sa_tensors, pad_boxes=pad_boxes, pad_points2d=pad_points2d, intersection=intersection
+            )
+            if stage is not None:
+                stage.add_bytes(batch)
+        return batch
+
+    @staticmethod
+    def _batch_list(sa_tensors: list, pad_boxes: bool = False, pad_points2d: bool = False, intersection=False):
+        """See :func:`batch_list`"""
         assert len(sa_tensors) >= 1 and isinstance(sa_tensors, list)
         frame0 = sa_tensors[0]
 
         if isinstance(frame0, dict):
             DL = LDtoDL(sa_tensors)
-            dict_of_sa = {key: SpatialAugmentedTensor.batch_list(val) for key, val in DL.items()}
+            dict_of_sa = {
+                key: SpatialAugmentedTensor._batch_list(
+                    val, pad_boxes=pad_boxes, pad_points2d=pad_points2d, intersection=intersection
+                )
+                for key, val in DL.items()
+            }
             return dict_of_sa
 
-        # Gather info on the given frames
-        max_h, max_w = 0, 0
-        dtype = sa_tensors[0].dtype
-        device = sa_tensors[0].device
-
         # Retrieve the target size
-        for i, frame in enumerate(sa_tensors):
+        max_h, max_w = 0, 0
+        for frame in sa_tensors:
             if frame is not None:
                 max_h, max_w = max(frame.H, max_h), max(frame.W, max_w)
 
+        # Add the batch dimension on each frame (without copy) and pad its labels. The tensors
+        # themselves are not padded: they are directly copied into the batch buffer below.
         n_sa_tensors = []
-        for i, n_frame in enumerate(sa_tensors):
-            if n_frame is None:
+        for frame in sa_tensors:
+            if frame is None:
                 continue
-            # Add the batch dimension and drop the labels
-            n_sa_tensors.append(n_frame.batch())
-            frame = n_frame
+            batch_frame = frame.batch()._shallow_copy()
+            # Nothing to pad (and the lazy children are not loaded) if the frame already has the target size
+            if pad_boxes or pad_points2d or frame.HW != (max_h, max_w):
+                offset_y = (0.0, (max_h - frame.H) / frame.H)
+                offset_x = (0.0, (max_w - frame.W) / frame.W)
+                batch_frame.recursive_apply_on_children_(
+                    lambda label: frame._pad_label(
+                        label, offset_y, offset_x, pad_boxes=pad_boxes, pad_points2d=pad_points2d
+                    )
+                )
+            n_sa_tensors.append(batch_frame)
 
+        frame0 = n_sa_tensors[0]
+        n_names = frame0.names
         batch_size = len(n_sa_tensors)
-        # Retrieve the new shapes and dim names
-        n_tensor_shape, n_mask_shape = list(n_sa_tensors[0].shape), list(n_sa_tensors[0].shape)
-        # New target frame size
-        n_tensor_shape[0], n_mask_shape[0] = batch_size, batch_size
-        n_tensor_shape[n_sa_tensors[0].names.index("H")] = max_h
-        n_tensor_shape[n_sa_tensors[0].names.index("W")] = max_w
-        # New target mask shape
-        n_mask_shape[n_sa_tensors[0].names.index("H")] = max_h
-        n_mask_shape[n_sa_tensors[0].names.index("W")] = max_w
-        n_mask_shape[n_sa_tensors[0].names.index("C")] = 1
-        n_names = n_sa_tensors[0].names
-
-        n_padded_list = []
-        for spatial_tensor in n_sa_tensors:
-            h_pad = (0, max_h - spatial_tensor.H)
-            w_pad = (0, max_w - spatial_tensor.W)
-            padded_spatial_tensor = spatial_tensor.pad(h_pad, w_pad, pad_boxes=pad_boxes, pad_points2d=pad_points2d)
-            n_padded_list.append(padded_spatial_tensor)
-
-        # batch the tensors witch torch.cat ; set flag to specify desired behavior of torch.cat
-        # necessary because torch.cat cannot accept kwargs (like intersection) that are not in the original signature
+        # New target frame & mask shapes
+        n_tensor_shape = list(frame0.shape)
+        n_tensor_shape[0] = batch_size
+        n_tensor_shape[n_names.index("H")] = max_h
+        n_tensor_shape[n_names.index("W")] = max_w
+        n_mask_shape = list(n_tensor_shape)
+        n_mask_shape[n_names.index("C")] = 1
+
+        # Allocate the batch buffers once. Each frame is copied once and only the padded area is filled up
+        # with the padding value. (For normalized frames, the padding value depends on the mean/std)
+        n_tensor = torch.empty(tuple(n_tensor_shape), dtype=frame0.dtype, device=frame0.device)
+        n_mask = torch.empty(tuple(n_mask_shape), dtype=torch.float, device=frame0.device)
+        for b, frame in enumerate(n_sa_tensors):
+            fill_value = frame._pad_fill_value()
+            b_slice = slice(b, b + 1)
+            frame_slice = frame.get_slices({"B": b_slice, "H": slice(None, frame.H), "W": slice(None, frame.W)})
+            bottom_slice = frame.get_slices({"B": b_slice, "H": slice(frame.H, None)})
+            right_slice = frame.get_slices({"B": b_slice, "H": slice(None, frame.H), "W": slice(frame.W, None)})
+            n_tensor[frame_slice].copy_(frame._as_raw_tensor())
+            n_tensor[bottom_slice] = fill_value
+            n_tensor[right_slice] = fill_value
+            n_mask[frame_slice] = 0
+            n_mask[bottom_slice] = 1
+            n_mask[right_slice] = 1
+
+        # Merge the labels & properties of all frames in one pass, as torch.cat would do.
+        # Set flag to specify desired behavior on the labels & properties that are not set on all frames.
+        n_augmented_tensors = frame0._shallow_copy(n_tensor)
         intersect_old_value = AugmentedTensor.BATCH_LIST_INTERSECT
         AugmentedTensor.BATCH_LIST_INTERSECT = intersection
-        n_augmented_tensors = torch.cat(n_padded_list, dim=0)
-        AugmentedTensor.BATCH_LIST_INTERSECT = intersect_old_value
-
-        # Set the new mask and tensor buffer filled up with zeros and ones
-        # Also, for normalized frames, the zero value is actually different based on the mean/std
-        n_tensor = torch.zeros(tuple(n_tensor_shape), dtype=dtype, device=device)
-
-        # Create the batch list mask
-        n_mask = torch.ones(tuple(n_mask_shape), dtype=torch.float, device=device)
-        for b, frame in enumerate(n_sa_tensors):
-            n_slice = frame.get_slices({"B": b, "H": slice(None, frame.H), "W": slice(None, frame.W)})
-            n_tensor[n_slice].copy_(frame[0])
-            n_mask[n_slice] = 0
+        try:
+            for name in n_augmented_tensors._children_list:
+                delattr(n_augmented_tensors, name)
+            frame0._merge_tensor(
+                n_augmented_tensors, n_sa_tensors, torch.cat, None, args=(n_sa_tensors,), kwargs={"dim": 0}
+            )
+            for name in frame0._children_list:
+                if name not in n_augmented_tensors.__dict__:
+                    setattr(n_augmented_tensors, name, frame0._get_child(name, load=False))
+        finally:
+            AugmentedTensor.BATCH_LIST_INTERSECT = intersect_old_value
 
-        # n_frame = instance(n_tensor, names=n_names, normalization=normalization, device=device, mean_std=mean_std)
-        n_augmented_tensors.append_mask(aloscene.Mask(n_mask, names=n_names))
+        n_augmented_tensors.append_mask(aloscene.Mask(n_mask, names=n_names, zero_copy=True))
 
         return n_augmented_tensors
 
+    def _pad_fill_value(self):
+        """Value used to fill up the padded area of the tensor in `batch_list`. Either a scalar
+        or a tensor broadcastable to the shape of this tensor."""
+        return 0
+
     def _relative_to_absolute_hs_ws(self, hs=None, ws=None, assert_integer=True, warn_non_integer=False):
         """
         Parameters
@@ -542,6 +578,11 @@ class SpatialAugmentedTensor(AugmentedTensor):
         if ("N" in self.names and self.size("N") == 0) or ("C" in self.names and self.size("C") == 0):
             shapes = list(self.shape)[:-2] + [h, w]
             return self.rename(None).view(shapes).reset_names()
+        if self.dim() > 4:
+            # Interpolation supports at most one batch dim: flatten the leading dims (ex: B and T)
+            data = self._as_raw_tensor()
+            resized = F.resize(data.reshape(-1, *data.shape[-3:]), (h, w), interpolation=interpolation)
+            return self._shallow_copy(resized.reshape(*data.shape[:-2], h, w))
         return F.resize(self.rename(None), (h, w), interpolation=interpolation).reset_names()
 
     def _rotate(self, angle, center=None, **kwargs):
@@ -0,0 +1,127 @@
+from copy import deepcopy
+from functools import wraps
+
+import torch
+
+
+class ViewCache(object):
+    """Per instance cache of the views derived from an augmented tensor (ex: `boxes.xcyc()`, `boxes.rel_pos()`).
+
+    A view is computed once and then reused while the augmented tensor does not change: a cached view is valid
+    as long as the data (memory and version counter, bumped by any in place operation), the names and the
+    properties of the augmented tensor are the same as when the view was computed. The children are not cached
+    (the cached methods do not alter them): each call returns a copy of the data of the cached view with copies
+    of the current children of the augmented tensor, so that the results can be modified in place without
+    altering the cache nor each other. A copy shares the views of the cached view (to chain the conversions, ex:
+    `boxes.rel_pos().xcyc()`) as long as it is not modified. The views requiring grad are never cached.
+
+    The cache is not sent with the augmented tensor: it is pickled (and deep copied) empty. The global
+    :attr:`hits` and :attr:`misses` counters are exposed by :func:`view_cache_stats`.
+    """
+
+    MAX_VIEWS = 8
+    hits = 0
+    misses = 0
+
+    def __init__(self, views: dict = None, alias: tuple = None):
+        self.views = {} if views is None else views
+        # (fingerprint of the copy, fingerprint of the cached view, cached view) if the views are the ones of a
+        # cached view
+        self.alias = alias
+
+    def __reduce__(self):
+        return (ViewCache, ())
+
+    def __len__(self):
+        return len(self.views)
+
+
+def _fingerprint(tensor):
+    """State of the augmented tensor a view depends on: its data and its properties (compared by value)"""
+    with torch._C.DisableTorchFunction():
+        data = (tensor.data_ptr(), tensor._version, tuple(tensor.shape), tensor.stride(), tensor.names)
+    return data, tuple(tensor.__dict__.get(name) for name in tensor._property_list)
+
+
+def _copy(tensor, children=None):
+    """Copy of the data of an augmented tensor and of the children of `children` (by default, its own children),
+    as `clone()` but without going through the torch functions"""
+    children = tensor if children is None else children
+    copy = tensor._shallow_copy(tensor._as_raw_tensor().clone())
+    copy._property_list = list(tensor._property_list)
+    copy._children_list = list(children._children_list)
+    copy._child_property = deepcopy(children._child_property)
+    for name in children._children_list:
+        setattr(copy, name, children.apply_on_child(getattr(children, name), _copy))
+    return copy
+
+
+def _copy_view(view, view_fingerprint, tensor):
+    """Copy of the data of a cached view with copies of the current children of `tensor`. The copy shares the
+    views of the cached view while it is not modified."""
+    copy = _copy(view, children=tensor)
+    copy.__dict__["_view_cache"] = ViewCache(
+        view.__dict__["_view_cache"].views, (_fingerprint(copy), view_fingerprint, view)
+    )
+    return copy
+
+
+def cached_view(method):
+    """Decorator of an augmented tensor method returning a new augmented tensor derived from this one, without
+    modifying it (format or coordinates conversion...). The result is memoized in a :class:`ViewCache` of the
+    instance, see :class:`ViewCache` for the invalidation rules. The arguments of the method must be hashable."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with torch._C.DisableTorchFunction():
+            requires_grad = self.requires_grad
+        if requires_grad and torch.is_grad_enabled():
+            return method(self, *args, **kwargs)
+        try:
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        cache = self.__dict__.get("_view_cache")
+        fingerprint = _fingerprint(self)
+        if cache is not None and cache.alias is not None:
+            if cache.alias[0] == fingerprint:
+                fingerprint = cache.alias[1]
+            else:
+                # This copy of a cached view was modified: the views of the cached view are not valid anymore
+                cache = None
+        if cache is None:
+            cache = self.__dict__["_view_cache"] = ViewCache()
+        entry = cache.views.get(key)
+        if entry is not None and entry[1] == fingerprint:
+            ViewCache.hits += 1
+            return _copy_view(entry[0], entry[2], self)
+
+        ViewCache.misses += 1
+        view = method(self, *args, **kwargs)
+        if view is self or not isinstance(view, type(self)):
+            return view
+        cache.views.pop(key, None)
+        if len(cache.views) >= ViewCache.MAX_VIEWS:
+            cache.views.pop(next(iter(cache.views)))
+        view.__dict__["_view_cache"] = ViewCache()
+        view_fingerprint = _fingerprint(view)
+        cache.views[key] = (view, fingerprint, view_fingerprint)
+        result = _copy_view(view, view_fingerprint, view)
+        # The cached view does not keep its children: the results get the children of the augmented tensor
+        view.drop_children()
+        return result
+
+    return wrapper
+
+
+def view_cache_stats() -> dict:
+    """Global number of cache hits and misses of the views of the augmented tensors"""
+    return {"hits": ViewCache.hits, "misses": ViewCache.misses}
+
+
+def reset_view_cache_stats():
+    """Reset the counters of :func:`view_cache_stats`"""
+    ViewCache.hits = 0
+    ViewCache.misses = 0
@@ -0,0 +1,257 @@
+"""Batched kernels on raw 2D box tensors.
+
+The boxes are `torch.Tensor` of shape (..., N, 4) in `xyxy` format, all the leading dimensions being batch
+dimensions. The sets of boxes of different sizes are padded to the same size (see
+:meth:`aloscene.BoundingBoxes2D.pad_list`), with a boolean validity mask of shape (..., N). The kernels compute
+all the frames of a batch in one op, without any intermediate :class:`~aloscene.BoundingBoxes2D`.
+"""
+from typing import Optional, Tuple, Union
+
+import torch
+from torchvision.ops.boxes import nms
+
+NMS_METHODS = ["hard", "linear", "gaussian"]
+
+
+def box_xyxy(boxes: torch.Tensor, boxes_format: str) -> torch.Tensor:
+    """Convert raw boxes of shape (..., 4) from `boxes_format` (`xcyc`, `xyxy` or `yxyx`) to `xyxy`"""
+    if boxes_format == "xyxy":
+        return boxes
+    elif boxes_format == "xcyc":
+        half_wh = boxes[..., 2:] / 2
+        return torch.cat([boxes[..., :2] - half_wh, boxes[..., :2] + half_wh], dim=-1)
+    elif boxes_format == "yxyx":
+        return boxes[..., [1, 0, 3, 2]]
+    else:
+        raise Exception(f"Do not know mapping from {boxes_format} to xyxy")
+
+
+def box_area(boxes: torch.Tensor) -> torch.Tensor:
+    """Area of `xyxy` boxes of shape (..., 4), returns a tensor of shape (...)"""
+    return (boxes[..., 2] - boxes[..., 0]) * (boxes[..., 3] - boxes[..., 1])
+
+
+def _pair_mask(mask1: Optional[torch.Tensor], mask2: Optional[torch.Tensor]) -> Optional[torch.Tensor]:
+    if mask1 is None and mask2 is None:
+        return None
+    if mask1 is None:
+        return mask2.unsqueeze(-2)
+    if mask2 is None:
+        return mask1.unsqueeze(-1)
+    return mask1.unsqueeze(-1) & mask2.unsqueeze(-2)
+
+
+def batched_box_iou(
+    boxes1: torch.Tensor,
+    boxes2: torch.Tensor,
+    mask1: Optional[torch.Tensor] = None,
+    mask2: Optional[torch.Tensor] = None,
+    ret_union: bool = False,
+    fill_value: float = 0.0,
+) -> Union[torch.Tensor, Tuple[torch.Tensor, torch.Tensor]]:
+    """IoU between each pair of boxes of two padded sets of boxes.
+
+    Parameters
+    ----------
+    boxes1 : torch.Tensor
+        `xyxy` boxes of shape (..., N, 4)
+    boxes2 : torch.Tensor
+        `xyxy` boxes of shape (..., M, 4), with the same (or broadcastable) leading dimensions
+    mask1 : torch.Tensor | None
+        Boolean validity mask of `boxes1`, of shape (..., N). None if all the boxes are valid.
+    mask2 : torch.Tensor | None
+        Boolean validity mask of `boxes2`, of shape (..., M). None if all the boxes are valid.
+    ret_union : bool
+        Return the union areas as well
+    fill_value : float
+        Value of the pairs with a padded box
+
+    Returns
+    -------
+    torch.Tensor
+        IoU of shape (..., N, M), and the union areas of the same shape if `ret_union`
+    """
+    area1 = box_area(boxes1)
+    area2 = box_area(boxes2)
+
+    lt = torch.max(boxes1[..., :, None, :2], boxes2[..., None, :, :2])  # [..., N, M, 2]
+    rb = torch.min(boxes1[..., :, None, 2:], boxes2[..., None, :, 2:])  # [..., N, M, 2]
+    wh = (rb - lt).clamp(min=0)
+    inter = wh[..., 0] * wh[..., 1]
+
+    union = area1[..., :, None] + area2[..., None, :] - inter
+    iou = inter / union
+
+    pair_mask = _pair_mask(mask1, mask2)
+    if pair_mask is not None:
+        iou = iou.masked_fill(~pair_mask, fill_value)
+
+    if ret_union:
+        return iou, union
+    return iou
+
+
+def batched_box_giou(
+    boxes1: torch.Tensor,
+    boxes2: torch.Tensor,
+    mask1: Optional[torch.Tensor] = None,
+    mask2: Optional[torch.Tensor] = None,
+    fill_value: float = 0.0,
+) -> torch.Tensor:
+    """Generalized IoU (https://giou.stanford.edu/) between each pair of boxes of two padded sets of boxes.
+    The valid boxes must not be degenerated (x1 >= x0 and y1 >= y0).
+
+    Parameters
+    ----------
+    boxes1, boxes2, mask1, mask2, fill_value :
+        See :func:`batched_box_iou`
+
+    Returns
+    -------
+    torch.Tensor
+        GIoU of shape (..., N, M)
+    """
+    iou, union = batched_box_iou(boxes1, boxes2, ret_union=True)
+
+    lt = torch.min(boxes1[..., :, None, :2], boxes2[..., None, :, :2])  # left top corner
+    rb = torch.max(boxes1[..., :, None, 2:], boxes2[..., None, :, 2:])  # right bottom corner
+    wh = (rb - lt).clamp(min=0)
+    area = wh[..., 0] * wh[..., 1]
+
+    giou = iou - (area - union) / area
+
+    pair_mask = _pair_mask(mask1, mask2)
+    if pair_mask is not None:
+        giou = giou.masked_fill(~pair_mask, fill_value)
+    return giou
+
+
+def paired_box_giou(boxes1: torch.Tensor, boxes2: torch.Tensor) -> torch.Tensor:
+    """Generalized IoU between the boxes `boxes1[i]` and `boxes2[i]`, without computing the whole (N, M) matrix.
+
+    Parameters
+    ----------
+    boxes1, boxes2 : torch.Tensor
+        `xyxy` boxes of the same shape (..., 4)
+
+    Returns
+    -------
+    torch.Tensor
+        GIoU of shape (...)
+    """
+    lt = torch.max(boxes1[..., :2], boxes2[..., :2])
+    rb = torch.min(boxes1[..., 2:], boxes2[..., 2:])
+    wh = (rb - lt).clamp(min=0)
+    inter = wh[..., 0] * wh[..., 1]
+    union = box_area(boxes1) + box_area(boxes2) - inter
+    iou = inter / union
+
+    lt = torch.min(boxes1[..., :2], boxes2[..., :2])
+    rb = torch.max(boxes1[..., 2:], boxes2[..., 2:])
+    wh = (rb - lt).clamp(min=0)
+    area = wh[..., 0] * wh[..., 1]
+    return iou - (area - union) / area
+
+
+def _grouped_nms(boxes: torch.Tensor, scores: torch.Tensor, groups: torch.Tensor, iou_threshold: float):
+    """NMS run independently on each group of boxes, in one call: the boxes of each group are offset so that the
+    boxes of two different groups never overlap. Returns the indices of the kept boxes."""
+    if len(boxes) == 0:
+        return torch.zeros((0,), dtype=torch.int64, device=boxes.device)
+    offsets = groups.to(boxes) * (boxes.max() - boxes.min() + 1)
+    return nms(boxes + offsets[:, None], scores, iou_threshold)
+
+
+def batched_nms(
+    boxes: torch.Tensor,
+    scores: torch.Tensor,
+    labels: Optional[torch.Tensor] = None,
+    mask: Optional[torch.Tensor] = None,
+    iou_threshold: float = 0.5,
+    method: str = "hard",
+    sigma: float = 0.5,
+    score_threshold: float = 0.001,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Class-aware NMS over all the frames of a batch at once: a box only suppresses the boxes of the same frame
+    and of the same label.
+
+    Parameters
+    ----------
+    boxes : torch.Tensor
+        `xyxy` boxes of shape (B, N, 4)
+    scores : torch.Tensor
+        Scores of shape (B, N)
+    labels : torch.Tensor | None
+        Integer labels of shape (B, N). None for a class-agnostic NMS.
+    mask : torch.Tensor | None
+        Boolean validity mask of shape (B, N). The padded boxes are never kept. None if all the boxes are valid.
+    iou_threshold : float
+        IoU above which the boxes are suppressed (`hard`) or their score decayed (`linear`)
+    method : str
+        `hard` for the standard NMS, `linear` or `gaussian` for the Soft-NMS (https://arxiv.org/abs/1704.04503),
+        that decays the scores of the overlapping boxes instead of suppressing them.
+    sigma : float
+        Parameter of the `gaussian` decay: `score * exp(-iou^2 / sigma)`
+    score_threshold : float
+        Soft-NMS only, the boxes with a decayed score below this threshold are suppressed
+
+    Returns
+    -------
+    keep : torch.Tensor
+        Boolean mask of shape (B, N) of the kept boxes
+    scores : torch.Tensor
+        Scores of shape (B, N): the input scores for the `hard` NMS, the decayed scores for the Soft-NMS
+    """
+    if method not in NMS_METHODS:
+        raise ValueError(f"Unknown NMS method {method}, should be one of {NMS_METHODS}")
+    n_frames, n_boxes = scores.shape
+    if mask is None:
+        mask = torch.ones_like(scores, dtype=torch.bool)
+    if labels is None:
+        labels = torch.zeros_like(scores, dtype=torch.int64)
+    labels = labels.long()
+
+    if method == "hard":
+        keep = torch.zeros_like(mask)
+        if n_boxes == 0:
+            return keep, scores
+        boxes, nms_scores = boxes.float(), scores.float()
+        if boxes.device.type == "cpu":
+            # The NMS is quadratic in the number of boxes: on CPU, one NMS per frame is faster than one on the batch
+            for b in range(n_frames):
+                valid = mask[b].nonzero()[:, 0]
+                kept = _grouped_nms(boxes[b, valid], nms_scores[b, valid], labels[b, valid], iou_threshold)
+                keep[b, valid[kept]] = True
+            return keep, scores
+        # One NMS group per (frame, label)
+        n_labels = int(labels.max()) + 1
+        groups = torch.arange(n_frames, device=boxes.device)[:, None] * n_labels + labels
+        valid = mask.nonzero(as_tuple=True)
+        kept = _grouped_nms(boxes[valid], nms_scores[valid], groups[valid], iou_threshold)
+        keep[valid[0][kept], valid[1][kept]] = True
+        return keep, scores
+
+    # Soft-NMS: greedy selection of the best remaining box of each frame, run on all the frames at once
+    iou = batched_box_iou(boxes, boxes)
+    iou = iou.masked_fill(labels[:, :, None] != labels[:, None, :], 0.0)
+    scores = scores.masked_fill(~mask, 0.0)
+    remaining = mask & (scores > score_threshold)
+    keep = torch.zeros_like(mask)
+    frames = torch.arange(n_frames, device=boxes.device)
+    for _ in range(n_boxes):
+        if not remaining.any():
+            break
+        best = scores.masked_fill(~remaining, -float("inf")).argmax(dim=1)
+        selected = remaining[frames, best]
+        keep[frames, best] |= selected
+        remaining[frames, best] = False
+
+        overlap = iou[frames, best]  # [B, N]
+        if method == "linear":
+            decay = torch.where(overlap > iou_threshold, 1 - overlap, torch.ones_like(overlap))
+        else:
+            decay = torch.exp(-(overlap ** 2) / sigma)
+        decay = torch.where(selected[:, None] & remaining, decay, torch.ones_like(decay))
+        scores = scores * decay
+        remaining &= scores > score_threshold
+    return keep, scores
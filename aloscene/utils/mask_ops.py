@@ -0,0 +1,66 @@
+"""Vectorized kernels on raw mask tensors.
+
+The masks are `torch.Tensor` of shape (..., N, H, W), all the leading dimensions being batch dimensions. The kernels
+run in one pass over the masks, on the device of the masks.
+"""
+from typing import Optional, Tuple
+
+import torch
+
+
+def masks_to_id_map(masks: torch.Tensor, categories: Optional[torch.Tensor] = None, void_id: int = -1) -> torch.Tensor:
+    """Panoptic id map of a set of masks: each pixel takes the index of the mask with the highest value, or `void_id`
+    if no mask is positive. On ties, the first mask wins.
+
+    Parameters
+    ----------
+    masks : torch.Tensor
+        Masks of shape (..., N, H, W)
+    categories : torch.Tensor | None
+        Integer category of each mask, of shape (..., N). If given, each pixel takes the category of its mask
+        instead of its index.
+    void_id : int
+        Value of the background pixels. The mask `i` has the id `void_id + 1 + i`.
+
+    Returns
+    -------
+    torch.Tensor
+        Long tensor of shape (..., H, W)
+    """
+    if masks.shape[-3] == 0:
+        return torch.full(masks.shape[:-3] + masks.shape[-2:], void_id, dtype=torch.int64, device=masks.device)
+    values, indices = masks.max(dim=-3)
+    ids = torch.where(values > 0, indices + 1, torch.zeros_like(indices))
+    if categories is None:
+        return ids + void_id
+
+    # Lookup table from the mask id (0 for the background) to its category
+    void = torch.full(categories.shape[:-1] + (1,), void_id, dtype=torch.int64, device=categories.device)
+    lut = torch.cat([void, categories.long()], dim=-1)
+    return torch.gather(lut, -1, ids.flatten(-2)).view_as(ids)
+
+
+def masks_centroids(masks: torch.Tensor, threshold: float = 0.5) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Area and center of mass of the pixels above `threshold` of each mask. Empty masks are centered on (0, 0).
+
+    Parameters
+    ----------
+    masks : torch.Tensor
+        Masks of shape (..., N, H, W)
+    threshold : float
+        Pixels above this value belong to the mask
+
+    Returns
+    -------
+    areas : torch.Tensor
+        Number of pixels of each mask, long tensor of shape (..., N)
+    centroids : torch.Tensor
+        (x, y) center of mass of each mask, float64 tensor of shape (..., N, 2)
+    """
+    n_masks = masks.shape[:-2]
+    instances, y, x = torch.nonzero((masks > threshold).reshape(-1, *masks.shape[-2:]), as_tuple=True)
+    areas = torch.bincount(instances, minlength=n_masks.numel())
+    sums_x = torch.bincount(instances, weights=x.to(torch.float64), minlength=n_masks.numel())
+    sums_y = torch.bincount(instances, weights=y.to(torch.float64), minlength=n_masks.numel())
+    centroids = torch.stack([sums_x, sums_y], dim=-1) / areas.clamp(min=1)[:, None]
+    return areas.view(n_masks), centroids.view(*n_masks, 2)
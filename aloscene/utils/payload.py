@@ -0,0 +1,217 @@
+"""Compact serialization of augmented tensors (and structures of augmented tensors) used to pass data
+from the DataLoader workers to the main process.
+
+The payload is made of a flat list of raw `torch.Tensor` (sent through shared memory by the torch
+multiprocessing pickler) and a small schema of python objects describing the augmented tensors: class,
+dim names, properties and children. On the main process side, the augmented tensors are rebuilt on top
+of the raw tensors, without any copy.
+
+Examples
+--------
+>>> payload = to_payload({"left": frame_left, "right": frame_right})
+>>> data = from_payload(payload)
+
+The same payload is used by :func:`to_device` to move a whole structure of augmented tensors to a device
+with one (non-blocking) copy per dtype, instead of one synchronous copy per tensor.
+
+>>> frames = to_device(frames, torch.device("cuda"))
+"""
+import torch
+
+from aloscene.tensors.augmented_tensor import AugmentedTensor
+from aloscene.tensors.lazy_child import LazyChild
+
+# Node tags of the payload schema
+_AUGMENTED_TENSOR = "augmented_tensor"
+_TENSOR = "tensor"
+_DICT = "dict"
+_LIST = "list"
+_TUPLE = "tuple"
+_VALUE = "value"
+
+
+def _raw_tensor(tensor: torch.Tensor):
+    """Return a plain unnamed torch.Tensor sharing the memory of `tensor`, and the names of `tensor`"""
+    with torch._C.DisableTorchFunction():
+        # Do not go through AugmentedTensor.__getattribute__ to not trigger the auto restore of the names
+        names = torch._C._TensorBase.names.__get__(tensor)
+        raw = tensor.as_subclass(torch.Tensor)
+        if any(n is not None for n in names):
+            raw = torch.Tensor.rename(raw, None)
+    return raw, names
+
+
+def _to_schema(data, tensors: list):
+    if isinstance(data, AugmentedTensor):
+        raw, names = _raw_tensor(data)
+        tensors.append(raw)
+        return (
+            _AUGMENTED_TENSOR,
+            {
+                "cls": type(data),
+                "tensor": len(tensors) - 1,
+                "names": names,
+                "properties": {name: data.__dict__[name] for name in data._property_list},
+                "child_property": data._child_property,
+                "children": {name: _to_schema(data.__dict__[name], tensors) for name in data._children_list},
+            },
+        )
+    elif isinstance(data, torch.Tensor):
+        raw, names = _raw_tensor(data)
+        tensors.append(raw)
+        return (_TENSOR, (len(tensors) - 1, names))
+    elif isinstance(data, LazyChild):
+        # The lazy children leaving the process are loaded (by the DataLoader workers)
+        return _to_schema(data.load(), tensors)
+    elif isinstance(data, dict):
+        return (_DICT, {key: _to_schema(value, tensors) for key, value in data.items()})
+    elif isinstance(data, list):
+        return (_LIST, [_to_schema(value, tensors) for value in data])
+    elif isinstance(data, tuple):
+        return (_TUPLE, [_to_schema(value, tensors) for value in data])
+    else:
+        return (_VALUE, data)
+
+
+def _from_schema(schema, tensors: list):
+    tag, node = schema
+    if tag == _AUGMENTED_TENSOR:
+        tensor = node["cls"]._wrap_zero_copy(tensors[node["tensor"]])
+        tensor = AugmentedTensor._init_augmented_tensor(tensor, node["names"])
+        tensor._property_list = list(node["properties"].keys())
+        for name, value in node["properties"].items():
+            setattr(tensor, name, value)
+        tensor._children_list = list(node["children"].keys())
+        tensor._child_property = node["child_property"]
+        for name, child in node["children"].items():
+            setattr(tensor, name, _from_schema(child, tensors))
+        return tensor
+    elif tag == _TENSOR:
+        idx, names = node
+        tensor = tensors[idx]
+        return tensor.rename(*names) if any(n is not None for n in names) else tensor
+    elif tag == _DICT:
+        return {key: _from_schema(value, tensors) for key, value in node.items()}
+    elif tag == _LIST:
+        return [_from_schema(value, tensors) for value in node]
+    elif tag == _TUPLE:
+        return tuple(_from_schema(value, tensors) for value in node)
+    else:
+        return node
+
+
+def to_payload(data) -> dict:
+    """Convert any structure (dict, list, tuple) of augmented tensors into a payload: a flat list of raw
+    tensors and a small schema describing the augmented tensors.
+
+    Parameters
+    ----------
+    data: AugmentedTensor | dict | list | tuple
+        Data to convert
+
+    Returns
+    -------
+    payload: dict
+        {"schema": schema, "tensors": list of torch.Tensor}
+    """
+    tensors = []
+    schema = _to_schema(data, tensors)
+    return {"schema": schema, "tensors": tensors}
+
+
+def from_payload(payload: dict):
+    """Rebuild the data converted with :func:`to_payload`. The augmented tensors are built on top of the
+    payload tensors, without any copy.
+
+    Parameters
+    ----------
+    payload: dict
+        Payload returned by :func:`to_payload`
+
+    Returns
+    -------
+    data: AugmentedTensor | dict | list | tuple
+    """
+    return _from_schema(payload["schema"], payload["tensors"])
+
+
+def _pack_tensors(tensors: list, pin_memory: bool = False):
+    """Copy the `tensors` into one flat host buffer per dtype.
+
+    Parameters
+    ----------
+    tensors: list of torch.Tensor
+        Host tensors to pack
+    pin_memory: bool
+        Allocate the buffers in page-locked memory, by default False
+
+    Returns
+    -------
+    buffers: dict
+        {dtype: flat buffer}
+    slices: list
+        (dtype, offset) of each tensor in its buffer
+    """
+    sizes = {}
+    slices = []
+    for tensor in tensors:
+        offset = sizes.get(tensor.dtype, 0)
+        slices.append((tensor.dtype, offset))
+        sizes[tensor.dtype] = offset + tensor.numel()
+    buffers = {dtype: torch.empty(size, dtype=dtype, pin_memory=pin_memory) for dtype, size in sizes.items()}
+    for tensor, (dtype, offset) in zip(tensors, slices):
+        buffers[dtype][offset : offset + tensor.numel()].view(tensor.shape).copy_(tensor)
+    return buffers, slices
+
+
+def _unpack_tensors(buffers: dict, slices: list, shapes: list):
+    """Split the buffers packed with :func:`_pack_tensors` back into tensors (views on the buffers)"""
+    return [
+        buffers[dtype][offset : offset + shape.numel()].view(shape) for (dtype, offset), shape in zip(slices, shapes)
+    ]
+
+
+def to_device(data, device, non_blocking: bool = True, pin_memory: bool = None):
+    """Move any structure (dict, list, tuple) of augmented tensors, children included, to `device`.
+
+    All the host tensors of the structure are gathered into one buffer per dtype, moved to the device with
+    a single copy per buffer, then the augmented tensors are rebuilt on top of views of the device buffers.
+    Tensors already on `device` are not moved.
+
+    Parameters
+    ----------
+    data: AugmentedTensor | dict | list | tuple
+        Data to move
+    device: torch.device | str
+        Target device
+    non_blocking: bool
+        Issue non-blocking copies, by default True
+    pin_memory: bool, optional
+        Gather the tensors into page-locked buffers. By default, pin the buffers if the target device is a cuda
+        device.
+
+    Returns
+    -------
+    data: AugmentedTensor | dict | list | tuple
+        Data on `device`
+    """
+    device = torch.device(device)
+    if pin_memory is None:
+        pin_memory = device.type == "cuda" and torch.cuda.is_available()
+    payload = to_payload(data)
+    tensors = payload["tensors"]
+
+    # Host tensors are packed together, tensors on other devices are moved one by one
+    packed = [i for i, t in enumerate(tensors) if t.device.type == "cpu" and t.device != device]
+    for i, tensor in enumerate(tensors):
+        if tensor.device.type != "cpu" and tensor.device != device:
+            tensors[i] = tensor.to(device, non_blocking=non_blocking)
+
+    if len(packed) > 0:
+        buffers, slices = _pack_tensors([tensors[i] for i in packed], pin_memory=pin_memory)
+        buffers = {dtype: buffer.to(device, non_blocking=non_blocking) for dtype, buffer in buffers.items()}
+        moved = _unpack_tensors(buffers, slices, [tensors[i].shape for i in packed])
+        for i, tensor in zip(packed, moved):
+            tensors[i] = tensor
+
+    return from_payload(payload)
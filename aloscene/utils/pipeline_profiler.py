@@ -0,0 +1,244 @@
+"""Per-stage timing of the data pipeline.
+
+The stages of the data pipeline are instrumented with :func:`profile_stage`:
+
+* `dataset/item`: whole `BaseDataset.__getitem__`, made of `dataset/getitem` (loading of the sample),
+  `dataset/transform_fn` and `dataset/rename_data_to_none`
+* `transform/<class name>`: call of each :class:`~alodataset.transforms.AloTransform` (nested in
+  `dataset/transform_fn`, the `Compose` stage including its children)
+* `batch_list`: :func:`~aloscene.tensors.SpatialAugmentedTensor.batch_list`
+
+Nothing is recorded until a :class:`PipelineProfiler` is started: the instrumentation then costs one global
+lookup per stage. Once started, the duration and the output size (bytes) of each stage are recorded in
+histograms. The DataLoader workers forked after the start of the profiler send their records to the main
+process after each top level stage, where they are aggregated by a collector thread.
+
+Examples
+--------
+>>> with PipelineProfiler() as profiler:
+...     for frames in dataset.train_loader(batch_size=8, num_workers=4):
+...         frames = aloscene.Frame.batch_list(frames)
+>>> profiler.stats()["dataset/getitem"]["mean_ms"]
+"""
+import contextlib
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+import torch
+
+# The histogram bin `b` holds the durations in [2 ** (b / BINS_PER_OCTAVE), 2 ** ((b + 1) / BINS_PER_OCTAVE)) µs
+BINS_PER_OCTAVE = 4
+N_BINS = 128
+
+_ACTIVE = None
+_NO_STAGE = contextlib.nullcontext()
+
+
+def data_nbytes(data) -> int:
+    """Number of bytes of the tensors of a structure of (augmented) tensors, children included. The lazy
+    children are not loaded (and not counted)."""
+    if isinstance(data, torch.Tensor):
+        with torch._C.DisableTorchFunction():
+            nbytes = data.element_size() * data.numel()
+        for name in getattr(data, "_children_list", ()):
+            nbytes += data_nbytes(data.__dict__.get(name))
+        return nbytes
+    elif isinstance(data, dict):
+        return sum(data_nbytes(value) for value in data.values())
+    elif isinstance(data, (list, tuple)):
+        return sum(data_nbytes(value) for value in data)
+    return 0
+
+
+def _add(stats: dict, name: str, duration: float, nbytes: int):
+    if name not in stats:
+        stats[name] = {"count": 0, "total_s": 0.0, "bytes": 0, "hist": {}}
+    stage = stats[name]
+    stage["count"] += 1
+    stage["total_s"] += duration
+    stage["bytes"] += nbytes
+    b = min(max(int(BINS_PER_OCTAVE * math.log2(max(duration * 1e6, 1.0))), 0), N_BINS - 1)
+    stage["hist"][b] = stage["hist"].get(b, 0) + 1
+
+
+def _merge(stats: dict, other: dict):
+    for name, other_stage in other.items():
+        if name not in stats:
+            stats[name] = {"count": 0, "total_s": 0.0, "bytes": 0, "hist": {}}
+        stage = stats[name]
+        stage["count"] += other_stage["count"]
+        stage["total_s"] += other_stage["total_s"]
+        stage["bytes"] += other_stage["bytes"]
+        for b, count in other_stage["hist"].items():
+            stage["hist"][b] = stage["hist"].get(b, 0) + count
+
+
+def _bin_ms(b: int, position: float = 0.5) -> float:
+    return 2 ** ((b + position) / BINS_PER_OCTAVE) / 1000
+
+
+def _percentile_ms(hist: dict, count: int, q: float) -> float:
+    """Percentile estimated at the (geometric) center of the histogram bin"""
+    cumulated = 0
+    for b in sorted(hist):
+        cumulated += hist[b]
+        if cumulated >= q * count:
+            return _bin_ms(b)
+    return 0.0
+
+
+def _summary(stage: dict) -> dict:
+    count, total = stage["count"], stage["total_s"]
+    return {
+        "count": count,
+        "total_s": total,
+        "mean_ms": 1000 * total / count,
+        "p50_ms": _percentile_ms(stage["hist"], count, 0.5),
+        "p90_ms": _percentile_ms(stage["hist"], count, 0.9),
+        "p99_ms": _percentile_ms(stage["hist"], count, 0.99),
+        "bytes": stage["bytes"],
+        "mb_per_s": stage["bytes"] / total / 1e6 if total > 0 else 0.0,
+        # Upper bound of the bin (ms) -> count
+        "histogram": {_bin_ms(b, 1.0): stage["hist"][b] for b in sorted(stage["hist"])},
+    }
+
+
+class _Stage(object):
+    __slots__ = ("profiler", "name", "nbytes", "start")
+
+    def __init__(self, profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self.nbytes = 0
+
+    def add_bytes(self, data):
+        """Count the bytes of `data` (structure of tensors) in the output size of the stage"""
+        self.nbytes += data_nbytes(data)
+
+    def __enter__(self):
+        self.profiler._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        self.profiler._depth -= 1
+        self.profiler._record(self.name, duration, self.nbytes)
+        return False
+
+
+def profile_stage(name: str):
+    """Context manager timing a stage of the data pipeline if a :class:`PipelineProfiler` is started.
+    Returns the stage (to count its output bytes with `stage.add_bytes(data)`), None if no profiler is started.
+
+    Examples
+    --------
+    >>> with profile_stage("dataset/getitem") as stage:
+    ...     data = self.getitem(idx)
+    ...     if stage is not None:
+    ...         stage.add_bytes(data)
+    """
+    if _ACTIVE is None:
+        return _NO_STAGE
+    return _Stage(_ACTIVE, name)
+
+
+def is_profiling() -> bool:
+    """True if a :class:`PipelineProfiler` is started"""
+    return _ACTIVE is not None
+
+
+class PipelineProfiler(object):
+    """Records the timings and the output sizes of the stages of the data pipeline (see :func:`profile_stage`),
+    on the main process and on the DataLoader workers forked after :func:`start`.
+
+    The workers started with another method than fork (ex: `multiprocessing_context="spawn"`) do not inherit the
+    started profiler and are not recorded.
+    """
+
+    def __init__(self):
+        self._main_pid = os.getpid()
+        self._stats = {}
+        self._lock = threading.Lock()
+        # Records of the current worker, not yet sent to the main process
+        self._pending = {}
+        self._depth = 0
+        self._queue = None
+        self._collector = None
+
+    def start(self):
+        """Start recording. Only one profiler can be started at a time."""
+        global _ACTIVE
+        if _ACTIVE is not None and _ACTIVE is not self:
+            raise RuntimeError("Another PipelineProfiler is already started.")
+        if self._queue is None:
+            self._queue = multiprocessing.Queue()
+            self._collector = threading.Thread(target=self._collect, daemon=True)
+            self._collector.start()
+        _ACTIVE = self
+        return self
+
+    def stop(self):
+        """Stop recording. The records of the workers still running are not received anymore."""
+        global _ACTIVE
+        if _ACTIVE is self:
+            _ACTIVE = None
+        if self._queue is not None:
+            self._queue.put(None)
+            self._collector.join()
+            self._queue.close()
+            self._queue, self._collector = None, None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _record(self, name: str, duration: float, nbytes: int):
+        if os.getpid() == self._main_pid:
+            with self._lock:
+                _add(self._stats, name, duration, nbytes)
+            return
+        _add(self._pending, name, duration, nbytes)
+        # In a worker, the records are sent once the top level stage is done
+        if self._depth == 0 and self._queue is not None:
+            self._queue.put(self._pending)
+            self._pending = {}
+
+    def _collect(self):
+        """Collector thread of the main process, merging the records of the workers"""
+        while True:
+            stats = self._queue.get()
+            if stats is None:
+                return
+            with self._lock:
+                _merge(self._stats, stats)
+
+    def stats(self) -> dict:
+        """Aggregated statistics of each stage: number of calls `count`, `total_s`, `mean_ms`, percentiles
+        `p50_ms`, `p90_ms` and `p99_ms` (estimated from the histogram), output size `bytes`, `mb_per_s` and
+        `histogram` (upper bound of the bin in ms -> count).
+        """
+        # Records already received but not yet merged by the collector thread
+        while self._queue is not None:
+            try:
+                stats = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if stats is None:
+                break
+            with self._lock:
+                _merge(self._stats, stats)
+        with self._lock:
+            return {name: _summary(stage) for name, stage in sorted(self._stats.items())}
+
+    def reset(self):
+        """Clear the recorded statistics"""
+        with self._lock:
+            self._stats = {}
@@ -0,0 +1,242 @@
+"""Run-length encoding of binary instance masks, and the spatial operations computed on the runs.
+
+A set of N masks of size (H, W) is encoded as an int32 array of shape (N, K): the lengths of the alternate
+background / foreground runs of each mask flattened in row-major order, starting with a background run (possibly
+empty). The rows are padded with zeros, a run of length zero being neutral. The trailing background is implicit.
+
+>>> rle.encode(np.array([[[0, 1, 1], [1, 0, 0]]], dtype=bool))
+array([[1, 3]], dtype=int32)
+
+The operations go through the foreground intervals [start, end) of each mask, or through its row segments
+(row, x0, x1) for the spatial operations: their cost depends on the number of runs and not on the number of
+pixels.
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+def _intervals(runs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Non empty foreground intervals (instance, start, end) of each mask, sorted by instance and start"""
+    runs = np.asarray(runs, dtype=np.int64)
+    ends = np.cumsum(runs, axis=1)
+    starts = ends - runs
+    fg_starts, fg_ends = starts[:, 1::2], ends[:, 1::2]
+    instances = np.broadcast_to(np.arange(len(runs))[:, None], fg_starts.shape)
+    keep = fg_ends > fg_starts
+    return instances[keep], fg_starts[keep], fg_ends[keep]
+
+
+def _runs(n_masks: int, instances: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Encode the disjoint foreground intervals of `n_masks` masks, sorted by instance and start. The contiguous
+    intervals are merged."""
+    if len(instances) > 0:
+        merged = np.concatenate([[False], (instances[1:] == instances[:-1]) & (starts[1:] == ends[:-1])])
+        first = ~merged
+        last = np.concatenate([first[1:], [True]])
+        instances, starts, ends = instances[first], starts[first], ends[last]
+
+    counts = np.bincount(instances, minlength=n_masks)
+    n_runs = 2 * int(counts.max()) if len(instances) > 0 else 0
+    runs = np.zeros((n_masks, n_runs), dtype=np.int32)
+    if len(instances) > 0:
+        rank = np.arange(len(instances)) - np.repeat(np.cumsum(counts) - counts, counts)
+        previous_ends = np.concatenate([[0], ends[:-1]])
+        previous_ends[rank == 0] = 0
+        runs[instances, 2 * rank] = starts - previous_ends
+        runs[instances, 2 * rank + 1] = ends - starts
+    return runs
+
+
+def _segments(instances: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int):
+    """Split the foreground intervals into row segments (instance, row, x0, x1)"""
+    first_rows = starts // width
+    n_rows = (ends - 1) // width - first_rows + 1
+    index = np.repeat(np.arange(len(instances)), n_rows)
+    rows = first_rows[index] + np.arange(len(index)) - np.repeat(np.cumsum(n_rows) - n_rows, n_rows)
+    x0 = np.maximum(starts[index] - rows * width, 0)
+    x1 = np.minimum(ends[index] - rows * width, width)
+    return instances[index], rows, x0, x1
+
+
+def _from_segments(n_masks: int, instances, rows, x0, x1, width: int) -> np.ndarray:
+    """Encode row segments (instance, row, x0, x1) of masks of width `width`. The empty segments are ignored."""
+    keep = x1 > x0
+    instances, rows, x0, x1 = instances[keep], rows[keep], x0[keep], x1[keep]
+    order = np.lexsort((x0, rows, instances))
+    instances, rows, x0, x1 = instances[order], rows[order], x0[order], x1[order]
+    return _runs(n_masks, instances, rows * width + x0, rows * width + x1)
+
+
+def _row_segments(runs: np.ndarray, width: int):
+    return _segments(*_intervals(runs), width)
+
+
+def encode(masks: np.ndarray) -> np.ndarray:
+    """Encode binary masks of shape (N, H, W)"""
+    n_masks = masks.shape[0]
+    flat = masks.reshape(n_masks, masks.shape[1] * masks.shape[2]).astype(np.int8)
+    padded = np.zeros((n_masks, flat.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = flat
+    changes = np.diff(padded, axis=1)
+    instances, starts = np.nonzero(changes == 1)
+    _, ends = np.nonzero(changes == -1)
+    return _runs(n_masks, instances, starts, ends)
+
+
+def encode_id_map(id_map: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Encode the masks `id_map == ids[i]` of an id map of shape (H, W), without building the dense masks"""
+    ids = np.asarray(ids).reshape(-1)
+    flat = id_map.reshape(-1)
+    if len(ids) == 0 or len(flat) == 0:
+        return np.zeros((len(ids), 0), dtype=np.int32)
+    changes = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    starts = np.concatenate([[0], changes])
+    ends = np.concatenate([changes, [len(flat)]])
+    values = flat[starts]
+
+    # Instance of each run of constant value
+    order = np.argsort(ids, kind="stable")
+    position = np.minimum(np.searchsorted(ids[order], values), len(ids) - 1)
+    valid = ids[order][position] == values
+    instances = order[position][valid]
+    sort = np.argsort(instances, kind="stable")
+    return _runs(len(ids), instances[sort], starts[valid][sort], ends[valid][sort])
+
+
+def decode(runs: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+    """Decode the masks to a boolean array of shape (N, H, W)"""
+    height, width = frame_size
+    instances, starts, ends = _intervals(runs)
+    if len(starts) <= len(runs) * height:
+        # Few intervals (the usual case, about one per row or less): fill them as slices of the flat masks
+        masks = np.zeros(len(runs) * height * width, dtype=bool)
+        offsets = instances.astype(np.int64) * (height * width)
+        for start, end in zip((starts + offsets).tolist(), (ends + offsets).tolist()):
+            masks[start:end] = True
+        return masks.reshape(len(runs), height, width)
+    delta = np.zeros((len(runs), height * width + 1), dtype=np.int8)
+    delta[instances, starts] += 1
+    delta[instances, ends] -= 1
+    masks = np.cumsum(delta[:, :-1], axis=1, dtype=np.int8) > 0
+    return masks.reshape(len(runs), height, width)
+
+
+def area(runs: np.ndarray) -> np.ndarray:
+    """Number of foreground pixels of each mask"""
+    return np.asarray(runs, dtype=np.int64)[:, 1::2].sum(axis=1)
+
+
+def intersection(runs1: np.ndarray, runs2: np.ndarray) -> np.ndarray:
+    """Number of pixels of the intersection of each pair of masks, array of shape (N, M)"""
+    if len(runs2) > len(runs1):
+        return intersection(runs2, runs1).T
+    inter = np.zeros((len(runs1), len(runs2)), dtype=np.int64)
+    instances1, starts1, ends1 = _intervals(runs1)
+    instances2, starts2, ends2 = _intervals(runs2)
+    bounds2 = np.concatenate([[0], np.cumsum(np.bincount(instances2, minlength=len(runs2)))])
+
+    for j in range(len(runs2)):
+        starts, ends = starts2[bounds2[j] : bounds2[j + 1]], ends2[bounds2[j] : bounds2[j + 1]]
+        if len(starts) == 0 or len(instances1) == 0:
+            continue
+        cumulated = np.concatenate([[0], np.cumsum(ends - starts)])
+
+        def coverage(x):
+            """Number of foreground pixels of the mask j before each position x"""
+            k = np.searchsorted(starts, x, side="right") - 1
+            kc = np.maximum(k, 0)
+            covered = cumulated[kc] + np.clip(x - starts[kc], 0, ends[kc] - starts[kc])
+            return np.where(k >= 0, covered, 0)
+
+        inter[:, j] = np.bincount(instances1, weights=coverage(ends1) - coverage(starts1), minlength=len(runs1))
+    return inter
+
+
+def iou(runs1: np.ndarray, runs2: np.ndarray) -> np.ndarray:
+    """IoU of each pair of masks, array of shape (N, M)"""
+    inter = intersection(runs1, runs2)
+    union = area(runs1)[:, None] + area(runs2)[None, :]
+    union = np.where(union == 0, 0.001, union)  # Avoid divide by 0
+    return inter / (union - inter)
+
+
+def hflip(runs: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+    width = frame_size[1]
+    instances, rows, x0, x1 = _row_segments(runs, width)
+    return _from_segments(len(runs), instances, rows, width - x1, width - x0, width)
+
+
+def vflip(runs: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+    height, width = frame_size
+    instances, rows, x0, x1 = _row_segments(runs, width)
+    return _from_segments(len(runs), instances, height - 1 - rows, x0, x1, width)
+
+
+def crop(runs: np.ndarray, frame_size: Tuple[int, int], H_crop: Tuple[int, int], W_crop: Tuple[int, int]):
+    """Crop the masks to the rows [H_crop[0], H_crop[1]) and columns [W_crop[0], W_crop[1])"""
+    width = frame_size[1]
+    (hmin, hmax), (wmin, wmax) = H_crop, W_crop
+    instances, rows, x0, x1 = _row_segments(runs, width)
+    keep = (rows >= hmin) & (rows < hmax)
+    new_width = wmax - wmin
+    x0 = np.clip(x0[keep] - wmin, 0, new_width)
+    x1 = np.clip(x1[keep] - wmin, 0, new_width)
+    return _from_segments(len(runs), instances[keep], rows[keep] - hmin, x0, x1, new_width)
+
+
+def pad(runs: np.ndarray, frame_size: Tuple[int, int], pad_y: Tuple[int, int], pad_x: Tuple[int, int]):
+    """Pad the masks with `pad_y` (top, bottom) rows and `pad_x` (left, right) columns of background"""
+    width = frame_size[1]
+    instances, rows, x0, x1 = _row_segments(runs, width)
+    new_width = width + pad_x[0] + pad_x[1]
+    return _from_segments(len(runs), instances, rows + pad_y[0], x0 + pad_x[0], x1 + pad_x[0], new_width)
+
+
+def resize(runs: np.ndarray, frame_size: Tuple[int, int], size: Tuple[int, int]) -> np.ndarray:
+    """Nearest neighbor resize of the masks to `size` (H, W): the output pixel (y, x) is the input pixel
+    (floor(y * H_in / H_out), floor(x * W_in / W_out)), as `torch.nn.functional.interpolate(mode="nearest")`"""
+    (height, width), (new_height, new_width) = frame_size, size
+    instances, rows, x0, x1 = _row_segments(runs, width)
+
+    def first_output(x, size_in, size_out):
+        """First output index whose nearest input index is >= x"""
+        return -((-x * size_out) // size_in)
+
+    x0, x1 = first_output(x0, width, new_width), first_output(x1, width, new_width)
+    row0, row1 = first_output(rows, height, new_height), first_output(rows + 1, height, new_height)
+    # Each input row is repeated on the output rows [row0, row1)
+    n_rows = row1 - row0
+    index = np.repeat(np.arange(len(rows)), n_rows)
+    new_rows = row0[index] + np.arange(len(index)) - np.repeat(np.cumsum(n_rows) - n_rows, n_rows)
+    return _from_segments(len(runs), instances[index], new_rows, x0[index], x1[index], new_width)
+
+
+def bounding_boxes(runs: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+    """Boxes (x_min, y_min, x_max, y_max) around the masks, with the max coordinates included in the masks
+    (as :func:`alodataset.utils.panoptic_utils.masks_to_boxes`). Zeros for the empty masks."""
+    instances, rows, x0, x1 = _row_segments(runs, frame_size[1])
+    boxes = np.zeros((len(runs), 4), dtype=np.float32)
+    if len(instances) == 0:
+        return boxes
+    # The segments are sorted by instance and row
+    firsts = np.flatnonzero(np.concatenate([[True], instances[1:] != instances[:-1]]))
+    lasts = np.concatenate([firsts[1:], [len(instances)]]) - 1
+    present = instances[firsts]
+    boxes[present, 0] = np.minimum.reduceat(x0, firsts)
+    boxes[present, 1] = rows[firsts]
+    boxes[present, 2] = np.maximum.reduceat(x1, firsts) - 1
+    boxes[present, 3] = rows[lasts]
+    return boxes
+
+
+def id_map(runs: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+    """Map of shape (H, W) of the index + 1 of the first mask covering each pixel, 0 for the background"""
+    height, width = frame_size
+    instances, starts, ends = _intervals(runs)
+    lengths = ends - starts
+    positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+    ids = np.full(height * width, len(runs) + 1, dtype=np.int64)
+    np.minimum.at(ids, positions, np.repeat(instances + 1, lengths))
+    ids[ids == len(runs) + 1] = 0
+    return ids.reshape(height, width)
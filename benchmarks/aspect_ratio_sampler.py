@@ -0,0 +1,95 @@
+"""Benchmark of the :class:`~alodataset.AspectRatioBucketSampler`: padding ratio of the batches built by
+:func:`~aloscene.Frame.batch_list` and effective throughput (real pixels per second, padding excluded) of a small
+convolutional backbone, with random batches and with aspect ratio bucketed batches.
+
+The image sizes mimic COCO / CrowdHuman: the longest side is fixed and the aspect ratio (W / H) is drawn among
+the usual ones (portrait, square, 4:3, 16:9, panoramas).
+
+Usage:
+    python benchmarks/aspect_ratio_sampler.py --n_images 512 --batch_size 8 --max_size 320
+"""
+from argparse import ArgumentParser
+import time
+
+import numpy as np
+import torch
+
+import aloscene
+from alodataset import AspectRatioBucketSampler
+
+
+ASPECT_RATIOS = [0.5, 0.75, 1.0, 4 / 3, 16 / 9, 2.5]
+
+
+class SizeDataset(torch.utils.data.Dataset):
+    def __init__(self, sizes):
+        self.sizes = sizes
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __getitem__(self, idx):
+        height, width = self.sizes[idx]
+        return aloscene.Frame(torch.rand(3, height, width), names=("C", "H", "W"))
+
+    def get_item_sizes(self):
+        return self.sizes
+
+
+def run_epoch(dataset, sampler, batch_size, backbone):
+    indices = list(sampler)
+    pixels, padded, duration = 0, 0, 0.0
+    for start in range(0, len(indices) - batch_size + 1, batch_size):
+        frames = aloscene.Frame.batch_list([dataset[idx] for idx in indices[start : start + batch_size]])
+        pixels += int((~frames.mask.as_tensor().bool()).sum())
+        padded += frames.mask.as_tensor().numel()
+        begin = time.perf_counter()
+        with torch.no_grad():
+            backbone(frames.as_tensor())
+        duration += time.perf_counter() - begin
+    return 1 - pixels / padded, pixels / duration
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_images", type=int, default=512, help="Number of images (default: %(default)s)")
+    parser.add_argument("--batch_size", type=int, default=8, help="Batch size (default: %(default)s)")
+    parser.add_argument("--max_size", type=int, default=320, help="Longest side of the images (default: %(default)s)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    aspect_ratios = rng.choice(ASPECT_RATIOS, size=args.n_images)
+    sizes = np.stack(
+        [
+            np.where(aspect_ratios >= 1, args.max_size / aspect_ratios, args.max_size),
+            np.where(aspect_ratios >= 1, args.max_size, args.max_size * aspect_ratios),
+        ],
+        axis=1,
+    ).astype(np.int64)
+    dataset = SizeDataset(sizes)
+
+    torch.manual_seed(0)
+    backbone = torch.nn.Sequential(
+        torch.nn.Conv2d(3, 32, 3, stride=2, padding=1),
+        torch.nn.ReLU(),
+        torch.nn.Conv2d(32, 64, 3, stride=2, padding=1),
+        torch.nn.ReLU(),
+        torch.nn.Conv2d(64, 64, 3, stride=2, padding=1),
+    ).eval()
+
+    # Random batches: a single bucket
+    random_sampler = AspectRatioBucketSampler(dataset, batch_size=args.batch_size, bucket_bounds=[])
+    bucket_sampler = AspectRatioBucketSampler(dataset, batch_size=args.batch_size)
+    print(f"{args.n_images} images, batch size {args.batch_size}, longest side {args.max_size}")
+    random_estimate, bucket_estimate = random_sampler.padding_ratio(), bucket_sampler.padding_ratio()
+    print(f"estimated padding: random {random_estimate:.1%}  buckets {bucket_estimate:.1%}")
+
+    random_padding, random_speed = run_epoch(dataset, random_sampler, args.batch_size, backbone)
+    bucket_padding, bucket_speed = run_epoch(dataset, bucket_sampler, args.batch_size, backbone)
+    print(f"random : padding {random_padding:6.1%}  {random_speed / 1e6:6.2f} Mpixels/s")
+    speedup = bucket_speed / random_speed
+    print(f"buckets: padding {bucket_padding:6.1%}  {bucket_speed / 1e6:6.2f} Mpixels/s  ({speedup:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Micro-benchmark of the AugmentedTensor construction: default (copy) path vs `zero_copy=True`.
+
+Report, for each resolution and each augmented tensor class, the mean time per construction and the
+number of bytes allocated by torch during one construction.
+
+Usage:
+    python benchmarks/augmented_tensor_construction.py --device cpu --n_iter 20
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+from torch.profiler import profile, ProfilerActivity
+
+import aloscene
+
+RESOLUTIONS = {"1080p": (1080, 1920), "4K": (2160, 3840)}
+
+# class, number of channels, dim names
+CLASSES = [
+    (aloscene.Frame, 3, ("C", "H", "W")),
+    (aloscene.Depth, 1, ("C", "H", "W")),
+    (aloscene.Flow, 2, ("C", "H", "W")),
+    (aloscene.Disparity, 1, ("C", "H", "W")),
+    (aloscene.Mask, 1, ("N", "H", "W")),
+]
+
+
+def _sync(device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def time_construction(cls, x, names, device, zero_copy, n_iter):
+    """Mean time (in ms) to build `cls` from `x`"""
+    cls(x, names=names, device=device, zero_copy=zero_copy)  # warmup
+    _sync(device)
+    start = time.perf_counter()
+    for _ in range(n_iter):
+        cls(x, names=names, device=device, zero_copy=zero_copy)
+    _sync(device)
+    return (time.perf_counter() - start) * 1000 / n_iter
+
+
+def allocated_bytes(cls, x, names, device, zero_copy):
+    """Number of bytes allocated by torch while building `cls` from `x`"""
+    activities = [ProfilerActivity.CPU] + ([ProfilerActivity.CUDA] if device.type == "cuda" else [])
+    with profile(activities=activities, profile_memory=True) as prof:
+        cls(x, names=names, device=device, zero_copy=zero_copy)
+    total = 0
+    for event in prof.events():
+        mem = event.cpu_memory_usage if device.type == "cpu" else event.cuda_memory_usage
+        # Only count allocations (positive usage) made by the leaf events
+        if mem > 0 and len(event.cpu_children) == 0:
+            total += mem
+    return total
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu", help="Target device (default: %(default)s)")
+    parser.add_argument("--n_iter", type=int, default=20, help="Iterations per measure (default: %(default)s)")
+    args = parser.parse_args()
+    device = torch.device(args.device)
+
+    print(f"{'resolution':<11}{'class':<11}{'mode':<11}{'ms/build':>10}{'MB alloc':>10}")
+    for res_name, (h, w) in RESOLUTIONS.items():
+        for cls, c, names in CLASSES:
+            x = torch.rand(c, h, w, device=device)
+            for zero_copy in [False, True]:
+                mode = "zero_copy" if zero_copy else "copy"
+                ms = time_construction(cls, x, names, device, zero_copy, args.n_iter)
+                mb = allocated_bytes(cls, x, names, device, zero_copy) / 1e6
+                print(f"{res_name:<11}{cls.__name__:<11}{mode:<11}{ms:>10.3f}{mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark of the torch ops throughput on augmented tensors compared to plain `torch.Tensor`.
+
+Elementwise ops go through the `AugmentedTensor.__torch_function__` fast path, other ops through the
+generic path (labels & properties bookkeeping).
+
+Usage:
+    python benchmarks/augmented_tensor_ops.py --size 3 128 128 --n_iter 2000
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+import aloscene
+
+OPS = {
+    "mul (elementwise)": lambda t: t * 2.0,
+    "add (elementwise)": lambda t: t + t,
+    "clamp (elementwise)": lambda t: t.clamp(0.1, 0.9),
+    "lt (elementwise)": lambda t: t < 0.5,
+    "transpose (generic)": lambda t: t.transpose(-1, -2),
+}
+
+
+def ops_per_second(op, tensor, n_iter):
+    op(tensor)  # warmup
+    start = time.perf_counter()
+    for _ in range(n_iter):
+        op(tensor)
+    return n_iter / (time.perf_counter() - start)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--size", type=int, nargs=3, default=[3, 128, 128], help="C H W (default: %(default)s)")
+    parser.add_argument("--n_iter", type=int, default=2000, help="Iterations per op (default: %(default)s)")
+    args = parser.parse_args()
+
+    tensor = torch.rand(*args.size)
+    frame = aloscene.Frame(tensor.clone(), normalization="01")
+    labeled_frame = frame.clone()
+    labeled_frame.append_flow(aloscene.Flow(torch.zeros(2, *args.size[1:])))
+    labeled_frame.append_boxes2d(aloscene.BoundingBoxes2D([[0.5, 0.5, 0.2, 0.2]], boxes_format="xcyc", absolute=False))
+
+    print(f"{'op':<22}{'Tensor op/s':>14}{'Frame op/s':>14}{'Frame+labels op/s':>20}")
+    for name, op in OPS.items():
+        t = ops_per_second(op, tensor, args.n_iter)
+        f = ops_per_second(op, frame, args.n_iter)
+        lf = ops_per_second(op, labeled_frame, args.n_iter)
+        print(f"{name:<22}{t:>14.0f}{f:>14.0f}{lf:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
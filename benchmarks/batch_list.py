@@ -0,0 +1,49 @@
+"""Benchmark of `SpatialAugmentedTensor.batch_list` on DETR-like batches: frames of random sizes with
+boxes2d & labels attached.
+
+Usage:
+    python benchmarks/batch_list.py --batch_size 16 --n_iter 10
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+import aloscene
+
+
+def get_frames(batch_size, max_size, n_boxes, normalization):
+    frames = []
+    for _ in range(batch_size):
+        h, w = torch.randint(max_size // 2, max_size, (2,)).tolist()
+        frame = aloscene.Frame(torch.rand(3, h, w), normalization="01")
+        frame = frame.norm_resnet() if normalization == "resnet" else frame
+        labels = aloscene.Labels(torch.randint(0, 80, (n_boxes,)).float(), names=("N",), encoding="id")
+        boxes = aloscene.BoundingBoxes2D(
+            torch.rand(n_boxes, 4) * 0.5, boxes_format="xcyc", absolute=False, labels=labels
+        )
+        frame.append_boxes2d(boxes)
+        frames.append(frame)
+    return frames
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--batch_size", type=int, default=16, help="Batch size (default: %(default)s)")
+    parser.add_argument("--max_size", type=int, default=1333, help="Max frame H/W (default: %(default)s)")
+    parser.add_argument("--n_boxes", type=int, default=20, help="Boxes per frame (default: %(default)s)")
+    parser.add_argument("--n_iter", type=int, default=10, help="Iterations (default: %(default)s)")
+    args = parser.parse_args()
+
+    for normalization in ["01", "resnet"]:
+        frames = get_frames(args.batch_size, args.max_size, args.n_boxes, normalization)
+        aloscene.batch_list(frames)  # warmup
+        start = time.perf_counter()
+        for _ in range(args.n_iter):
+            aloscene.batch_list(frames)
+        ms = (time.perf_counter() - start) * 1000 / args.n_iter
+        print(f"normalization={normalization:<7} batch_size={args.batch_size}: {ms:.1f} ms/batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark of the batched box kernels (:mod:`aloscene.utils.box_ops`) against the per-frame loops on
+:class:`~aloscene.BoundingBoxes2D`: IoU / GIoU matrices between the predictions and the targets of each frame of a
+batch, and class-aware NMS of the predictions of each frame.
+
+Usage:
+    python benchmarks/batched_box_ops.py --batch_size 16 --n_queries 100 --n_targets 20 --n_classes 10
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+from aloscene import BoundingBoxes2D
+from aloscene.utils import box_ops
+
+
+def random_boxes(n_boxes):
+    xy = torch.rand(n_boxes, 2) * 0.8
+    wh = torch.rand(n_boxes, 2) * 0.2 + 0.01
+    return BoundingBoxes2D(torch.cat([xy + wh / 2, wh], dim=1), boxes_format="xcyc", absolute=False)
+
+
+def timed(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--batch_size", type=int, default=16, help="Frames per batch (default: %(default)s)")
+    parser.add_argument("--n_queries", type=int, default=100, help="Predictions per frame (default: %(default)s)")
+    parser.add_argument("--n_targets", type=int, default=20, help="Max targets per frame (default: %(default)s)")
+    parser.add_argument("--n_classes", type=int, default=10, help="Number of classes (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetitions (default: %(default)s)")
+    args = parser.parse_args()
+    torch.manual_seed(0)
+
+    preds = [random_boxes(args.n_queries) for _ in range(args.batch_size)]
+    targets = [random_boxes(int(n)) for n in torch.randint(1, args.n_targets + 1, (args.batch_size,))]
+    scores = torch.rand(args.batch_size, args.n_queries)
+    labels = torch.randint(0, args.n_classes, (args.batch_size, args.n_queries))
+    print(f"{args.batch_size} frames, {args.n_queries} predictions, up to {args.n_targets} targets per frame")
+
+    def padded():
+        return BoundingBoxes2D.pad_list(preds), BoundingBoxes2D.pad_list(targets)
+
+    (p_boxes, p_mask), (t_boxes, t_mask) = padded()
+    benchmarks = {
+        "IoU": (
+            lambda: [p.iou_with(t) for p, t in zip(preds, targets)],
+            lambda: box_ops.batched_box_iou(p_boxes, t_boxes, p_mask, t_mask),
+        ),
+        "GIoU": (
+            lambda: [p.giou_with(t) for p, t in zip(preds, targets)],
+            lambda: box_ops.batched_box_giou(p_boxes, t_boxes, p_mask, t_mask),
+        ),
+        "NMS": (
+            lambda: [p.nms(scores[b], 0.5, labels=labels[b]) for b, p in enumerate(preds)],
+            lambda: box_ops.batched_nms(p_boxes, scores, labels, p_mask, iou_threshold=0.5),
+        ),
+        "Soft-NMS": (
+            lambda: [
+                box_ops.batched_nms(p._xyxy_tensor()[None], scores[b : b + 1], labels[b : b + 1], method="gaussian")
+                for b, p in enumerate(preds)
+            ],
+            lambda: box_ops.batched_nms(p_boxes, scores, labels, p_mask, method="gaussian"),
+        ),
+    }
+    print(f"{'padding':10s} {timed(padded, args.repeat) * 1000:8.3f} ms")
+    for name, (loop, batched) in benchmarks.items():
+        loop_time, batched_time = timed(loop, args.repeat), timed(batched, args.repeat)
+        print(
+            f"{name:10s} per frame {loop_time * 1000:8.3f} ms  batched {batched_time * 1000:8.3f} ms"
+            f"  speedup {loop_time / batched_time:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
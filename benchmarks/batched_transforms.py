@@ -0,0 +1,70 @@
+"""Benchmark of the augmentations applied per sample (default `AloTransform.__call__`) vs applied once
+on the collated batch (`batched=True`).
+
+Usage:
+    python benchmarks/batched_transforms.py --device cpu --batch_size 8 --seq_len 2 --n_iter 5
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+import aloscene
+from alodataset import transforms as T
+
+TRANSFORMS = {
+    "Resize": lambda: T.Resize((240, 320)),
+    "RandomHorizontalFlip": lambda: T.RandomHorizontalFlip(),
+    "ColorJitter": lambda: T.ColorJitter(same_on_sequence=False),
+    "RealisticNoise": lambda: T.RealisticNoise(),
+    "CustomRandomColoring": lambda: T.CustomRandomColoring(),
+}
+
+
+def _sync(device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def get_frames(batch_size, seq_len, size, device):
+    frames = []
+    for _ in range(batch_size):
+        frame = aloscene.Frame(torch.rand(seq_len, 3, *size), names=("T", "C", "H", "W"), normalization="01")
+        boxes = aloscene.BoundingBoxes2D(torch.rand(20, 4) * 0.5, boxes_format="xcyc", absolute=False)
+        frame.append_boxes2d([boxes] * seq_len, "gt")
+        frames.append(frame.to(device))
+    return frames
+
+
+def time_transform(fn, n_iter, device):
+    """Mean time (in ms) of `fn`"""
+    fn()  # warmup
+    _sync(device)
+    start = time.perf_counter()
+    for _ in range(n_iter):
+        fn()
+    _sync(device)
+    return (time.perf_counter() - start) * 1000 / n_iter
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu", help="Device (default: %(default)s)")
+    parser.add_argument("--batch_size", type=int, default=8, help="Batch size (default: %(default)s)")
+    parser.add_argument("--seq_len", type=int, default=2, help="Size of the T dim (default: %(default)s)")
+    parser.add_argument("--n_iter", type=int, default=5, help="Iterations per measure (default: %(default)s)")
+    args = parser.parse_args()
+    device = torch.device(args.device)
+
+    frames = get_frames(args.batch_size, args.seq_len, (480, 640), device)
+    batch = aloscene.Frame.batch_list(frames)
+    print(f"{'transform':<22}{'per sample ms':>15}{'batched ms':>12}")
+    for name, build in TRANSFORMS.items():
+        transform = build()
+        per_sample = time_transform(lambda: [transform(frame) for frame in frames], args.n_iter, device)
+        batched = time_transform(lambda: transform(batch, batched=True), args.n_iter, device)
+        print(f"{name:<22}{per_sample:>15.2f}{batched:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark of the annotations loading of a COCO-like dataset: `pycocotools.COCO` against the
+memory-mapped :class:`~alodataset.utils.coco_index.CocoIndex` (compilation, then loading), with the
+class filtering of `CocoBaseDataset`.
+
+Usage:
+    python benchmarks/coco_index.py --n_images 20000 --anns_per_image 7
+"""
+from argparse import ArgumentParser
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+from pycocotools.coco import COCO
+
+from alodataset.utils.coco_index import CocoIndex
+
+
+def write_annotations(path, n_images, anns_per_image, n_categories=80):
+    rng = np.random.RandomState(0)
+    images = [{"id": i, "file_name": f"{i:012d}.jpg", "height": 480, "width": 640} for i in range(n_images)]
+    annotations = []
+    for image in images:
+        for _ in range(rng.poisson(anns_per_image)):
+            x, y, w, h = (rng.rand(4) * [500, 400, 140, 80]).round(2).tolist()
+            annotations.append(
+                {
+                    "id": len(annotations),
+                    "image_id": image["id"],
+                    "category_id": int(rng.randint(1, n_categories + 1)),
+                    "bbox": [x, y, w, h],
+                    "area": w * h,
+                    "iscrowd": 0,
+                    "segmentation": [[x, y, x + w, y, x + w, y + h, x, y + h]],
+                }
+            )
+    categories = [{"id": c, "name": f"class_{c}", "supercategory": "object"} for c in range(1, n_categories + 1)]
+    with open(path, "w") as f:
+        json.dump({"images": images, "annotations": annotations, "categories": categories}, f)
+    return len(annotations)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def filter_loop(coco, valid_categories):
+    """Class filtering of CocoBaseDataset without the index"""
+    ids = []
+    for i in sorted(coco.getImgIds()):
+        target = coco.loadAnns(coco.getAnnIds(i))
+        if any([valid_categories[ann["category_id"]] for ann in target]):
+            ids.append(i)
+    return ids
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_images", type=int, default=20000, help="Number of images (default: %(default)s)")
+    parser.add_argument("--anns_per_image", type=int, default=7, help="Mean boxes per image (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ann_file = os.path.join(tmp_dir, "annotations.json")
+        n_anns = write_annotations(ann_file, args.n_images, args.anns_per_image)
+        print(f"{args.n_images} images, {n_anns} annotations ({os.path.getsize(ann_file) / 1e6:.1f} MB)")
+
+        valid_categories = np.zeros(81, dtype=bool)
+        valid_categories[[1, 2, 3]] = True
+
+        coco, load_time = timed(lambda: COCO(ann_file))
+        ids, filter_time = timed(lambda: filter_loop(coco, valid_categories))
+        print(f"pycocotools  : load {load_time * 1000:8.1f} ms  filter {filter_time * 1000:8.1f} ms")
+
+        _, build_time = timed(lambda: CocoIndex.load(ann_file))
+        index, load_time = timed(lambda: CocoIndex.load(ann_file))
+        index_ids, filter_time = timed(lambda: index.images_with_categories(valid_categories))
+        assert index_ids == ids
+        print(f"CocoIndex    : load {load_time * 1000:8.1f} ms  filter {filter_time * 1000:8.1f} ms")
+        print(f"               (compiled once in {build_time * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
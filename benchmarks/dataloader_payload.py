@@ -0,0 +1,75 @@
+"""Benchmark of the DataLoader throughput (samples/s) with and without the `detached_payload` mode, on
+synthetic COCO-like detection samples (frame + boxes2d with multiple label sets + segmentation masks).
+
+Usage:
+    python benchmarks/dataloader_payload.py --n_samples 256 --workers 0 4 16
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+import aloscene
+from alodataset import BaseDataset
+
+
+class SyntheticCocoDataset(BaseDataset):
+    """COCO-like samples generated on the fly"""
+
+    def __init__(self, n_samples=256, size=(480, 640), n_boxes=20, **kwargs):
+        super().__init__(name="synthetic_coco", **kwargs)
+        self.items = list(range(n_samples))
+        self.size = size
+        self.n_boxes = n_boxes
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        h, w = self.size
+        frame = aloscene.Frame(torch.randint(0, 255, (3, h, w)).float())
+        boxes = torch.rand(self.n_boxes, 4) * 0.5
+        boxes2d = aloscene.BoundingBoxes2D(boxes, boxes_format="xcyc", absolute=False, frame_size=(h, w))
+        segmentation = aloscene.Mask(torch.zeros(self.n_boxes, h // 4, w // 4), names=("N", "H", "W"))
+        for element in [boxes2d, segmentation]:
+            for name in ["category", "supercategory", "iscrowd"]:
+                labels = aloscene.Labels(torch.randint(0, 80, (self.n_boxes,)).float(), names=("N",), encoding="id")
+                element.append_labels(labels, name=name)
+        frame.append_boxes2d(boxes2d)
+        frame.append_segmentation(segmentation)
+        return frame
+
+
+def samples_per_second(dataset, num_workers, detached_payload, batch_size):
+    loader = dataset.train_loader(
+        batch_size=batch_size,
+        num_workers=num_workers,
+        sampler=torch.utils.data.SequentialSampler,
+        detached_payload=detached_payload,
+    )
+    n_samples = 0
+    start = time.perf_counter()
+    for frames in loader:
+        n_samples += len(frames)
+    return n_samples / (time.perf_counter() - start)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_samples", type=int, default=256, help="Number of samples (default: %(default)s)")
+    parser.add_argument("--batch_size", type=int, default=4, help="Batch size (default: %(default)s)")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[0, 4, 16], help="Number of workers to test (default: %(default)s)"
+    )
+    args = parser.parse_args()
+
+    dataset = SyntheticCocoDataset(n_samples=args.n_samples)
+    print(f"{'workers':<10}{'pickle samples/s':>18}{'payload samples/s':>20}")
+    for num_workers in args.workers:
+        default = samples_per_second(dataset, num_workers, False, args.batch_size)
+        payload = samples_per_second(dataset, num_workers, True, args.batch_size)
+        print(f"{num_workers:<10}{default:>18.1f}{payload:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
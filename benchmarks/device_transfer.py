@@ -0,0 +1,51 @@
+"""Benchmark of the host to device transfer of a batch of frames: `Frame.to` (one synchronous copy per
+tensor of the frame tree) vs :func:`aloscene.utils.payload.to_device` (pinned buffers, one non-blocking copy
+per dtype).
+
+Usage:
+    python benchmarks/device_transfer.py --device cuda --batch_size 8 --n_iter 20
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+from aloscene.utils.payload import to_device
+from dataloader_payload import SyntheticCocoDataset
+
+
+def _sync(device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def time_transfer(transfer, frames, device, n_iter):
+    """Mean time (in ms) to move `frames` to `device`"""
+    transfer(frames, device)  # warmup
+    _sync(device)
+    start = time.perf_counter()
+    for _ in range(n_iter):
+        transfer(frames, device)
+    _sync(device)
+    return (time.perf_counter() - start) * 1000 / n_iter
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--device", type=str, default="cuda", help="Target device (default: %(default)s)")
+    parser.add_argument("--batch_size", type=int, default=8, help="Batch size (default: %(default)s)")
+    parser.add_argument("--n_iter", type=int, default=20, help="Iterations per measure (default: %(default)s)")
+    args = parser.parse_args()
+    device = torch.device(args.device)
+
+    dataset = SyntheticCocoDataset(n_samples=args.batch_size)
+    frames = [dataset[i] for i in range(args.batch_size)]
+    default = time_transfer(lambda f, d: [frame.to(d) for frame in f], frames, device, args.n_iter)
+    packed = time_transfer(to_device, frames, device, args.n_iter)
+    print(f"{'mode':<12}{'ms/batch':>10}")
+    print(f"{'Frame.to':<12}{default:>10.3f}")
+    print(f"{'to_device':<12}{packed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
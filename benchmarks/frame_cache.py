@@ -0,0 +1,79 @@
+"""Benchmark of the frame cache of the sequence datasets: one epoch of overlapping sequences (`sequence_size`
+frames, sequence skip 0) read with a RandomSampler and no cache, against the
+:class:`~alodataset.SequenceWindowSampler` with the frame cache (`frame_cache` of
+:class:`~alodataset.SequenceMixin`).
+
+Usage:
+    python benchmarks/frame_cache.py --n_images 256 --sequence_size 4 --batch_size 8 --num_workers 2
+"""
+from argparse import ArgumentParser
+import os
+import tempfile
+import time
+
+import torch
+import torchvision
+
+from alodataset import BaseDataset, SequenceMixin, SequenceWindowSampler
+
+
+class JpegSequenceDataset(BaseDataset, SequenceMixin):
+    def __init__(self, paths, **kwargs):
+        super().__init__(name="jpeg_sequence", **kwargs)
+        self.paths = paths
+        n_items = len(paths) - self.sequence_size + 1
+        self.items = [list(range(start, start + self.sequence_size)) for start in range(n_items)]
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        frames = [self.load_sequence_frame(self.paths[t]).temporal() for t in self.items[idx]]
+        return torch.cat(frames, dim=0)
+
+
+def epoch_time(dataset, sampler, sampler_kwargs, args):
+    loader = dataset.train_loader(
+        batch_size=args.batch_size, num_workers=args.num_workers, sampler=sampler, sampler_kwargs=sampler_kwargs
+    )
+    start = time.perf_counter()
+    for _ in loader:
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_images", type=int, default=256, help="Number of images (default: %(default)s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[720, 1280], help="Image size (default: %(default)s)")
+    parser.add_argument("--sequence_size", type=int, default=4, help="Sequence size (default: %(default)s)")
+    parser.add_argument("--batch_size", type=int, default=8, help="Batch size (default: %(default)s)")
+    parser.add_argument("--num_workers", type=int, default=2, help="Number of workers (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for idx in range(args.n_images):
+            paths.append(os.path.join(tmp_dir, f"{idx:06d}.jpg"))
+            image = torch.randint(0, 256, (3, *args.size), dtype=torch.uint8)
+            torchvision.io.write_jpeg(image, paths[-1])
+
+        dataset = JpegSequenceDataset(paths, sequence_size=args.sequence_size)
+        no_cache = epoch_time(dataset, torch.utils.data.RandomSampler, {}, args)
+
+        # A few sequences per worker are enough
+        dataset = JpegSequenceDataset(paths, sequence_size=args.sequence_size, frame_cache=2 * args.sequence_size)
+        sampler_kwargs = {"batch_size": args.batch_size, "num_workers": args.num_workers}
+        cache = epoch_time(dataset, SequenceWindowSampler, sampler_kwargs, args)
+        print(f"{len(dataset)} sequences of {args.sequence_size} frames {args.size[0]}x{args.size[1]}")
+        print(f"no cache: {no_cache:6.2f} s  frame cache: {cache:6.2f} s  ({no_cache / cache:.2f}x)")
+
+        # Hit rate, measured in the main process
+        dataset.frame_cache.clear()
+        for idx in SequenceWindowSampler(dataset, batch_size=args.batch_size):
+            dataset[idx]
+        print(f"frame cache stats (one process): {dataset.frame_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark of the frames loaded in float32 (default) against the frames kept in uint8 until the
+normalization: loading time, size of the frames sent by the workers, and normalization time.
+
+Usage:
+    python benchmarks/frame_uint8.py --n_frames 32
+"""
+from argparse import ArgumentParser
+import os
+import tempfile
+import time
+
+import torch
+import torchvision
+
+import aloscene
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_frames", type=int, default=32, help="Number of frames (default: %(default)s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[720, 1280], help="Frame size (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for idx in range(args.n_frames):
+            paths.append(os.path.join(tmp_dir, f"{idx}.jpg"))
+            image = torch.randint(0, 256, (3, *args.size), dtype=torch.uint8)
+            torchvision.io.write_jpeg(image, paths[-1])
+
+        for dtype in [torch.float32, torch.uint8]:
+            start = time.perf_counter()
+            frames = [aloscene.Frame(path, dtype=dtype) for path in paths]
+            load_time = time.perf_counter() - start
+
+            batch = aloscene.Frame.batch_list(frames)
+            nbytes = batch.numel() * batch.element_size()
+
+            start = time.perf_counter()
+            batch.norm_resnet()
+            norm_time = time.perf_counter() - start
+            print(
+                f"{str(dtype):14s} load {load_time * 1000:8.1f} ms  batch {nbytes / 1e6:8.1f} MB"
+                f"  norm_resnet {norm_time * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
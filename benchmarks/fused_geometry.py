@@ -0,0 +1,56 @@
+"""Benchmark of a DETR-like geometric augmentation pipeline with and without the crop & resize fusion of
+`Compose` (`fuse_geometry`), on a frame with boxes, flow, depth and segmentation labels.
+
+Usage:
+    python benchmarks/fused_geometry.py --n_iter 20
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+import aloscene
+from alodataset import transforms as T
+
+
+def get_frame(size=(480, 640)):
+    frame = aloscene.Frame(torch.rand(3, *size), normalization="01")
+    frame.append_boxes2d(aloscene.BoundingBoxes2D(torch.rand(20, 4) * 0.5, boxes_format="xcyc", absolute=False))
+    frame.append_flow(aloscene.Flow(torch.rand(2, *size)))
+    frame.append_depth(aloscene.Depth(torch.rand(1, *size)))
+    frame.append_segmentation(aloscene.Mask(torch.rand(20, *size).round(), names=("N", "H", "W")))
+    return frame
+
+
+def time_pipeline(transform, frame, n_iter):
+    """Mean time (in ms) of the transformation"""
+    transform(frame)  # warmup
+    start = time.perf_counter()
+    for _ in range(n_iter):
+        transform(frame)
+    return (time.perf_counter() - start) * 1000 / n_iter
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_iter", type=int, default=20, help="Iterations per measure (default: %(default)s)")
+    args = parser.parse_args()
+
+    frame = get_frame()
+    print(f"{'mode':<12}{'ms/sample':>10}")
+    for fuse_geometry in [False, True]:
+        transform = T.Compose(
+            [
+                T.RandomResizeWithAspectRatio([400, 500, 600]),
+                T.RandomSizeCrop(0.6, 0.9),
+                T.RandomResizeWithAspectRatio([480, 512, 544, 576, 608], max_size=1333),
+                T.RandomCrop((320, 320)),
+            ],
+            fuse_geometry=fuse_geometry,
+        )
+        mode = "fused" if fuse_geometry else "sequential"
+        print(f"{mode:<12}{time_pipeline(transform, frame, args.n_iter):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark of the dense ground truth readers of `aloscene.io`: `.flo` flows and `.pfm` disparities
+(FlyingThings3D-like, 540x960) and `.flo` flows (Sintel-like, 436x1024) read from the original files,
+against the same readers on a ground truth pack (see :mod:`aloscene.io.gt_pack`), in float32 and float16.
+
+The files are read once before timing: all the configurations are measured with a warm page cache, where the
+float16 packs only pay for the conversion to float32 (they halve the reads from the disk).
+
+Usage:
+    python benchmarks/gt_pack.py --n_files 32
+"""
+from argparse import ArgumentParser
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from aloscene.io.disparity import load_disp_pfm
+from aloscene.io.flow import load_flow_flo
+from aloscene.io.gt_pack import PACK_FILE, pack_directory
+
+DATASETS = {
+    "FlyingThings3D flo": ((540, 960), ".flo"),
+    "FlyingThings3D pfm": ((540, 960), ".pfm"),
+    "Sintel flo": ((436, 1024), ".flo"),
+}
+
+
+def write_file(path, size, rng):
+    data = rng.randn(*size, 2 if path.endswith(".flo") else 1).astype(np.float32) * 20
+    with open(path, "wb") as f:
+        if path.endswith(".flo"):
+            f.write(b"PIEH")
+            np.array([size[1], size[0]], dtype=np.int32).tofile(f)
+        else:
+            f.write(f"Pf\n{size[1]} {size[0]}\n-1.0\n".encode())
+        data.tofile(f)
+
+
+def read_time(paths, reader):
+    for path in paths:
+        reader(path)
+    start = time.perf_counter()
+    for path in paths:
+        # The sum reads all the values (the packed readers only map the file)
+        reader(path).sum()
+    return (time.perf_counter() - start) / len(paths)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_files", type=int, default=32, help="Number of files per dataset (default: %(default)s)")
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    for name, (size, ext) in DATASETS.items():
+        reader = load_flow_flo if ext == ".flo" else load_disp_pfm
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = [os.path.join(tmp_dir, f"{idx:07d}{ext}") for idx in range(args.n_files)]
+            for path in paths:
+                write_file(path, size, rng)
+
+            files = read_time(paths, lambda path: reader(path, packed=False))
+            pack_directory(tmp_dir)
+            packed = read_time(paths, reader)
+            pack_directory(tmp_dir, float16=True)
+            packed16 = read_time(paths, reader)
+            os.remove(os.path.join(tmp_dir, PACK_FILE))
+            print(
+                f"{name:20s}: files {files * 1000:6.2f} ms  pack {packed * 1000:6.2f} ms ({files / packed:.1f}x)"
+                f"  pack float16 {packed16 * 1000:6.2f} ms ({files / packed16:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark of the bulk text label parsers (:mod:`alodataset.utils.label_table`) against the previous line by
+line parsing, on synthetic MOT17 `gt.txt` (sorted by object) and KITTI tracking `label_02` files: startup time
+(first run, then cached run) and time of the label lookup of one frame.
+
+Usage:
+    python benchmarks/label_table.py --n_frames 5000 --n_objects 40
+"""
+from argparse import ArgumentParser
+from collections import defaultdict
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from alodataset.kitti_tracking import KittiTrackingDataset
+from alodataset.utils.label_table import load_frame_labels
+
+
+def mot_line_by_line(path, visibility_threshold=0.0):
+    """Previous parsing of Mot17: one dict per box"""
+    sequence = {}
+    with open(path) as gt:
+        for line in gt.read().split("\n"):
+            if len(line) == 0:
+                continue
+            frame_id, object_id, left, top, width, height, conf, _, visible = line.split(",")
+            frame_id = int(frame_id)
+            if frame_id not in sequence:
+                sequence[frame_id] = []
+            if float(visible) <= visibility_threshold or float(conf) != 1:
+                continue
+            left, top, width, height = float(left), float(top), float(width), float(height)
+            sequence[frame_id].append(
+                {
+                    "xc": (left + width / 2) / 1920,
+                    "yc": (top + height / 2) / 1080,
+                    "width": width / 1920,
+                    "height": height / 1080,
+                    "object_id": int(object_id),
+                }
+            )
+    return sequence
+
+
+def kitti_line_by_line(path):
+    """Previous parsing of KittiTrackingDataset: the labels are converted at each item"""
+    labels = defaultdict(list)
+    with open(path, "r") as f:
+        for line in f:
+            line = line.split()
+            labels[int(line[0])].append(line[1:])
+    return labels
+
+
+def kitti_frame_line_by_line(rows):
+    boxes2d = [[float(box[5]), float(box[6]), float(box[7]), float(box[8])] for box in rows]
+    categories = [KittiTrackingDataset.LABELS.index(box[1]) for box in rows]
+    return np.array(boxes2d), categories
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_frames", type=int, default=5000, help="Frames per sequence (default: %(default)s)")
+    parser.add_argument("--n_objects", type=int, default=40, help="Objects per frame (default: %(default)s)")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = os.path.join(tmp_dir, "cache")
+        mot_path, kitti_path = os.path.join(tmp_dir, "gt.txt"), os.path.join(tmp_dir, "label.txt")
+        with open(mot_path, "w") as f:
+            for obj in range(args.n_objects):
+                for frame in range(1, args.n_frames + 1):
+                    f.write(f"{frame},{obj},{rng.randint(0, 1800)},{rng.randint(0, 1000)},40,80,1,1,0.8\n")
+        with open(kitti_path, "w") as f:
+            for frame in range(args.n_frames):
+                for obj in range(args.n_objects):
+                    label = rng.choice(KittiTrackingDataset.LABELS)
+                    values = "0 0 -1.79 296.74 161.75 455.22 292.37 2.0 1.82 4.43 -4.55 1.85 13.41 -2.11"
+                    f.write(f"{frame} {obj} {label} {values}\n")
+        print(f"{args.n_frames} frames x {args.n_objects} objects")
+
+        old, old_time = timed(mot_line_by_line, mot_path)
+        _, first_time = timed(load_frame_labels, mot_path, delimiter=",", cache_dir=cache_dir)
+        labels, cached_time = timed(load_frame_labels, mot_path, delimiter=",", cache_dir=cache_dir)
+        print(f"MOT17 startup: line by line {old_time:.3f} s, numpy {first_time:.3f} s, cached {cached_time:.3f} s")
+        old_boxes = lambda: np.array([[d["xc"], d["yc"], d["width"], d["height"]] for d in old[10]])
+        _, old_lookup = timed(old_boxes, repeat=1000)
+        _, new_lookup = timed(lambda: labels[10][:, 2:6] / np.array([1920, 1080, 1920, 1080]), repeat=1000)
+        print(f"MOT17 frame lookup: line by line {old_lookup * 1e6:.1f} us, numpy {new_lookup * 1e6:.1f} us")
+
+        old, old_time = timed(kitti_line_by_line, kitti_path)
+        categories = {2: KittiTrackingDataset.LABELS}
+        _, first_time = timed(load_frame_labels, kitti_path, n_columns=17, categories=categories, cache_dir=cache_dir)
+        labels, cached_time = timed(
+            load_frame_labels, kitti_path, n_columns=17, categories=categories, cache_dir=cache_dir
+        )
+        print(f"KITTI startup: line by line {old_time:.3f} s, numpy {first_time:.3f} s, cached {cached_time:.3f} s")
+        _, old_lookup = timed(kitti_frame_line_by_line, old[10], repeat=1000)
+        _, new_lookup = timed(lambda: (labels[10][:, 6:10], labels[10][:, 2].astype(np.int64)), repeat=1000)
+        print(f"KITTI frame lookup: line by line {old_lookup * 1e6:.1f} us, numpy {new_lookup * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
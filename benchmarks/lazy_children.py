@@ -0,0 +1,60 @@
+"""Benchmark of the lazy children: time to build sequences of frames with a forward and a backward flow,
+loaded eagerly against attached as :class:`~aloscene.tensors.lazy_child.LazyChild`, when the pipeline
+only uses the forward flow.
+
+Usage:
+    python benchmarks/lazy_children.py --n_sequences 16 --sequence_size 4
+"""
+from argparse import ArgumentParser
+import os
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+from aloscene import Flow, Frame, LazyChild
+
+
+def load_flow(path):
+    return Flow(torch.from_numpy(np.load(path)), names=("C", "H", "W"))
+
+
+def sequence(paths, size, lazy):
+    frames = []
+    for forward, backward in paths:
+        frame = Frame(torch.zeros(3, *size), names=("C", "H", "W"))
+        for path, name in [(forward, "flow_forward"), (backward, "flow_backward")]:
+            frame.append_flow(LazyChild(load_flow, path) if lazy else load_flow(path), name)
+        frames.append(frame.temporal())
+    frames = torch.cat(frames, dim=0)
+    # Only the forward flow is used
+    return [flow.mean() for flow in frames.flow["flow_forward"]]
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_sequences", type=int, default=16, help="Number of sequences (default: %(default)s)")
+    parser.add_argument("--sequence_size", type=int, default=4, help="Frames per sequence (default: %(default)s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[540, 960], help="Frame size (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for idx in range(args.sequence_size):
+            pair = []
+            for name in ["forward", "backward"]:
+                pair.append(os.path.join(tmp_dir, f"{idx}_{name}.npy"))
+                np.save(pair[-1], np.random.randn(2, *args.size).astype(np.float32))
+            paths.append(pair)
+
+        for lazy in [False, True]:
+            start = time.perf_counter()
+            for _ in range(args.n_sequences):
+                sequence(paths, args.size, lazy)
+            elapsed = (time.perf_counter() - start) / args.n_sequences
+            print(f"{'lazy' if lazy else 'eager':6s}: {elapsed * 1000:8.1f} ms per sequence")
+
+
+if __name__ == "__main__":
+    main()
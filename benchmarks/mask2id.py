@@ -0,0 +1,65 @@
+"""Benchmark of the panoptic view of a set of masks (:meth:`aloscene.Mask.mask2id`), used by the PQ metrics and the
+mask rendering, against the previous implementation looping over the labels.
+
+Usage:
+    python benchmarks/mask2id.py --n_masks 100 --size 800 1200
+"""
+from argparse import ArgumentParser
+import time
+
+import numpy as np
+import torch
+
+from aloscene import Labels, Mask
+
+
+def mask2id_loop(mask, return_cats=True):
+    """Previous implementation: argmax, then one pass on the whole frame per label"""
+    frame = mask.cpu().rename(None).permute([1, 2, 0]).detach().contiguous().numpy()
+    frame = np.concatenate([np.zeros_like(frame[..., [0]]), frame], axis=-1)
+    frame = np.argmax(frame, axis=-1).astype("int") - 1
+    copy_frame = frame.copy()
+    annotations = []
+    for i, label in enumerate(mask.labels):
+        label = int(label)
+        if return_cats:
+            frame[copy_frame == i] = label
+        mass_y, mass_x = np.where(mask[i].cpu().detach().contiguous().numpy() > 0.5)
+        x, y = np.average(mass_x) if len(mass_x) else 0, np.average(mass_y) if len(mass_y) else 0
+        annotations.append({"color": (0, 0, 0), "x": int(x), "y": int(y), "text": str(label)})
+    return frame, annotations
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_masks", type=int, default=100, help="Number of masks (default: %(default)s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[800, 1200], help="Frame size (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (default: %(default)s)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    height, width = args.size
+    masks = torch.zeros((args.n_masks, height, width))
+    for mask in masks:
+        h, w = rng.integers(height // 20, height // 4), rng.integers(width // 20, width // 4)
+        y, x = rng.integers(0, height - h), rng.integers(0, width - w)
+        mask[y : y + h, x : x + w] = 1.0
+    labels = Labels(torch.from_numpy(rng.integers(0, 100, args.n_masks)).float(), encoding="id")
+    mask = Mask(masks, names=("N", "H", "W"), labels=labels)
+
+    (frame_loop, ann_loop), loop_time = timed(lambda: mask2id_loop(mask), args.repeat)
+    (frame, ann), vec_time = timed(lambda: mask.mask2id(return_ann=True, return_cats=True), args.repeat)
+    assert (frame == frame_loop).all() and ann == ann_loop
+    print(f"{args.n_masks} masks, frame {height}x{width}")
+    print(f"mask2id    loop {loop_time * 1000:10.1f} ms   vectorized {vec_time * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark of the index of :class:`~alodataset.MergeDataset`: construction time and memory of the
+materialized list of (dataset, sample) tuples (previous implementation) against the virtual index, and
+lookup time.
+
+Usage:
+    python benchmarks/merge_dataset.py --lengths 2000000 1000000 500000 --weights 1 2 3
+"""
+from argparse import ArgumentParser
+import time
+import tracemalloc
+
+import torch
+
+from alodataset import MergeDataset
+
+
+class RangeDataset(torch.utils.data.Dataset):
+    def __init__(self, length):
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, idx):
+        return idx
+
+
+def materialized_indices(datasets, weights):
+    """Index of the previous implementation"""
+    indices = []
+    for dset_idx, dset in enumerate(datasets):
+        for _ in range(weights[dset_idx]):
+            for idx in range(len(dset)):
+                indices.append((dset_idx, idx))
+    return indices
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, memory
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--lengths", type=int, nargs="+", default=[2000000, 1000000, 500000])
+    parser.add_argument("--weights", type=int, nargs="+", default=[1, 2, 3])
+    args = parser.parse_args()
+
+    datasets = [RangeDataset(length) for length in args.lengths]
+    indices, list_time, list_memory = measure(lambda: materialized_indices(datasets, args.weights))
+    dataset, index_time, index_memory = measure(lambda: MergeDataset(datasets, weights=args.weights))
+    print(f"{len(dataset)} items")
+    print(f"list index   : build {list_time * 1000:9.1f} ms  memory {list_memory / 1e6:9.1f} MB")
+    print(f"virtual index: build {index_time * 1000:9.1f} ms  memory {index_memory / 1e6:9.3f} MB")
+
+    lookups = torch.randint(0, len(dataset), (100000,)).tolist()
+    start = time.perf_counter()
+    for idx in lookups:
+        indices[idx]
+    list_lookup = (time.perf_counter() - start) / len(lookups)
+    start = time.perf_counter()
+    for idx in lookups:
+        dataset.get_index(idx)
+    index_lookup = (time.perf_counter() - start) / len(lookups)
+    print(f"lookup: list {list_lookup * 1e6:.2f} us  virtual index {index_lookup * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
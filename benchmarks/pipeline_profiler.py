@@ -0,0 +1,92 @@
+"""Benchmark of the data pipeline instrumentation (:mod:`aloscene.utils.pipeline_profiler`): cost of the
+instrumentation when no profiler is started and when a profiler is started, then per-stage report of an epoch
+of a synthetic dataset (random frames, Detr-like augmentations) read by DataLoader workers.
+
+Usage:
+    python benchmarks/pipeline_profiler.py --n_items 256 --batch_size 8 --num_workers 2
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+import aloscene
+from alodataset import BaseDataset, transforms as T
+from aloscene.utils.pipeline_profiler import PipelineProfiler, profile_stage
+
+
+class RandomFrameDataset(BaseDataset):
+    def __init__(self, n_items, size, **kwargs):
+        super().__init__(name="random_frames", **kwargs)
+        self.items = list(range(n_items))
+        self.size = size
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        frame = aloscene.Frame(torch.rand(3, *self.size), names=("C", "H", "W"))
+        boxes = aloscene.BoundingBoxes2D(
+            torch.tensor([[0.2, 0.2, 0.6, 0.6]]), boxes_format="xyxy", absolute=False, names=("N", None)
+        )
+        frame.append_boxes2d(boxes)
+        return frame
+
+
+def time_per_call(func, n_calls):
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        func()
+    return (time.perf_counter() - start) / n_calls
+
+
+def empty_stage():
+    with profile_stage("empty"):
+        pass
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_items", type=int, default=256, help="Number of items (default: %(default)s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[480, 640], help="Frame size (default: %(default)s)")
+    parser.add_argument("--batch_size", type=int, default=8, help="Batch size (default: %(default)s)")
+    parser.add_argument("--num_workers", type=int, default=2, help="Number of workers (default: %(default)s)")
+    args = parser.parse_args()
+
+    transform = T.Compose(
+        [
+            T.RandomHorizontalFlip(),
+            T.RandomResizeWithAspectRatio([320, 352, 384, 416], 600),
+            T.ColorJitter(0.2, 0.2, 0.2),
+        ]
+    )
+    dataset = RandomFrameDataset(args.n_items, args.size, transform_fn=transform)
+
+    # Cost of the instrumentation
+    n_calls = 100000
+    disabled = time_per_call(empty_stage, n_calls)
+    with PipelineProfiler():
+        enabled = time_per_call(empty_stage, n_calls)
+    print(f"one stage: {disabled * 1e9:.0f} ns without profiler, {enabled * 1e9:.0f} ns with profiler")
+
+    torch.manual_seed(0)
+    item_disabled = time_per_call(lambda: dataset[0], 50)
+    with PipelineProfiler():
+        item_enabled = time_per_call(lambda: dataset[0], 50)
+    print(f"dataset item: {item_disabled * 1e3:.2f} ms without profiler, {item_enabled * 1e3:.2f} ms with profiler")
+
+    # Per-stage report of an epoch
+    with PipelineProfiler() as profiler:
+        for frames in dataset.train_loader(batch_size=args.batch_size, num_workers=args.num_workers):
+            aloscene.Frame.batch_list(frames)
+        stats = profiler.stats()
+    print(f"\n{'stage':40s} {'count':>6s} {'mean ms':>8s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s} {'MB/s':>8s}")
+    for name, stage in stats.items():
+        print(
+            f"{name:40s} {stage['count']:6d} {stage['mean_ms']:8.2f} {stage['p50_ms']:8.2f} "
+            + f"{stage['p90_ms']:8.2f} {stage['p99_ms']:8.2f} {stage['mb_per_s']:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
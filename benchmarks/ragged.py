@@ -0,0 +1,106 @@
+"""Benchmark of the packed :class:`~aloscene.Ragged` boxes against the list of per frame boxes2d given by
+`batch_list`: format conversion, selection of the matched targets, padding, and the whole DETR criterion (with its
+auxiliary stages) that now packs the targets once.
+
+Usage:
+    python benchmarks/ragged.py --batch_size 8 --max_boxes 50
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+from aloscene import BoundingBoxes2D, Frame, Labels, Ragged
+from alonet.detr import DetrCriterion, DetrHungarianMatcher
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def build_frames(batch_size, max_boxes, n_classes=20):
+    frames = []
+    for _ in range(batch_size):
+        n = int(torch.randint(0, max_boxes + 1, (1,)))
+        xy = torch.rand(n, 2) * 400
+        boxes = torch.cat([xy, xy + torch.rand(n, 2) * 200 + 1], dim=1)
+        labels = torch.randint(0, n_classes, (n,)).float()
+        labels = Labels(labels, encoding="id", labels_names=[str(i) for i in range(n_classes)])
+        frame = Frame(torch.zeros(3, 640, 640), names=("C", "H", "W"))
+        boxes = BoundingBoxes2D(boxes, boxes_format="xyxy", absolute=True, frame_size=(640, 640), labels=labels)
+        frame.append_boxes2d(boxes)
+        frames.append(frame)
+    return Frame.batch_list(frames)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--batch_size", type=int, default=8, help="Batch size (default: %(default)s)")
+    parser.add_argument("--max_boxes", type=int, default=50, help="Max boxes per frame (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=10, help="Repetitions (default: %(default)s)")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    frames = build_frames(args.batch_size, args.max_boxes)
+    boxes_list = frames.boxes2d
+    ragged = Ragged.from_list(boxes_list)
+    indices = [torch.randperm(len(boxes))[: len(boxes) // 2] for boxes in boxes_list]
+    print(f"{args.batch_size} frames, {len(ragged.data)} boxes")
+
+    def list_convert():
+        return [boxes.rel_pos().xcyc() for boxes in boxes_list]
+
+    def list_select():
+        return torch.cat([boxes.labels.as_tensor()[idx] for boxes, idx in zip(boxes_list, indices)])
+
+    _, list_time = timed(list_convert, args.repeat)
+    _, ragged_time = timed(lambda: ragged.apply(lambda b: b.rel_pos().xcyc()), args.repeat)
+    print(f"convert    list {list_time * 1000:8.2f} ms   ragged {ragged_time * 1000:8.2f} ms")
+    _, list_time = timed(list_select, args.repeat)
+    _, ragged_time = timed(lambda: ragged.data.labels.as_tensor()[ragged.flat_index(indices)], args.repeat)
+    print(f"select     list {list_time * 1000:8.2f} ms   ragged {ragged_time * 1000:8.2f} ms")
+    _, list_time = timed(lambda: BoundingBoxes2D.pad_list(boxes_list), args.repeat)
+    _, ragged_time = timed(lambda: ragged.to_padded(), args.repeat)
+    print(f"pad        list {list_time * 1000:8.2f} ms   ragged {ragged_time * 1000:8.2f} ms")
+
+    # DETR criterion, with 5 auxiliary stages: packed once per forward vs packed by each matching and loss
+    n_queries, n_classes = 100, 20
+
+    def outputs():
+        return {
+            "pred_logits": torch.randn(args.batch_size, n_queries, n_classes + 1),
+            "pred_boxes": torch.rand(args.batch_size, n_queries, 4) * 0.5 + 0.1,
+        }
+
+    m_outputs = outputs()
+    m_outputs["aux_outputs"] = [outputs() for _ in range(5)]
+    criterion = DetrCriterion(
+        DetrHungarianMatcher(),
+        loss_ce_weight=1,
+        loss_boxes_weight=5,
+        loss_giou_weight=2,
+        eos_coef=0.1,
+        aux_loss_stage=6,
+        losses=["labels", "boxes"],
+    )
+
+    def unpacked_forward():
+        # Without the packed targets, each matching and each loss packs the targets again
+        indices = criterion.matcher({k: v for k, v in m_outputs.items() if k != "aux_outputs"}, frames)
+        for loss in criterion.losses:
+            criterion.get_loss(loss, m_outputs, frames, indices, 1)
+        for aux_outputs in m_outputs["aux_outputs"]:
+            indices = criterion.matcher(aux_outputs, frames)
+            for loss in criterion.losses:
+                criterion.get_loss(loss, aux_outputs, frames, indices, 1)
+
+    _, list_time = timed(unpacked_forward, args.repeat)
+    _, ragged_time = timed(lambda: criterion(m_outputs, frames), args.repeat)
+    print(f"criterion  list {list_time * 1000:8.2f} ms   ragged {ragged_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
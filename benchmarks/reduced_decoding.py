@@ -0,0 +1,63 @@
+"""Benchmark of the decoding of JPEG images followed by a downscale: full resolution decoding against the
+reduced (DCT domain) decoding of :func:`aloscene.io.image.load_image` with `decode_size`, on a set of
+COCO-sized synthetic images.
+
+Usage:
+    python benchmarks/reduced_decoding.py --n_images 64 --size 480 640 --targets 400 240 120 60
+"""
+from argparse import ArgumentParser
+import os
+import tempfile
+import time
+
+import numpy as np
+import torch
+import torchvision
+
+import aloscene
+
+
+def synthetic_image(size, rng):
+    """Smooth random image (closer to natural images than uniform noise for the jpeg compression)"""
+    small = torch.from_numpy(rng.randint(0, 256, (1, 3, size[0] // 16, size[1] // 16)).astype(np.float32))
+    image = torch.nn.functional.interpolate(small, size=size, mode="bicubic", align_corners=False)[0]
+    image = image + torch.from_numpy(rng.randn(3, *size).astype(np.float32)) * 8
+    return image.clamp(0, 255).to(torch.uint8)
+
+
+def decode_time(paths, target, decode_size):
+    start = time.perf_counter()
+    for path in paths:
+        frame = aloscene.Frame(path, decode_size=decode_size)
+        frame.resize((target, round(target * frame.W / frame.H)))
+    return (time.perf_counter() - start) / len(paths)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_images", type=int, default=64, help="Number of images (default: %(default)s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[480, 640], help="Image size (default: %(default)s)")
+    parser.add_argument(
+        "--targets", type=int, nargs="+", default=[400, 240, 120, 60], help="Output heights (default: %(default)s)"
+    )
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for idx in range(args.n_images):
+            paths.append(os.path.join(tmp_dir, f"{idx:012d}.jpg"))
+            torchvision.io.write_jpeg(synthetic_image(tuple(args.size), rng), paths[-1], quality=90)
+
+        print(f"{args.n_images} images {args.size[0]}x{args.size[1]}, time per image (decoding + resize)")
+        for target in args.targets:
+            full = decode_time(paths, target, None)
+            reduced = decode_time(paths, target, (target, target))
+            print(
+                f"output height {target:5d}: full {full * 1000:6.2f} ms  reduced {reduced * 1000:6.2f} ms"
+                f"  ({full / reduced:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
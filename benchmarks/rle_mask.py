@@ -0,0 +1,78 @@
+"""Benchmark of the run-length encoded :class:`~aloscene.RLEMask` against the dense :class:`~aloscene.Mask` on a
+synthetic panoptic annotation: size in memory (also the size sent from the dataloader workers), time to build the
+masks from the panoptic id map, IoU matrix, and the spatial augmentations of a frame.
+
+Usage:
+    python benchmarks/rle_mask.py --n_instances 200 --size 800 1200
+"""
+from argparse import ArgumentParser
+import time
+
+import numpy as np
+import torch
+from torchvision.transforms import InterpolationMode
+
+from aloscene import Frame, Mask, RLEMask
+
+
+def panoptic_id_map(n_instances, size, rng):
+    """Id map made of random overlapping rectangles"""
+    id_map = np.zeros(size, dtype=np.int64)
+    for idx in range(1, n_instances + 1):
+        h, w = rng.integers(size[0] // 20, size[0] // 4), rng.integers(size[1] // 20, size[1] // 4)
+        y, x = rng.integers(0, size[0] - h), rng.integers(0, size[1] - w)
+        id_map[y : y + h, x : x + w] = idx
+    return id_map
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def augment(frame):
+    frame = frame.hflip().crop((0.1, 0.9), (0.05, 0.95))
+    return frame.resize((512, 768), interpolation=InterpolationMode.NEAREST).pad(offset_y=(0, 0), offset_x=(0, 32))
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_instances", type=int, default=200, help="Number of instances (default: %(default)s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[800, 1200], help="Frame size (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (default: %(default)s)")
+    args = parser.parse_args()
+
+    id_map = panoptic_id_map(args.n_instances, args.size, np.random.default_rng(0))
+    ids = np.unique(id_map[id_map > 0])
+    print(f"{len(ids)} instances, frame {args.size[0]}x{args.size[1]}")
+
+    def dense_masks():
+        return Mask(torch.from_numpy(id_map == ids[:, None, None]).float(), names=("N", "H", "W"))
+
+    dense, dense_time = timed(dense_masks, args.repeat)
+    encoded, rle_time = timed(lambda: RLEMask.from_id_map(id_map, ids), args.repeat)
+    dense_mb, rle_mb = dense.numel() * dense.element_size() / 1e6, encoded.numel() * encoded.element_size() / 1e6
+    print(f"size       dense {dense_mb:10.3f} MB   rle {rle_mb:10.3f} MB   ratio {dense_mb / rle_mb:7.1f}x")
+    print(f"build      dense {dense_time * 1000:10.1f} ms   rle {rle_time * 1000:10.1f} ms")
+
+    _, dense_time = timed(lambda: dense.iou_with(dense), args.repeat)
+    _, rle_time = timed(lambda: encoded.iou_with(encoded), args.repeat)
+    print(f"iou        dense {dense_time * 1000:10.1f} ms   rle {rle_time * 1000:10.1f} ms")
+
+    frames = []
+    for segmentation in [dense, encoded]:
+        frame = Frame(torch.zeros(3, *args.size), names=("C", "H", "W"))
+        frame.append_segmentation(segmentation)
+        frames.append(frame)
+    _, dense_time = timed(lambda: augment(frames[0]), args.repeat)
+    _, rle_time = timed(lambda: augment(frames[1]), args.repeat)
+    print(f"augment    dense {dense_time * 1000:10.1f} ms   rle {rle_time * 1000:10.1f} ms")
+
+    _, rle_time = timed(lambda: encoded.to_mask(), args.repeat)
+    print(f"densify                           rle {rle_time * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
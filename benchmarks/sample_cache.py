@@ -0,0 +1,73 @@
+"""Benchmark of the epoch time of a dataset decoding JPEG images and polygon masks, without cache, on the
+first epoch with cache (decoding + writing) and on the next epochs (memory mapped samples).
+
+Usage:
+    python benchmarks/sample_cache.py --n_samples 64 --workers 2
+"""
+from argparse import ArgumentParser
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+import torch
+
+import aloscene
+from alodataset import BaseDataset
+
+
+class JpegDataset(BaseDataset):
+    """Frames decoded from jpeg files, with segmentation masks rasterized from polygons"""
+
+    def __init__(self, folder, n_samples=64, size=(720, 1280), n_polygons=20, **kwargs):
+        super().__init__(name="jpeg_benchmark", **kwargs)
+        self.folder = folder
+        self.items = list(range(n_samples))
+        self.size = size
+        self.n_polygons = n_polygons
+
+    def get_dataset_dir(self):
+        return None
+
+    def write_images(self):
+        for idx in self.items:
+            image = np.random.randint(0, 255, (*self.size, 3), dtype=np.uint8)
+            cv2.imwrite(os.path.join(self.folder, f"{idx}.jpg"), image)
+
+    def getitem(self, idx):
+        frame = aloscene.Frame(os.path.join(self.folder, f"{idx}.jpg"))
+        rng = np.random.RandomState(idx)
+        masks = np.zeros((self.n_polygons, *self.size), dtype=np.uint8)
+        for mask in masks:
+            polygon = (rng.rand(8, 2) * self.size[::-1]).astype(np.int32)
+            cv2.fillPoly(mask, [polygon], 1)
+        frame.append_segmentation(aloscene.Mask(torch.from_numpy(masks).float(), names=("N", "H", "W")))
+        return frame
+
+
+def epoch_time(dataset, num_workers):
+    start = time.perf_counter()
+    for _ in dataset.train_loader(batch_size=4, num_workers=num_workers, sampler=None):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_samples", type=int, default=64, help="Number of samples (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=2, help="Number of workers (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cache_dir:
+        dataset = JpegDataset(folder, n_samples=args.n_samples)
+        dataset.write_images()
+        cached = JpegDataset(folder, n_samples=args.n_samples, cache_dir=cache_dir)
+        print(f"{'epoch':<22}{'seconds':>10}")
+        print(f"{'no cache':<22}{epoch_time(dataset, args.workers):>10.2f}")
+        print(f"{'cache, first epoch':<22}{epoch_time(cached, args.workers):>10.2f}")
+        print(f"{'cache, next epochs':<22}{epoch_time(cached, args.workers):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
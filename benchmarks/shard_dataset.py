@@ -0,0 +1,42 @@
+"""Benchmark of the epoch time of a dataset reading one jpeg file per sample vs the same samples packed into
+shards (jpg encoded frames) and streamed with `ShardDataset`.
+
+Usage:
+    python benchmarks/shard_dataset.py --n_samples 256 --workers 2
+"""
+from argparse import ArgumentParser
+import tempfile
+import time
+
+from alodataset import ShardDataset, write_shards
+from sample_cache import JpegDataset
+
+
+def epoch_time(loader):
+    start = time.perf_counter()
+    n_samples = 0
+    for frames in loader:
+        n_samples += len(frames)
+    return n_samples / (time.perf_counter() - start)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_samples", type=int, default=256, help="Number of samples (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=2, help="Number of workers (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as shard_dir:
+        dataset = JpegDataset(folder, n_samples=args.n_samples, size=(480, 640), n_polygons=0)
+        dataset.write_images()
+        write_shards(dataset, shard_dir, max_samples_per_shard=64, image_format="jpg")
+        shards = ShardDataset(shard_dir, shuffle=True, shuffle_buffer=64)
+
+        print(f"{'dataset':<12}{'samples/s':>10}")
+        files = dataset.train_loader(batch_size=4, num_workers=args.workers)
+        print(f"{'files':<12}{epoch_time(files):>10.1f}")
+        print(f"{'shards':<12}{epoch_time(shards.train_loader(batch_size=4, num_workers=args.workers)):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
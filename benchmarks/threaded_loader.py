@@ -0,0 +1,80 @@
+"""Benchmark of the :class:`~alodataset.base_dataset.ThreadedStreamLoader` (`stream_loader(num_threads=N)`)
+against the process workers of `stream_loader(num_workers=N)`: latency to the first sample (including the
+loader startup) and sustained throughput, when streaming JPEG frames from disk. `--io_delay` adds a sleep to
+each read to simulate a slow storage (network file system, object storage).
+
+Usage:
+    python benchmarks/threaded_loader.py --n_images 128 --size 720 1280 --workers 2 --io_delay 5
+"""
+from argparse import ArgumentParser
+import os
+import tempfile
+import time
+
+import torch
+import torchvision
+
+from alodataset import BaseDataset
+from aloscene import Frame
+
+
+class JpegDataset(BaseDataset):
+    def __init__(self, paths, io_delay, **kwargs):
+        super().__init__(name="jpeg", **kwargs)
+        self.items = paths
+        self.io_delay = io_delay
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        if self.io_delay > 0:
+            time.sleep(self.io_delay)
+        return Frame(self.items[idx])
+
+
+def measure(loader):
+    start = time.perf_counter()
+    first = None
+    n_items = 0
+    for _ in loader:
+        n_items += 1
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return first, n_items / total
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_images", type=int, default=128, help="Number of images (default: %(default)s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[720, 1280], help="Image size (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=2, help="Number of processes / threads (default: %(default)s)")
+    parser.add_argument("--io_delay", type=float, default=5.0, help="Delay per read in ms (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for idx in range(args.n_images):
+            paths.append(os.path.join(tmp_dir, f"{idx:06d}.jpg"))
+            image = torch.randint(0, 256, (3, *args.size), dtype=torch.uint8)
+            torchvision.io.write_jpeg(image, paths[-1])
+        dataset = JpegDataset(paths, args.io_delay / 1000)
+
+        print(f"{args.n_images} jpeg {args.size[0]}x{args.size[1]}, read delay {args.io_delay} ms")
+        loaders = {
+            "main process": dataset.stream_loader(num_workers=0),
+            f"{args.workers} processes": dataset.stream_loader(num_workers=args.workers),
+            f"{args.workers} processes (payload)": dataset.stream_loader(
+                num_workers=args.workers, detached_payload=True
+            ),
+            f"{args.workers} threads": dataset.stream_loader(num_threads=args.workers),
+            f"{2 * args.workers} threads": dataset.stream_loader(num_threads=2 * args.workers),
+        }
+        for name, loader in loaders.items():
+            first, throughput = measure(loader)
+            print(f"{name:30s} first sample {first * 1000:7.1f} ms  {throughput:7.1f} items/s")
+
+
+if __name__ == "__main__":
+    main()
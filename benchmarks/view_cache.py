@@ -0,0 +1,62 @@
+"""Benchmark of the memoized format/coordinates views of :class:`~aloscene.BoundingBoxes2D` (see
+:class:`aloscene.tensors.ViewCache`): repeated conversions of the same target boxes, as done by the matcher and the
+losses of each stage, with and without the cache.
+
+Usage:
+    python benchmarks/view_cache.py --n_boxes 50 --repeat 100
+"""
+from argparse import ArgumentParser
+import time
+
+import torch
+
+from aloscene import BoundingBoxes2D, Labels
+from aloscene.tensors import reset_view_cache_stats, view_cache_stats
+
+
+def uncached(boxes, name, *args):
+    """Call the conversion without the cache"""
+    return getattr(BoundingBoxes2D, name).__wrapped__(boxes, *args)
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--n_boxes", type=int, default=50, help="Number of boxes (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=100, help="Repetitions (default: %(default)s)")
+    args = parser.parse_args()
+
+    xy = torch.rand(args.n_boxes, 2) * 400
+    labels = Labels(torch.randint(0, 20, (args.n_boxes,)).float(), encoding="id")
+    boxes = BoundingBoxes2D(
+        torch.cat([xy, xy + torch.rand(args.n_boxes, 2) * 200 + 1], dim=1),
+        boxes_format="xyxy",
+        absolute=True,
+        frame_size=(640, 640),
+        labels=labels,
+    )
+
+    def uncached_rel_xcyc():
+        return uncached(uncached(boxes, "rel_pos"), "xcyc")
+
+    conversions = {
+        "rel_pos().xcyc()": (lambda: boxes.rel_pos().xcyc(), uncached_rel_xcyc),
+        "xcyc()": (lambda: boxes.xcyc(), lambda: uncached(boxes, "xcyc")),
+        "abs_pos((320, 320))": (lambda: boxes.abs_pos((320, 320)), lambda: uncached(boxes, "abs_pos", (320, 320))),
+    }
+    reset_view_cache_stats()
+    for name, (cached_func, uncached_func) in conversions.items():
+        uncached_time = timed(uncached_func, args.repeat)
+        cached_time = timed(cached_func, args.repeat)
+        print(f"{name:22s} uncached {uncached_time * 1e6:8.1f} us   cached {cached_time * 1e6:8.1f} us")
+    print(view_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import numpy as np
+import torch
+
+from alodataset import AspectRatioBucketSampler, MergeDataset
+
+
+class SizeDataset(torch.utils.data.Dataset):
+    def __init__(self, sizes):
+        self.sizes = np.asarray(sizes)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __getitem__(self, idx):
+        return self.sizes[idx]
+
+    def get_item_sizes(self):
+        return self.sizes
+
+
+def random_sizes(n_items, seed=0):
+    rng = np.random.default_rng(seed)
+    heights = rng.integers(300, 800, size=n_items)
+    aspect_ratios = rng.choice([0.75, 1.0, 4 / 3, 16 / 9], size=n_items)
+    return np.stack([heights, (heights * aspect_ratios).astype(np.int64)], axis=1)
+
+
+def test_aspect_ratio_bucket_sampler():
+    dataset = SizeDataset(random_sizes(203))
+    sampler = AspectRatioBucketSampler(dataset, batch_size=4)
+    indices = list(sampler)
+    assert len(indices) == len(sampler) == 200 and len(set(indices)) == 200
+
+    # The batches of a bucket are emitted first, then the remaining items sorted by aspect ratio
+    batches = sampler.get_batches()
+    n_full = sum(len(set(sampler.buckets[batch])) == 1 for batch in batches)
+    assert n_full >= len(batches) - 4
+
+    # Same order for the same epoch, another one for the next epoch
+    assert list(sampler) == indices
+    sampler.set_epoch(1)
+    assert list(sampler) != indices
+
+    # Less padding than random batches
+    random_sampler = AspectRatioBucketSampler(dataset, batch_size=4, bucket_bounds=[])
+    assert sampler.padding_ratio() < random_sampler.padding_ratio()
+
+
+def test_aspect_ratio_bucket_sampler_distributed():
+    dataset = SizeDataset(random_sizes(103))
+    replicas = [AspectRatioBucketSampler(dataset, batch_size=4, num_replicas=2, rank=rank) for rank in range(2)]
+    indices = [list(sampler) for sampler in replicas]
+    assert len(indices[0]) == len(indices[1]) == len(replicas[0]) == 48
+    assert not set(indices[0]) & set(indices[1])
+    # Each replica reads full batches
+    batches = replicas[0].get_batches()
+    assert indices[0] == sum(batches[0::2][:12], []) and indices[1] == sum(batches[1::2][:12], [])
+
+
+def test_merge_dataset_item_sizes():
+    dataset = MergeDataset([SizeDataset([[10, 20]]), SizeDataset([[30, 40], [50, 60]])], weights=[2, 1])
+    assert np.array_equal(dataset.get_item_sizes(), [[10, 20], [10, 20], [30, 40], [50, 60]])
@@ -1,7 +1,8 @@
 import pytest
 import aloscene
 import torch
-from aloscene import Frame, Disparity, Flow
+import numpy as np
+from aloscene import Frame, Disparity, Flow, Depth, Mask
 
 def test_batch_list_intersection_property():
     """
@@ -64,3 +65,73 @@ def test_batch_list_intersection_unmergeable_child():
     assert len(f.flow) == 2
     assert f.flow[0].shape == (2, 10, 10)
     assert f.flow[1] is None
+
+def test_zero_copy_construction():
+    """
+    With zero_copy=True, the augmented tensor must share the memory of the given tensor / numpy array
+    """
+    x = torch.rand(3, 10, 10)
+    f = Frame(x, zero_copy=True)
+    assert f.data_ptr() == x.data_ptr()
+    assert f.names == ("C", "H", "W") and x.names == (None, None, None)
+    f.add_(1)
+    assert torch.equal(f.as_tensor(), x)
+
+    x = np.zeros((1, 10, 10), dtype=np.uint8)
+    d = Disparity(x, zero_copy=True)
+    assert d.data_ptr() == x.ctypes.data
+    assert d.dtype == torch.uint8
+
+    for cls in [Flow, Depth, Mask]:
+        x = torch.rand(2, 10, 10)
+        names = ("N", "H", "W") if cls is Mask else ("C", "H", "W")
+        t = cls(x, names=names, zero_copy=True)
+        assert isinstance(t, cls)
+        assert t.data_ptr() == x.data_ptr()
+
+    # The default construction still copy the data
+    x = torch.rand(3, 10, 10)
+    assert Frame(x).data_ptr() != x.data_ptr()
+
+
+def test_elementwise_torch_function():
+    """
+    Elementwise ops (fast path) must keep the labels and properties of the augmented tensor
+    """
+    f = Frame(torch.ones(3, 10, 10), normalization="01")
+    f.append_flow(Flow(torch.ones(2, 10, 10)))
+    for n_f in [f * 2, 2 * f, f + f, f.clamp(0, 0.5), f < 0.5]:
+        assert isinstance(n_f, Frame)
+        assert n_f.names == ("C", "H", "W")
+        assert n_f.normalization == "01"
+        assert n_f.flow is f.flow
+    # The properties of the output are not shared with the input
+    n_f = f * 2
+    n_f.normalization = "255"
+    assert f.normalization == "01"
+    # In-place
+    assert f.mul_(2) is f and f.normalization == "01"
+    # Broadcasting on new dimensions go through the generic path
+    n_f = f + torch.zeros(2, 3, 10, 10)
+    assert n_f.shape == (2, 3, 10, 10)
+
+
+def test_batch_list_padding():
+    """
+    The frames are copied at the top left of the batch and the padded area is filled up
+    with the padding value of the frame normalization
+    """
+    f1 = Frame(torch.rand(3, 10, 12), normalization="01").norm_resnet()
+    f2 = Frame(torch.rand(3, 12, 10), normalization="01").norm_resnet()
+    f = aloscene.batch_list([f1, f2])
+    assert f.shape == (2, 3, 12, 12) and f.names == ("B", "C", "H", "W")
+    assert f.normalization == "resnet"
+    data, data01 = f.as_tensor(), f.norm01().as_tensor()
+    assert torch.allclose(data[0, :, :10, :12], f1.as_tensor())
+    assert torch.allclose(data[1, :, :12, :10], f2.as_tensor())
+    # Padded area is black once un-normalized
+    assert torch.allclose(data01[0, :, 10:], torch.zeros(3, 2, 12), atol=1e-6)
+    assert torch.allclose(data01[1, :, :, 10:], torch.zeros(3, 12, 2), atol=1e-6)
+    mask = f.mask.as_tensor()
+    assert mask[0, :, :10, :12].sum() == 0 and mask[0, :, 10:].min() == 1
+    assert mask[1, :, :12, :10].sum() == 0 and mask[1, :, :, 10:].min() == 1
@@ -0,0 +1,90 @@
+import pytest
+import torch
+
+from aloscene import BoundingBoxes2D
+from aloscene.utils import box_ops
+
+
+def random_boxes(n_boxes, frame_size=(60, 80)):
+    xy = torch.rand(n_boxes, 2) * torch.tensor([frame_size[1], frame_size[0]]) * 0.8
+    wh = torch.rand(n_boxes, 2) * 20 + 1
+    return BoundingBoxes2D(torch.cat([xy, xy + wh], dim=1), boxes_format="xyxy", absolute=True, frame_size=frame_size)
+
+
+def test_iou_with_formats():
+    boxes1 = random_boxes(5)
+    boxes2 = random_boxes(7)
+    expected = boxes1.iou_with(boxes2)
+    assert expected.shape == (5, 7)
+    # Same results whatever the format / position of the other boxes
+    assert torch.allclose(boxes1.iou_with(boxes2.rel_pos().xcyc()), expected, atol=1e-6)
+    assert torch.allclose(boxes1.rel_pos().iou_with(boxes2.yxyx()), expected, atol=1e-6)
+    assert torch.allclose(boxes1.giou_with(boxes2.rel_pos()), boxes1.rel_pos().giou_with(boxes2), atol=1e-6)
+    assert torch.allclose(boxes1.iou_with(boxes1).diag(), torch.ones(5))
+
+
+def test_batched_iou_giou():
+    boxes1 = [random_boxes(n) for n in [3, 0, 5]]
+    boxes2 = [random_boxes(n) for n in [4, 2, 1]]
+    padded1, mask1 = BoundingBoxes2D.pad_list(boxes1)
+    padded2, mask2 = BoundingBoxes2D.pad_list(boxes2)
+    assert padded1.shape == (3, 5, 4) and mask1.sum(dim=1).tolist() == [3, 0, 5]
+
+    iou = BoundingBoxes2D.batched_iou(padded1, padded2, mask1, mask2)
+    giou = BoundingBoxes2D.batched_giou(padded1, padded2, mask1, mask2, fill_value=-2.0)
+    assert iou.shape == (3, 5, 4)
+    for b, (b1, b2) in enumerate(zip(boxes1, boxes2)):
+        n, m = len(b1), len(b2)
+        assert torch.allclose(iou[b, :n, :m], b1.iou_with(b2), atol=1e-6)
+        assert torch.allclose(giou[b, :n, :m], b1.giou_with(b2), atol=1e-6)
+        assert (iou[b, n:] == 0).all() and (iou[b, :, m:] == 0).all()
+        assert (giou[b, n:] == -2).all() and (giou[b, :, m:] == -2).all()
+
+    # Paired GIoU: diagonal of the GIoU matrix
+    b1, b2 = random_boxes(6), random_boxes(6)
+    paired = box_ops.paired_box_giou(b1._xyxy_tensor(), b2._xyxy_tensor())
+    assert torch.allclose(paired, torch.diag(b1.giou_with(b2)), atol=1e-6)
+
+
+def test_batched_nms():
+    boxes = [random_boxes(n) for n in [12, 4, 9]]
+    scores = [torch.rand(len(b)) for b in boxes]
+    labels = [torch.randint(0, 3, (len(b),)) for b in boxes]
+    padded, mask = BoundingBoxes2D.pad_list(boxes, absolute=True)
+    padded_scores = torch.zeros(mask.shape)
+    padded_labels = torch.zeros(mask.shape, dtype=torch.int64)
+    padded_scores[mask] = torch.cat(scores)
+    padded_labels[mask] = torch.cat(labels)
+
+    # Class aware: same as the NMS of each frame
+    keep, _ = BoundingBoxes2D.batched_nms(padded, padded_scores, padded_labels, mask, iou_threshold=0.1)
+    assert not keep[~mask].any()
+    for b in range(len(boxes)):
+        expected = boxes[b].nms(scores[b], iou_threshold=0.1, labels=labels[b])
+        assert set(keep[b].nonzero()[:, 0].tolist()) == set(expected.tolist())
+
+    # Class agnostic
+    keep, _ = box_ops.batched_nms(padded, padded_scores, mask=mask, iou_threshold=0.1)
+    for b in range(len(boxes)):
+        assert set(keep[b].nonzero()[:, 0].tolist()) == set(boxes[b].nms(scores[b], iou_threshold=0.1).tolist())
+
+
+def test_soft_nms():
+    boxes = torch.tensor([[[0, 0, 10, 10], [0, 0, 10, 9], [20, 20, 30, 30], [0, 0, 10, 10]]], dtype=torch.float)
+    scores = torch.tensor([[0.9, 0.8, 0.7, 0.95]])
+    mask = torch.tensor([[True, True, True, False]])
+
+    keep, decayed = box_ops.batched_nms(boxes, scores, mask=mask, method="linear", iou_threshold=0.5)
+    assert keep.tolist() == [[True, True, True, False]]
+    assert torch.allclose(decayed, torch.tensor([[0.9, 0.8 * 0.1, 0.7, 0.0]]))
+    # The decayed boxes are suppressed below the score threshold
+    keep, _ = box_ops.batched_nms(boxes, scores, mask=mask, method="linear", iou_threshold=0.5, score_threshold=0.1)
+    assert keep.tolist() == [[True, False, True, False]]
+
+    # Different labels do not decay each other
+    labels = torch.tensor([[0, 1, 0, 0]])
+    _, decayed = box_ops.batched_nms(boxes, scores, labels, mask, method="gaussian")
+    assert torch.allclose(decayed[0, :3], scores[0, :3])
+
+    with pytest.raises(ValueError):
+        box_ops.batched_nms(boxes, scores, method="unknown")
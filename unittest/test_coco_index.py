@@ -0,0 +1,117 @@
+import json
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pytest
+import torch
+import torchvision
+from pycocotools.coco import COCO
+
+from alodataset import CocoBaseDataset
+from alodataset.utils.coco_index import CocoIndex
+
+CATEGORIES = [
+    {"id": 1, "name": "person", "supercategory": "person"},
+    {"id": 3, "name": "car", "supercategory": "vehicle"},
+    {"id": 4, "name": "bike", "supercategory": "vehicle"},
+]
+
+
+def write_coco(directory, n_images=6, image_size=(32, 48)):
+    """Write a small COCO dataset: image i has i annotations, with categories cycling over CATEGORIES"""
+    os.makedirs(os.path.join(directory, "images"), exist_ok=True)
+    images, annotations = [], []
+    for i in range(n_images):
+        image_id = 100 - i  # Image ids not sorted in the json file
+        file_name = f"{image_id:012d}.jpg"
+        torchvision.io.write_jpeg(
+            torch.zeros((3, *image_size), dtype=torch.uint8), os.path.join(directory, "images", file_name)
+        )
+        images.append(
+            {"id": image_id, "file_name": file_name, "height": image_size[0], "width": image_size[1], "license": 1}
+        )
+        for a in range(i):
+            x, y = 2.0 * a, 1.5 * a
+            annotations.append(
+                {
+                    "id": 1000 - len(annotations),
+                    "image_id": image_id,
+                    "category_id": CATEGORIES[(i + a) % len(CATEGORIES)]["id"],
+                    "bbox": [x, y, 10.5, 8.0],
+                    "area": 84.0,
+                    "iscrowd": int(a == 3),
+                    "segmentation": [[x, y, x + 10.5, y, x + 10.5, y + 8.0, x, y + 8.0]],
+                }
+            )
+    annotations.reverse()
+    ann_file = os.path.join(directory, "annotations.json")
+    with open(ann_file, "w") as f:
+        json.dump({"images": images, "annotations": annotations, "categories": CATEGORIES}, f)
+    return ann_file
+
+
+class TmpCocoDataset(CocoBaseDataset):
+    def __init__(self, dataset_dir, **kwargs):
+        self._tmp_dataset_dir = dataset_dir
+        super().__init__(img_folder="images", ann_file="annotations.json", **kwargs)
+
+    def get_dataset_dir(self):
+        return self._tmp_dataset_dir
+
+
+def test_coco_index_api(tmp_path):
+    ann_file = write_coco(tmp_path)
+    coco = COCO(ann_file)
+    index = CocoIndex.load(ann_file)
+    assert os.path.isdir(CocoIndex.default_index_dir(ann_file))
+    assert isinstance(index.ann_bboxes, np.memmap)
+
+    assert index.getImgIds() == sorted(coco.imgs.keys())
+    assert index.getCatIds() == coco.getCatIds()
+    assert index.getCatIds("car") == coco.getCatIds("car") == [3]
+    assert index.getCatIds(supNms="vehicle") == coco.getCatIds(supNms="vehicle")
+    assert index.loadCats(index.getCatIds()) == coco.loadCats(coco.getCatIds())
+    for image_id in index.getImgIds():
+        assert index.loadImgs(image_id) == coco.loadImgs(image_id)
+        assert index.getAnnIds(image_id) == coco.getAnnIds(image_id)
+        assert index.loadAnns(index.getAnnIds(image_id)) == coco.loadAnns(coco.getAnnIds(image_id))
+
+    # The index is loaded back (not compiled again), and can be sent to other processes
+    index = pickle.loads(pickle.dumps(CocoIndex.load(ann_file)))
+    assert index.loadAnns([990]) == coco.loadAnns([990])
+
+    # Unknown ids (before or after the range of the ids): KeyError, as pycocotools
+    unknown = [(index.loadImgs, [94]), (index.loadImgs, [97, 101]), (index.loadAnns, [985]), (index.loadAnns, [1001])]
+    for load, ids in unknown:
+        with pytest.raises(KeyError):
+            load(ids)
+    assert index.getAnnIds([94, 99, 101]) == coco.getAnnIds([94, 99, 101]) == [1000]
+
+
+def test_coco_index_dataset():
+    # The image folder path must not contain "test" (reserved to the test split of COCO)
+    with tempfile.TemporaryDirectory(prefix="coco") as tmp_dir:
+        _check_coco_index_dataset(tmp_dir)
+
+
+def _check_coco_index_dataset(tmp_path):
+    write_coco(tmp_path)
+    classes = ["car"]
+    dataset = TmpCocoDataset(tmp_path, classes=classes, sample=False)
+    mmap_dataset = TmpCocoDataset(tmp_path, classes=classes, mmap_index=True, sample=False)
+    assert isinstance(mmap_dataset.coco, CocoIndex)
+    assert mmap_dataset.items == dataset.items and len(dataset.items) > 0
+    assert mmap_dataset.label_names == dataset.label_names == classes
+
+    for idx in range(len(dataset)):
+        frame, mmap_frame = dataset.getitem(idx), mmap_dataset.getitem(idx)
+        assert torch.equal(frame.boxes2d.as_tensor(), mmap_frame.boxes2d.as_tensor())
+        assert torch.equal(frame.boxes2d.labels.as_tensor(), mmap_frame.boxes2d.labels.as_tensor())
+
+
+if __name__ == "__main__":
+    test_coco_index_dataset()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_coco_index_api(tmp_dir)
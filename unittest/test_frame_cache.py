@@ -0,0 +1,71 @@
+import os
+import pickle
+
+import torch
+import torchvision
+
+from alodataset import BaseDataset, SequenceMixin, SequenceWindowSampler
+from aloscene import Frame
+
+
+class TmpSequenceDataset(BaseDataset, SequenceMixin):
+    """Overlapping windows of a sequence of png images"""
+
+    def __init__(self, dataset_dir, n_images=10, **kwargs):
+        self._tmp_dataset_dir = dataset_dir
+        super().__init__(name="tmp_sequence", **kwargs)
+        self.paths = []
+        for idx in range(n_images):
+            self.paths.append(os.path.join(dataset_dir, f"{idx:04d}.png"))
+            image = torch.randint(0, 256, (3, 8, 12), dtype=torch.uint8, generator=torch.Generator().manual_seed(idx))
+            torchvision.io.write_png(image, self.paths[-1])
+        self.items = [list(range(start, start + self.sequence_size)) for start in range(n_images - self.sequence_size + 1)]
+
+    def get_dataset_dir(self):
+        return self._tmp_dataset_dir
+
+    def getitem(self, idx):
+        frames = [self.load_sequence_frame(self.paths[t]).temporal() for t in self.items[idx]]
+        return torch.cat(frames, dim=0)
+
+
+def test_frame_cache(tmp_path):
+    dataset = TmpSequenceDataset(str(tmp_path), sequence_size=4, frame_cache=8)
+    uncached = TmpSequenceDataset(str(tmp_path), sequence_size=4)
+    assert uncached.frame_cache_stats() is None
+
+    for idx in SequenceWindowSampler(dataset, batch_size=2, shuffle=False):
+        frames = dataset[idx]
+        assert frames.names == ("T", "C", "H", "W") and frames.dtype == torch.float32
+        assert torch.equal(frames.as_tensor(), uncached[idx].as_tensor())
+    # Each image is decoded once
+    stats = dataset.frame_cache_stats()
+    assert stats["misses"] == 10 and stats["hits"] == len(dataset) * 4 - 10
+    assert stats["n_frames"] == 8 and stats["nbytes"] == 8 * 3 * 8 * 12
+
+    # The frames returned by the dataset can be modified without changing the cache
+    dataset[0].as_tensor().fill_(0)
+    assert torch.equal(dataset[0].as_tensor(), uncached[0].as_tensor())
+
+    # The cached images are not sent to the other processes
+    copy = pickle.loads(pickle.dumps(dataset.frame_cache))
+    assert len(copy) == 0 and copy.max_frames == 8 and copy.stats()["hits"] == 0
+
+
+def test_sequence_window_sampler():
+    sampler = SequenceWindowSampler(list(range(103)), batch_size=4, num_workers=3, chunk_size=10)
+    assert sampler.chunk_size == 12
+    assert sorted(sampler) == list(range(103)) and len(sampler) == 103
+
+    # 9 chunks of 12 items: 3 per worker
+    sampler = SequenceWindowSampler(list(range(108)), batch_size=4, num_workers=3, chunk_size=12)
+    indices = list(sampler)
+    assert sorted(indices) == list(range(108))
+    # Items read by each worker (the DataLoader sends the batch b to the worker b % num_workers)
+    batches = [indices[start : start + 4] for start in range(0, len(indices), 4)]
+    workers = [sum(batches[w::3], []) for w in range(3)]
+    for items in workers:
+        # Chunks of 12 consecutive items
+        for start in range(0, len(items), 12):
+            chunk = items[start : start + 12]
+            assert chunk == list(range(chunk[0], chunk[0] + len(chunk)))
@@ -0,0 +1,46 @@
+import os
+
+import torch
+import torchvision
+
+import aloscene
+
+
+def write_image(directory, size=(3, 24, 32)):
+    path = os.path.join(directory, "image.png")
+    image = torch.randint(0, 256, size, dtype=torch.uint8, generator=torch.Generator().manual_seed(0))
+    torchvision.io.write_png(image, path)
+    return path, image
+
+
+def test_uint8_frame(tmp_path):
+    path, image = write_image(tmp_path)
+    frame = aloscene.Frame(path, dtype=torch.uint8)
+    assert frame.dtype == torch.uint8 and frame.normalization == "255" and frame.names == ("C", "H", "W")
+    assert torch.equal(frame.as_tensor(), image)
+
+    # Spatial augmentations keep the compact storage
+    assert frame.hflip().dtype == torch.uint8
+    assert frame.crop((0.25, 0.75), (0.25, 0.75)).dtype == torch.uint8
+    assert frame.pad((0.25, 0.25), (0.25, 0.25)).dtype == torch.uint8
+    assert frame.resize((12, 16)).dtype == torch.uint8
+    assert frame.norm255().dtype == torch.uint8
+    assert aloscene.Frame.batch_list([frame, frame.crop((0.25, 0.75), (0.25, 0.75))]).dtype == torch.uint8
+
+
+def test_uint8_frame_normalization(tmp_path):
+    path, _ = write_image(tmp_path)
+    frame = aloscene.Frame(path, dtype=torch.uint8)
+    float_frame = aloscene.Frame(path)
+    assert float_frame.dtype == torch.float32
+
+    for norm in ["norm01", "norm_minmax_sym", "norm_resnet"]:
+        n_frame, n_float_frame = getattr(frame, norm)(), getattr(float_frame, norm)()
+        assert n_frame.dtype == torch.float32
+        assert n_frame.normalization == n_float_frame.normalization and n_frame.names == ("C", "H", "W")
+        assert torch.allclose(n_frame.as_tensor(), n_float_frame.as_tensor(), atol=1e-5)
+
+    batch = aloscene.Frame.batch_list([frame, frame]).norm_resnet()
+    assert batch.names == ("B", "C", "H", "W")
+    assert torch.allclose(batch.as_tensor()[1], float_frame.norm_resnet().as_tensor(), atol=1e-5)
+    assert torch.allclose(batch.norm255().as_tensor(), float_frame.as_tensor()[None].expand(2, -1, -1, -1), atol=1e-3)
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import torch
+
+import aloscene
+from aloscene.io.depth import load_depth
+from aloscene.io.disparity import load_disp_pfm
+from aloscene.io.flow import load_flow_flo
+from aloscene.io.gt_pack import PACK_FILE, open_pack, pack_directory
+
+
+def write_flo(path, flow):
+    """Write a (H, W, 2) flow in the .flo format"""
+    with open(path, "wb") as f:
+        f.write(b"PIEH")
+        np.array([flow.shape[1], flow.shape[0]], dtype=np.int32).tofile(f)
+        flow.astype(np.float32).tofile(f)
+
+
+def write_pfm(path, disp):
+    """Write a (H, W) disparity in the .pfm format (little endian, bottom to top)"""
+    with open(path, "wb") as f:
+        f.write(f"Pf\n{disp.shape[1]} {disp.shape[0]}\n-1.0\n".encode())
+        np.flip(disp, 0).astype("<f4").tofile(f)
+
+
+def write_ground_truth(directory, n=3, size=(12, 16)):
+    rng = np.random.RandomState(0)
+    for i in range(n):
+        write_flo(os.path.join(directory, f"{i:04d}.flo"), rng.randn(*size, 2) * 20)
+        write_pfm(os.path.join(directory, f"{i:04d}.pfm"), rng.rand(*size) * 100)
+        np.save(os.path.join(directory, f"{i:04d}.npy"), rng.rand(1, *size).astype(np.float32))
+
+
+def test_gt_pack(tmp_path):
+    directory = str(tmp_path)
+    write_ground_truth(directory)
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+    expected = {
+        path: load_flow_flo(path) if path.endswith(".flo") else load_disp_pfm(path) if path.endswith(".pfm")
+        # Depth
+        else torch.from_numpy(load_depth(path))
+        for path in paths
+    }
+    assert pack_directory(directory) == 9
+    assert len(open_pack(directory)) == 9
+
+    # The original files are not read anymore
+    for path in paths:
+        os.remove(path)
+    for path in paths:
+        if path.endswith(".flo"):
+            packed = load_flow_flo(path)
+        elif path.endswith(".pfm"):
+            packed = load_disp_pfm(path)
+        else:
+            packed = torch.from_numpy(load_depth(path))
+        assert packed.is_contiguous() and packed.dtype == torch.float32
+        assert torch.equal(packed, expected[path])
+
+    flow_path, disp_path = os.path.join(directory, "0001.flo"), os.path.join(directory, "0001.pfm")
+    flow = aloscene.Flow(flow_path)
+    assert flow.names == ("C", "H", "W") and torch.equal(flow.as_tensor(), expected[flow_path])
+    # Copy-on-write: the pack is not modified
+    flow.as_tensor().fill_(0)
+    assert torch.equal(aloscene.Flow(flow_path).as_tensor(), expected[flow_path])
+    disp = aloscene.Disparity(disp_path, camera_side="left")
+    assert torch.equal(disp.as_tensor(), expected[disp_path])
+
+
+def test_gt_pack_float16(tmp_path):
+    directory = str(tmp_path)
+    write_ground_truth(directory, n=1)
+    flow = load_flow_flo(os.path.join(directory, "0000.flo"))
+    size = os.path.getsize(os.path.join(directory, "0000.flo"))
+    pack_directory(directory, float16=True, extensions=(".flo",))
+    assert os.path.getsize(os.path.join(directory, PACK_FILE)) < size
+    packed = load_flow_flo(os.path.join(directory, "0000.flo"))
+    assert packed.dtype == torch.float32
+    assert torch.allclose(packed, flow, rtol=1e-3, atol=1e-3)
+    # Not packed: read from the file
+    assert load_disp_pfm(os.path.join(directory, "0000.pfm")).shape == (1, 12, 16)
@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+import torch
+import torchvision
+
+from aloscene import Frame
+from aloscene.io.image import load_image
+
+from test_coco_index import TmpCocoDataset, write_coco
+
+
+def test_load_image_reduced(tmp_path):
+    image = torch.randint(0, 256, (3, 240, 320), dtype=torch.uint8)
+    jpg_path, png_path = os.path.join(tmp_path, "image.jpg"), os.path.join(tmp_path, "image.png")
+    torchvision.io.write_jpeg(image, jpg_path)
+    torchvision.io.write_png(image, png_path)
+
+    assert load_image(jpg_path).shape == (3, 240, 320)
+    assert load_image(jpg_path, decode_size=(240, 320)).shape == (3, 240, 320)
+    assert load_image(jpg_path, decode_size=(100, 150)).shape == (3, 120, 160)
+    assert load_image(jpg_path, decode_size=(60, 60)).shape == (3, 60, 80)
+    assert load_image(jpg_path, decode_size=(1, 1)).shape == (3, 30, 40)
+    reduced = load_image(jpg_path, decode_size=(120, 160))
+    assert reduced.dtype == torch.float32
+    full = torch.nn.functional.interpolate(load_image(jpg_path)[None], size=(120, 160), mode="area")[0]
+    assert (reduced - full).abs().mean() < 20
+    # Only the JPEG images can be decoded at a reduced scale
+    assert load_image(png_path, decode_size=(60, 80)).shape == (3, 240, 320)
+    assert Frame(jpg_path, decode_size=(60, 80), dtype=torch.uint8).shape == (3, 60, 80)
+
+
+def test_coco_reduced_decoding():
+    # The image folder path must not contain "test" (reserved to the test split of COCO)
+    with tempfile.TemporaryDirectory(prefix="coco") as tmp_dir:
+        write_coco(tmp_dir, image_size=(64, 96))
+        dataset = TmpCocoDataset(tmp_dir, return_masks=True, sample=False)
+        reduced_dataset = TmpCocoDataset(tmp_dir, return_masks=True, decode_size=(32, 32), sample=False)
+        assert reduced_dataset.cache_config() != dataset.cache_config()
+
+        for idx in range(len(dataset)):
+            frame, reduced_frame = dataset.getitem(idx), reduced_dataset.getitem(idx)
+            assert reduced_frame.HW == (32, 48)
+            boxes = frame.boxes2d.abs_pos((32, 48))
+            assert torch.allclose(boxes.as_tensor(), reduced_frame.boxes2d.as_tensor())
+            assert reduced_frame.boxes2d.frame_size == (32, 48)
+            assert reduced_frame.segmentation.shape[-2:] == (32, 48)
+            masks = frame.segmentation.as_tensor()
+            if len(masks) > 0:
+                masks = torch.nn.functional.interpolate(masks[None], (32, 48), mode="nearest")[0]
+                assert torch.equal(reduced_frame.segmentation.as_tensor(), masks)
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pytest
+import torch
+import torchvision
+
+import aloscene.bounding_boxes_3d
+from alodataset import Split
+from alodataset.kitti_tracking import KittiTrackingDataset
+from alodataset.utils.label_table import load_frame_labels, load_label_table
+
+KITTI_LINES = [
+    "0 1 Car 0 0 -1.5 10.0 20.0 50.0 60.0 1.5 1.6 3.9 2.0 1.7 15.0 0.1",
+    "0 -1 DontCare -1 -1 -10 100.0 120.0 130.0 140.0 -1000 -1000 -1000 -1000 -1000 -1000 -10",
+    "2 1 Car 0 0 -1.5 11.0 21.0 51.0 61.0 1.5 1.6 3.9 2.1 1.7 14.0 0.2",
+    "2 3 Pedestrian 0 1 0.3 5.0 6.0 7.0 8.0 1.8 0.6 0.8 -3.0 1.6 9.0 -0.4",
+]
+
+
+def write_lines(path, lines):
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def test_frame_labels(tmp_path):
+    # MOT17 like file, sorted by object and not by frame
+    path = os.path.join(tmp_path, "gt.txt")
+    write_lines(path, ["1,1,10,10,5,5,1,1,1.0", "3,1,11,10,5,5,1,1,0.5", "1,2,20,20,6,6,0,1,1.0"])
+    cache_dir = os.path.join(tmp_path, "cache")
+
+    labels = load_frame_labels(path, delimiter=",", cache_dir=cache_dir)
+    assert len(labels) == 2 and 1 in labels and 3 in labels and 2 not in labels
+    assert labels[1][:, 1].tolist() == [1, 2] and labels[3][:, 2].tolist() == [11]
+    assert labels[2].shape == (0, 9) and labels[100].shape == (0, 9)
+
+    # The frame ids are kept when their rows are removed
+    selected = labels.select(labels.table[:, 6] == 1)
+    assert len(selected) == 2 and selected[1][:, 1].tolist() == [1] and selected[3][:, 1].tolist() == [1]
+
+    # Read from the cache, invalidated when the file changes
+    assert len(os.listdir(cache_dir)) == 1
+    cached = load_frame_labels(path, delimiter=",", cache_dir=cache_dir)
+    assert np.array_equal(cached.table, labels.table) and np.array_equal(cached.offsets, labels.offsets)
+    write_lines(path, ["1,1,10,10,5,5,1,1,1.0"])
+    os.utime(path, ns=(0, 0))
+    assert len(load_frame_labels(path, delimiter=",", cache_dir=cache_dir)) == 1
+
+
+def test_label_table_categories(tmp_path):
+    path = os.path.join(tmp_path, "labels.txt")
+    write_lines(path, KITTI_LINES)
+    table = load_label_table(path, n_columns=17, categories={2: KittiTrackingDataset.LABELS}, cache_dir=None)
+    assert table.shape == (4, 17)
+    assert table[:, 2].tolist() == [0, 8, 0, 3]
+
+    # Single line files
+    write_lines(path, ["1.5"])
+    assert load_label_table(path, cache_dir=None).shape == (1, 1)
+
+
+class TmpKittiTracking(KittiTrackingDataset):
+    def __init__(self, dataset_dir, **kwargs):
+        self._tmp_dataset_dir = dataset_dir
+        super().__init__(**kwargs)
+
+    def get_dataset_dir(self):
+        return self._tmp_dataset_dir
+
+
+@pytest.mark.skipif(bool(aloscene.bounding_boxes_3d.import_error), reason="BoundingBoxes3D can not be imported")
+def test_kitti_tracking_labels(tmp_path):
+    root = os.path.join(tmp_path, "training")
+    for folder in ["calib", "label_02", "image_02/0000"]:
+        os.makedirs(os.path.join(root, folder))
+    projection = "700 0 600 {} 0 700 180 0 0 0 1 0"
+    calib = [f"P{i}: " + projection.format(-380 * (i % 2)) for i in range(4)]
+    calib += ["R_rect " + " ".join(["1", "0", "0", "0", "1", "0", "0", "0", "1"])]
+    calib += ["Tr_velo_cam " + " ".join(["0", "-1", "0", "0", "0", "0", "-1", "0", "1", "0", "0", "0"])]
+    write_lines(os.path.join(root, "calib", "0000.txt"), calib)
+    write_lines(os.path.join(root, "label_02", "0000.txt"), KITTI_LINES)
+    for idx in range(3):
+        image = torch.zeros((3, 8, 12), dtype=torch.uint8)
+        torchvision.io.write_png(image, os.path.join(root, "image_02", "0000", f"{idx:06d}.png"))
+
+    dataset = TmpKittiTracking(
+        str(tmp_path), sequences=0, right_frame=False, sequence_size=2, skip=1, split=Split.TRAIN
+    )
+    frames = dataset.getitem(0)["left"]
+    assert frames.shape[0] == 2
+
+    boxes = frames.boxes2d[0]
+    assert boxes.as_tensor().tolist() == [[10.0, 20.0, 50.0, 60.0], [100.0, 120.0, 130.0, 140.0]]
+    assert boxes.labels["track_id"].as_tensor().tolist() == [1, -1]
+    assert boxes.labels["categories"].as_tensor().tolist() == [0, 8]
+    # No 3D box for the DontCare objects
+    boxes3d = frames.boxes3d[0]
+    expected = [2.0, 1.7 - 1.5 / 2, 15.0, 1.6, 1.5, 3.9, 0.1 + np.pi / 2]
+    assert boxes3d.shape[0] == 1 and np.allclose(boxes3d.as_tensor()[0].numpy(), expected)
+
+    assert frames.boxes2d[1].labels["track_id"].as_tensor().tolist() == [1, 3]
+    assert frames.boxes3d[1].shape[0] == 2
@@ -0,0 +1,123 @@
+import os
+import pickle
+
+import torch
+
+from alodataset import BaseDataset
+from aloscene import Depth, Flow, Frame, Labels, LazyChild
+from aloscene.utils.payload import from_payload, to_payload
+
+
+class Loader(object):
+    """Picklable loader counting its calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    def flow(self, value):
+        self.calls.append(("flow", value))
+        return Flow(torch.full((2, 8, 10), float(value)), names=("C", "H", "W"))
+
+    def depth(self, value):
+        self.calls.append(("depth", value))
+        return Depth(torch.full((1, 8, 10), float(value)), names=("C", "H", "W"))
+
+
+def pid_flow():
+    """Flow filled with the pid of the process loading it"""
+    return Flow(torch.full((2, 8, 10), float(os.getpid())), names=("C", "H", "W"))
+
+
+class LazyDataset(BaseDataset):
+    def __init__(self, **kwargs):
+        super().__init__(name="lazy", **kwargs)
+        self.items = list(range(2))
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        frame = Frame(torch.zeros(3, 8, 10), names=("C", "H", "W"))
+        frame.append_flow(LazyChild(pid_flow), "flow_forward")
+        return frame
+
+
+def lazy_frame(loader, value=1):
+    frame = Frame(torch.zeros(3, 8, 10), names=("C", "H", "W"))
+    frame.append_flow(LazyChild(loader.flow, value), "flow_forward")
+    return frame
+
+
+def test_lazy_child_not_loaded():
+    loader = Loader()
+    frame = lazy_frame(loader)
+    frame = (frame * 2).temporal()
+    frames = torch.cat([frame, lazy_frame(loader, 2).temporal()], dim=0)
+    batch = Frame.batch_list([frames, frames])
+    assert loader.calls == []
+    assert isinstance(batch[1][0].__dict__["flow"]["flow_forward"], LazyChild)
+
+    # Dropped before being accessed: never loaded
+    frames.flow = None
+    frames.drop_children()
+    assert loader.calls == []
+
+
+def test_lazy_child_loaded_on_access():
+    loader = Loader()
+    frames = torch.cat([lazy_frame(loader, 1).temporal(), lazy_frame(loader, 2).temporal()], dim=0)
+    flow = frames[1].flow["flow_forward"]
+    assert loader.calls == [("flow", 2)]
+    assert isinstance(flow, Flow) and flow.names == ("C", "H", "W") and flow.mean() == 2
+    flows = frames.flow["flow_forward"]
+    assert [f.mean() for f in flows] == [1, 2]
+    assert loader.calls == [("flow", 2), ("flow", 1)]
+
+    # Loaded by the transformations
+    loader = Loader()
+    flipped = lazy_frame(loader, 3).hflip()
+    assert loader.calls == [("flow", 3)]
+    assert flipped.__dict__["flow"]["flow_forward"].shape == (2, 8, 10)
+
+
+def test_lazy_mergeable_child():
+    loader = Loader()
+    frame = lazy_frame(loader)
+    frame.append_depth(LazyChild(loader.depth, 4))
+    assert loader.calls == []
+    frames = torch.cat([frame.temporal(), frame.temporal()], dim=0)
+    # Mergeable children are loaded to be merged
+    assert loader.calls == [("depth", 4)]
+    assert frames.depth.shape == (2, 1, 8, 10) and frames.depth.names == ("T", "C", "H", "W")
+
+
+def test_lazy_children_flag():
+    # Only the augmented tensors with lazy children look for them on attribute access
+    loader = Loader()
+    frame = lazy_frame(loader)
+    frames = torch.cat([frame.temporal(), frame.temporal()], dim=0)
+    assert frame.__dict__["_lazy_children"] and (frame * 2).__dict__["_lazy_children"]
+    assert frames.__dict__["_lazy_children"] and frames[1].__dict__["_lazy_children"]
+    assert not frame.load_lazy_children().__dict__["_lazy_children"] and loader.calls == [("flow", 1)]
+    labels = Labels(torch.zeros(2), encoding="id", labels_names=["a", "b"])
+    assert not labels.__dict__.get("_lazy_children", False)
+
+
+def test_lazy_child_pickle_and_payload():
+    loader = Loader()
+    frame = pickle.loads(pickle.dumps(lazy_frame(loader, 5)))
+    assert isinstance(frame.__dict__["flow"]["flow_forward"], LazyChild)
+    assert frame.flow["flow_forward"].mean() == 5
+
+    # The payload contains the loaded child
+    frame = from_payload(to_payload(lazy_frame(loader, 6)))
+    assert isinstance(frame.__dict__["flow"]["flow_forward"], Flow)
+    assert frame.flow["flow_forward"].mean() == 6
+
+
+def test_lazy_child_loaded_by_workers():
+    # The lazy children left by the transformations are loaded by the workers
+    for frames in LazyDataset().train_loader(batch_size=2, num_workers=1):
+        for frame in frames:
+            flow = frame.__dict__["flow"]["flow_forward"]
+            assert isinstance(flow, Flow) and float(flow.as_tensor()[0, 0, 0]) != os.getpid()
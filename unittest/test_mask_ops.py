@@ -0,0 +1,40 @@
+import torch
+
+from aloscene import Labels, Mask
+from aloscene.utils.mask_ops import masks_centroids, masks_to_id_map
+
+
+def build_masks():
+    masks = torch.zeros((3, 6, 8))
+    masks[0, 1:4, 1:4] = 1.0
+    masks[1, 2:5, 3:7] = 0.8  # Overlaps the first mask, lower value
+    masks[2, 0, 7] = 0.3  # Below the centroid threshold
+    labels = Labels(torch.tensor([4.0, 2.0, 7.0]), encoding="id", labels_names=[f"c{i}" for i in range(8)])
+    return Mask(masks, names=("N", "H", "W"), labels=labels)
+
+
+def test_mask2id():
+    mask = build_masks()
+    frame = mask.mask2id()
+    assert frame.shape == (6, 8) and frame.dtype == "int64"
+    assert frame[0, 0] == -1 and frame[2, 2] == 0 and frame[2, 3] == 0 and frame[4, 6] == 1 and frame[0, 7] == 2
+
+    cats, annotations = mask.mask2id(return_ann=True, return_cats=True)
+    assert cats[2, 2] == 4 and cats[4, 6] == 2 and cats[0, 7] == 7 and cats[0, 0] == -1
+    assert [(ann["x"], ann["y"], ann["text"]) for ann in annotations] == [(2, 2, "c4"), (4, 3, "c2"), (0, 0, "c7")]
+
+
+def test_batched_masks_to_id_map():
+    mask = build_masks().as_tensor()
+    batch = torch.stack([mask, mask.flip(-1), torch.zeros_like(mask)])
+    categories = torch.tensor([[4, 2, 7], [1, 1, 3], [5, 5, 5]])
+    id_maps = masks_to_id_map(batch, categories)
+    assert id_maps.shape == (3, 6, 8)
+    for b in range(3):
+        assert torch.equal(id_maps[b], masks_to_id_map(batch[b], categories[b]))
+    assert (id_maps[2] == -1).all()
+
+    areas, centroids = masks_centroids(batch)
+    assert areas.tolist() == [[9, 12, 0], [9, 12, 0], [0, 0, 0]]
+    assert centroids.shape == (3, 3, 2) and centroids[1, 0].tolist() == [5.0, 2.0]
+    assert masks_to_id_map(batch[:, :0]).shape == (3, 6, 8)
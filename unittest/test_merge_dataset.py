@@ -0,0 +1,67 @@
+import pytest
+import torch
+
+from alodataset import MergeDataset, WeightedMergeSampler
+
+
+class RangeDataset(torch.utils.data.Dataset):
+    def __init__(self, name, length):
+        self.name = name
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, idx):
+        return self.name, idx
+
+
+def merge_dataset(weights=None):
+    return MergeDataset([RangeDataset("a", 5), RangeDataset("b", 3), RangeDataset("c", 4)], weights=weights)
+
+
+def test_merge_dataset_index():
+    dataset = merge_dataset(weights=[2, 1, 3])
+    expected = []
+    for name, length, weight in [("a", 5, 2), ("b", 3, 1), ("c", 4, 3)]:
+        expected += [(name, idx) for idx in range(length)] * weight
+    assert len(dataset) == len(expected) == 25
+    assert [dataset[idx] for idx in range(len(dataset))] == expected
+    assert dataset[-1] == ("c", 3) and dataset.get_index(10) == (1, 0)
+    with pytest.raises(IndexError):
+        dataset[25]
+    with pytest.raises(RuntimeError):
+        merge_dataset(weights=[0.5, 1, 1])
+
+
+def test_weighted_merge_sampler():
+    dataset = merge_dataset()
+    generator = torch.Generator().manual_seed(0)
+
+    # Fixed composition of the batches
+    sampler = WeightedMergeSampler(
+        dataset, weights=[0.7, 0.0, 0.3], num_samples=100, batch_size=10, generator=generator
+    )
+    indices = list(sampler)
+    assert len(indices) == len(sampler) == 100
+    for start in range(0, 100, 10):
+        names = [dataset[idx][0] for idx in indices[start : start + 10]]
+        assert names.count("a") == 7 and names.count("c") == 3
+    # Without replacement in each dataset
+    samples_a = [dataset[idx][1] for idx in indices if dataset[idx][0] == "a"]
+    for start in range(0, len(samples_a), 5):
+        assert sorted(samples_a[start : start + 5]) == list(range(5))
+
+    # Fractional composition: the remaining samples follow the fractional parts
+    sampler = WeightedMergeSampler(
+        dataset, weights=[0.7, 0.0, 0.3], num_samples=8000, batch_size=8, generator=generator
+    )
+    names = [dataset[idx][0] for idx in sampler]
+    for start in range(0, 8000, 8):
+        assert names[start : start + 8].count("a") in (5, 6)
+    assert abs(names.count("a") / 8000 - 0.7) < 0.02
+
+    # Independent samples, weights proportional to the dataset lengths by default
+    sampler = WeightedMergeSampler(dataset, num_samples=12000, generator=generator)
+    names = [dataset[idx][0] for idx in sampler]
+    assert abs(names.count("b") / 12000 - 3 / 12) < 0.02
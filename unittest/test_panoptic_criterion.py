@@ -0,0 +1,78 @@
+import pytest
+import torch
+
+from aloscene import BoundingBoxes2D, Frame, Labels, Mask, RLEMask
+from alonet.detr import DetrHungarianMatcher
+from alonet.detr_panoptic import DetrPanopticCriterion
+from alonet.deformable_detr_panoptic import DeformablePanopticCriterion
+
+N_QUERIES, N_CLASSES, H, W = 10, 5, 32, 40
+
+
+def build_frames(rle_masks=False):
+    frames = []
+    for n_objects in [2, 3]:
+        masks = torch.zeros(n_objects, H, W)
+        boxes = []
+        for i in range(n_objects):
+            masks[i, 4 * i : 4 * i + 10, 5 * i : 5 * i + 12] = 1
+            boxes.append([5.0 * i, 4.0 * i, 5.0 * i + 12, 4.0 * i + 10])
+        labels = Labels(torch.arange(n_objects).float(), encoding="id", labels_names=list(map(str, range(N_CLASSES))))
+        frame = Frame(torch.rand(3, H, W), names=("C", "H", "W"))
+        frame.append_boxes2d(
+            BoundingBoxes2D(boxes, boxes_format="xyxy", absolute=True, frame_size=(H, W), labels=labels)
+        )
+        masks = Mask(masks, names=("N", "H", "W"), labels=labels)
+        frame.append_segmentation(RLEMask.from_mask(masks) if rle_masks else masks)
+        frames.append(frame)
+    return Frame.batch_list(frames)
+
+
+def build_outputs(mask_size, n_classes=N_CLASSES + 1, activation_fn="softmax"):
+    torch.manual_seed(0)
+    return {
+        "pred_logits": torch.randn(2, N_QUERIES, n_classes),
+        "pred_boxes": torch.rand(2, N_QUERIES, 4) * 0.5 + 0.1,
+        "pred_masks": torch.randn(2, N_QUERIES, *mask_size),
+        "pred_masks_info": {"filters": torch.ones(2, N_QUERIES, dtype=torch.bool)},
+        "activation_fn": activation_fn,
+    }
+
+
+def criterion_kwargs(**kwargs):
+    kwargs.update(
+        matcher=DetrHungarianMatcher(),
+        loss_boxes_weight=5,
+        loss_giou_weight=2,
+        loss_dice_weight=1,
+        loss_focal_weight=1,
+        eos_coef=0.1,
+        aux_loss_stage=0,
+        losses=["labels", "boxes", "masks"],
+        upscale_interpolate=False,
+    )
+    return kwargs
+
+
+def test_panoptic_criterion():
+    frames = build_frames()
+    criterion = DetrPanopticCriterion(**criterion_kwargs(loss_ce_weight=1))
+    _, losses = criterion(build_outputs((H // 4, W // 4)), frames)
+    assert all(name in losses for name in ["loss_ce", "loss_bbox", "loss_giou", "loss_DICE", "loss_focal"])
+    assert 0 < float(losses["loss_DICE"]) < 1
+
+    criterion = DeformablePanopticCriterion(**criterion_kwargs(loss_label_weight=1))
+    _, losses = criterion(build_outputs((H // 4, W // 4), N_CLASSES, "sigmoid"), frames)
+    assert all(name in losses for name in ["loss_focal_label", "loss_DICE", "loss_focal"])
+
+
+@pytest.mark.parametrize("upscale_interpolate", [False, True])
+def test_panoptic_criterion_rle_masks(upscale_interpolate):
+    mask_size = (H, W) if upscale_interpolate else (H // 4, W // 4)
+    kwargs = criterion_kwargs(loss_ce_weight=1)
+    kwargs["upscale_interpolate"] = upscale_interpolate
+    criterion = DetrPanopticCriterion(**kwargs)
+    _, losses = criterion(build_outputs(mask_size), build_frames())
+    _, rle_losses = criterion(build_outputs(mask_size), build_frames(rle_masks=True))
+    for name in ["loss_DICE", "loss_focal"]:
+        assert torch.allclose(losses[name], rle_losses[name])
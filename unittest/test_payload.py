@@ -0,0 +1,77 @@
+import pickle
+import pytest
+import torch
+
+import aloscene
+from aloscene import Frame, BoundingBoxes2D, Labels, Flow
+from aloscene.utils.payload import to_payload, from_payload, to_device, _pack_tensors, _unpack_tensors
+from alodataset.base_dataset import rename_data_to_none
+
+
+def _get_frame():
+    frame = Frame(torch.rand(3, 20, 30), normalization="01")
+    labels = Labels([1.0], labels_names=["a", "b"], names=("N",))
+    boxes = BoundingBoxes2D([[0.5, 0.5, 0.2, 0.2]], boxes_format="xcyc", absolute=False, labels=labels)
+    frame.append_boxes2d(boxes, "gt")
+    frame.append_flow(Flow(torch.rand(2, 20, 30)))
+    return frame.temporal()
+
+
+def test_payload_round_trip():
+    frame = rename_data_to_none(_get_frame())
+    payload = to_payload({"left": frame, "right": [frame, None]})
+    assert all(type(t) is torch.Tensor for t in payload["tensors"])
+
+    data = from_payload(pickle.loads(pickle.dumps(payload)))
+    n_frame = data["left"]
+    assert isinstance(n_frame, Frame) and data["right"][1] is None
+    assert n_frame.names == ("T", "C", "H", "W")
+    assert n_frame.normalization == "01"
+    assert torch.equal(n_frame.as_tensor(), frame.as_tensor())
+    boxes = n_frame.boxes2d["gt"][0]
+    assert isinstance(boxes, BoundingBoxes2D) and boxes.boxes_format == "xcyc"
+    assert boxes.labels.labels_names == ["a", "b"]
+    assert torch.equal(boxes.as_tensor(), frame.boxes2d["gt"][0].as_tensor())
+    assert n_frame.flow[0].names == ("C", "H", "W")
+
+
+def test_payload_zero_copy():
+    frame = _get_frame()
+    payload = to_payload(frame)
+    n_frame = from_payload(payload)
+    assert n_frame.data_ptr() == frame.data_ptr()
+
+
+def test_pack_tensors():
+    tensors = [torch.rand(3, 4), torch.arange(6).view(2, 3).t(), torch.rand(5) > 0.5, torch.rand(2, 2)]
+    buffers, slices = _pack_tensors(tensors)
+    assert len(buffers) == 3 and buffers[torch.float32].numel() == 16
+    unpacked = _unpack_tensors(buffers, slices, [t.shape for t in tensors])
+    for tensor, n_tensor in zip(tensors, unpacked):
+        assert n_tensor.dtype == tensor.dtype and torch.equal(n_tensor, tensor)
+
+
+def test_to_device():
+    frame = _get_frame()
+    data = to_device([frame, {"id": torch.tensor([3])}], "meta")
+    n_frame = data[0]
+    assert isinstance(n_frame, Frame) and n_frame.device.type == "meta"
+    assert n_frame.names == ("T", "C", "H", "W") and n_frame.normalization == "01"
+    boxes = n_frame.boxes2d["gt"][0]
+    assert isinstance(boxes, BoundingBoxes2D) and boxes.device.type == "meta"
+    assert boxes.labels.device.type == "meta" and boxes.labels.labels_names == ["a", "b"]
+    assert n_frame.flow[0].device.type == "meta" and n_frame.flow[0].shape == frame.flow[0].shape
+    assert data[1]["id"].device.type == "meta"
+    # Already on the target device: nothing is moved
+    assert to_device(frame, "cpu").data_ptr() == frame.data_ptr()
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="Pinned memory requires cuda")
+def test_to_device_pinned():
+    frame = _get_frame()
+    buffers, _ = _pack_tensors(to_payload(frame)["tensors"], pin_memory=True)
+    assert all(buffer.is_pinned() for buffer in buffers.values())
+    n_frame = to_device(frame, "cuda")
+    torch.cuda.synchronize()
+    assert n_frame.is_cuda and n_frame.boxes2d["gt"][0].is_cuda
+    assert torch.equal(n_frame.cpu().as_tensor(), frame.as_tensor())
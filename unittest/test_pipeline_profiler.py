@@ -0,0 +1,55 @@
+import torch
+
+import aloscene
+from alodataset import BaseDataset, transforms as T
+from aloscene.utils.pipeline_profiler import PipelineProfiler, is_profiling
+
+
+class RandomFrameDataset(BaseDataset):
+    def __init__(self, n_items=8, **kwargs):
+        super().__init__(name="random_frames", **kwargs)
+        self.items = list(range(n_items))
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        return aloscene.Frame(torch.rand(3, 16, 24), names=("C", "H", "W"))
+
+
+def run_epoch(dataset, num_workers):
+    for frames in dataset.train_loader(batch_size=2, num_workers=num_workers):
+        aloscene.Frame.batch_list(frames)
+
+
+def test_pipeline_profiler():
+    transform = T.Compose([T.RandomHorizontalFlip(p=1.0), T.Resize((8, 12))], fuse_geometry=False)
+    dataset = RandomFrameDataset(transform_fn=transform)
+
+    # Nothing recorded by default
+    profiler = PipelineProfiler()
+    run_epoch(dataset, num_workers=0)
+    assert profiler.stats() == {}
+
+    for num_workers in [0, 2]:
+        with PipelineProfiler() as profiler:
+            assert is_profiling()
+            run_epoch(dataset, num_workers=num_workers)
+            stats = profiler.stats()
+        assert not is_profiling()
+
+        for name in ["dataset/item", "dataset/getitem", "dataset/transform_fn", "dataset/rename_data_to_none"]:
+            assert stats[name]["count"] == 8, (num_workers, name)
+        for name in ["transform/Compose", "transform/RandomHorizontalFlip", "transform/Resize"]:
+            assert stats[name]["count"] == 8
+        assert stats["batch_list"]["count"] == 4
+        # Output sizes: 3x16x24 frames loaded, 3x8x12 after the transformations
+        assert stats["dataset/getitem"]["bytes"] == 8 * 3 * 16 * 24 * 4
+        assert stats["dataset/transform_fn"]["bytes"] == 8 * 3 * 8 * 12 * 4
+        # Frames and padding masks
+        assert stats["batch_list"]["bytes"] == 4 * (2 * 3 * 8 * 12 * 4 + 2 * 8 * 12 * 4)
+
+        stage = stats["dataset/item"]
+        assert sum(stage["histogram"].values()) == 8
+        assert 0 < stage["p50_ms"] <= stage["p90_ms"] <= stage["p99_ms"]
+        assert stage["total_s"] >= stats["dataset/transform_fn"]["total_s"]
@@ -0,0 +1,55 @@
+import torch
+
+from aloscene import BoundingBoxes2D, Labels, Points2D, Ragged
+
+
+def boxes_list(lengths=(3, 0, 2)):
+    boxes = []
+    for n in lengths:
+        labels = Labels(torch.arange(n, dtype=torch.float32), encoding="id")
+        xy = torch.rand(n, 2) * 50
+        data = torch.cat([xy, xy + torch.rand(n, 2) * 20 + 1], dim=1)
+        boxes.append(BoundingBoxes2D(data, boxes_format="xyxy", absolute=True, frame_size=(80, 100), labels=labels))
+    return boxes
+
+
+def test_ragged_boxes():
+    boxes = boxes_list()
+    ragged = Ragged.from_list(boxes)
+    assert len(ragged) == 3 and ragged.lengths.tolist() == [3, 0, 2] and ragged.offsets.tolist() == [0, 3, 3, 5]
+    assert ragged.data.labels.as_tensor().tolist() == [0, 1, 2, 0, 1]
+    assert ragged.batch_index().tolist() == [0, 0, 0, 2, 2]
+
+    # A frame is a view of the packed boxes, with its labels
+    frame = ragged[2]
+    assert isinstance(frame, BoundingBoxes2D) and frame.data_ptr() == ragged.data[3:].data_ptr()
+    assert torch.equal(frame.as_tensor(), boxes[2].as_tensor()) and frame.labels.as_tensor().tolist() == [0, 1]
+    assert len(ragged[1]) == 0 and len(ragged[-1]) == 2
+    assert ragged[1:].lengths.tolist() == [0, 2] and torch.equal(ragged[1:][1].as_tensor(), boxes[2].as_tensor())
+
+    # Row wise transformation of all the frames at once
+    converted = ragged.apply(lambda b: b.rel_pos().xcyc())
+    for packed, box in zip(converted, boxes):
+        assert converted.data.boxes_format == "xcyc" and not converted.data.absolute
+        assert torch.allclose(packed.as_tensor(), box.rel_pos().xcyc().as_tensor())
+    flipped = ragged.apply(lambda b: b.hflip())
+    assert torch.allclose(flipped[0].as_tensor(), boxes[0].hflip().as_tensor())
+
+    # Matched rows of each frame and padded form
+    flat = ragged.flat_index([torch.tensor([2, 0]), torch.tensor([], dtype=torch.int64), torch.tensor([1])])
+    assert flat.tolist() == [2, 0, 4]
+    padded, mask = ragged.to_padded(fill_value=-1)
+    assert padded.shape == (3, 3, 4) and mask.tolist() == [[True] * 3, [False] * 3, [True, True, False]]
+    assert torch.equal(padded[2, :2], boxes[2].as_tensor()) and (padded[1] == -1).all()
+    assert ragged.to_padded(max_length=5)[0].shape == (3, 5, 4)
+
+
+def test_ragged_points_and_tensors():
+    points = [Points2D(torch.rand(n, 2), points_format="xy", absolute=False) for n in [1, 4]]
+    ragged = Ragged.from_list(points)
+    assert ragged.data.shape == (5, 2) and torch.equal(ragged[1].as_tensor(), points[1].as_tensor())
+    assert torch.equal(ragged.to_padded()[0][0, 0], points[0].as_tensor()[0])
+
+    ragged = Ragged.from_list([torch.ones(2), torch.ones(0)])
+    padded, mask = ragged.to_padded()
+    assert padded.tolist() == [[1, 1], [0, 0]] and mask.sum() == 2
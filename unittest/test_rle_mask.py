@@ -0,0 +1,92 @@
+import numpy as np
+import torch
+from torchvision.transforms import InterpolationMode
+
+from aloscene import Frame, Labels, Mask, RLEMask
+from aloscene.utils import rle
+from alonet.metrics import PQMetrics
+
+
+def random_masks(n_masks=5, size=(37, 53), seed=0):
+    """Blob-like binary masks"""
+    rng = np.random.default_rng(seed)
+    masks = np.zeros((n_masks, *size), dtype=bool)
+    for mask in masks:
+        y0, x0 = rng.integers(0, size[0] - 5), rng.integers(0, size[1] - 5)
+        y1, x1 = y0 + rng.integers(1, size[0] - y0), x0 + rng.integers(1, size[1] - x0)
+        mask[y0:y1, x0:x1] = rng.random((y1 - y0, x1 - x0)) > 0.2
+    labels = Labels(torch.arange(n_masks, dtype=torch.float32), encoding="id", labels_names=[str(i) for i in range(50)])
+    return Mask(torch.from_numpy(masks).float(), names=("N", "H", "W"), labels=labels)
+
+
+def test_rle_kernels():
+    masks = random_masks().as_tensor().numpy() > 0.5
+    runs = rle.encode(masks)
+    assert runs.dtype == np.int32 and runs.shape[0] == 5
+    assert (rle.decode(runs, masks.shape[1:]) == masks).all()
+    assert (rle.area(runs) == masks.sum(axis=(1, 2))).all()
+    # Zero padded runs are neutral
+    padded = np.concatenate([runs, np.zeros((5, 4), dtype=np.int32)], axis=1)
+    assert (rle.decode(padded, masks.shape[1:]) == masks).all()
+
+    # Sparse masks, decoded by slices
+    boxes = np.zeros((3, 20, 30), dtype=bool)
+    boxes[0, 2:9, 4:17], boxes[2, 11:, 25:] = True, True
+    assert (rle.decode(rle.encode(boxes), (20, 30)) == boxes).all()
+
+    # Encoding of an id map
+    id_map = np.random.default_rng(0).integers(0, 4, (7, 9))
+    ids = np.array([3, 0, 8])
+    assert (rle.decode(rle.encode_id_map(id_map, ids), (7, 9)) == (id_map == ids[:, None, None])).all()
+
+    # Empty masks
+    empty = rle.encode(np.zeros((2, 4, 4), dtype=bool))
+    assert empty.shape == (2, 0) and rle.decode(empty, (4, 4)).sum() == 0
+    assert rle.iou(empty, runs[:, :0]).shape == (2, 5)
+
+
+def test_rle_mask_ops():
+    mask = random_masks()
+    rle_mask = RLEMask.from_mask(mask)
+    assert rle_mask.frame_size == (37, 53) and rle_mask.dtype == torch.int32
+    assert rle_mask.labels.as_tensor().tolist() == mask.labels.as_tensor().tolist()
+    assert torch.equal(rle_mask.to_mask().as_tensor(), mask.as_tensor())
+    assert torch.equal(rle_mask.area(), mask.as_tensor().sum(dim=(1, 2)).long())
+
+    mask2 = random_masks(seed=1)
+    assert torch.allclose(rle_mask.iou_with(RLEMask.from_mask(mask2)), mask.iou_with(mask2))
+    assert torch.allclose(mask.iou_with(RLEMask.from_mask(mask2)), mask.iou_with(mask2))
+
+    # Spatial transformations of a frame applied on the runs, same results than on the dense masks
+    frames = []
+    for segmentation in [mask, rle_mask]:
+        frame = Frame(torch.rand(3, 37, 53), names=("C", "H", "W"))
+        frame.append_segmentation(segmentation)
+        frame = frame.hflip().crop((0.1, 0.9), (0.2, 0.7))
+        frame = frame.resize((45, 21), interpolation=InterpolationMode.NEAREST).pad(offset_y=(3, 1), offset_x=(0, 5))
+        frames.append(frame)
+    dense, encoded = frames[0].segmentation, frames[1].segmentation
+    assert isinstance(encoded, RLEMask) and encoded.frame_size == dense.shape[1:] == frames[1].HW
+    assert torch.equal(encoded.to_mask().as_tensor(), dense.as_tensor())
+    assert encoded.labels.as_tensor().tolist() == [0, 1, 2, 3, 4]
+
+    # Boxes around the masks and panoptic id map
+    boxes = rle_mask.to_boxes2d()
+    y, x = torch.nonzero(mask.as_tensor()[2], as_tuple=True)
+    assert boxes.as_tensor()[2].tolist() == [x.min(), y.min(), x.max(), y.max()]
+    assert (rle_mask.mask2id(return_cats=True) == mask.mask2id(return_cats=True)).all()
+    assert (rle_mask.mask2id() == mask.mask2id()).all()
+
+
+def test_rle_mask_pq_metrics():
+    target = random_masks(seed=2)
+    pred = target.clone()
+    pred[:, 10:20] = 0
+    results = []
+    for encode in [False, True]:
+        metrics = PQMetrics()
+        t_mask = RLEMask.from_mask(target) if encode else target
+        p_mask = RLEMask.from_mask(pred) if encode else pred
+        metrics.add_sample(p_mask, t_mask)
+        results.append(metrics.calc_map()[0]["all"])
+    assert results[0] == results[1] and 0 < results[0]["pq"] < 1
@@ -0,0 +1,63 @@
+import os
+import torch
+
+import aloscene
+from alodataset import BaseDataset
+from alodataset.utils.sample_cache import SampleCache, save_sample, load_sample
+
+
+class CountingDataset(BaseDataset):
+    def __init__(self, n_samples=4, size=(16, 20), **kwargs):
+        super().__init__(name="counting", **kwargs)
+        self.items = list(range(n_samples))
+        self.size = size
+        self.n_decoded = 0
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        self.n_decoded += 1
+        frame = aloscene.Frame(torch.full((3, *self.size), float(idx)), normalization="255")
+        boxes = aloscene.BoundingBoxes2D([[0.5, 0.5, 0.2, 0.2]], boxes_format="xcyc", absolute=False)
+        boxes.append_labels(aloscene.Labels([idx], encoding="id", names=("N",)))
+        frame.append_boxes2d(boxes)
+        return {"frame": frame, "mask": torch.zeros(0, 2, dtype=torch.bool), "id": idx}
+
+
+def test_save_load_sample(tmp_path):
+    data = CountingDataset(sample=False).getitem(3)
+    path = os.path.join(tmp_path, "sample")
+    save_sample(path, data)
+    n_data = load_sample(path)
+    assert n_data["id"] == 3 and n_data["mask"].shape == (0, 2) and n_data["mask"].dtype == torch.bool
+    frame = n_data["frame"]
+    assert frame.names == ("C", "H", "W") and frame.normalization == "255"
+    assert torch.equal(frame.as_tensor(), data["frame"].as_tensor())
+    assert torch.equal(frame.boxes2d.labels.as_tensor(), data["frame"].boxes2d.labels.as_tensor())
+
+
+def test_dataset_cache(tmp_path):
+    dataset = CountingDataset(cache_dir=str(tmp_path))
+    for idx in range(len(dataset)):
+        dataset[idx]
+    assert dataset.n_decoded == 4
+    data = dataset[2]
+    assert dataset.n_decoded == 4
+    assert torch.equal(data["frame"].as_tensor(), torch.full((3, 16, 20), 2.0))
+
+    # Another configuration of the dataset does not share the cached samples
+    other = CountingDataset(cache_dir=str(tmp_path), size=(8, 8))
+    assert other[2]["frame"].shape == (3, 8, 8) and other.n_decoded == 1
+
+
+def test_cache_eviction(tmp_path):
+    cache = SampleCache(str(tmp_path), "counting", max_size=1)
+    data = CountingDataset().getitem(0)
+    cache.put(0, data)
+    sample_size = os.path.getsize(cache.path(0))
+    cache.max_size = int(sample_size * 2.5)
+    for idx in range(1, 4):
+        cache.put(idx, data)
+    assert cache.get(0) is None and cache.get(1) is None
+    assert cache.get(2) is not None and cache.get(3) is not None
@@ -0,0 +1,67 @@
+import json
+import os
+import torch
+
+import aloscene
+from alodataset import BaseDataset, ShardDataset, write_shards
+
+
+class RangeDataset(BaseDataset):
+    def __init__(self, n_samples=10, **kwargs):
+        super().__init__(name="range", **kwargs)
+        self.items = list(range(n_samples))
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        torch.manual_seed(idx)
+        frame = aloscene.Frame(torch.randint(0, 255, (3, 16, 20)).float(), normalization="255")
+        boxes = aloscene.BoundingBoxes2D([[0.5, 0.5, 0.2, 0.2]], boxes_format="xcyc", absolute=False)
+        boxes.append_labels(aloscene.Labels([idx], encoding="id", names=("N",)))
+        frame.append_boxes2d(boxes)
+        return frame
+
+
+def _ids(frames):
+    return [int(frame.boxes2d.labels.as_tensor()[0]) for frame in frames]
+
+
+def test_write_read_shards(tmp_path):
+    index = write_shards(RangeDataset(), str(tmp_path), max_samples_per_shard=4)
+    assert [s["n_samples"] for s in index["shards"]] == [4, 4, 2]
+    with open(os.path.join(tmp_path, "shards.json")) as f:
+        assert json.load(f) == index
+
+    dataset = ShardDataset(str(tmp_path))
+    frames = list(dataset)
+    assert len(dataset) == 10 and _ids(frames) == list(range(10))
+    assert isinstance(frames[0], aloscene.Frame) and frames[0].names == ("C", "H", "W")
+
+    # Each worker reads its own shards
+    ids = [_ids(batch)[0] for batch in dataset.train_loader(num_workers=2)]
+    assert sorted(ids) == list(range(10))
+
+    shuffled = ShardDataset(str(tmp_path), shuffle=True, shuffle_buffer=3)
+    assert sorted(_ids(shuffled)) == list(range(10))
+
+
+def test_shuffled_shards_workers(tmp_path):
+    write_shards(RangeDataset(n_samples=12), str(tmp_path), max_samples_per_shard=1)
+    # Each shard is read by exactly one worker, at each epoch
+    for seed in [None, 0]:
+        dataset = ShardDataset(str(tmp_path), shuffle=True, shuffle_buffer=2, seed=seed)
+        orders = []
+        for epoch in range(2):
+            dataset.set_epoch(epoch)
+            ids = [_ids(batch)[0] for batch in dataset.train_loader(num_workers=3)]
+            assert sorted(ids) == list(range(12))
+            orders.append(ids)
+        assert orders[0] != orders[1]
+
+
+def test_shards_image_format(tmp_path):
+    frame = RangeDataset().getitem(0)
+    write_shards(RangeDataset(n_samples=1), str(tmp_path), image_format="png")
+    n_frame = next(iter(ShardDataset(str(tmp_path))))
+    assert n_frame.dtype == frame.dtype and torch.equal(n_frame.as_tensor(), frame.as_tensor())
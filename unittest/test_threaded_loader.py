@@ -0,0 +1,65 @@
+import random
+import threading
+import time
+
+import pytest
+import torch
+
+import aloscene
+from alodataset import BaseDataset, MergeDataset
+from alodataset.base_dataset import ThreadedStreamLoader
+
+
+class SlowDataset(BaseDataset):
+    """Items loaded with random delays"""
+
+    def __init__(self, n_items=20, fail_at=None, **kwargs):
+        super().__init__(name="slow", **kwargs)
+        self.items = list(range(n_items))
+        self.fail_at = fail_at
+        self.loaded = []
+        self.threads = set()
+
+    def get_dataset_dir(self):
+        return None
+
+    def getitem(self, idx):
+        time.sleep(random.uniform(0, 0.01))
+        if idx == self.fail_at:
+            raise ValueError(f"Invalid item {idx}")
+        self.loaded.append(idx)
+        self.threads.add(threading.get_ident())
+        return aloscene.Frame(torch.full((3, 4, 6), float(idx)), names=("C", "H", "W"))
+
+
+def test_threaded_stream_loader():
+    dataset = SlowDataset(transform_fn=lambda frame: frame + 1)
+    loader = dataset.stream_loader(num_threads=4)
+    assert isinstance(loader, ThreadedStreamLoader) and len(loader) == 20
+
+    # In order, transformed, read by several threads
+    frames = list(loader)
+    assert [frame.as_tensor()[0, 0, 0].item() for frame in frames] == [idx + 1 for idx in range(20)]
+    assert len(dataset.threads) > 1 and threading.get_ident() not in dataset.threads
+
+    # Merged datasets
+    merged = MergeDataset([SlowDataset(n_items=3), SlowDataset(n_items=2)])
+    values = [frame.as_tensor()[0, 0, 0].item() for frame in merged.stream_loader(num_threads=2)]
+    assert values == [0, 1, 2, 0, 1]
+
+
+def test_threaded_stream_loader_stop():
+    # Only the prefetched items are read when the iteration stops
+    dataset = SlowDataset(n_items=100)
+    for idx, _ in enumerate(ThreadedStreamLoader(dataset, num_threads=2, prefetch=4)):
+        if idx == 5:
+            break
+    assert len(dataset.loaded) <= 10
+
+    # The errors are raised at the position of the item
+    dataset = SlowDataset(n_items=10, fail_at=6)
+    values = []
+    with pytest.raises(ValueError):
+        for frame in dataset.stream_loader(num_threads=3):
+            values.append(frame.as_tensor()[0, 0, 0].item())
+    assert values == list(range(6))
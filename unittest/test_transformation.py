@@ -78,6 +78,79 @@ def test_color_jitter():
     assert torch.allclose(n_frame_set["frame1"][0].as_tensor(), n_frame_set["frame1"][1].as_tensor())
 
 
+def _batched_frames():
+    frames = []
+    for _ in range(4):
+        frame = aloscene.Frame(np.random.uniform(0, 1, (3, 20, 30)), names=("C", "H", "W"), normalization="01")
+        boxes = aloscene.BoundingBoxes2D([[0.3, 0.5, 0.2, 0.2]], boxes_format="xcyc", absolute=False)
+        frame.append_boxes2d(boxes, "gt")
+        frame.append_depth(aloscene.Depth(torch.rand(1, 20, 30)))
+        frames.append(torch.cat([frame.temporal(), frame.temporal()], dim=0))
+    return aloscene.Frame.batch_list(frames)
+
+
+def test_batched_color_jitter():
+    frames = _batched_frames()
+    frame_aug = T.ColorJitter(same_on_sequence=True)(frames, batched=True)
+    assert frame_aug.names == ("B", "T", "C", "H", "W")
+    assert not torch.allclose(frame_aug[0].as_tensor(), frame_aug[1].as_tensor())
+    assert torch.allclose(frame_aug[0][0].as_tensor(), frame_aug[0][1].as_tensor())
+    frame_aug = T.ColorJitter(same_on_sequence=False)(frames, batched=True)
+    assert not torch.allclose(frame_aug[0][0].as_tensor(), frame_aug[0][1].as_tensor())
+
+    # Same result than the per frame transformation
+    transform = T.ColorJitter()
+    params = transform.sample_params()
+    transform.set_params(*params)
+    frame_aug = transform.apply(frames[0][0])
+    transform.set_params(params[0], *[torch.tensor([[p]]) for p in params[1:]])
+    batch_aug = transform.apply_batch(frames[0:1, 0:1])
+    assert torch.allclose(frame_aug.as_tensor(), batch_aug.as_tensor()[0, 0], atol=1e-5)
+
+
+def test_batched_hflip():
+    frames = _batched_frames()
+    transform = T.RandomHorizontalFlip(p=0.5)
+    transform.p = 0.5
+    transform.set_params(torch.tensor([[0.1], [0.9], [0.2], [0.7]]))
+    frame_aug = transform.apply_batch(frames)
+    for b, flipped in enumerate([True, False, True, False]):
+        data, depth = frames.as_tensor()[b], frames.depth.as_tensor()[b]
+        assert torch.equal(frame_aug.as_tensor()[b], data.flip(-1) if flipped else data)
+        assert torch.equal(frame_aug.depth.as_tensor()[b], depth.flip(-1) if flipped else depth)
+        boxes = frame_aug.boxes2d["gt"][b][1].as_tensor()
+        assert torch.allclose(boxes[0, 0], torch.tensor(0.7 if flipped else 0.3))
+
+
+def test_batched_compose():
+    frames = _batched_frames()
+    transform = T.Compose([T.Resize((10, 16)), T.RealisticNoise(), T.CustomRandomColoring()])
+    frame_aug = transform(frames, batched=True)
+    assert frame_aug.shape == (4, 2, 3, 10, 16) and frame_aug.depth.shape == (4, 2, 1, 10, 16)
+    assert len(frame_aug.boxes2d["gt"]) == 4
+
+
+def test_compose_fused_geometry():
+    frame = aloscene.Frame(np.random.uniform(0, 1, (3, 200, 300)), names=("C", "H", "W"), normalization="01")
+    boxes = aloscene.BoundingBoxes2D([[0.5, 0.5, 0.2, 0.2]], boxes_format="xcyc", absolute=False)
+    frame.append_boxes2d(boxes, "gt")
+    frame.append_flow(aloscene.Flow(torch.rand(2, 200, 300)))
+
+    def _run(fuse_geometry):
+        torch.manual_seed(42)
+        np.random.seed(42)
+        random.seed(42)
+        transform = T.Compose(
+            [T.Resize((100, 150)), T.RandomSizeCrop(0.5, 0.9), T.RandomCrop((40, 60)), T.RandomHorizontalFlip()],
+            fuse_geometry=fuse_geometry,
+        )
+        return transform(frame)
+
+    sequential, fused = _run(False), _run(True)
+    assert fused.shape == sequential.shape and fused.flow.shape == sequential.flow.shape
+    assert torch.allclose(fused.boxes2d["gt"].as_tensor(), sequential.boxes2d["gt"].as_tensor(), atol=1e-5)
+
+
 if __name__ == "__main__":
     # seed everything
     seed = 42
@@ -86,3 +159,7 @@ if __name__ == "__main__":
     torch.manual_seed(seed)
     torch.cuda.manual_seed_all(seed)
     test_color_jitter()
+    test_batched_color_jitter()
+    test_batched_hflip()
+    test_batched_compose()
+    test_compose_fused_geometry()
@@ -0,0 +1,86 @@
+import pickle
+
+import torch
+
+from aloscene import BoundingBoxes2D, Labels, Points2D
+from aloscene.tensors import reset_view_cache_stats, view_cache_stats
+
+
+def build_boxes():
+    labels = Labels(torch.tensor([1.0, 3.0]), encoding="id")
+    data = torch.tensor([[10.0, 20.0, 50.0, 60.0], [0.0, 0.0, 30.0, 40.0]])
+    return BoundingBoxes2D(data, boxes_format="xyxy", absolute=True, frame_size=(100, 200), labels=labels)
+
+
+def test_cached_views():
+    boxes = build_boxes()
+    expected = boxes.rel_pos().xcyc().as_tensor()
+    reset_view_cache_stats()
+    first = boxes.rel_pos().xcyc()
+    second = boxes.rel_pos().xcyc()
+    assert view_cache_stats() == {"hits": 4, "misses": 0}
+    assert first is not second and torch.equal(second.as_tensor(), expected)
+    assert second.boxes_format == "xcyc" and not second.absolute and second.labels.as_tensor().tolist() == [1, 3]
+
+    # Setting a property on a result does not alter the cache
+    first.boxes_format = "yxyx"
+    assert boxes.rel_pos().xcyc().boxes_format == "xcyc"
+
+    # In place modification of the boxes, new property or new children: the view is computed again
+    reset_view_cache_stats()
+    boxes[0, 0] = 0.0
+    assert boxes.xcyc().as_tensor()[0, 0] == 25.0
+    view = boxes.xcyc()
+    view.mul_(2)
+    assert boxes.xcyc().as_tensor()[0, 0] == 25.0
+    boxes.frame_size = (200, 400)
+    assert boxes.rel_pos().as_tensor()[0, 2] == 50.0 / 400
+    boxes.labels = Labels(torch.tensor([0.0, 0.0]), encoding="id")
+    assert boxes.xcyc().labels.as_tensor().tolist() == [0, 0]
+    assert view_cache_stats() == {"hits": 2, "misses": 3}
+
+
+def test_cached_views_not_aliased():
+    boxes = build_boxes()
+    first, second = boxes.xyxy(), boxes.xyxy()
+    first.add_(1)
+    first.labels.add_(1)
+    assert torch.equal(second.as_tensor(), boxes.as_tensor()) and second.labels.as_tensor().tolist() == [1, 3]
+    assert torch.equal(boxes.xyxy().as_tensor(), boxes.as_tensor())
+
+    # The children are not cached: an in place modification of a child is seen by the next results
+    boxes.xcyc()
+    boxes.labels[0] = 5
+    assert boxes.xcyc().labels.as_tensor().tolist() == [5, 3]
+
+    # A modified result does not use the views of the cached view
+    relative = boxes.rel_pos()
+    expected = relative.xcyc().as_tensor()
+    relative.mul_(2)
+    assert torch.equal(relative.xcyc().as_tensor(), expected * 2)
+    assert torch.equal(boxes.rel_pos().xcyc().as_tensor(), expected)
+
+    # Rotation modifies the points given by `xy().abs_pos()` in place
+    points = Points2D(torch.tensor([[10.0, 20.0]]), points_format="xy", absolute=True, frame_size=(100, 200))
+    expected = points.xy().abs_pos((100, 200)).as_tensor()
+    points._rotate(90)
+    assert torch.equal(points.xy().abs_pos((100, 200)).as_tensor(), expected)
+
+
+def test_cached_views_grad_and_pickle():
+    boxes = build_boxes()
+    boxes.xcyc()
+    # The cache is not sent with the boxes
+    assert len(pickle.loads(pickle.dumps(boxes)).__dict__.get("_view_cache", [])) == 0
+
+    # The views requiring grad are not cached
+    data = torch.rand(3, 4, requires_grad=True)
+    pred = BoundingBoxes2D(data, boxes_format="xcyc", absolute=False)
+    reset_view_cache_stats()
+    (pred.xyxy().as_tensor().sum() + pred.xyxy().as_tensor().sum()).backward()
+    assert view_cache_stats() == {"hits": 0, "misses": 0} and data.grad is not None
+
+    points = Points2D(torch.tensor([[10.0, 20.0]]), points_format="xy", absolute=True, frame_size=(100, 200))
+    points.rel_pos().yx()
+    assert torch.equal(points.rel_pos().yx().as_tensor(), torch.tensor([[0.2, 0.05]]))
+    assert view_cache_stats()["hits"] == 2